@@ -8,8 +8,12 @@ export interface ApplicationBasicInfo {
   name: string
   /** 应用描述 */
   description?: string
-  /** 应用图标（Base64编码字符串） */
+  /** 应用图标（Base64编码字符串或图标地址） */
   icon?: string
+  /** 应用图标地址（带版本号，可被浏览器缓存） */
+  icon_url?: string
+  /** 应用图标内容摘要 */
+  icon_hash?: string
   /** 应用所属分组 */
   category?: string
   /** 应用版本号 */
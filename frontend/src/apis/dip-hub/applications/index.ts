@@ -30,7 +30,9 @@ export const postApplications = (file: Blob | ArrayBuffer): Promise<ApplicationI
 export const getApplications = (params?: Record<string, any>): Promise<ApplicationInfo[]> =>
   get(`/api/dip-hub/v1/applications`, { params }).then((result: any) => {
     // 如果结果不是数组，返回空数组
-    return Array.isArray(result) ? result : []
+    if (!Array.isArray(result)) return []
+    // 列表默认不返回图标内容，使用图标地址加载
+    return result.map((app: ApplicationInfo) => ({ ...app, icon: app.icon || app.icon_url }))
   })
 
 /**
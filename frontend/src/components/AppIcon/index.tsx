@@ -5,7 +5,7 @@ import BuiltInIcon from '@/assets/images/project/builtIn.svg?react'
 import SystemIcon from '@/assets/images/project/system.svg?react'
 
 interface AppIconProps {
-  /** 应用图标（Base64编码字符串） */
+  /** 应用图标（Base64编码字符串或图标地址） */
   icon?: string
   /** 应用名称（用于显示首字母） */
   name?: string
@@ -25,7 +25,7 @@ interface AppIconProps {
 
 /**
  * 应用图标组件
- * 支持显示 base64 图片，加载失败时自动 fallback 到 Avatar 显示首字母
+ * 支持显示 base64 图片或图标地址，加载失败时自动 fallback 到 Avatar 显示首字母
  */
 const AppIcon = ({
   icon,
@@ -57,8 +57,9 @@ const AppIcon = ({
     )
   }
 
-  // 判断 icon 是否已经是完整的 data URL
-  const imageSrc = icon.startsWith('data:') ? icon : `data:image/png;base64,${icon}`
+  // 判断 icon 是否已经是完整的 data URL 或图标地址（JPEG 的 Base64 以 "/9j/" 开头，不能只判断 "/"）
+  const isUrl = icon.startsWith('data:') || icon.startsWith('/api/') || /^https?:\/\//.test(icon)
+  const imageSrc = isUrl ? icon : `data:image/png;base64,${icon}`
 
   return (
     <div className={clsx('relative inline-flex', className)} style={style}>
@@ -0,0 +1,149 @@
+"""
+认证中间件基准测试
+
+直接以 ASGI 调用方式（不经过网络）测量每个请求的中间件开销，对比：
+- 无中间件
+- 原生 ASGI 实现的 AuthMiddleware（当前实现）
+- 基于 BaseHTTPMiddleware、逐项匹配公开路径的旧实现
+
+内省和用户信息查询替换为立即返回的桩，只测量中间件本身的开销。
+
+用法:
+    python scripts/bench_auth_middleware.py --requests 20000
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from src.infrastructure.config.settings import Settings
+from src.infrastructure.container import init_container
+from src.infrastructure.context.token_context import TokenContext, UserContext
+from src.infrastructure.middleware.auth_middleware import AuthMiddleware, PUBLIC_PATHS
+from src.ports.hydra_port import IntrospectResponse
+from src.ports.user_management_port import UserInfo
+
+
+class LegacyAuthMiddleware(BaseHTTPMiddleware):
+    """旧实现：BaseHTTPMiddleware + 逐项匹配公开路径（省略错误分支）。"""
+
+    def _is_public_path(self, path: str) -> bool:
+        for public_path in PUBLIC_PATHS:
+            if path == public_path:
+                return True
+            if path.endswith(public_path) or path.endswith(public_path + "/"):
+                return True
+            if path.startswith(public_path + "/") or path.startswith(public_path + "?"):
+                return True
+        return False
+
+    async def dispatch(self, request: Request, call_next):
+        if self._is_public_path(request.url.path):
+            return await call_next(request)
+        auth_header = request.headers.get("Authorization")
+        auth_token = auth_header[7:] if auth_header.startswith("Bearer ") else auth_header
+        request.state.auth_token = auth_header
+        TokenContext.set_token(auth_token)
+        container = _container
+        introspect = await container.hydra_adapter.introspect(auth_token)
+        user_infos = await container.user_management_adapter.batch_get_user_info_by_id([introspect.visitor_id])
+        UserContext.set_user_info(user_infos[introspect.visitor_id])
+        try:
+            return await call_next(request)
+        finally:
+            TokenContext.clear_token()
+            UserContext.clear_user_info()
+
+
+class _StubHydra:
+    async def introspect(self, token: str) -> IntrospectResponse:
+        return IntrospectResponse(active=True, visitor_id="u1")
+
+
+class _StubUserManagement:
+    async def batch_get_user_info_by_id(self, user_ids: list) -> dict:
+        return {"u1": UserInfo(id="u1", account="bench", vision_name="bench")}
+
+
+async def endpoint(request: Request) -> PlainTextResponse:
+    return PlainTextResponse("ok")
+
+
+def _build_app(middleware: list) -> Starlette:
+    return Starlette(
+        routes=[
+            Route("/api/dip-hub/v1/applications", endpoint),
+            Route("/api/dip-hub/v1/healthz", endpoint),
+        ],
+        middleware=middleware,
+    )
+
+
+async def _measure(app, path: str, total: int) -> float:
+    """调用 total 次 ASGI 应用，返回平均每个请求的耗时（微秒）。"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench"), (b"authorization", b"Bearer bench-token")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("127.0.0.1", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(200):
+        await app(dict(scope), receive, send)
+    start = time.perf_counter()
+    for _ in range(total):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / total * 1e6
+
+
+async def main(total: int) -> None:
+    apps = {
+        "无中间件": _build_app([]),
+        "原生 ASGI AuthMiddleware": _build_app([Middleware(AuthMiddleware)]),
+        "BaseHTTPMiddleware 旧实现": _build_app([Middleware(LegacyAuthMiddleware)]),
+    }
+    print(f"requests={total}")
+    for path in ("/api/dip-hub/v1/applications", "/api/dip-hub/v1/healthz"):
+        print(f"\n{path}")
+        baseline = None
+        for name, app in apps.items():
+            per_request = await _measure(app, path, total)
+            baseline = per_request if baseline is None else baseline
+            print(f"  {name:<28} {per_request:8.1f} us/req  (中间件开销 {per_request - baseline:6.1f} us)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000, help="每种配置的请求数")
+    args = parser.parse_args()
+
+    _container = init_container(Settings())
+    _container._hydra_adapter = _StubHydra()
+    _container._user_management_adapter = _StubUserManagement()
+    asyncio.run(main(args.requests))
@@ -0,0 +1,92 @@
+"""
+HTTP 连接池基准测试
+
+在本地启动一个模拟上游服务，分别用“每次请求新建会话”（旧实现）和
+共享连接池（OntologyManagerAdapter + HttpClientPool）发送请求，对比吞吐量。
+
+用法:
+    python scripts/bench_http_pool.py --requests 2000 --concurrency 20
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import aiohttp
+from aiohttp import web
+
+from src.adapters.external_service_adapter import OntologyManagerAdapter
+from src.infrastructure.config.settings import Settings
+from src.infrastructure.http_client import HttpClientPool
+
+
+async def _start_upstream() -> tuple:
+    """启动模拟 Ontology Manager 服务，返回 (runner, port)。"""
+
+    async def handle(request: web.Request) -> web.Response:
+        return web.json_response({"entries": [{"id": request.match_info["kn_id"], "name": "kn"}]})
+
+    app = web.Application()
+    app.router.add_get("/api/ontology-manager/v1/knowledge-networks/{kn_id}", handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, site._server.sockets[0].getsockname()[1]
+
+
+async def _run(fn, total: int, concurrency: int) -> float:
+    """以指定并发执行 total 次 fn，返回每秒请求数。"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            await fn(i)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return total / (time.perf_counter() - start)
+
+
+async def main(total: int, concurrency: int) -> None:
+    runner, port = await _start_upstream()
+    base_url = f"http://127.0.0.1:{port}"
+    url = f"{base_url}/api/ontology-manager/v1/knowledge-networks"
+    settings = Settings(ontology_manager_url=base_url)
+
+    async def per_request_session(i: int) -> None:
+        timeout = aiohttp.ClientTimeout(total=settings.ontology_manager_timeout, connect=30.0)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with session.get(f"{url}/{i}") as response:
+                response.raise_for_status()
+                await response.json()
+
+    pool = HttpClientPool(settings)
+    adapter = OntologyManagerAdapter(settings, pool)
+
+    async def pooled(i: int) -> None:
+        await adapter.get_knowledge_network(str(i))
+
+    try:
+        before = await _run(per_request_session, total, concurrency)
+        after = await _run(pooled, total, concurrency)
+    finally:
+        await pool.close()
+        await runner.cleanup()
+
+    print(f"requests={total} concurrency={concurrency}")
+    print(f"每次请求新建会话: {before:10.1f} req/s")
+    print(f"共享连接池:       {after:10.1f} req/s  ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="请求总数")
+    parser.add_argument("--concurrency", type=int, default=20, help="并发数")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
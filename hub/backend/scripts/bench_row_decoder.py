@@ -0,0 +1,264 @@
+"""
+应用行解码基准测试
+
+构造 t_application 查询结果行，对比解码耗时：
+- 旧实现 _row_to_application（按行长度判断旧表结构、标准库 json，保留在本脚本中作为对照）
+- ApplicationRowDecoder + 标准库 json
+- ApplicationRowDecoder + orjson（未安装时跳过）
+列表查询不加载图标（include_icon=False），详情查询加载图标，分别测量。
+
+用法:
+    python scripts/bench_row_decoder.py --rows 10000
+"""
+import argparse
+import base64
+import json
+import logging
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.adapters.application_row_decoder import ApplicationRowDecoder
+from src.domains.application import (
+    Application, MicroAppInfo, OntologyConfigItem, AgentConfigItem, ReleaseConfigItem, compute_icon_hash,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_micro_app(json_str: Optional[str]) -> Optional[MicroAppInfo]:
+    """
+    解析 JSON 字符串为 MicroAppInfo。
+
+    参数:
+        json_str: JSON 字符串
+
+    返回:
+        Optional[MicroAppInfo]: 解析后的微应用信息，失败时返回 None
+    """
+    if not json_str:
+        return None
+    try:
+        data = json.loads(json_str)
+        if isinstance(data, dict):
+            return MicroAppInfo(
+                name=data.get("name", ""),
+                entry=data.get("entry", ""),
+                headless=data.get("headless", False),
+            )
+        return None
+    except (json.JSONDecodeError, TypeError) as e:
+        logger.warning(f"微应用配置 JSON 解析失败: {json_str}, 错误: {e}")
+        return None
+
+
+def _parse_release_config_list(json_str: Optional[str]) -> List[ReleaseConfigItem]:
+    """
+    解析 release_config JSON 字符串。
+
+    参数:
+        json_str: JSON 字符串
+
+    返回:
+        list: 解析后的 ReleaseConfigItem 列表
+    """
+    if not json_str:
+        return []
+    try:
+        data = json.loads(json_str)
+        if not isinstance(data, list):
+            return []
+        
+        result = []
+        for item in data:
+            if isinstance(item, dict):
+                # 新格式：{name, namespace}
+                result.append(ReleaseConfigItem(
+                    name=item.get("name", ""),
+                    namespace=item.get("namespace", "default"),
+                ))
+            elif isinstance(item, str):
+                # 兼容旧格式：仅 release name，namespace 使用默认值
+                result.append(ReleaseConfigItem(name=item, namespace="default"))
+        return result
+    except (json.JSONDecodeError, TypeError) as e:
+        logger.warning(f"release_config JSON 解析失败: {json_str}, 错误: {e}")
+        return []
+
+
+def _parse_config_list(json_str: Optional[str], config_type: str) -> list:
+    """
+    解析配置列表 JSON 字符串。
+
+    参数:
+        json_str: JSON 字符串
+        config_type: 配置类型 ('ontology' 或 'agent')
+
+    返回:
+        list: 解析后的配置项列表
+    """
+    if not json_str:
+        return []
+    try:
+        data = json.loads(json_str)
+        if not isinstance(data, list):
+            return []
+        
+        result = []
+        for item in data:
+            if isinstance(item, dict):
+                if config_type == 'ontology':
+                    result.append(OntologyConfigItem(
+                        id=str(item.get("id", "")),
+                        is_config=item.get("is_config", False),
+                    ))
+                elif config_type == 'agent':
+                    result.append(AgentConfigItem(
+                        id=str(item.get("id", "")),
+                        is_config=item.get("is_config", False),
+                    ))
+            # 兼容旧格式：如果是整数或字符串，转换为配置项
+            elif isinstance(item, (int, str)):
+                if config_type == 'ontology':
+                    result.append(OntologyConfigItem(id=str(item), is_config=False))
+                elif config_type == 'agent':
+                    result.append(AgentConfigItem(id=str(item), is_config=False))
+        return result
+    except (json.JSONDecodeError, TypeError) as e:
+        logger.warning(f"配置列表 JSON 解析失败: {json_str}, 错误: {e}")
+        return []
+
+
+def _row_to_application(row: tuple) -> Application:
+    """
+    将数据库行转换为应用领域模型（引入 ApplicationRowDecoder 之前 ApplicationAdapter 的实现）。
+
+    参数:
+        row: 数据库查询结果行
+            (id, key, name, description, icon, version, category, micro_app,
+             release_config, ontology_ids, agent_ids, is_config, updated_by, updated_by_id, updated_at)
+            或包含 business_domain、pinned、icon_hash 的扩展版本
+
+    返回:
+        Application: 应用领域模型
+    """
+    # 将二进制图标转换为 Base64 字符串
+    icon_base64 = None
+    if row[4]:
+        try:
+            icon_base64 = base64.b64encode(row[4]).decode('utf-8')
+        except Exception as e:
+            logger.warning(f"应用图标 Base64 编码失败: {e}")
+            icon_base64 = None
+
+    # 解析 JSON 字段
+    micro_app = _parse_micro_app(row[7])
+    release_config = _parse_release_config_list(row[8])
+    # 兼容旧格式：如果字段名还是 ontology_ids/agent_ids，先尝试解析为配置项
+    ontology_config = _parse_config_list(row[9], 'ontology')
+    agent_config = _parse_config_list(row[10], 'agent')
+    
+    # is_config, pinned, updated_by, updated_by_id, updated_at, business_domain
+    # 新结构（17 列）：row[11]=is_config, row[12]=pinned, row[13]=updated_by, row[14]=updated_by_id, row[15]=updated_at, row[16]=business_domain
+    # 旧结构（16 列）：row[11]=is_config, row[12]=updated_by, row[13]=updated_by_id, row[14]=updated_at, row[15]=business_domain
+    if len(row) > 16:
+        pinned = bool(row[12]) if row[12] is not None else False
+        updated_by = row[13] or ""
+        updated_by_id = (row[14] or "") if len(row) > 14 else ""
+        updated_at = row[15] if len(row) > 15 else None
+        business_domain = row[16] if row[16] is not None else "db_public"
+    else:
+        pinned = False
+        updated_by = row[12] or "" if len(row) > 12 else ""
+        updated_by_id = (row[13] or "") if len(row) > 13 else ""
+        updated_at = row[14] if len(row) > 14 else (row[13] if len(row) > 13 else None)
+        business_domain = row[15] if len(row) > 15 and row[15] is not None else "db_public"
+
+    # 新结构（18 列）：row[17]=icon_hash；尚未回填摘要的旧数据根据图标内容计算
+    icon_hash = row[17] if len(row) > 17 else None
+    if icon_hash is None and row[4]:
+        icon_hash = compute_icon_hash(row[4])
+
+    return Application(
+        id=row[0],
+        key=row[1],
+        name=row[2],
+        description=row[3],
+        icon=icon_base64,
+        version=row[5],
+        category=row[6],
+        business_domain=business_domain,
+        micro_app=micro_app,
+        release_config=release_config,
+        ontology_config=ontology_config,
+        agent_config=agent_config,
+        is_config=bool(row[11]) if row[11] is not None else False,
+        pinned=pinned,
+        updated_by=updated_by,
+        updated_by_id=updated_by_id,
+        updated_at=updated_at,
+        icon_hash=icon_hash,
+    )
+
+
+def _build_rows(count: int, include_icon: bool) -> list:
+    """构造 count 行查询结果（每个应用 2 个 Release、3 个业务知识网络、5 个智能体）。"""
+    icon = bytes(range(256)) * 16 if include_icon else None
+    rows = []
+    for i in range(count):
+        rows.append((
+            i, f"app-{i:06d}", f"应用 {i}", "应用描述" * 8, icon, "1.2.3", "分组",
+            json.dumps({"name": f"app{i}", "entry": f"/app{i}", "headless": False}),
+            json.dumps([{"name": f"release-{i}-{j}", "namespace": "dip"} for j in range(2)]),
+            json.dumps([{"id": f"kn-{i}-{j}", "is_config": j % 2 == 0} for j in range(3)]),
+            json.dumps([{"id": f"agent-{i}-{j}", "is_config": True} for j in range(5)]),
+            1, 0, "管理员", "00000000-0000-0000-0000-000000000000", datetime(2024, 1, 1), "db_public",
+            "a" * 40,
+        ))
+    return rows
+
+
+def _measure(decode, rows: list, repeat: int) -> float:
+    """返回 repeat 次中最快一次解码全部行的耗时（秒）。"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for row in rows:
+            decode(row)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(count: int, repeat: int) -> None:
+    decoders = [
+        ("_row_to_application（旧实现）", _row_to_application),
+        ("ApplicationRowDecoder + json", ApplicationRowDecoder(json_loads=json.loads).decode),
+    ]
+    try:
+        import orjson
+        decoders.append(("ApplicationRowDecoder + orjson", ApplicationRowDecoder(json_loads=orjson.loads).decode))
+    except ImportError:
+        print("未安装 orjson，跳过 orjson 解码器")
+
+    for include_icon in (False, True):
+        rows = _build_rows(count, include_icon)
+        print(f"\n{count} 行，{'加载' if include_icon else '不加载'}图标：")
+        baseline = None
+        for label, decode in decoders:
+            elapsed = _measure(decode, rows, repeat)
+            baseline = baseline or elapsed
+            print(f"  {label:<34} {elapsed * 1000:8.1f} ms  {elapsed / count * 1e6:6.2f} us/行  x{baseline / elapsed:.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="应用行解码基准测试")
+    parser.add_argument("--rows", type=int, default=10000, help="解码的行数")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数（取最快一次）")
+    args = parser.parse_args()
+    main(args.rows, args.repeat)
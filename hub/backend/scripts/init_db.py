@@ -81,12 +81,13 @@ def init_database():
                     `name` VARCHAR(128) NOT NULL COMMENT '应用名称',
                     `description` VARCHAR(800) NULL COMMENT '应用描述',
                     `icon` BLOB NULL COMMENT '应用图标（二进制数据）',
+                    `icon_hash` CHAR(40) NULL COMMENT '应用图标 SHA-1 摘要',
                     `version` VARCHAR(128) NULL COMMENT '当前上传的版本号',
                     `category` VARCHAR(128) NULL COMMENT '应用所属分组',
-                    `micro_app` TEXT NULL COMMENT '微应用配置（JSON对象）',
-                    `release_config` TEXT NULL COMMENT '应用安装配置（JSON数组，helm release名称列表）',
-                    `ontology_ids` TEXT NULL COMMENT '业务知识网络配置（JSON数组，每个元素包含id和is_config字段）',
-                    `agent_ids` TEXT NULL COMMENT '智能体配置（JSON数组，每个元素包含id和is_config字段）',
+                    `micro_app` JSON NULL COMMENT '微应用配置（JSON对象）',
+                    `release_config` JSON NULL COMMENT '应用安装配置（JSON数组，helm release名称列表）',
+                    `ontology_ids` JSON NULL COMMENT '业务知识网络配置（JSON数组，每个元素包含id和is_config字段）',
+                    `agent_ids` JSON NULL COMMENT '智能体配置（JSON数组，每个元素包含id和is_config字段）',
                     `is_config` BOOLEAN NOT NULL DEFAULT FALSE COMMENT '是否完成配置',
                     `updated_by` CHAR(36) NOT NULL COMMENT '更新者ID',
                     `updated_at` TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
@@ -94,11 +95,28 @@ def init_database():
                     UNIQUE INDEX `idx_key` (`key`),
                     INDEX `idx_updated_by` (`updated_by`),
                     INDEX `idx_updated_at` (`updated_at`),
-                    INDEX `idx_category` (`category`)
+                    INDEX `idx_category` (`category`),
+                    INDEX `idx_category_updated_at` (`category`, `updated_at`),
+                    INDEX `idx_business_domain_updated_at` (`business_domain`, `updated_at`),
+                    INDEX `idx_pinned_updated_at` (`pinned`, `updated_at`),
+                    INDEX `idx_name` (`name`)
                 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='应用表'
             """)
             print("✓ 表 't_application' 已创建")
 
+            # 创建应用引用表（按业务知识网络/智能体 ID 反查应用）
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS `t_application_ref` (
+                    `application_id` BIGINT NOT NULL COMMENT '应用主键ID（t_application.id）',
+                    `kind` VARCHAR(16) NOT NULL COMMENT '引用类型（ontology=业务知识网络，agent=智能体）',
+                    `ref_id` VARCHAR(128) NOT NULL COMMENT '业务知识网络ID或智能体ID',
+                    `is_config` BOOLEAN NOT NULL DEFAULT FALSE COMMENT '是否已配置',
+                    PRIMARY KEY (`application_id`, `kind`, `ref_id`),
+                    INDEX `idx_kind_ref_id` (`kind`, `ref_id`)
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='应用引用的业务知识网络和智能体'
+            """)
+            print("✓ 表 't_application_ref' 已创建")
+
         connection.commit()
         print("\n✓ 数据库初始化完成！")
 
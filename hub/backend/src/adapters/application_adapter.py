@@ -4,17 +4,22 @@
 实现 ApplicationPort 接口的数据库适配器。
 负责与 MariaDB 数据库交互，完成应用数据的持久化操作。
 """
+import asyncio
 import base64
-import json
 import logging
-from typing import List, Optional
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional, Tuple
 from datetime import datetime
 
-import aiomysql
-
-from src.domains.application import Application, MicroAppInfo, OntologyConfigItem, AgentConfigItem, ReleaseConfigItem
+from src.domains.application import (
+    Application, ApplicationCursor, ApplicationIcon, ApplicationListQuery, ApplicationPage, ApplicationRefKind,
+    OntologyConfigItem, AgentConfigItem, compute_icon_hash,
+)
 from src.ports.application_port import ApplicationPort
+from src.adapters.application_query_builder import ApplicationQueryBuilder
 from src.infrastructure.config.settings import Settings
+from src.infrastructure.database.pool import DatabasePool
+from src.infrastructure.metrics.histogram import Histogram
 
 logger = logging.getLogger(__name__)
 
@@ -25,260 +30,299 @@ class ApplicationAdapter(ApplicationPort):
 
     该适配器实现了 ApplicationPort 接口，提供应用数据的数据库访问操作。
     使用 aiomysql 进行异步数据库操作。
+
+    应用引用的业务知识网络和智能体同时写入 t_application_ref 表（与 t_application 在同一事务中更新），
+    按业务知识网络/智能体 ID 反查应用时走该表的索引，不需要全表扫描解析 JSON 字段。
     """
 
-    def __init__(self, settings: Settings):
+    def __init__(self, settings: Settings, acquire_wait: Optional[Histogram] = None):
         """
         初始化应用适配器。
 
         参数:
             settings: 应用配置
+            acquire_wait: 获取数据库连接等待时间直方图（可选）
         """
         self._settings = settings
-        self._pool: Optional[aiomysql.Pool] = None
+        self._acquire_wait = acquire_wait
+        self._pool: Optional[DatabasePool] = None
+        self._pool_lock = asyncio.Lock()
+        # 连接池创建时按实际表结构重新生成
+        self._queries = ApplicationQueryBuilder()
 
-    async def _get_pool(self) -> aiomysql.Pool:
+    async def _get_pool(self) -> DatabasePool:
         """
-        获取数据库连接池。
+        获取数据库连接池（首次调用时创建）。
 
         返回:
-            aiomysql.Pool: 数据库连接池
+            DatabasePool: 数据库连接池
         """
         if self._pool is None:
-            self._pool = await aiomysql.create_pool(
-                host=self._settings.db_host,
-                port=self._settings.db_port,
-                user=self._settings.db_user,
-                password=self._settings.db_password,
-                db=self._settings.db_name,
-                autocommit=True,
-                minsize=1,
-                maxsize=10,
-            )
-            logger.info(f"数据库连接池已创建: {self._settings.db_host}:{self._settings.db_port}/{self._settings.db_name}")
+            async with self._pool_lock:
+                if self._pool is None:
+                    pool = DatabasePool(self._settings, self._acquire_wait)
+                    await pool.open()
+                    self._queries = await self._detect_queries(pool)
+                    self._pool = pool
         return self._pool
 
-    async def close(self):
-        """关闭数据库连接池。"""
-        if self._pool is not None:
-            self._pool.close()
-            await self._pool.wait_closed()
-            logger.info("数据库连接池已关闭")
-
-    def _parse_json_list(self, json_str: Optional[str], default: list = None) -> list:
+    async def _detect_queries(self, pool: DatabasePool) -> ApplicationQueryBuilder:
         """
-        解析 JSON 字符串为列表。
+        读取 t_application 的实际列，生成对应的 SQL 语句和行解码器。读取失败时按最新表结构处理。
 
         参数:
-            json_str: JSON 字符串
-            default: 默认值
+            pool: 数据库连接池
 
         返回:
-            list: 解析后的列表
+            ApplicationQueryBuilder: SQL 构建器
         """
-        if default is None:
-            default = []
-        if not json_str:
-            return default
         try:
-            result = json.loads(json_str)
-            return result if isinstance(result, list) else default
-        except json.JSONDecodeError:
-            logger.warning(f"JSON 解析失败: {json_str}")
-            return default
+            async with pool.acquire() as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.execute(
+                        "SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS "
+                        "WHERE TABLE_SCHEMA = %s AND TABLE_NAME = 't_application'",
+                        (self._settings.db_name,)
+                    )
+                    columns = [row[0] for row in await cursor.fetchall()]
+        except Exception as e:
+            logger.warning(f"读取 t_application 表结构失败，按最新表结构生成 SQL: {e}")
+            return ApplicationQueryBuilder()
+        if not columns:
+            return ApplicationQueryBuilder()
+        return ApplicationQueryBuilder(columns)
 
-    def _parse_micro_app(self, json_str: Optional[str]) -> Optional[MicroAppInfo]:
+    async def get_pool(self) -> DatabasePool:
         """
-        解析 JSON 字符串为 MicroAppInfo。
-
-        参数:
-            json_str: JSON 字符串
+        获取数据库连接池（供同库的其他适配器共享）。
 
         返回:
-            Optional[MicroAppInfo]: 解析后的微应用信息，失败时返回 None
+            DatabasePool: 数据库连接池
         """
-        if not json_str:
-            return None
-        try:
-            data = json.loads(json_str)
-            if isinstance(data, dict):
-                return MicroAppInfo(
-                    name=data.get("name", ""),
-                    entry=data.get("entry", ""),
-                    headless=data.get("headless", False),
-                )
-            return None
-        except (json.JSONDecodeError, TypeError) as e:
-            logger.warning(f"微应用配置 JSON 解析失败: {json_str}, 错误: {e}")
-            return None
+        return await self._get_pool()
+
+    @property
+    def pool(self) -> Optional[DatabasePool]:
+        """已创建的数据库连接池，尚未创建时为 None（供指标读取，不触发创建）。"""
+        return self._pool
+
+    async def warm_up(self) -> None:
+        """创建数据库连接池并预热 db_pool_minsize 个连接（服务启动时调用）。"""
+        pool = await self._get_pool()
+        count = await pool.warm_up()
+        logger.info(f"数据库连接池已预热: {count} 个连接")
+
+    async def close(self):
+        """关闭数据库连接池。"""
+        if self._pool is not None:
+            await self._pool.close()
+            logger.info("数据库连接池已关闭")
 
-    def _parse_release_config_list(self, json_str: Optional[str]) -> List[ReleaseConfigItem]:
+    async def get_all_applications(
+        self,
+        pinned: Optional[bool] = None,
+        include_icon: bool = True,
+    ) -> List[Application]:
         """
-        解析 release_config JSON 字符串。
+        获取所有已安装的应用列表，可按被钉状态过滤。
 
         参数:
-            json_str: JSON 字符串
+            pinned: 可选，按被钉状态过滤
+            include_icon: 是否加载图标内容
+        """
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                # 不加载图标内容时只返回 icon_hash，图标由图标接口单独提供
+                queries = self._queries
+                sql = queries.select(include_icon)
+                params = ()
+                if pinned is not None:
+                    sql += " WHERE pinned = %s"
+                    params = (pinned,)
+                sql += " ORDER BY updated_at DESC"
+                await cursor.execute(sql, params)
+                rows = await cursor.fetchall()
+                return [queries.decoder.decode(row) for row in rows]
+
+    async def list_applications(self, query: ApplicationListQuery) -> ApplicationPage:
+        """
+        按条件分页查询应用列表，按 (updated_at, id) 倒序排列。
+
+        过滤、排序和分页都在 SQL 中完成：分页使用 keyset 条件而非 OFFSET，
+        总数仅在 query.include_total 为 True 时统计。
+
+        参数:
+            query: 查询条件
 
         返回:
-            list: 解析后的 ReleaseConfigItem 列表
+            ApplicationPage: 分页结果
+        """
+        where, params = self._build_list_filters(query)
+        page_where = list(where)
+        page_params = list(params)
+        if query.cursor is not None:
+            # 展开写法而非行构造器 (updated_at, id) < (...)，确保能走 updated_at 索引范围扫描
+            page_where.append("(updated_at < %s OR (updated_at = %s AND id < %s))")
+            page_params.extend([query.cursor.updated_at, query.cursor.updated_at, query.cursor.id])
+
+        queries = self._queries
+        sql = queries.select(query.include_icon)
+        if page_where:
+            sql += " WHERE " + " AND ".join(page_where)
+        sql += " ORDER BY updated_at DESC, id DESC"
+        if query.limit is not None:
+            # 多取一条用于判断是否还有下一页
+            sql += " LIMIT %s"
+            page_params.append(query.limit + 1)
+
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(sql, tuple(page_params))
+                rows = await cursor.fetchall()
+
+                total = None
+                if query.include_total:
+                    count_sql = "SELECT COUNT(*) FROM t_application"
+                    if where:
+                        count_sql += " WHERE " + " AND ".join(where)
+                    await cursor.execute(count_sql, tuple(params))
+                    total = (await cursor.fetchone())[0]
+
+        has_more = query.limit is not None and len(rows) > query.limit
+        if has_more:
+            rows = rows[:query.limit]
+        items = [queries.decoder.decode(row) for row in rows]
+        next_cursor = ApplicationCursor.after(items[-1]) if has_more else None
+        return ApplicationPage(items=items, next_cursor=next_cursor, total=total)
+
+    @staticmethod
+    def _build_list_filters(query: ApplicationListQuery) -> tuple:
         """
-        if not json_str:
-            return []
-        try:
-            data = json.loads(json_str)
-            if not isinstance(data, list):
-                return []
-            
-            result = []
-            for item in data:
-                if isinstance(item, dict):
-                    # 新格式：{name, namespace}
-                    result.append(ReleaseConfigItem(
-                        name=item.get("name", ""),
-                        namespace=item.get("namespace", "default"),
-                    ))
-                elif isinstance(item, str):
-                    # 兼容旧格式：仅 release name，namespace 使用默认值
-                    result.append(ReleaseConfigItem(name=item, namespace="default"))
-            return result
-        except (json.JSONDecodeError, TypeError) as e:
-            logger.warning(f"release_config JSON 解析失败: {json_str}, 错误: {e}")
-            return []
-
-    def _parse_config_list(self, json_str: Optional[str], config_type: str) -> list:
-        """
-        解析配置列表 JSON 字符串。
+        根据查询条件生成 WHERE 子句（不含分页游标）。
 
         参数:
-            json_str: JSON 字符串
-            config_type: 配置类型 ('ontology' 或 'agent')
+            query: 查询条件
 
         返回:
-            list: 解析后的配置项列表
+            tuple: (条件列表, 参数列表)
+        """
+        where: List[str] = []
+        params: list = []
+        if query.pinned is not None:
+            where.append("pinned = %s")
+            params.append(query.pinned)
+        if query.category is not None:
+            where.append("category = %s")
+            params.append(query.category)
+        if query.business_domain is not None:
+            # 历史数据的 business_domain 可能为 NULL，按默认业务域 db_public 处理；
+            # 不使用 COALESCE，以便走 business_domain 索引
+            if query.business_domain == "db_public":
+                where.append("(business_domain = %s OR business_domain IS NULL)")
+            else:
+                where.append("business_domain = %s")
+            params.append(query.business_domain)
+        if query.is_config is not None:
+            where.append("is_config = %s")
+            params.append(query.is_config)
+        if query.name_prefix:
+            # 转义 LIKE 通配符，前缀匹配可以使用 name 索引
+            escaped = (
+                query.name_prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            )
+            where.append("name LIKE %s")
+            params.append(escaped + "%")
+        for kind, ref_id in (
+            (ApplicationRefKind.ONTOLOGY, query.ontology_id),
+            (ApplicationRefKind.AGENT, query.agent_id),
+        ):
+            if ref_id is not None:
+                # 反查使用 t_application_ref 的 (kind, ref_id) 索引
+                where.append("id IN (SELECT application_id FROM t_application_ref WHERE kind = %s AND ref_id = %s)")
+                params.extend([kind, ref_id])
+        return where, params
+
+    @staticmethod
+    @asynccontextmanager
+    async def _transaction(conn) -> AsyncIterator[None]:
+        """
+        在事务中执行（连接池默认自动提交），异常时回滚。
+
+        参数:
+            conn: 数据库连接
         """
-        if not json_str:
-            return []
+        await conn.begin()
         try:
-            data = json.loads(json_str)
-            if not isinstance(data, list):
-                return []
-            
-            result = []
-            for item in data:
-                if isinstance(item, dict):
-                    if config_type == 'ontology':
-                        result.append(OntologyConfigItem(
-                            id=str(item.get("id", "")),
-                            is_config=item.get("is_config", False),
-                        ))
-                    elif config_type == 'agent':
-                        result.append(AgentConfigItem(
-                            id=str(item.get("id", "")),
-                            is_config=item.get("is_config", False),
-                        ))
-                # 兼容旧格式：如果是整数或字符串，转换为配置项
-                elif isinstance(item, (int, str)):
-                    if config_type == 'ontology':
-                        result.append(OntologyConfigItem(id=str(item), is_config=False))
-                    elif config_type == 'agent':
-                        result.append(AgentConfigItem(id=str(item), is_config=False))
-            return result
-        except (json.JSONDecodeError, TypeError) as e:
-            logger.warning(f"配置列表 JSON 解析失败: {json_str}, 错误: {e}")
-            return []
-
-    def _row_to_application(self, row: tuple) -> Application:
-        """
-        将数据库行转换为应用领域模型。
+            yield
+        except BaseException:
+            await conn.rollback()
+            raise
+        await conn.commit()
+
+    @staticmethod
+    def _config_refs(
+        ontology_config: List[OntologyConfigItem],
+        agent_config: List[AgentConfigItem],
+    ) -> List[Tuple[str, str, bool]]:
+        """
+        将业务知识网络/智能体配置转换为引用记录，同一资源重复出现时只保留第一项。
 
         参数:
-            row: 数据库查询结果行
-                (id, key, name, description, icon, version, category, micro_app,
-                 release_config, ontology_ids, agent_ids, is_config, updated_by, updated_by_id, updated_at)
-                或包含 business_domain 的扩展版本
+            ontology_config: 业务知识网络配置列表
+            agent_config: 智能体配置列表
 
         返回:
-            Application: 应用领域模型
-        """
-        # 将二进制图标转换为 Base64 字符串
-        icon_base64 = None
-        if row[4]:
-            try:
-                icon_base64 = base64.b64encode(row[4]).decode('utf-8')
-            except Exception as e:
-                logger.warning(f"应用图标 Base64 编码失败: {e}")
-                icon_base64 = None
-
-        # 解析 JSON 字段
-        micro_app = self._parse_micro_app(row[7])
-        release_config = self._parse_release_config_list(row[8])
-        # 兼容旧格式：如果字段名还是 ontology_ids/agent_ids，先尝试解析为配置项
-        ontology_config = self._parse_config_list(row[9], 'ontology')
-        agent_config = self._parse_config_list(row[10], 'agent')
-        
-        # is_config, pinned, updated_by, updated_by_id, updated_at, business_domain
-        # 新结构（17 列）：row[11]=is_config, row[12]=pinned, row[13]=updated_by, row[14]=updated_by_id, row[15]=updated_at, row[16]=business_domain
-        # 旧结构（16 列）：row[11]=is_config, row[12]=updated_by, row[13]=updated_by_id, row[14]=updated_at, row[15]=business_domain
-        if len(row) > 16:
-            pinned = bool(row[12]) if row[12] is not None else False
-            updated_by = row[13] or ""
-            updated_by_id = (row[14] or "") if len(row) > 14 else ""
-            updated_at = row[15] if len(row) > 15 else None
-            business_domain = row[16] if row[16] is not None else "db_public"
-        else:
-            pinned = False
-            updated_by = row[12] or "" if len(row) > 12 else ""
-            updated_by_id = (row[13] or "") if len(row) > 13 else ""
-            updated_at = row[14] if len(row) > 14 else (row[13] if len(row) > 13 else None)
-            business_domain = row[15] if len(row) > 15 and row[15] is not None else "db_public"
-
-        return Application(
-            id=row[0],
-            key=row[1],
-            name=row[2],
-            description=row[3],
-            icon=icon_base64,
-            version=row[5],
-            category=row[6],
-            business_domain=business_domain,
-            micro_app=micro_app,
-            release_config=release_config,
-            ontology_config=ontology_config,
-            agent_config=agent_config,
-            is_config=bool(row[11]) if row[11] is not None else False,
-            pinned=pinned,
-            updated_by=updated_by,
-            updated_by_id=updated_by_id,
-            updated_at=updated_at,
-        )
-
-    async def get_all_applications(self, pinned: Optional[bool] = None) -> List[Application]:
+            List[Tuple[str, str, bool]]: (kind, ref_id, is_config) 列表
+        """
+        refs = {}
+        for kind, items in (
+            (ApplicationRefKind.ONTOLOGY, ontology_config or []),
+            (ApplicationRefKind.AGENT, agent_config or []),
+        ):
+            for item in items:
+                if item.id:
+                    refs.setdefault((kind, str(item.id)), bool(item.is_config))
+        return [(kind, ref_id, is_config) for (kind, ref_id), is_config in refs.items()]
+
+    async def _replace_refs(
+        self,
+        cursor,
+        app_id: int,
+        ontology_config: List[OntologyConfigItem],
+        agent_config: List[AgentConfigItem],
+    ) -> None:
         """
-        获取所有已安装的应用列表，可按被钉状态过滤。
+        用应用当前的配置替换 t_application_ref 中的引用记录（需在事务中调用）。
+
+        参数:
+            cursor: 数据库游标
+            app_id: 应用主键 ID
+            ontology_config: 业务知识网络配置列表
+            agent_config: 智能体配置列表
         """
-        pool = await self._get_pool()
-        async with pool.acquire() as conn:
-            async with conn.cursor() as cursor:
-                sql = """SELECT id, `key`, name, description, icon, version, category, micro_app,
-                              release_config, ontology_ids, agent_ids, is_config,
-                              COALESCE(pinned, 0) as pinned,
-                              updated_by, updated_by_id, updated_at, COALESCE(business_domain, 'db_public') as business_domain
-                       FROM t_application"""
-                params = ()
-                if pinned is not None:
-                    sql += " WHERE pinned = %s"
-                    params = (pinned,)
-                sql += " ORDER BY updated_at DESC"
-                await cursor.execute(sql, params)
-                rows = await cursor.fetchall()
-                return [self._row_to_application(row) for row in rows]
+        await cursor.execute("DELETE FROM t_application_ref WHERE application_id = %s", (app_id,))
+        refs = self._config_refs(ontology_config, agent_config)
+        if refs:
+            await cursor.executemany(
+                "INSERT INTO t_application_ref (application_id, kind, ref_id, is_config) VALUES (%s, %s, %s, %s)",
+                [(app_id, kind, ref_id, is_config) for kind, ref_id, is_config in refs],
+            )
 
-    async def get_application_by_key(self, key: str) -> Application:
+    async def get_application_by_key(
+        self,
+        key: str,
+        include_icon: bool = True,
+        include_config: bool = True,
+    ) -> Application:
         """
         根据应用唯一标识获取应用信息。
 
         参数:
             key: 应用包唯一标识
+            include_icon: 是否加载图标内容
+            include_config: 是否加载 Release、业务知识网络和智能体配置
 
         返回:
             Application: 应用实体
@@ -287,55 +331,55 @@ class ApplicationAdapter(ApplicationPort):
             ValueError: 当应用不存在时抛出
         """
         pool = await self._get_pool()
+        queries = self._queries
         async with pool.acquire() as conn:
             async with conn.cursor() as cursor:
-                await cursor.execute(
-                    """SELECT id, `key`, name, description, icon, version, category, micro_app,
-                              release_config, ontology_ids, agent_ids, is_config,
-                              COALESCE(pinned, 0) as pinned,
-                              updated_by, updated_by_id, updated_at, COALESCE(business_domain, 'db_public') as business_domain
-                       FROM t_application 
-                       WHERE `key` = %s""",
-                    (key,)
-                )
+                await cursor.execute(queries.select(include_icon, include_config, by="key"), (key,))
                 row = await cursor.fetchone()
                 if row is None:
                     raise ValueError(f"应用不存在: {key}")
-                return self._row_to_application(row)
+                return queries.decoder.decode(row)
 
-    async def get_application_by_key_optional(self, key: str) -> Optional[Application]:
+    async def get_application_by_key_optional(
+        self,
+        key: str,
+        include_icon: bool = True,
+        include_config: bool = True,
+    ) -> Optional[Application]:
         """
         根据应用唯一标识获取应用信息（可选）。
 
         参数:
             key: 应用包唯一标识
+            include_icon: 是否加载图标内容
+            include_config: 是否加载 Release、业务知识网络和智能体配置
 
         返回:
             Optional[Application]: 应用实体，不存在时返回 None
         """
         pool = await self._get_pool()
+        queries = self._queries
         async with pool.acquire() as conn:
             async with conn.cursor() as cursor:
-                await cursor.execute(
-                    """SELECT id, `key`, name, description, icon, version, category, micro_app,
-                              release_config, ontology_ids, agent_ids, is_config,
-                              COALESCE(pinned, 0) as pinned,
-                              updated_by, updated_by_id, updated_at, COALESCE(business_domain, 'db_public') as business_domain
-                       FROM t_application 
-                       WHERE `key` = %s""",
-                    (key,)
-                )
+                await cursor.execute(queries.select(include_icon, include_config, by="key"), (key,))
                 row = await cursor.fetchone()
                 if row is None:
                     return None
-                return self._row_to_application(row)
+                return queries.decoder.decode(row)
 
-    async def get_application_by_id(self, app_id: int) -> Application:
+    async def get_application_by_id(
+        self,
+        app_id: int,
+        include_icon: bool = True,
+        include_config: bool = True,
+    ) -> Application:
         """
         根据应用主键 ID 获取应用信息。
 
         参数:
             app_id: 应用主键 ID
+            include_icon: 是否加载图标内容
+            include_config: 是否加载 Release、业务知识网络和智能体配置
 
         返回:
             Application: 应用实体
@@ -344,21 +388,34 @@ class ApplicationAdapter(ApplicationPort):
             ValueError: 当应用不存在时抛出
         """
         pool = await self._get_pool()
+        queries = self._queries
         async with pool.acquire() as conn:
             async with conn.cursor() as cursor:
-                await cursor.execute(
-                    """SELECT id, `key`, name, description, icon, version, category, micro_app,
-                              release_config, ontology_ids, agent_ids, is_config,
-                              COALESCE(pinned, 0) as pinned,
-                              updated_by, updated_by_id, updated_at, COALESCE(business_domain, 'db_public') as business_domain
-                       FROM t_application 
-                       WHERE id = %s""",
-                    (app_id,)
-                )
+                await cursor.execute(queries.select(include_icon, include_config, by="id"), (app_id,))
                 row = await cursor.fetchone()
                 if row is None:
                     raise ValueError(f"应用不存在: id={app_id}")
-                return self._row_to_application(row)
+                return queries.decoder.decode(row)
+
+    async def get_application_icon(self, app_id: int) -> Optional[ApplicationIcon]:
+        """
+        获取应用图标的原始内容。
+
+        参数:
+            app_id: 应用主键 ID
+
+        返回:
+            Optional[ApplicationIcon]: 应用图标，应用不存在或没有图标时返回 None
+        """
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(self._queries.select_icon_sql, (app_id,))
+                row = await cursor.fetchone()
+                if row is None or not row[0]:
+                    return None
+                icon_data = bytes(row[0])
+                return ApplicationIcon(data=icon_data, icon_hash=row[1] or compute_icon_hash(icon_data))
 
     async def set_application_pinned(self, app_id: int, pinned: bool) -> Application:
         """设置应用是否被钉状态。"""
@@ -387,7 +444,7 @@ class ApplicationAdapter(ApplicationPort):
             ValueError: 当应用 key 已存在时抛出
         """
         pool = await self._get_pool()
-        async with pool.acquire() as conn:
+        async with pool.acquire() as conn, self._transaction(conn):
             async with conn.cursor() as cursor:
                 # 检查应用是否已存在
                 await cursor.execute(
@@ -398,65 +455,18 @@ class ApplicationAdapter(ApplicationPort):
                 if count > 0:
                     raise ValueError(f"应用已存在: {application.key}")
 
-                # 将 Base64 字符串转换为二进制数据
-                icon_binary = None
-                if application.icon:
-                    try:
-                        icon_binary = base64.b64decode(application.icon)
-                    except Exception as e:
-                        logger.warning(f"应用图标 Base64 解码失败: {e}")
-                        icon_binary = None
-
-                # 序列化 JSON 字段
-                micro_app_json = None
-                if application.micro_app:
-                    micro_app_json = json.dumps({
-                        "name": application.micro_app.name,
-                        "entry": application.micro_app.entry,
-                        "headless": application.micro_app.headless,
-                    })
-                release_config_json = json.dumps([
-                    {"name": item.name, "namespace": item.namespace}
-                    for item in (application.release_config or [])
-                ])
-                ontology_config_json = json.dumps([
-                    {"id": item.id, "is_config": item.is_config}
-                    for item in (application.ontology_config or [])
-                ])
-                agent_config_json = json.dumps([
-                    {"id": item.id, "is_config": item.is_config}
-                    for item in (application.agent_config or [])
-                ])
-
                 # 插入新应用
+                icon_binary = self._decode_icon(application)
                 await cursor.execute(
-                    """INSERT INTO t_application 
-                       (`key`, name, description, icon, version, category, micro_app,
-                        release_config, ontology_ids, agent_ids, is_config, pinned,
-                        updated_by, updated_by_id, updated_at, business_domain) 
-                       VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""",
-                    (
-                        application.key,
-                        application.name,
-                        application.description,
-                        icon_binary,
-                        application.version,
-                        application.category,
-                        micro_app_json,
-                        release_config_json,
-                        ontology_config_json,
-                        agent_config_json,
-                        application.is_config,
-                        getattr(application, 'pinned', False),
-                        application.updated_by,
-                        application.updated_by_id,
-                        application.updated_at or datetime.now(),
-                        application.business_domain,
-                    )
+                    self._queries.insert_sql,
+                    self._queries.insert_params(application, icon_binary, application.updated_at or datetime.now()),
                 )
 
                 # 获取插入的 ID
                 application.id = cursor.lastrowid
+                await self._replace_refs(
+                    cursor, application.id, application.ontology_config, application.agent_config
+                )
                 return application
 
     async def update_application(self, application: Application) -> Application:
@@ -473,67 +483,69 @@ class ApplicationAdapter(ApplicationPort):
             ValueError: 当应用不存在时抛出
         """
         pool = await self._get_pool()
-        async with pool.acquire() as conn:
+        async with pool.acquire() as conn, self._transaction(conn):
             async with conn.cursor() as cursor:
-                # 将 Base64 字符串转换为二进制数据
-                icon_binary = None
-                if application.icon:
-                    try:
-                        icon_binary = base64.b64decode(application.icon)
-                    except Exception as e:
-                        logger.warning(f"应用图标 Base64 解码失败: {e}")
-                        icon_binary = None
-
-                # 序列化 JSON 字段
-                micro_app_json = None
-                if application.micro_app:
-                    micro_app_json = json.dumps({
-                        "name": application.micro_app.name,
-                        "entry": application.micro_app.entry,
-                        "headless": application.micro_app.headless,
-                    })
-                release_config_json = json.dumps([
-                    {"name": item.name, "namespace": item.namespace}
-                    for item in (application.release_config or [])
-                ])
-                ontology_config_json = json.dumps([
-                    {"id": item.id, "is_config": item.is_config}
-                    for item in (application.ontology_config or [])
-                ])
-                agent_config_json = json.dumps([
-                    {"id": item.id, "is_config": item.is_config}
-                    for item in (application.agent_config or [])
-                ])
-
+                icon_binary = self._decode_icon(application)
                 await cursor.execute(
-                    """UPDATE t_application 
-                       SET name = %s, description = %s, icon = %s, version = %s, category = %s, micro_app = %s,
-                           release_config = %s, ontology_ids = %s, agent_ids = %s, is_config = %s, pinned = %s,
-                           updated_by = %s, updated_by_id = %s, updated_at = %s, business_domain = %s
-                       WHERE `key` = %s""",
-                    (
-                        application.name,
-                        application.description,
-                        icon_binary,
-                        application.version,
-                        application.category,
-                        micro_app_json,
-                        release_config_json,
-                        ontology_config_json,
-                        agent_config_json,
-                        application.is_config,
-                        getattr(application, 'pinned', False),
-                        application.updated_by,
-                        application.updated_by_id,
-                        application.updated_at or datetime.now(),
-                        application.business_domain,
-                        application.key,
-                    )
+                    self._queries.update_sql,
+                    self._queries.update_params(application, icon_binary, application.updated_at or datetime.now()),
                 )
 
                 if cursor.rowcount == 0:
                     raise ValueError(f"应用不存在: {application.key}")
 
+                await self._replace_refs(
+                    cursor, await self._get_id_by_key(cursor, application.key),
+                    application.ontology_config, application.agent_config,
+                )
+                return application
+
+    async def upsert_application(
+        self,
+        application: Application,
+        expected_version: Optional[str] = None,
+    ) -> Application:
+        """
+        创建应用，或在已安装版本与预期一致时更新应用。
+
+        使用 INSERT ... ON DUPLICATE KEY UPDATE，各列按 version <=> expected_version 条件更新，
+        应用 ID 通过 LAST_INSERT_ID 返回，不需要再次查询。
+        影响行数为 0 既可能是版本不一致，也可能是版本一致但内容与已保存的相同（如一秒内重复安装同一安装包），
+        此时重新读取已安装版本号，与预期不一致才视为冲突。
+
+        参数:
+            application: 应用实体
+            expected_version: 预期的已安装版本号，None 表示预期应用尚未安装
+
+        返回:
+            Application: 创建或更新后的应用实体（包含 ID）
+
+        异常:
+            ValueError: 已安装版本与预期不一致（应用已被其他安装修改）时抛出
+        """
+        pool = await self._get_pool()
+        queries = self._queries
+        async with pool.acquire() as conn, self._transaction(conn):
+            async with conn.cursor() as cursor:
+                icon_binary = self._decode_icon(application)
+                await cursor.execute(
+                    queries.upsert_sql,
+                    queries.upsert_params(
+                        application, icon_binary, application.updated_at or datetime.now(), expected_version
+                    ),
+                )
+                # 插入时影响行数为 1，更新时为 2，版本不一致或内容未变化时为 0
+                if cursor.rowcount == 0:
+                    await cursor.execute(queries.select_version_sql, (application.key,))
+                    row = await cursor.fetchone()
+                    if row is None or expected_version is None or row[1] != expected_version:
+                        raise ValueError(f"应用已被其他安装修改: {application.key}，预期版本 {expected_version}")
+                    application.id = row[0]
+                else:
+                    application.id = cursor.lastrowid
+                await self._replace_refs(
+                    cursor, application.id, application.ontology_config, application.agent_config
+                )
                 return application
 
     async def update_application_config(
@@ -562,38 +574,65 @@ class ApplicationAdapter(ApplicationPort):
         """
         pool = await self._get_pool()
         async with pool.acquire() as conn:
-            async with conn.cursor() as cursor:
-                ontology_config_json = json.dumps([
-                    {"id": item.id, "is_config": item.is_config}
-                    for item in ontology_config
-                ])
-                agent_config_json = json.dumps([
-                    {"id": item.id, "is_config": item.is_config}
-                    for item in agent_config
-                ])
-                is_config = True  # 配置后标记为已配置
-
+            async with self._transaction(conn), conn.cursor() as cursor:
+                # 配置后标记为已配置
                 await cursor.execute(
-                    """UPDATE t_application 
-                       SET ontology_ids = %s, agent_ids = %s, is_config = %s,
-                           updated_by = %s, updated_by_id = %s, updated_at = %s 
-                       WHERE `key` = %s""",
-                    (
-                        ontology_config_json,
-                        agent_config_json,
-                        is_config,
-                        updated_by,
-                        updated_by_id,
-                        datetime.now(),
-                        key,
-                    )
+                    self._queries.update_config_sql,
+                    self._queries.update_config_params(
+                        key, ontology_config, agent_config, updated_by, updated_by_id, datetime.now()
+                    ),
                 )
 
                 if cursor.rowcount == 0:
                     raise ValueError(f"应用不存在: {key}")
 
-                # 返回更新后的应用
-                return await self.get_application_by_key(key)
+                await self._replace_refs(
+                    cursor, await self._get_id_by_key(cursor, key), ontology_config, agent_config
+                )
+
+        # 返回更新后的应用
+        return await self.get_application_by_key(key)
+
+    @staticmethod
+    def _decode_icon(application: Application) -> Optional[bytes]:
+        """
+        将应用的 Base64 图标转换为二进制数据，并同步更新 application.icon_hash。
+
+        参数:
+            application: 应用实体
+
+        返回:
+            Optional[bytes]: 图标二进制数据，没有图标或解码失败时返回 None
+        """
+        icon_binary = None
+        if application.icon:
+            try:
+                icon_binary = base64.b64decode(application.icon)
+            except Exception as e:
+                logger.warning(f"应用图标 Base64 解码失败: {e}")
+        application.icon_hash = compute_icon_hash(icon_binary) if icon_binary else None
+        return icon_binary
+
+    @staticmethod
+    async def _get_id_by_key(cursor, key: str) -> int:
+        """
+        在当前事务中查询应用主键 ID。
+
+        参数:
+            cursor: 数据库游标
+            key: 应用包唯一标识
+
+        返回:
+            int: 应用主键 ID
+
+        异常:
+            ValueError: 当应用不存在时抛出
+        """
+        await cursor.execute("SELECT id FROM t_application WHERE `key` = %s", (key,))
+        row = await cursor.fetchone()
+        if row is None:
+            raise ValueError(f"应用不存在: {key}")
+        return row[0]
 
     async def delete_application(self, key: str) -> bool:
         """
@@ -609,8 +648,13 @@ class ApplicationAdapter(ApplicationPort):
             ValueError: 当应用不存在时抛出
         """
         pool = await self._get_pool()
-        async with pool.acquire() as conn:
+        async with pool.acquire() as conn, self._transaction(conn):
             async with conn.cursor() as cursor:
+                await cursor.execute(
+                    "DELETE FROM t_application_ref WHERE application_id = "
+                    "(SELECT id FROM t_application WHERE `key` = %s)",
+                    (key,)
+                )
                 await cursor.execute(
                     "DELETE FROM t_application WHERE `key` = %s",
                     (key,)
@@ -635,8 +679,12 @@ class ApplicationAdapter(ApplicationPort):
             ValueError: 当应用不存在时抛出
         """
         pool = await self._get_pool()
-        async with pool.acquire() as conn:
+        async with pool.acquire() as conn, self._transaction(conn):
             async with conn.cursor() as cursor:
+                await cursor.execute(
+                    "DELETE FROM t_application_ref WHERE application_id = %s",
+                    (app_id,)
+                )
                 await cursor.execute(
                     "DELETE FROM t_application WHERE id = %s",
                     (app_id,)
@@ -0,0 +1,227 @@
+"""
+应用 SQL 构建器
+
+按 t_application 的实际表结构一次性生成应用的 SELECT、INSERT 和 UPDATE 语句：
+- SELECT 按投影（是否加载图标、是否加载配置）和查询条件预先生成，调用方按需选择较轻的投影；
+- INSERT/UPDATE 只写表中实际存在的列，参数顺序与语句中的列一一对应；
+- 安装使用单条 INSERT ... ON DUPLICATE KEY UPDATE 语句，已存在的应用仅在版本号与预期一致时更新；
+- JSON 字段的序列化集中在此处，创建、更新应用和更新配置共用。
+"""
+import json
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.adapters.application_row_decoder import ApplicationRowDecoder
+from src.domains.application import Application, MicroAppInfo, ReleaseConfigItem
+
+# SELECT 语句支持的查询条件
+_WHERE_CLAUSES: Dict[Optional[str], str] = {
+    None: "",
+    "key": " WHERE `key` = %s",
+    "id": " WHERE id = %s",
+}
+
+# 更新配置时写入的列（按顺序）
+_CONFIG_UPDATE_COLUMNS = ("ontology_ids", "agent_ids", "is_config", "updated_by", "updated_by_id", "updated_at")
+
+
+def encode_micro_app(micro_app: Optional[MicroAppInfo]) -> Optional[str]:
+    """序列化微应用配置，未配置时返回 None。"""
+    if not micro_app:
+        return None
+    return json.dumps({"name": micro_app.name, "entry": micro_app.entry, "headless": micro_app.headless})
+
+
+def encode_release_config(items: Optional[List[ReleaseConfigItem]]) -> str:
+    """序列化 Release 配置。"""
+    return json.dumps([{"name": item.name, "namespace": item.namespace} for item in items or []])
+
+
+def encode_config(items: Optional[list]) -> str:
+    """序列化业务知识网络/智能体配置。"""
+    return json.dumps([{"id": item.id, "is_config": item.is_config} for item in items or []])
+
+
+def _quote(column: str) -> str:
+    """转义列名（key 为保留字）。"""
+    return "`key`" if column == "key" else column
+
+
+class ApplicationQueryBuilder:
+    """
+    应用 SQL 构建器。
+
+    与 ApplicationRowDecoder 使用同一份列描述（APPLICATION_COLUMNS）和表结构，
+    在连接池创建时生成一次，之后只做字典查找和参数组装。
+    """
+
+    def __init__(
+        self,
+        available_columns: Optional[Iterable[str]] = None,
+        json_loads: Optional[Callable[[Any], Any]] = None,
+    ):
+        """
+        按表结构生成 SQL 语句。
+
+        参数:
+            available_columns: t_application 实际存在的列名，None 表示按最新表结构
+            json_loads: JSON 解析函数，默认优先使用 orjson
+        """
+        self.decoder = ApplicationRowDecoder(available_columns, json_loads)
+        columns = self.decoder.columns
+
+        self._selects: Dict[Tuple[Optional[str], bool, bool], str] = {}
+        for where, clause in _WHERE_CLAUSES.items():
+            for include_icon in (True, False):
+                for include_config in (True, False):
+                    select_list = self.decoder.select_list(include_icon, include_config)
+                    self._selects[where, include_icon, include_config] = (
+                        f"SELECT {select_list} FROM t_application{clause}"
+                    )
+
+        self._write_columns = tuple(c for c in columns if c != "id")
+        self.insert_sql = (
+            f"INSERT INTO t_application ({', '.join(_quote(c) for c in self._write_columns)}) "
+            f"VALUES ({', '.join(['%s'] * len(self._write_columns))})"
+        )
+        self._update_columns = tuple(c for c in self._write_columns if c != "key")
+        self.update_sql = (
+            f"UPDATE t_application SET {', '.join(f'{c} = %s' for c in self._update_columns)} WHERE `key` = %s"
+        )
+        self._config_update_columns = tuple(c for c in _CONFIG_UPDATE_COLUMNS if c in columns)
+        self.update_config_sql = (
+            f"UPDATE t_application SET {', '.join(f'{c} = %s' for c in self._config_update_columns)} "
+            "WHERE `key` = %s"
+        )
+        # 已存在时逐列按版本号条件更新：version 必须最后赋值，前面的条件才能读到旧版本号；
+        # pinned 由用户设置，安装时保留；id = LAST_INSERT_ID(id) 使 lastrowid 返回已存在应用的 ID
+        self._upsert_columns = tuple(c for c in self._update_columns if c not in ("pinned", "version")) + ("version",)
+        assignments = ", ".join(f"{c} = IF(version <=> %s, VALUES({c}), {c})" for c in self._upsert_columns)
+        self.upsert_sql = f"{self.insert_sql} ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id), {assignments}"
+        # upsert 影响行数为 0 时（版本不一致，或版本一致但内容未变化）读取当前 ID 和版本号加以区分
+        self.select_version_sql = "SELECT id, version FROM t_application WHERE `key` = %s"
+        icon_hash = "icon_hash" if "icon_hash" in columns else "NULL AS icon_hash"
+        self.select_icon_sql = f"SELECT icon, {icon_hash} FROM t_application WHERE id = %s"
+
+    def select(self, include_icon: bool = True, include_config: bool = True, by: Optional[str] = None) -> str:
+        """
+        获取 SELECT 语句。
+
+        参数:
+            include_icon: 是否读取图标内容
+            include_config: 是否读取 Release、业务知识网络和智能体配置
+            by: 查询条件（"key"、"id"），None 表示不带 WHERE 子句（由调用方追加）
+
+        返回:
+            str: SELECT 语句，结果行由 self.decoder 解码
+        """
+        return self._selects[by, include_icon, include_config]
+
+    def insert_params(self, application: Application, icon: Optional[bytes], updated_at: Any) -> tuple:
+        """
+        生成 insert_sql 的参数。
+
+        参数:
+            application: 应用实体（icon_hash 已按 icon 计算）
+            icon: 图标二进制内容
+            updated_at: 更新时间
+
+        返回:
+            tuple: 与 insert_sql 中的列一一对应的参数
+        """
+        values = self._write_values(application, icon, updated_at)
+        return tuple(values[c] for c in self._write_columns)
+
+    def update_params(self, application: Application, icon: Optional[bytes], updated_at: Any) -> tuple:
+        """
+        生成 update_sql 的参数（按 application.key 更新）。
+
+        参数:
+            application: 应用实体（icon_hash 已按 icon 计算）
+            icon: 图标二进制内容
+            updated_at: 更新时间
+
+        返回:
+            tuple: 与 update_sql 中的占位符一一对应的参数
+        """
+        values = self._write_values(application, icon, updated_at)
+        return tuple(values[c] for c in self._update_columns) + (application.key,)
+
+    def upsert_params(
+        self,
+        application: Application,
+        icon: Optional[bytes],
+        updated_at: Any,
+        expected_version: Optional[str],
+    ) -> tuple:
+        """
+        生成 upsert_sql 的参数。
+
+        参数:
+            application: 应用实体（icon_hash 已按 icon 计算）
+            icon: 图标二进制内容
+            updated_at: 更新时间
+            expected_version: 预期的已安装版本号，None 表示预期应用尚未安装
+
+        返回:
+            tuple: 与 upsert_sql 中的占位符一一对应的参数
+        """
+        return (
+            self.insert_params(application, icon, updated_at)
+            + (expected_version,) * len(self._upsert_columns)
+        )
+
+    def update_config_params(
+        self,
+        key: str,
+        ontology_config: list,
+        agent_config: list,
+        updated_by: str,
+        updated_by_id: str,
+        updated_at: Any,
+    ) -> tuple:
+        """
+        生成 update_config_sql 的参数，配置后标记为已配置。
+
+        参数:
+            key: 应用包唯一标识
+            ontology_config: 业务知识网络配置列表
+            agent_config: 智能体配置列表
+            updated_by: 更新者用户显示名称
+            updated_by_id: 更新者用户ID
+            updated_at: 更新时间
+
+        返回:
+            tuple: 与 update_config_sql 中的占位符一一对应的参数
+        """
+        values = {
+            "ontology_ids": encode_config(ontology_config),
+            "agent_ids": encode_config(agent_config),
+            "is_config": True,
+            "updated_by": updated_by,
+            "updated_by_id": updated_by_id,
+            "updated_at": updated_at,
+        }
+        return tuple(values[c] for c in self._config_update_columns) + (key,)
+
+    @staticmethod
+    def _write_values(application: Application, icon: Optional[bytes], updated_at: Any) -> Dict[str, Any]:
+        """按列名组装写入的值。"""
+        return {
+            "key": application.key,
+            "name": application.name,
+            "description": application.description,
+            "icon": icon,
+            "version": application.version,
+            "category": application.category,
+            "micro_app": encode_micro_app(application.micro_app),
+            "release_config": encode_release_config(application.release_config),
+            "ontology_ids": encode_config(application.ontology_config),
+            "agent_ids": encode_config(application.agent_config),
+            "is_config": application.is_config,
+            "pinned": application.pinned,
+            "updated_by": application.updated_by,
+            "updated_by_id": application.updated_by_id,
+            "updated_at": updated_at,
+            "business_domain": application.business_domain,
+            "icon_hash": application.icon_hash,
+        }
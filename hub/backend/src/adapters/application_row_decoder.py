@@ -0,0 +1,203 @@
+"""
+应用行解码器
+
+将 t_application 的查询结果行解码为 Application 领域模型。
+
+解码器在连接池创建时按实际表结构生成一次：缺失的列在 SELECT 中以常量代替，
+查询结果始终是固定的 18 列，解码时直接按位置解包，不再按行长度判断旧表结构。
+安装了 orjson 时使用 orjson 解析 JSON 字段。
+"""
+import base64
+import json
+import logging
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+try:
+    import orjson
+    _default_json_loads: Callable[[Any], Any] = orjson.loads
+except ImportError:
+    # orjson 为可选依赖，未安装时使用标准库
+    _default_json_loads = json.loads
+
+from src.domains.application import (
+    Application, MicroAppInfo, OntologyConfigItem, AgentConfigItem, ReleaseConfigItem, compute_icon_hash,
+)
+
+logger = logging.getLogger(__name__)
+
+# 解码器读取的列：(列名, 列存在时的 SELECT 表达式, 列不存在时的 SELECT 表达式)
+# 核心列没有替代表达式，必须存在
+APPLICATION_COLUMNS: Tuple[Tuple[str, str, Optional[str]], ...] = (
+    ("id", "id", None),
+    ("key", "`key`", None),
+    ("name", "name", None),
+    ("description", "description", None),
+    ("icon", "icon", None),
+    ("version", "version", None),
+    ("category", "category", None),
+    ("micro_app", "micro_app", None),
+    ("release_config", "release_config", None),
+    ("ontology_ids", "ontology_ids", None),
+    ("agent_ids", "agent_ids", None),
+    ("is_config", "is_config", None),
+    ("pinned", "COALESCE(pinned, 0) AS pinned", "0 AS pinned"),
+    ("updated_by", "updated_by", None),
+    ("updated_by_id", "updated_by_id", "NULL AS updated_by_id"),
+    ("updated_at", "updated_at", None),
+    (
+        "business_domain",
+        "COALESCE(business_domain, 'db_public') AS business_domain",
+        "'db_public' AS business_domain",
+    ),
+    ("icon_hash", "icon_hash", "NULL AS icon_hash"),
+)
+
+# 图标列和配置列（release_config、ontology_ids、agent_ids）在 APPLICATION_COLUMNS 中的位置
+_ICON = 4
+_CONFIGS = (8, 9, 10)
+
+
+class ApplicationRowDecoder:
+    """
+    应用行解码器。
+
+    select_list 生成的列与 decode 的解包顺序一一对应；不加载图标或配置时对应的列为 NULL，
+    图标不进行 Base64 编码，配置解码为空列表。
+    """
+
+    def __init__(
+        self,
+        available_columns: Optional[Iterable[str]] = None,
+        json_loads: Optional[Callable[[Any], Any]] = None,
+    ):
+        """
+        按表结构生成解码器。
+
+        参数:
+            available_columns: t_application 实际存在的列名，None 表示按最新表结构
+            json_loads: JSON 解析函数，默认优先使用 orjson
+        """
+        available = None if available_columns is None else {c.lower() for c in available_columns}
+        expressions = []
+        columns = []
+        for name, expression, fallback in APPLICATION_COLUMNS:
+            if available is not None and name not in available and fallback is not None:
+                expression = fallback
+            else:
+                columns.append(name)
+            expressions.append(expression)
+        # 表中实际存在的列（写入语句只写这些列）
+        self.columns: Tuple[str, ...] = tuple(columns)
+        self._select_lists = {}
+        for include_icon in (True, False):
+            for include_config in (True, False):
+                projected = list(expressions)
+                if not include_icon:
+                    projected[_ICON] = "NULL AS icon"
+                if not include_config:
+                    for index in _CONFIGS:
+                        projected[index] = f"NULL AS {APPLICATION_COLUMNS[index][0]}"
+                self._select_lists[include_icon, include_config] = ", ".join(projected)
+        self._loads = json_loads or _default_json_loads
+
+    def select_list(self, include_icon: bool = True, include_config: bool = True) -> str:
+        """
+        生成 SELECT 列表。
+
+        参数:
+            include_icon: 是否读取图标内容（不读取时只返回 icon_hash）
+            include_config: 是否读取 Release、业务知识网络和智能体配置（不读取时解码为空列表）
+
+        返回:
+            str: 逗号分隔的列表达式
+        """
+        return self._select_lists[include_icon, include_config]
+
+    def decode(self, row: tuple) -> Application:
+        """
+        解码一行查询结果。
+
+        参数:
+            row: select_list 对应的查询结果行
+
+        返回:
+            Application: 应用领域模型
+        """
+        (
+            app_id, key, name, description, icon, version, category, micro_app, release_config,
+            ontology_ids, agent_ids, is_config, pinned, updated_by, updated_by_id, updated_at,
+            business_domain, icon_hash,
+        ) = row
+        icon_base64 = None
+        if icon:
+            icon_base64 = base64.b64encode(icon).decode("ascii")
+            if icon_hash is None:
+                # 尚未回填摘要的旧数据根据图标内容计算
+                icon_hash = compute_icon_hash(icon)
+        return Application(
+            id=app_id,
+            key=key,
+            name=name,
+            description=description,
+            icon=icon_base64,
+            version=version,
+            category=category,
+            business_domain=business_domain if business_domain is not None else "db_public",
+            micro_app=self._decode_micro_app(micro_app),
+            release_config=self._decode_release_config(release_config),
+            ontology_config=self._decode_config(ontology_ids, OntologyConfigItem, "ontology_ids"),
+            agent_config=self._decode_config(agent_ids, AgentConfigItem, "agent_ids"),
+            is_config=bool(is_config),
+            pinned=bool(pinned),
+            updated_by=updated_by or "",
+            updated_by_id=updated_by_id or "",
+            updated_at=updated_at,
+            icon_hash=icon_hash,
+        )
+
+    def _load(self, value: Any, column: str) -> Any:
+        """解析 JSON 字段，为空或格式错误时返回 None。"""
+        if not value:
+            return None
+        try:
+            return self._loads(value)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"{column} JSON 解析失败: {value}, 错误: {e}")
+            return None
+
+    def _decode_micro_app(self, value: Any) -> Optional[MicroAppInfo]:
+        """解码微应用配置。"""
+        data = self._load(value, "micro_app")
+        if type(data) is not dict:
+            return None
+        return MicroAppInfo(
+            name=data.get("name", ""),
+            entry=data.get("entry", ""),
+            headless=data.get("headless", False),
+        )
+
+    def _decode_release_config(self, value: Any) -> List[ReleaseConfigItem]:
+        """解码 Release 配置，兼容仅包含 Release 名称的旧格式。"""
+        data = self._load(value, "release_config")
+        if type(data) is not list:
+            return []
+        result = []
+        for item in data:
+            if type(item) is dict:
+                result.append(ReleaseConfigItem(item.get("name", ""), item.get("namespace", "default")))
+            elif type(item) is str:
+                result.append(ReleaseConfigItem(item, "default"))
+        return result
+
+    def _decode_config(self, value: Any, item_type: type, column: str) -> list:
+        """解码业务知识网络/智能体配置，兼容仅包含 ID 的旧格式。"""
+        data = self._load(value, column)
+        if type(data) is not list:
+            return []
+        result = []
+        for item in data:
+            if type(item) is dict:
+                result.append(item_type(str(item.get("id", "")), item.get("is_config", False)))
+            elif isinstance(item, (int, str)):
+                result.append(item_type(str(item), False))
+        return result
@@ -0,0 +1,87 @@
+"""
+制品索引适配器
+
+使用 MariaDB 的 t_artifact_upload 表实现 ArtifactIndexPort，
+复用 ApplicationAdapter 的数据库连接池。
+"""
+import json
+import logging
+from typing import Awaitable, Callable, Optional
+
+from src.domains.application import ArtifactRecord
+from src.ports.artifact_index_port import ArtifactIndexPort
+from src.infrastructure.database.pool import DatabasePool
+
+logger = logging.getLogger(__name__)
+
+
+class ArtifactIndexAdapter(ArtifactIndexPort):
+    """
+    基于数据库的制品索引适配器。
+
+    (kind, digest) 唯一，重复保存时覆盖上传结果。
+    """
+
+    def __init__(self, pool_factory: Callable[[], Awaitable[DatabasePool]]):
+        """
+        初始化适配器。
+
+        参数:
+            pool_factory: 返回数据库连接池的异步函数（如 ApplicationAdapter.get_pool）
+        """
+        self._pool_factory = pool_factory
+
+    async def get_artifact(self, kind: str, digest: str) -> Optional[ArtifactRecord]:
+        """按内容摘要查询已上传的制品。"""
+        pool = await self._pool_factory()
+        async with pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(
+                    "SELECT kind, digest, size, name, result, created_at FROM t_artifact_upload "
+                    "WHERE kind = %s AND digest = %s",
+                    (kind, digest),
+                )
+                row = await cursor.fetchone()
+        if row is None:
+            return None
+        try:
+            result = json.loads(row[4]) if row[4] else {}
+        except json.JSONDecodeError:
+            logger.warning(f"[get_artifact] 制品上传结果 JSON 解析失败: {kind}:{digest}")
+            return None
+        return ArtifactRecord(
+            kind=row[0],
+            digest=row[1],
+            size=row[2],
+            name=row[3] or "",
+            result=result,
+            created_at=row[5],
+        )
+
+    async def save_artifact(self, record: ArtifactRecord) -> None:
+        """保存（创建或覆盖）制品记录。"""
+        pool = await self._pool_factory()
+        async with pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(
+                    "INSERT INTO t_artifact_upload (kind, digest, size, name, result) "
+                    "VALUES (%s, %s, %s, %s, %s) "
+                    "ON DUPLICATE KEY UPDATE size = VALUES(size), name = VALUES(name), result = VALUES(result)",
+                    (
+                        record.kind,
+                        record.digest,
+                        record.size,
+                        record.name,
+                        json.dumps(record.result, ensure_ascii=False),
+                    ),
+                )
+
+    async def delete_artifact(self, kind: str, digest: str) -> None:
+        """删除制品记录。"""
+        pool = await self._pool_factory()
+        async with pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(
+                    "DELETE FROM t_artifact_upload WHERE kind = %s AND digest = %s",
+                    (kind, digest),
+                )
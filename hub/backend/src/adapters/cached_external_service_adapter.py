@@ -0,0 +1,235 @@
+"""
+带缓存的外部服务适配器
+
+在 OntologyManagerPort 和 AgentFactoryPort 实现外层增加详情缓存。业务知识网络和智能体
+定义在应用安装后很少变化，详情按 (ID, 业务域) 缓存，过期后先返回旧值并在后台刷新。
+应用安装、配置、卸载时由应用服务调用 invalidate 清除相关条目。
+"""
+import logging
+from typing import List, Optional
+
+from src.ports.external_service_port import (
+    AgentFactoryPort,
+    AgentFactoryResult,
+    OntologyManagerPort,
+)
+from src.infrastructure.cache import StaleWhileRevalidateCache
+from src.infrastructure.config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+
+def _create_detail_cache(settings: Settings) -> StaleWhileRevalidateCache:
+    """
+    按配置创建详情缓存。
+
+    参数:
+        settings: 应用配置
+
+    返回:
+        StaleWhileRevalidateCache: 键为 (ID, 业务域) 的详情缓存
+    """
+    return StaleWhileRevalidateCache(
+        max_size=settings.detail_cache_max_size,
+        ttl=settings.detail_cache_ttl,
+        stale_ttl=settings.detail_cache_stale_ttl,
+    )
+
+
+class CachedOntologyManagerAdapter(OntologyManagerPort):
+    """
+    带缓存的 Ontology Manager 适配器。
+
+    只缓存 get_knowledge_network 的成功结果，创建和删除操作直接透传。
+    """
+
+    def __init__(self, inner: OntologyManagerPort, settings: Settings):
+        """
+        初始化适配器。
+
+        参数:
+            inner: 实际执行请求的 Ontology Manager 端口实现
+            settings: 应用配置
+        """
+        self._inner = inner
+        self._cache = _create_detail_cache(settings)
+
+    async def get_knowledge_network(
+        self,
+        kn_id: str,
+        auth_token: Optional[str] = None,
+        business_domain: Optional[str] = None,
+    ) -> dict:
+        """
+        获取业务知识网络详情，优先读取缓存。
+
+        参数:
+            kn_id: 业务知识网络 ID
+            auth_token: 认证令牌
+            business_domain: 业务域，默认为 None
+
+        返回:
+            dict: 业务知识网络信息（原始数据）
+
+        异常:
+            ValueError: 当业务知识网络不存在时抛出
+        """
+        return await self._cache.get_or_load(
+            (str(kn_id), business_domain),
+            lambda: self._inner.get_knowledge_network(
+                kn_id, auth_token=auth_token, business_domain=business_domain
+            ),
+        )
+
+    async def create_knowledge_network(
+        self,
+        data: dict,
+        auth_token: Optional[str] = None,
+        business_domain: Optional[str] = None,
+    ) -> str:
+        """
+        创建业务知识网络。
+
+        参数:
+            data: 创建请求数据
+            auth_token: 认证令牌
+            business_domain: 业务域，默认为 None
+
+        返回:
+            str: 创建的业务知识网络 ID
+        """
+        kn_id = await self._inner.create_knowledge_network(
+            data, auth_token=auth_token, business_domain=business_domain
+        )
+        await self.invalidate([kn_id])
+        return kn_id
+
+    async def delete_knowledge_network(
+        self,
+        kn_id: str,
+        auth_token: Optional[str] = None,
+        business_domain: Optional[str] = None,
+    ) -> None:
+        """
+        删除业务知识网络，并清除其详情缓存。
+
+        参数:
+            kn_id: 业务知识网络 ID
+            auth_token: 认证令牌
+            business_domain: 业务域，默认为 None
+        """
+        await self._inner.delete_knowledge_network(
+            kn_id, auth_token=auth_token, business_domain=business_domain
+        )
+        await self.invalidate([kn_id])
+
+    async def invalidate(self, kn_ids: List[str]) -> None:
+        """
+        清除业务知识网络详情缓存（所有业务域）。
+
+        参数:
+            kn_ids: 业务知识网络 ID 列表
+        """
+        ids = {str(kn_id) for kn_id in kn_ids}
+        removed = self._cache.invalidate_where(lambda key: key[0] in ids)
+        logger.debug(f"[CachedOntologyManagerAdapter] 清除业务知识网络详情缓存: {len(ids)} 个 ID，{removed} 个条目")
+        await self._inner.invalidate(kn_ids)
+
+
+class CachedAgentFactoryAdapter(AgentFactoryPort):
+    """
+    带缓存的 Agent Factory 适配器。
+
+    只缓存 get_agent 的成功结果，创建和删除操作直接透传。
+    """
+
+    def __init__(self, inner: AgentFactoryPort, settings: Settings):
+        """
+        初始化适配器。
+
+        参数:
+            inner: 实际执行请求的 Agent Factory 端口实现
+            settings: 应用配置
+        """
+        self._inner = inner
+        self._cache = _create_detail_cache(settings)
+
+    async def get_agent(
+        self,
+        agent_id: str,
+        auth_token: Optional[str] = None,
+        business_domain: Optional[str] = None,
+    ) -> dict:
+        """
+        获取智能体详情，优先读取缓存。
+
+        参数:
+            agent_id: 智能体 ID
+            auth_token: 认证令牌
+            business_domain: 业务域，默认为 None
+
+        返回:
+            dict: 智能体信息（原始数据）
+
+        异常:
+            ValueError: 当智能体不存在时抛出
+        """
+        return await self._cache.get_or_load(
+            (str(agent_id), business_domain),
+            lambda: self._inner.get_agent(
+                agent_id, auth_token=auth_token, business_domain=business_domain
+            ),
+        )
+
+    async def create_agent(
+        self,
+        data: dict,
+        auth_token: Optional[str] = None,
+        business_domain: Optional[str] = None,
+    ) -> AgentFactoryResult:
+        """
+        创建智能体。
+
+        参数:
+            data: 创建请求数据
+            auth_token: 认证令牌
+            business_domain: 业务域，默认为 None
+
+        返回:
+            AgentFactoryResult: 创建结果
+        """
+        result = await self._inner.create_agent(
+            data, auth_token=auth_token, business_domain=business_domain
+        )
+        if result.id:
+            await self.invalidate([result.id])
+        return result
+
+    async def delete_agent(
+        self,
+        agent_id: str,
+        auth_token: Optional[str] = None,
+        business_domain: Optional[str] = None,
+    ) -> None:
+        """
+        删除智能体，并清除其详情缓存。
+
+        参数:
+            agent_id: 智能体 ID
+            auth_token: 认证令牌
+            business_domain: 业务域，默认为 None
+        """
+        await self._inner.delete_agent(agent_id, auth_token=auth_token, business_domain=business_domain)
+        await self.invalidate([agent_id])
+
+    async def invalidate(self, agent_ids: List[str]) -> None:
+        """
+        清除智能体详情缓存（所有业务域）。
+
+        参数:
+            agent_ids: 智能体 ID 列表
+        """
+        ids = {str(agent_id) for agent_id in agent_ids}
+        removed = self._cache.invalidate_where(lambda key: key[0] in ids)
+        logger.debug(f"[CachedAgentFactoryAdapter] 清除智能体详情缓存: {len(ids)} 个 ID，{removed} 个条目")
+        await self._inner.invalidate(agent_ids)
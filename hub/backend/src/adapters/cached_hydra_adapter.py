@@ -0,0 +1,154 @@
+"""
+带缓存的 Hydra 适配器
+
+在 HydraPort 实现外层增加 Token 内省结果缓存，减少对 Hydra Admin API 的请求。
+一级缓存为进程内 LRU TTL 缓存；可选的二级缓存使用 Redis，在多个 worker 之间共享。
+"""
+import hashlib
+import json
+import logging
+import time
+from dataclasses import asdict
+from typing import Awaitable, Callable, Optional
+
+from src.ports.hydra_port import HydraPort, IntrospectResponse
+from src.infrastructure.cache import TTLCache
+from src.infrastructure.config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# Redis 缓存键前缀
+REDIS_KEY_PREFIX = "dip-hub:introspect:"
+
+
+def _token_key(token: str) -> str:
+    """
+    计算 Token 的缓存键，避免在缓存中保存明文 Token。
+
+    参数:
+        token: 访问令牌
+
+    返回:
+        str: Token 的 SHA-256 摘要（十六进制）
+    """
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class CachedHydraAdapter(HydraPort):
+    """
+    带缓存的 Hydra 适配器。
+
+    只缓存有效（active）的内省结果，缓存时间不超过 Token 的剩余有效期；
+    无效 Token 不缓存，避免随机 Token 挤占缓存容量。
+    """
+
+    def __init__(
+        self,
+        inner: HydraPort,
+        settings: Settings,
+        redis_client_factory: Optional[Callable[[], Awaitable]] = None,
+    ):
+        """
+        初始化适配器。
+
+        参数:
+            inner: 实际执行内省的 Hydra 端口实现
+            settings: 应用配置
+            redis_client_factory: 返回 Redis 客户端的异步函数，为 None 时不启用二级缓存
+        """
+        self._inner = inner
+        self._ttl = settings.introspect_cache_ttl
+        self._local_ttl = self._ttl
+        self._redis_client_factory = redis_client_factory
+        if redis_client_factory is not None:
+            # 其他 worker 登出时无法清除本进程的一级缓存，缩短一级缓存时间以限制撤销后的延迟
+            self._local_ttl = min(self._ttl, settings.introspect_cache_local_ttl)
+        self._cache: TTLCache[str, IntrospectResponse] = TTLCache(settings.introspect_cache_max_size)
+
+    def _remaining_ttl(self, response: IntrospectResponse, ttl: float) -> float:
+        """
+        计算缓存时间：配置的 TTL 与 Token 剩余有效期中的较小值。
+
+        参数:
+            response: 内省响应
+            ttl: 配置的缓存时间（秒）
+
+        返回:
+            float: 缓存时间（秒），小于等于 0 表示不缓存
+        """
+        if response.exp is None:
+            return ttl
+        return min(ttl, response.exp - time.time())
+
+    async def _redis_get(self, key: str) -> Optional[IntrospectResponse]:
+        """从 Redis 读取内省结果，Redis 不可用时返回 None。"""
+        try:
+            client = await self._redis_client_factory()
+            data = await client.get(REDIS_KEY_PREFIX + key)
+        except Exception as e:
+            logger.warning(f"[CachedHydraAdapter] 读取 Redis 缓存失败: {e}")
+            return None
+        if data is None:
+            return None
+        try:
+            return IntrospectResponse(**json.loads(data))
+        except (TypeError, ValueError) as e:
+            logger.warning(f"[CachedHydraAdapter] Redis 缓存数据无效: {e}")
+            return None
+
+    async def _redis_set(self, key: str, response: IntrospectResponse, ttl: float) -> None:
+        """写入 Redis 缓存，失败时仅记录日志。"""
+        try:
+            client = await self._redis_client_factory()
+            await client.set(REDIS_KEY_PREFIX + key, json.dumps(asdict(response)), ex=max(1, int(ttl)))
+        except Exception as e:
+            logger.warning(f"[CachedHydraAdapter] 写入 Redis 缓存失败: {e}")
+
+    async def introspect(self, token: str) -> IntrospectResponse:
+        """
+        内省 Token，优先读取缓存。
+
+        参数:
+            token: 访问令牌
+
+        返回:
+            IntrospectResponse: 内省响应
+
+        异常:
+            Exception: 当内省失败时抛出
+        """
+        key = _token_key(token)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        if self._redis_client_factory is not None:
+            cached = await self._redis_get(key)
+            if cached is not None:
+                self._cache.set(key, cached, self._remaining_ttl(cached, self._local_ttl))
+                return cached
+
+        response = await self._inner.introspect(token)
+        if response.active:
+            self._cache.set(key, response, self._remaining_ttl(response, self._local_ttl))
+            if self._redis_client_factory is not None:
+                ttl = self._remaining_ttl(response, self._ttl)
+                if ttl > 0:
+                    await self._redis_set(key, response, ttl)
+        return response
+
+    async def invalidate(self, token: str) -> None:
+        """
+        清除 Token 的内省缓存。
+
+        参数:
+            token: 访问令牌
+        """
+        key = _token_key(token)
+        self._cache.delete(key)
+        if self._redis_client_factory is not None:
+            try:
+                client = await self._redis_client_factory()
+                await client.delete(REDIS_KEY_PREFIX + key)
+            except Exception as e:
+                logger.warning(f"[CachedHydraAdapter] 删除 Redis 缓存失败: {e}")
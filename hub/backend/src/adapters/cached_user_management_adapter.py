@@ -0,0 +1,152 @@
+"""
+带缓存的 User Management 适配器
+
+在 UserManagementPort 实现外层增加用户信息缓存：
+- 命中缓存的用户直接返回；
+- 并发请求同一个未命中的用户时只查询一次（single-flight）；
+- 短时间窗口内的未命中用户合并为一次批量查询。
+"""
+import asyncio
+import logging
+from typing import Dict, List, Optional
+
+from src.ports.user_management_port import UserManagementPort, UserInfo
+from src.infrastructure.cache import TTLCache
+from src.infrastructure.config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+
+class CachedUserManagementAdapter(UserManagementPort):
+    """
+    带缓存和批量合并的 User Management 适配器。
+
+    未命中的用户 ID 先进入待查询队列，等待 user_info_batch_window_ms 毫秒或
+    队列达到 user_info_batch_max_size 后统一发起一次批量查询。
+    不存在的用户不缓存。
+    """
+
+    def __init__(self, inner: UserManagementPort, settings: Settings):
+        """
+        初始化适配器。
+
+        参数:
+            inner: 实际执行查询的 User Management 端口实现
+            settings: 应用配置
+        """
+        self._inner = inner
+        self._ttl = settings.user_info_cache_ttl
+        self._batch_window = settings.user_info_batch_window_ms / 1000
+        self._batch_max_size = max(1, settings.user_info_batch_max_size)
+        self._cache: TTLCache[str, UserInfo] = TTLCache(settings.user_info_cache_max_size)
+        # 正在查询或等待查询的用户 ID -> 查询结果
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # 等待下一次批量查询的用户 ID（按加入顺序）
+        self._pending: List[str] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # 持有查询任务的引用，避免任务在完成前被回收
+        self._tasks: set = set()
+
+    async def batch_get_user_info_by_id(self, user_ids: list[str]) -> Dict[str, UserInfo]:
+        """
+        批量获取用户信息，优先读取缓存。
+
+        参数:
+            user_ids: 用户 ID 列表
+
+        返回:
+            Dict[str, UserInfo]: 用户信息字典，key 为用户 ID
+
+        异常:
+            Exception: 当获取失败时抛出
+        """
+        result: Dict[str, UserInfo] = {}
+        waiting: Dict[str, asyncio.Future] = {}
+        for user_id in dict.fromkeys(user_ids):
+            cached = self._cache.get(user_id)
+            if cached is not None:
+                result[user_id] = cached
+            else:
+                waiting[user_id] = self._enqueue(user_id)
+
+        if waiting:
+            # shield：单个请求被取消时不影响等待同一用户的其他请求
+            outcomes = await asyncio.gather(
+                *(asyncio.shield(future) for future in waiting.values()),
+                return_exceptions=True,
+            )
+            for user_id, outcome in zip(waiting, outcomes):
+                if isinstance(outcome, BaseException):
+                    raise outcome
+                if outcome is not None:
+                    result[user_id] = outcome
+        return result
+
+    def _enqueue(self, user_id: str) -> asyncio.Future:
+        """
+        获取用户的查询结果 Future，必要时加入待查询队列。
+
+        参数:
+            user_id: 用户 ID
+
+        返回:
+            asyncio.Future: 结果为 UserInfo，用户不存在时为 None
+        """
+        future = self._inflight.get(user_id)
+        if future is not None:
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[user_id] = future
+        self._pending.append(user_id)
+
+        if len(self._pending) >= self._batch_max_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._batch_window, self._flush)
+        return future
+
+    def _flush(self) -> None:
+        """将待查询队列按最大批量拆分，每批发起一次查询。"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        while self._pending:
+            batch = self._pending[:self._batch_max_size]
+            del self._pending[:self._batch_max_size]
+            task = asyncio.ensure_future(self._fetch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, batch: List[str]) -> None:
+        """
+        查询一批用户信息，并唤醒等待这些用户的请求。
+
+        参数:
+            batch: 用户 ID 列表
+        """
+        try:
+            infos = await self._inner.batch_get_user_info_by_id(batch)
+        except asyncio.CancelledError:
+            for user_id in batch:
+                future = self._inflight.pop(user_id, None)
+                if future is not None and not future.done():
+                    future.cancel()
+            raise
+        except Exception as e:
+            logger.warning(f"[CachedUserManagementAdapter] 批量查询用户信息失败 ({len(batch)} 个): {e}")
+            for user_id in batch:
+                future = self._inflight.pop(user_id, None)
+                if future is not None and not future.done():
+                    future.set_exception(e)
+            return
+
+        logger.debug(f"[CachedUserManagementAdapter] 批量查询用户信息: {len(batch)} 个")
+        for user_id in batch:
+            info = infos.get(user_id)
+            if info is not None:
+                self._cache.set(user_id, info, self._ttl)
+            future = self._inflight.pop(user_id, None)
+            if future is not None and not future.done():
+                future.set_result(info)
@@ -5,11 +5,11 @@ Deploy Manager 适配器
 负责与部署管理服务交互。
 """
 import logging
-
-import httpx
+from typing import Optional
 
 from src.ports.deploy_manager_port import DeployManagerPort, GetHostResponse
 from src.infrastructure.config.settings import Settings
+from src.infrastructure.http_client import HttpClientPool
 
 logger = logging.getLogger(__name__)
 
@@ -21,14 +21,16 @@ class DeployManagerAdapter(DeployManagerPort):
     使用 HTTP 客户端与部署管理服务交互。
     """
 
-    def __init__(self, settings: Settings):
+    def __init__(self, settings: Settings, http_pool: Optional[HttpClientPool] = None):
         """
         初始化适配器。
 
         参数:
             settings: 应用配置
+            http_pool: 共享 HTTP 连接池，为 None 时使用适配器私有的连接池
         """
         self._settings = settings
+        self._http_pool = http_pool or HttpClientPool(settings)
         self._base_url = settings.deploy_manager_url
         self._timeout = settings.deploy_manager_timeout
 
@@ -44,15 +46,15 @@ class DeployManagerAdapter(DeployManagerPort):
         """
         url = f"{self._base_url}/api/deploy-manager/v1/access-addr/app"
         
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
-            response = await client.get(url)
-            response.raise_for_status()
+        client = self._http_pool.get_httpx_client("deploy_manager")
+        response = await client.get(url, timeout=self._timeout)
+        response.raise_for_status()
             
-            data = response.json()
+        data = response.json()
             
-            return GetHostResponse(
-                host=data.get("host", ""),
-                port=data.get("port", ""),
-                scheme=data.get("scheme", "https"),
-            )
+        return GetHostResponse(
+            host=data.get("host", ""),
+            port=data.get("port", ""),
+            scheme=data.get("scheme", "https"),
+        )
 
@@ -6,7 +6,8 @@
 """
 import logging
 import asyncio
-from typing import List, BinaryIO, Optional
+import os
+from typing import Any, AsyncIterator, Awaitable, Callable, List, BinaryIO, Optional
 import aiohttp
 from aiohttp import ClientError, ClientTimeout
 
@@ -19,9 +20,12 @@ from src.ports.external_service_port import (
     ChartUploadResult,
     ReleaseResult,
     AgentFactoryResult,
+    UploadProgressCallback,
 )
 from src.infrastructure.config.settings import Settings
 from src.infrastructure.context.token_context import get_auth_token
+from src.infrastructure.executor import BlockingExecutor
+from src.infrastructure.http_client import HttpClientPool
 
 logger = logging.getLogger(__name__)
 
@@ -92,6 +96,58 @@ def _handle_http_error(
         raise
 
 
+def _resolve_file_size(file_obj: BinaryIO) -> Optional[int]:
+    """
+    获取文件对象从当前位置到末尾的字节数。
+
+    参数:
+        file_obj: 文件对象
+
+    返回:
+        Optional[int]: 剩余字节数，无法确定时返回 None
+    """
+    try:
+        position = file_obj.tell()
+        end = file_obj.seek(0, os.SEEK_END)
+        file_obj.seek(position)
+        return end - position
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+async def _iter_file_chunks(
+    file_obj: BinaryIO,
+    chunk_size: int,
+    total_size: Optional[int] = None,
+    progress_callback: Optional[UploadProgressCallback] = None,
+    run_blocking: Optional[Callable[..., Awaitable[Any]]] = None,
+) -> AsyncIterator[bytes]:
+    """
+    按固定大小分块读取文件，作为流式请求体。
+
+    读取（ZIP 成员还包括解压）在线程池中执行，避免阻塞事件循环；同一时刻内存中只保留一个分块。
+
+    参数:
+        file_obj: 文件对象
+        chunk_size: 分块大小（字节）
+        total_size: 总大小（字节），仅用于进度回调
+        progress_callback: 进度回调，每发送一个分块调用一次
+        run_blocking: 执行阻塞读取的函数（可选，未提供时使用 asyncio 默认线程池）
+
+    返回:
+        AsyncIterator[bytes]: 分块数据
+    """
+    sent = 0
+    while True:
+        chunk = await (run_blocking or asyncio.to_thread)(file_obj.read, chunk_size)
+        if not chunk:
+            break
+        sent += len(chunk)
+        yield chunk
+        if progress_callback:
+            progress_callback(sent, total_size)
+
+
 class DeployInstallerAdapter(DeployInstallerPort):
     """
     Deploy Installer 服务适配器。
@@ -99,27 +155,50 @@ class DeployInstallerAdapter(DeployInstallerPort):
     使用 HTTP 客户端与 Deploy Installer 服务交互。
     """
 
-    def __init__(self, settings: Settings):
+    def __init__(
+        self,
+        settings: Settings,
+        http_pool: Optional[HttpClientPool] = None,
+        executor: Optional[BlockingExecutor] = None,
+    ):
         """
         初始化适配器。
 
         参数:
             settings: 应用配置
+            http_pool: 共享 HTTP 连接池，为 None 时使用适配器私有的连接池
+            executor: 读取镜像/Chart 内容的阻塞任务执行器（可选，未提供时使用 asyncio 默认线程池）
         """
         self._settings = settings
+        self._http_pool = http_pool or HttpClientPool(settings)
         self._base_url = f"{settings.proton_url}/internal/api/deploy-installer/v1"
         self._timeout = settings.proton_timeout
+        self._upload_chunk_size = settings.deploy_upload_chunk_size
+        self._executor = executor
+
+    async def _run_blocking(self, func: Callable[..., Any], *args: Any) -> Any:
+        """在阻塞任务执行器中读取文件（ZIP 成员的解压也在此执行）。"""
+        if self._executor is not None:
+            return await self._executor.run(func, *args)
+        return await asyncio.to_thread(func, *args)
 
     async def upload_image(
         self,
         image_data: BinaryIO,
         auth_token: Optional[str] = None,
+        size: Optional[int] = None,
+        progress_callback: Optional[UploadProgressCallback] = None,
     ) -> List[ImageUploadResult]:
         """
         上传镜像。
 
+        以固定大小分块流式发送文件内容，内存占用与文件大小无关。
+
         参数:
             image_data: 镜像数据
+            auth_token: 认证令牌
+            size: 数据总大小（字节），为 None 时从文件对象推断
+            progress_callback: 上传进度回调
 
         返回:
             List[ImageUploadResult]: 上传的镜像列表
@@ -131,23 +210,32 @@ class DeployInstallerAdapter(DeployInstallerPort):
         try:
             # 确保文件指针在开头
             image_data.seek(0)
-            # 读取文件内容
-            content = image_data.read()
-            file_size = len(content)
-            logger.info(f"[upload_image] 开始上传镜像到: {url}, 大小: {file_size} bytes ({file_size / 1024 / 1024:.2f} MB), timeout={self._timeout}s")
-            
+            file_size = size if size is not None else _resolve_file_size(image_data)
+            if file_size is not None:
+                # 显式指定长度，避免使用 chunked 传输编码
+                headers["Content-Length"] = str(file_size)
+            size_mb = (file_size or 0) / 1024 / 1024
+            logger.info(f"[upload_image] 开始上传镜像到: {url}, 大小: {file_size} bytes ({size_mb:.2f} MB), 分块大小: {self._upload_chunk_size} bytes, timeout={self._timeout}s")
+
             # 对于大文件，动态调整超时时间
-            calculated_timeout = max(self._timeout, 120 + (file_size // (1024 * 1024)) * 3)
+            calculated_timeout = max(self._timeout, 120 + ((file_size or 0) // (1024 * 1024)) * 3)
             timeout = ClientTimeout(total=calculated_timeout, connect=30.0)
-            
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.put(
-                    url,
-                    data=content,
-                    headers=headers,
-                ) as response:
-                    response.raise_for_status()
-                    data = await response.json()
+
+            session = self._http_pool.get_aiohttp_session("deploy_installer")
+            async with session.put(
+                url,
+                data=_iter_file_chunks(
+                    image_data,
+                    self._upload_chunk_size,
+                    file_size,
+                    progress_callback,
+                    self._run_blocking,
+                ),
+                headers=headers,
+                timeout=timeout,
+            ) as response:
+                response.raise_for_status()
+                data = await response.json()
         except Exception as e:
             _handle_http_error(
                 "upload_image",
@@ -171,12 +259,19 @@ class DeployInstallerAdapter(DeployInstallerPort):
         self,
         chart_data: BinaryIO,
         auth_token: Optional[str] = None,
+        size: Optional[int] = None,
+        progress_callback: Optional[UploadProgressCallback] = None,
     ) -> ChartUploadResult:
         """
         上传 Chart。
 
+        以固定大小分块流式发送文件内容，内存占用与文件大小无关。
+
         参数:
             chart_data: Chart 数据
+            auth_token: 认证令牌
+            size: 数据总大小（字节），为 None 时从文件对象推断
+            progress_callback: 上传进度回调
 
         返回:
             ChartUploadResult: Chart 上传结果
@@ -188,23 +283,32 @@ class DeployInstallerAdapter(DeployInstallerPort):
         try:
             # 确保文件指针在开头
             chart_data.seek(0)
-            # 读取文件内容
-            content = chart_data.read()
-            file_size = len(content)
-            logger.info(f"[upload_chart] 开始上传 Chart 到: {url}, 大小: {file_size} bytes ({file_size / 1024 / 1024:.2f} MB), timeout={self._timeout}s")
-            
+            file_size = size if size is not None else _resolve_file_size(chart_data)
+            if file_size is not None:
+                # 显式指定长度，避免使用 chunked 传输编码
+                headers["Content-Length"] = str(file_size)
+            size_mb = (file_size or 0) / 1024 / 1024
+            logger.info(f"[upload_chart] 开始上传 Chart 到: {url}, 大小: {file_size} bytes ({size_mb:.2f} MB), 分块大小: {self._upload_chunk_size} bytes, timeout={self._timeout}s")
+
             # 对于大文件，动态调整超时时间
-            calculated_timeout = max(self._timeout, 120 + (file_size // (1024 * 1024)) * 3)
+            calculated_timeout = max(self._timeout, 120 + ((file_size or 0) // (1024 * 1024)) * 3)
             timeout = ClientTimeout(total=calculated_timeout, connect=30.0)
-            
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.put(
-                    url,
-                    data=content,
-                    headers=headers,
-                ) as response:
-                    response.raise_for_status()
-                    data = await response.json()
+
+            session = self._http_pool.get_aiohttp_session("deploy_installer")
+            async with session.put(
+                url,
+                data=_iter_file_chunks(
+                    chart_data,
+                    self._upload_chunk_size,
+                    file_size,
+                    progress_callback,
+                    self._run_blocking,
+                ),
+                headers=headers,
+                timeout=timeout,
+            ) as response:
+                response.raise_for_status()
+                data = await response.json()
         except Exception as e:
             _handle_http_error(
                 "upload_chart",
@@ -264,15 +368,16 @@ class DeployInstallerAdapter(DeployInstallerPort):
         try:
             logger.info(f"[install_release] 安装 Release: {url}, release_name={release_name}")
             timeout = ClientTimeout(total=self._timeout, connect=30.0)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(
-                    url,
-                    params=params,
-                    json=body,
-                    headers=headers or None,
-                ) as response:
-                    response.raise_for_status()
-                    data = await response.json()
+            session = self._http_pool.get_aiohttp_session("deploy_installer")
+            async with session.post(
+                url,
+                params=params,
+                json=body,
+                headers=headers or None,
+                timeout=timeout,
+            ) as response:
+                response.raise_for_status()
+                data = await response.json()
         except Exception as e:
             _handle_http_error(
                 "install_release",
@@ -309,10 +414,10 @@ class DeployInstallerAdapter(DeployInstallerPort):
         try:
             logger.info(f"[delete_release] 删除 Release: {url}, release_name={release_name}")
             timeout = ClientTimeout(total=self._timeout, connect=30.0)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.delete(url, params=params, headers=headers or None) as response:
-                    response.raise_for_status()
-                    data = await response.json()
+            session = self._http_pool.get_aiohttp_session("deploy_installer")
+            async with session.delete(url, params=params, headers=headers or None, timeout=timeout) as response:
+                response.raise_for_status()
+                data = await response.json()
         except Exception as e:
             _handle_http_error(
                 "delete_release",
@@ -333,14 +438,16 @@ class OntologyManagerAdapter(OntologyManagerPort):
     使用 HTTP 客户端与 Ontology Manager 服务交互。
     """
 
-    def __init__(self, settings: Settings):
+    def __init__(self, settings: Settings, http_pool: Optional[HttpClientPool] = None):
         """
         初始化适配器。
 
         参数:
             settings: 应用配置
+            http_pool: 共享 HTTP 连接池，为 None 时使用适配器私有的连接池
         """
         self._settings = settings
+        self._http_pool = http_pool or HttpClientPool(settings)
         self._base_url = f"{settings.ontology_manager_url}/api/ontology-manager/v1"
         self._timeout = settings.ontology_manager_timeout
 
@@ -370,13 +477,13 @@ class OntologyManagerAdapter(OntologyManagerPort):
 
         try:
             timeout = ClientTimeout(total=self._timeout, connect=30.0)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(url, headers=headers or None) as response:
-                    if response.status == 404:
-                        raise ValueError(f"业务知识网络不存在: {kn_id}")
+            session = self._http_pool.get_aiohttp_session("ontology_manager")
+            async with session.get(url, headers=headers or None, timeout=timeout) as response:
+                if response.status == 404:
+                    raise ValueError(f"业务知识网络不存在: {kn_id}")
                     
-                    response.raise_for_status()
-                    data = await response.json()
+                response.raise_for_status()
+                data = await response.json()
         except ValueError:
             raise
         except Exception as e:
@@ -414,10 +521,10 @@ class OntologyManagerAdapter(OntologyManagerPort):
 
         try:
             timeout = ClientTimeout(total=self._timeout, connect=30.0)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(url, json=data, headers=headers or None) as response:
-                    response.raise_for_status()
-                    result = await response.json()
+            session = self._http_pool.get_aiohttp_session("ontology_manager")
+            async with session.post(url, json=data, headers=headers or None, timeout=timeout) as response:
+                response.raise_for_status()
+                result = await response.json()
         except Exception as e:
             _handle_http_error(
                 "create_knowledge_network",
@@ -433,6 +540,43 @@ class OntologyManagerAdapter(OntologyManagerPort):
             return result[0].get("id", "")
         return ""
 
+    async def delete_knowledge_network(
+        self,
+        kn_id: str,
+        auth_token: Optional[str] = None,
+        business_domain: Optional[str] = None,
+    ) -> None:
+        """
+        删除业务知识网络，不存在时视为已删除。
+
+        参数:
+            kn_id: 业务知识网络 ID
+            auth_token: 认证令牌
+            business_domain: 业务域
+        """
+        url = f"{self._base_url}/knowledge-networks/{kn_id}"
+
+        headers = _build_headers(auth_token, business_domain)
+
+        try:
+            logger.info(f"[delete_knowledge_network] 删除业务知识网络: {url}")
+            timeout = ClientTimeout(total=self._timeout, connect=30.0)
+            session = self._http_pool.get_aiohttp_session("ontology_manager")
+            async with session.delete(url, headers=headers or None, timeout=timeout) as response:
+                if response.status == 404:
+                    logger.info(f"[delete_knowledge_network] 业务知识网络不存在，视为已删除: {kn_id}")
+                    return
+                response.raise_for_status()
+        except Exception as e:
+            _handle_http_error(
+                "delete_knowledge_network",
+                url,
+                e,
+                self._settings.ontology_manager_url,
+                self._timeout,
+            )
+            raise
+
 
 class AgentFactoryAdapter(AgentFactoryPort):
     """
@@ -441,14 +585,16 @@ class AgentFactoryAdapter(AgentFactoryPort):
     使用 HTTP 客户端与 Agent Factory 服务交互。
     """
 
-    def __init__(self, settings: Settings):
+    def __init__(self, settings: Settings, http_pool: Optional[HttpClientPool] = None):
         """
         初始化适配器。
 
         参数:
             settings: 应用配置
+            http_pool: 共享 HTTP 连接池，为 None 时使用适配器私有的连接池
         """
         self._settings = settings
+        self._http_pool = http_pool or HttpClientPool(settings)
         self._base_url = f"{settings.agent_factory_url}/api/agent-factory/v3"
         self._timeout = settings.agent_factory_timeout
 
@@ -478,13 +624,13 @@ class AgentFactoryAdapter(AgentFactoryPort):
 
         try:
             timeout = ClientTimeout(total=self._timeout, connect=30.0)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(url, headers=headers or None) as response:
-                    if response.status == 404:
-                        raise ValueError(f"智能体不存在: {agent_id}")
+            session = self._http_pool.get_aiohttp_session("agent_factory")
+            async with session.get(url, headers=headers or None, timeout=timeout) as response:
+                if response.status == 404:
+                    raise ValueError(f"智能体不存在: {agent_id}")
                     
-                    response.raise_for_status()
-                    data = await response.json()
+                response.raise_for_status()
+                data = await response.json()
         except ValueError:
             raise
         except Exception as e:
@@ -522,10 +668,10 @@ class AgentFactoryAdapter(AgentFactoryPort):
 
         try:
             timeout = ClientTimeout(total=self._timeout, connect=30.0)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(url, json=data, headers=headers or None) as response:
-                    response.raise_for_status()
-                    result = await response.json()
+            session = self._http_pool.get_aiohttp_session("agent_factory")
+            async with session.post(url, json=data, headers=headers or None, timeout=timeout) as response:
+                response.raise_for_status()
+                result = await response.json()
         except Exception as e:
             _handle_http_error(
                 "create_agent",
@@ -541,3 +687,40 @@ class AgentFactoryAdapter(AgentFactoryPort):
             version=result.get("version", "v0"),
         )
 
+    async def delete_agent(
+        self,
+        agent_id: str,
+        auth_token: Optional[str] = None,
+        business_domain: Optional[str] = None,
+    ) -> None:
+        """
+        删除智能体，不存在时视为已删除。
+
+        参数:
+            agent_id: 智能体 ID
+            auth_token: 认证令牌
+            business_domain: 业务域
+        """
+        url = f"{self._base_url}/agent/{agent_id}"
+
+        headers = _build_headers(auth_token, business_domain)
+
+        try:
+            logger.info(f"[delete_agent] 删除智能体: {url}")
+            timeout = ClientTimeout(total=self._timeout, connect=30.0)
+            session = self._http_pool.get_aiohttp_session("agent_factory")
+            async with session.delete(url, headers=headers or None, timeout=timeout) as response:
+                if response.status == 404:
+                    logger.info(f"[delete_agent] 智能体不存在，视为已删除: {agent_id}")
+                    return
+                response.raise_for_status()
+        except Exception as e:
+            _handle_http_error(
+                "delete_agent",
+                url,
+                e,
+                self._settings.agent_factory_url,
+                self._timeout,
+            )
+            raise
+
@@ -5,11 +5,11 @@ Hydra 适配器
 负责与 Hydra OAuth2/OIDC 服务交互。
 """
 import logging
-
-import httpx
+from typing import Optional
 
 from src.ports.hydra_port import HydraPort, IntrospectResponse
 from src.infrastructure.config.settings import Settings
+from src.infrastructure.http_client import HttpClientPool
 
 logger = logging.getLogger(__name__)
 
@@ -21,14 +21,16 @@ class HydraAdapter(HydraPort):
     使用 HTTP 客户端与 Hydra OAuth2/OIDC 服务交互。
     """
 
-    def __init__(self, settings: Settings):
+    def __init__(self, settings: Settings, http_pool: Optional[HttpClientPool] = None):
         """
         初始化适配器。
 
         参数:
             settings: 应用配置
+            http_pool: 共享 HTTP 连接池，为 None 时使用适配器私有的连接池
         """
         self._settings = settings
+        self._http_pool = http_pool or HttpClientPool(settings)
         self._base_url = settings.hydra_host
         self._timeout = settings.hydra_timeout
 
@@ -51,19 +53,21 @@ class HydraAdapter(HydraPort):
             "token": token,
         }
         
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
-            response = await client.post(
-                url,
-                data=data,
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-            )
-            response.raise_for_status()
+        client = self._http_pool.get_httpx_client("hydra")
+        response = await client.post(
+            url,
+            data=data,
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            timeout=self._timeout,
+        )
+        response.raise_for_status()
             
-            introspect_data = response.json()
+        introspect_data = response.json()
             
-            return IntrospectResponse(
-                active=introspect_data.get("active", False),
-                visitor_id=introspect_data.get("sub") or introspect_data.get("visitor_id"),
-                visitor_typ=introspect_data.get("visitor_typ"),
-            )
+        return IntrospectResponse(
+            active=introspect_data.get("active", False),
+            visitor_id=introspect_data.get("sub") or introspect_data.get("visitor_id"),
+            visitor_typ=introspect_data.get("visitor_typ"),
+            exp=introspect_data.get("exp"),
+        )
 
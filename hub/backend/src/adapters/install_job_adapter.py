@@ -0,0 +1,177 @@
+"""
+安装任务适配器
+
+使用 Redis 实现 InstallJobPort，复用 SessionAdapter 的 Redis 连接，
+任务状态和事件在多个副本之间共享。
+"""
+import json
+import logging
+from datetime import datetime
+from typing import Awaitable, Callable, List, Optional
+
+from src.domains.install_job import InstallJob, InstallJobEvent
+from src.ports.install_job_port import InstallJobPort
+from src.infrastructure.config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# Redis 键前缀：任务状态为字符串（JSON），任务事件为列表（每项一个 JSON）
+REDIS_KEY_PREFIX = "dip-hub:install-job:"
+
+
+def _format_datetime(value: Optional[datetime]) -> Optional[str]:
+    """将时间转换为 ISO 8601 字符串。"""
+    return value.isoformat() if value is not None else None
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """将 ISO 8601 字符串解析为时间，无法解析时返回 None。"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class RedisInstallJobAdapter(InstallJobPort):
+    """
+    基于 Redis 的安装任务适配器。
+
+    任务状态和事件列表都设置 install_job_ttl 过期时间，每次写入时续期。
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        redis_client_factory: Callable[[], Awaitable],
+    ):
+        """
+        初始化适配器。
+
+        参数:
+            settings: 应用配置
+            redis_client_factory: 返回 Redis 客户端的异步函数（如 SessionAdapter.get_client）
+        """
+        self._ttl = settings.install_job_ttl
+        self._redis_client_factory = redis_client_factory
+
+    @staticmethod
+    def _job_key(job_id: str) -> str:
+        """任务状态的 Redis 键。"""
+        return f"{REDIS_KEY_PREFIX}{job_id}"
+
+    @staticmethod
+    def _events_key(job_id: str) -> str:
+        """任务事件列表的 Redis 键。"""
+        return f"{REDIS_KEY_PREFIX}{job_id}:events"
+
+    async def save_job(self, job: InstallJob) -> None:
+        """
+        保存（创建或覆盖）安装任务。
+
+        参数:
+            job: 安装任务
+        """
+        client = await self._redis_client_factory()
+        data = {
+            "id": job.id,
+            "status": job.status,
+            "stage": job.stage,
+            "application_id": job.application_id,
+            "application_key": job.application_key,
+            "error_code": job.error_code,
+            "error": job.error,
+            "updated_by": job.updated_by,
+            "updated_by_id": job.updated_by_id,
+            "created_by_id": job.created_by_id,
+            "stage_durations": job.stage_durations,
+            "duration": job.duration,
+            "created_at": _format_datetime(job.created_at),
+            "updated_at": _format_datetime(job.updated_at),
+        }
+        await client.set(self._job_key(job.id), json.dumps(data, ensure_ascii=False), ex=self._ttl)
+
+    async def get_job(self, job_id: str) -> Optional[InstallJob]:
+        """
+        获取安装任务。
+
+        参数:
+            job_id: 任务 ID
+
+        返回:
+            Optional[InstallJob]: 安装任务，不存在或已过期时返回 None
+        """
+        client = await self._redis_client_factory()
+        raw = await client.get(self._job_key(job_id))
+        if raw is None:
+            return None
+        try:
+            data = json.loads(raw)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"[get_job] 安装任务数据格式错误: {job_id}, {e}")
+            return None
+        return InstallJob(
+            id=data.get("id", job_id),
+            status=data.get("status", ""),
+            stage=data.get("stage"),
+            application_id=data.get("application_id"),
+            application_key=data.get("application_key"),
+            error_code=data.get("error_code"),
+            error=data.get("error"),
+            updated_by=data.get("updated_by", ""),
+            updated_by_id=data.get("updated_by_id", ""),
+            created_by_id=data.get("created_by_id", ""),
+            stage_durations=data.get("stage_durations") or {},
+            duration=data.get("duration"),
+            created_at=_parse_datetime(data.get("created_at")),
+            updated_at=_parse_datetime(data.get("updated_at")),
+        )
+
+    async def append_event(self, job_id: str, event: InstallJobEvent) -> None:
+        """
+        追加安装任务事件。
+
+        参数:
+            job_id: 任务 ID
+            event: 任务事件
+        """
+        client = await self._redis_client_factory()
+        data = {
+            "stage": event.stage,
+            "status": event.status,
+            "message": event.message,
+            "timestamp": _format_datetime(event.timestamp),
+        }
+        key = self._events_key(job_id)
+        await client.rpush(key, json.dumps(data, ensure_ascii=False))
+        await client.expire(key, self._ttl)
+
+    async def get_events(self, job_id: str, start: int = 0) -> List[InstallJobEvent]:
+        """
+        按追加顺序获取安装任务事件。
+
+        参数:
+            job_id: 任务 ID
+            start: 起始序号（从 0 开始），用于增量读取
+
+        返回:
+            List[InstallJobEvent]: 序号不小于 start 的事件
+        """
+        client = await self._redis_client_factory()
+        items = await client.lrange(self._events_key(job_id), max(0, start), -1)
+        events = []
+        for raw in items:
+            try:
+                data = json.loads(raw)
+            except (TypeError, ValueError) as e:
+                # 保持序号连续，格式错误的事件以空事件占位
+                logger.warning(f"[get_events] 安装任务事件格式错误: {job_id}, {e}")
+                data = {}
+            events.append(InstallJobEvent(
+                stage=data.get("stage"),
+                status=data.get("status", ""),
+                message=data.get("message", ""),
+                timestamp=_parse_datetime(data.get("timestamp")),
+            ))
+        return events
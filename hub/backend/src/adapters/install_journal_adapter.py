@@ -0,0 +1,135 @@
+"""
+安装日志适配器
+
+使用 Redis 实现 InstallJournalPort，复用 SessionAdapter 的 Redis 连接，
+任一副本都能读取其他副本上失败的安装留下的日志。
+"""
+import json
+import logging
+from dataclasses import asdict
+from datetime import datetime
+from typing import Awaitable, Callable, Optional
+
+from src.domains.install_journal import InstallJournal, JournalStep
+from src.ports.install_journal_port import InstallJournalPort
+from src.infrastructure.config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# Redis 键前缀：安装日志为字符串（JSON）
+REDIS_KEY_PREFIX = "dip-hub:install-journal:"
+
+
+def _format_datetime(value: Optional[datetime]) -> Optional[str]:
+    """将时间转换为 ISO 8601 字符串。"""
+    return value.isoformat() if value is not None else None
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """将 ISO 8601 字符串解析为时间，无法解析时返回 None。"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class RedisInstallJournalAdapter(InstallJournalPort):
+    """
+    基于 Redis 的安装日志适配器。
+
+    安装日志设置 install_journal_ttl 过期时间，每次写入时续期。
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        redis_client_factory: Callable[[], Awaitable],
+    ):
+        """
+        初始化适配器。
+
+        参数:
+            settings: 应用配置
+            redis_client_factory: 返回 Redis 客户端的异步函数（如 SessionAdapter.get_client）
+        """
+        self._ttl = settings.install_journal_ttl
+        self._redis_client_factory = redis_client_factory
+
+    @staticmethod
+    def _journal_key(app_key: str, version: str) -> str:
+        """安装日志的 Redis 键。"""
+        return f"{REDIS_KEY_PREFIX}{app_key}:{version}"
+
+    async def get_journal(self, app_key: str, version: str) -> Optional[InstallJournal]:
+        """
+        获取安装日志。
+
+        参数:
+            app_key: 应用包唯一标识
+            version: 版本号
+
+        返回:
+            Optional[InstallJournal]: 安装日志，不存在或已过期时返回 None
+        """
+        client = await self._redis_client_factory()
+        raw = await client.get(self._journal_key(app_key, version))
+        if raw is None:
+            return None
+        try:
+            data = json.loads(raw)
+            steps = [
+                JournalStep(
+                    kind=item["kind"],
+                    name=item["name"],
+                    digest=item.get("digest"),
+                    resource_id=item.get("resource_id"),
+                    result=item.get("result") or {},
+                )
+                for item in data.get("steps") or []
+            ]
+        except (TypeError, ValueError, KeyError) as e:
+            logger.warning(f"[get_journal] 安装日志数据格式错误: {app_key}:{version}, {e}")
+            return None
+        return InstallJournal(
+            app_key=data.get("app_key", app_key),
+            version=data.get("version", version),
+            steps=steps,
+            attempts=data.get("attempts", 0),
+            created_at=_parse_datetime(data.get("created_at")),
+            updated_at=_parse_datetime(data.get("updated_at")),
+        )
+
+    async def save_journal(self, journal: InstallJournal) -> None:
+        """
+        保存（创建或覆盖）安装日志。
+
+        参数:
+            journal: 安装日志
+        """
+        client = await self._redis_client_factory()
+        data = {
+            "app_key": journal.app_key,
+            "version": journal.version,
+            "steps": [asdict(step) for step in journal.steps],
+            "attempts": journal.attempts,
+            "created_at": _format_datetime(journal.created_at),
+            "updated_at": _format_datetime(journal.updated_at),
+        }
+        await client.set(
+            self._journal_key(journal.app_key, journal.version),
+            json.dumps(data, ensure_ascii=False),
+            ex=self._ttl,
+        )
+
+    async def delete_journal(self, app_key: str, version: str) -> None:
+        """
+        删除安装日志。
+
+        参数:
+            app_key: 应用包唯一标识
+            version: 版本号
+        """
+        client = await self._redis_client_factory()
+        await client.delete(self._journal_key(app_key, version))
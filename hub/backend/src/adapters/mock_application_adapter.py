@@ -3,13 +3,18 @@ Mock 应用适配器
 
 用于本地开发和测试时模拟数据库操作。
 """
+import base64
 import logging
 from typing import List, Optional
 from datetime import datetime
 from copy import deepcopy
 
-from src.domains.application import Application, MicroAppInfo, OntologyConfigItem, AgentConfigItem, ReleaseConfigItem
+from src.domains.application import (
+    Application, ArtifactRecord, ApplicationCursor, ApplicationIcon, ApplicationListQuery, ApplicationPage, MicroAppInfo, OntologyConfigItem, AgentConfigItem, ReleaseConfigItem,
+    compute_icon_hash,
+)
 from src.ports.application_port import ApplicationPort
+from src.ports.artifact_index_port import ArtifactIndexPort
 
 logger = logging.getLogger(__name__)
 
@@ -84,17 +89,71 @@ class MockApplicationAdapter(ApplicationPort):
         
         self._next_id = len(sample_apps) + 1
 
-    async def get_all_applications(self, pinned: Optional[bool] = None) -> List[Application]:
+    async def get_all_applications(
+        self,
+        pinned: Optional[bool] = None,
+        include_icon: bool = True,
+    ) -> List[Application]:
         """
         获取所有已安装的应用列表，可按被钉状态过滤。
         """
-        apps = list(self._applications.values())
+        apps = [deepcopy(a) for a in self._applications.values()]
         if pinned is not None:
             apps = [a for a in apps if getattr(a, 'pinned', False) == pinned]
         apps.sort(key=lambda x: x.updated_at or datetime.min, reverse=True)
+        for app in apps:
+            if app.icon and not app.icon_hash:
+                app.icon_hash = compute_icon_hash(base64.b64decode(app.icon))
+            if not include_icon:
+                app.icon = None
         logger.info(f"[Mock] 获取应用列表: {len(apps)} 个应用")
         return apps
 
+    async def list_applications(self, query: ApplicationListQuery) -> ApplicationPage:
+        """
+        按条件分页查询应用列表，按 (updated_at, id) 倒序排列。
+        """
+        apps = await self.get_all_applications(pinned=query.pinned, include_icon=query.include_icon)
+        if query.category is not None:
+            apps = [a for a in apps if a.category == query.category]
+        if query.business_domain is not None:
+            apps = [a for a in apps if (a.business_domain or "db_public") == query.business_domain]
+        if query.is_config is not None:
+            apps = [a for a in apps if a.is_config == query.is_config]
+        if query.name_prefix:
+            apps = [a for a in apps if a.name.startswith(query.name_prefix)]
+        if query.ontology_id is not None:
+            apps = [a for a in apps if any(item.id == query.ontology_id for item in a.ontology_config or [])]
+        if query.agent_id is not None:
+            apps = [a for a in apps if any(item.id == query.agent_id for item in a.agent_config or [])]
+        apps.sort(key=lambda x: (x.updated_at or datetime.min, x.id), reverse=True)
+        total = len(apps) if query.include_total else None
+
+        if query.cursor is not None:
+            position = (query.cursor.updated_at, query.cursor.id)
+            apps = [a for a in apps if (a.updated_at or datetime.min, a.id) < position]
+        next_cursor = None
+        if query.limit is not None and len(apps) > query.limit:
+            apps = apps[:query.limit]
+            next_cursor = ApplicationCursor.after(apps[-1])
+        return ApplicationPage(items=apps, next_cursor=next_cursor, total=total)
+
+    async def get_application_icon(self, app_id: int) -> Optional[ApplicationIcon]:
+        """
+        获取应用图标的原始内容。
+
+        参数:
+            app_id: 应用主键 ID
+
+        返回:
+            Optional[ApplicationIcon]: 应用图标，应用不存在或没有图标时返回 None
+        """
+        for app in self._applications.values():
+            if app.id == app_id and app.icon:
+                data = base64.b64decode(app.icon)
+                return ApplicationIcon(data=data, icon_hash=compute_icon_hash(data))
+        return None
+
     async def set_application_pinned(self, app_id: int, pinned: bool) -> Application:
         """设置应用是否被钉状态。"""
         for app in self._applications.values():
@@ -105,12 +164,19 @@ class MockApplicationAdapter(ApplicationPort):
                 return deepcopy(app)
         raise ValueError(f"应用不存在: id={app_id}")
 
-    async def get_application_by_key(self, key: str) -> Application:
+    async def get_application_by_key(
+        self,
+        key: str,
+        include_icon: bool = True,
+        include_config: bool = True,
+    ) -> Application:
         """
         根据应用唯一标识获取应用信息。
 
         参数:
             key: 应用包唯一标识
+            include_icon: 是否加载图标内容；为 False 时 icon 为 None，仅返回 icon_hash
+            include_config: 是否加载 Release、业务知识网络和智能体配置；为 False 时均为空列表
 
         返回:
             Application: 应用实体
@@ -120,25 +186,46 @@ class MockApplicationAdapter(ApplicationPort):
         """
         if key in self._applications:
             logger.info(f"[Mock] 获取应用: {key}")
-            return deepcopy(self._applications[key])
+            return self._project(self._applications[key], include_icon, include_config)
         
         logger.warning(f"[Mock] 应用不存在: {key}")
         raise ValueError(f"应用不存在: {key}")
 
-    async def get_application_by_key_optional(self, key: str) -> Optional[Application]:
+    async def get_application_by_key_optional(
+        self,
+        key: str,
+        include_icon: bool = True,
+        include_config: bool = True,
+    ) -> Optional[Application]:
         """
         根据应用唯一标识获取应用信息（可选）。
 
         参数:
             key: 应用包唯一标识
+            include_icon: 是否加载图标内容；为 False 时 icon 为 None，仅返回 icon_hash
+            include_config: 是否加载 Release、业务知识网络和智能体配置；为 False 时均为空列表
 
         返回:
             Optional[Application]: 应用实体，不存在时返回 None
         """
         if key in self._applications:
-            return deepcopy(self._applications[key])
+            return self._project(self._applications[key], include_icon, include_config)
         return None
 
+    @staticmethod
+    def _project(app: Application, include_icon: bool, include_config: bool) -> Application:
+        """按投影返回应用副本（与数据库适配器的 NULL 列行为一致）。"""
+        app = deepcopy(app)
+        if not include_icon:
+            if app.icon and not app.icon_hash:
+                app.icon_hash = compute_icon_hash(base64.b64decode(app.icon))
+            app.icon = None
+        if not include_config:
+            app.release_config = []
+            app.ontology_config = []
+            app.agent_config = []
+        return app
+
     async def create_application(self, application: Application) -> Application:
         """
         创建新应用。
@@ -186,6 +273,39 @@ class MockApplicationAdapter(ApplicationPort):
         
         return application
 
+    async def upsert_application(
+        self,
+        application: Application,
+        expected_version: Optional[str] = None,
+    ) -> Application:
+        """
+        创建应用，或在已安装版本与预期一致时更新应用（安装时使用，单条语句完成）。
+
+        并发安装同一应用时，只有一个安装能按预期版本写入，其余安装失败，不会互相覆盖；
+        应用的被钉状态保留不变。
+
+        参数:
+            application: 应用实体
+            expected_version: 预期的已安装版本号，None 表示预期应用尚未安装
+
+        返回:
+            Application: 创建或更新后的应用实体（包含 ID）
+
+        异常:
+            ValueError: 已安装版本与预期不一致（应用已被其他安装修改）时抛出
+        """
+        existing = self._applications.get(application.key)
+        installed_version = existing.version if existing else None
+        if installed_version != expected_version:
+            raise ValueError(
+                f"应用已被其他安装修改: {application.key}，预期版本 {expected_version}，当前版本 {installed_version}"
+            )
+        if existing is None:
+            return await self.create_application(application)
+        application.id = existing.id
+        application.pinned = existing.pinned
+        return await self.update_application(application)
+
     async def update_application_config(
         self,
         key: str,
@@ -250,3 +370,30 @@ class MockApplicationAdapter(ApplicationPort):
         """关闭适配器（Mock 不需要实际关闭操作）。"""
         logger.info("[Mock] 应用适配器已关闭")
 
+
+class MockArtifactIndexAdapter(ArtifactIndexPort):
+    """
+    Mock 制品索引适配器。
+
+    使用内存存储模拟 t_artifact_upload 表。
+    """
+
+    def __init__(self):
+        """初始化 Mock 适配器。"""
+        self._records = {}
+
+    async def get_artifact(self, kind: str, digest: str) -> Optional[ArtifactRecord]:
+        """按内容摘要查询已上传的制品。"""
+        record = self._records.get((kind, digest))
+        return deepcopy(record) if record else None
+
+    async def save_artifact(self, record: ArtifactRecord) -> None:
+        """保存（创建或覆盖）制品记录。"""
+        record = deepcopy(record)
+        record.created_at = record.created_at or datetime.now()
+        self._records[(record.kind, record.digest)] = record
+        logger.info(f"[Mock] 保存制品记录: {record.kind}:{record.digest[:12]}, {record.name}")
+
+    async def delete_artifact(self, kind: str, digest: str) -> None:
+        """删除制品记录。"""
+        self._records.pop((kind, digest), None)
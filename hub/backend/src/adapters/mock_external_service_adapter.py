@@ -16,10 +16,41 @@ from src.ports.external_service_port import (
     ReleaseResult,
     KnowledgeNetworkInfo,
     AgentFactoryResult,
+    UploadProgressCallback,
 )
 
 logger = logging.getLogger(__name__)
 
+# 模拟上传时按块读取数据的大小
+_MOCK_UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def _consume_upload(
+    data: BinaryIO,
+    size: Optional[int] = None,
+    progress_callback: Optional[UploadProgressCallback] = None,
+) -> int:
+    """
+    按块读取上传数据，模拟流式发送。
+
+    参数:
+        data: 上传数据
+        size: 数据总大小（字节）
+        progress_callback: 上传进度回调
+
+    返回:
+        int: 读取的字节数
+    """
+    sent = 0
+    while True:
+        chunk = data.read(_MOCK_UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        sent += len(chunk)
+        if progress_callback:
+            progress_callback(sent, size)
+    return sent
+
 
 class MockDeployInstallerAdapter(DeployInstallerPort):
     """
@@ -39,19 +70,23 @@ class MockDeployInstallerAdapter(DeployInstallerPort):
         self,
         image_data: BinaryIO,
         auth_token: Optional[str] = None,
+        size: Optional[int] = None,
+        progress_callback: Optional[UploadProgressCallback] = None,
     ) -> List[ImageUploadResult]:
         """
         模拟上传镜像。
 
         参数:
             image_data: 镜像数据
+            auth_token: 认证令牌
+            size: 数据总大小（字节）
+            progress_callback: 上传进度回调
 
         返回:
             List[ImageUploadResult]: 模拟的上传结果
         """
-        # 读取一些数据来模拟处理
-        data = image_data.read()
-        size_kb = len(data) / 1024
+        # 按块读取数据来模拟处理
+        size_kb = _consume_upload(image_data, size, progress_callback) / 1024
         
         # 生成模拟的镜像名称
         image_name = f"mock-image-{len(self._images) + 1}"
@@ -69,18 +104,22 @@ class MockDeployInstallerAdapter(DeployInstallerPort):
         self,
         chart_data: BinaryIO,
         auth_token: Optional[str] = None,
+        size: Optional[int] = None,
+        progress_callback: Optional[UploadProgressCallback] = None,
     ) -> ChartUploadResult:
         """
         模拟上传 Chart。
 
         参数:
             chart_data: Chart 数据
+            auth_token: 认证令牌
+            size: 数据总大小（字节）
+            progress_callback: 上传进度回调
 
         返回:
             ChartUploadResult: 模拟的上传结果
         """
-        data = chart_data.read()
-        size_kb = len(data) / 1024
+        size_kb = _consume_upload(chart_data, size, progress_callback) / 1024
         
         chart_name = f"mock-chart-{len(self._charts) + 1}"
         result = ChartUploadResult(
@@ -171,7 +210,7 @@ class MockOntologyManagerAdapter(OntologyManagerPort):
     """
     Mock Ontology Manager 服务适配器。
 
-    模拟业务知识网络的创建和查询操作。
+    模拟业务知识网络的创建、查询和删除操作。
     """
 
     def __init__(self):
@@ -260,12 +299,31 @@ class MockOntologyManagerAdapter(OntologyManagerPort):
         
         return kn_id
 
+    async def delete_knowledge_network(
+        self,
+        kn_id: str,
+        auth_token: Optional[str] = None,
+        business_domain: Optional[str] = None,
+    ) -> None:
+        """
+        模拟删除业务知识网络。
+
+        参数:
+            kn_id: 业务知识网络 ID
+            auth_token: 认证令牌
+            business_domain: 业务域
+        """
+        if self._knowledge_networks.pop(kn_id, None) is not None:
+            logger.info(f"[Mock] 删除业务知识网络: {kn_id}")
+        else:
+            logger.warning(f"[Mock] 业务知识网络不存在: {kn_id}")
+
 
 class MockAgentFactoryAdapter(AgentFactoryPort):
     """
     Mock Agent Factory 服务适配器。
 
-    模拟智能体的创建操作。
+    模拟智能体的创建和删除操作。
     """
 
     def __init__(self):
@@ -350,3 +408,22 @@ class MockAgentFactoryAdapter(AgentFactoryPort):
             version="v0",
         )
 
+    async def delete_agent(
+        self,
+        agent_id: str,
+        auth_token: Optional[str] = None,
+        business_domain: Optional[str] = None,
+    ) -> None:
+        """
+        模拟删除智能体。
+
+        参数:
+            agent_id: 智能体 ID
+            auth_token: 认证令牌
+            business_domain: 业务域
+        """
+        if self._agents.pop(agent_id, None) is not None:
+            logger.info(f"[Mock] 删除智能体: {agent_id}")
+        else:
+            logger.warning(f"[Mock] 智能体不存在: {agent_id}")
+
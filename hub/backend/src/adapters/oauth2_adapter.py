@@ -6,12 +6,14 @@ OAuth2 适配器
 """
 import base64
 import logging
+from typing import Optional
 from urllib.parse import quote
 
 import httpx
 
 from src.ports.oauth2_port import OAuth2Port, Code2TokenResponse, RefreshTokenResponse
 from src.infrastructure.config.settings import Settings
+from src.infrastructure.http_client import HttpClientPool
 
 logger = logging.getLogger(__name__)
 
@@ -23,14 +25,16 @@ class OAuth2Adapter(OAuth2Port):
     使用 HTTP 客户端与 OAuth2 服务交互。
     """
 
-    def __init__(self, settings: Settings):
+    def __init__(self, settings: Settings, http_pool: Optional[HttpClientPool] = None):
         """
         初始化适配器。
 
         参数:
             settings: 应用配置
+            http_pool: 共享 HTTP 连接池，为 None 时使用适配器私有的连接池
         """
         self._settings = settings
+        self._http_pool = http_pool or HttpClientPool(settings)
         self._timeout = 30
 
     def _encode_authorization(self) -> str:
@@ -100,29 +104,30 @@ class OAuth2Adapter(OAuth2Port):
         
         # 禁用 SSL 证书验证以避免 certificate_verify_failed
         try:
-            async with httpx.AsyncClient(timeout=self._timeout, verify=False) as client:
-                response = await client.post(
-                    token_url,
-                    data=data,
-                    headers=headers,
-                )
-                response.raise_for_status()
+            client = self._http_pool.get_httpx_client("oauth2", verify=False)
+            response = await client.post(
+                token_url,
+                data=data,
+                headers=headers,
+                timeout=self._timeout,
+            )
+            response.raise_for_status()
                 
-                token_data = response.json()
-                has_refresh = "refresh_token" in token_data and token_data.get("refresh_token")
-                logger.info(
-                    "[code2token] token 响应: 含 access_token=%s, 含 refresh_token=%s",
-                    bool(token_data.get("access_token")),
-                    has_refresh,
-                )
+            token_data = response.json()
+            has_refresh = "refresh_token" in token_data and token_data.get("refresh_token")
+            logger.info(
+                "[code2token] token 响应: 含 access_token=%s, 含 refresh_token=%s",
+                bool(token_data.get("access_token")),
+                has_refresh,
+            )
                 
-                return Code2TokenResponse(
-                    access_token=token_data.get("access_token", ""),
-                    refresh_token=token_data.get("refresh_token"),
-                    id_token=token_data.get("id_token"),
-                    token_type=token_data.get("token_type", "Bearer"),
-                    expires_in=token_data.get("expires_in"),
-                )
+            return Code2TokenResponse(
+                access_token=token_data.get("access_token", ""),
+                refresh_token=token_data.get("refresh_token"),
+                id_token=token_data.get("id_token"),
+                token_type=token_data.get("token_type", "Bearer"),
+                expires_in=token_data.get("expires_in"),
+            )
         except httpx.HTTPStatusError as exc:
             logger.error(
                 "[code2token] HTTPStatusError: %s\nResponse content: %s",
@@ -158,23 +163,24 @@ class OAuth2Adapter(OAuth2Port):
         
         logger.info(f"refresh_token request to {token_url}")
         
-        async with httpx.AsyncClient(timeout=self._timeout, verify=False) as client:
-            response = await client.post(
-                token_url,
-                data=data,
-                headers=self._get_headers(),
-            )
-            response.raise_for_status()
+        client = self._http_pool.get_httpx_client("oauth2", verify=False)
+        response = await client.post(
+            token_url,
+            data=data,
+            headers=self._get_headers(),
+            timeout=self._timeout,
+        )
+        response.raise_for_status()
             
-            token_data = response.json()
+        token_data = response.json()
             
-            return RefreshTokenResponse(
-                access_token=token_data.get("access_token", ""),
-                refresh_token=token_data.get("refresh_token"),
-                id_token=token_data.get("id_token"),
-                token_type=token_data.get("token_type", "Bearer"),
-                expires_in=token_data.get("expires_in"),
-            )
+        return RefreshTokenResponse(
+            access_token=token_data.get("access_token", ""),
+            refresh_token=token_data.get("refresh_token"),
+            id_token=token_data.get("id_token"),
+            token_type=token_data.get("token_type", "Bearer"),
+            expires_in=token_data.get("expires_in"),
+        )
 
     async def revoke_token(self, token: str) -> None:
         """
@@ -194,11 +200,12 @@ class OAuth2Adapter(OAuth2Port):
             "token": token,
         }
         
-        async with httpx.AsyncClient(timeout=self._timeout, verify=False) as client:
-            response = await client.post(
-                revoke_url,
-                data=data,
-                headers=self._get_headers(),
-            )
-            response.raise_for_status()
+        client = self._http_pool.get_httpx_client("oauth2", verify=False)
+        response = await client.post(
+            revoke_url,
+            data=data,
+            headers=self._get_headers(),
+            timeout=self._timeout,
+        )
+        response.raise_for_status()
 
@@ -64,6 +64,15 @@ class SessionAdapter(SessionPort):
             logger.info(f"Redis 客户端已创建: {self._redis_host}:{self._redis_port}/{self._settings.redis_db}")
         return self._redis_client
 
+    async def get_client(self) -> redis.Redis:
+        """
+        获取共享的 Redis 客户端，供其他组件复用同一连接池。
+
+        返回:
+            redis.Redis: Redis 客户端
+        """
+        return await self._get_client()
+
     async def get_session(self, session_id: str) -> Optional[SessionInfo]:
         """
         获取 Session 信息。
@@ -4,34 +4,66 @@
 应用层服务，负责编排应用管理操作。
 该服务使用端口（接口），不依赖任何基础设施细节。
 """
+import asyncio
 import base64
+import copy
+import functools
+import hashlib
 import io
 import json
 import logging
 import os
+import posixpath
+import re
 import shutil
 import tempfile
+import time
 import zipfile
-from typing import List, Optional, BinaryIO
+from dataclasses import asdict, is_dataclass
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
 from datetime import datetime
 from packaging import version as pkg_version
 
 import yaml
 
 from src.domains.application import (
-    Application, ManifestInfo, MicroAppInfo,
+    Application, ApplicationIcon, ApplicationListQuery, ApplicationPage, ArtifactRecord, ArtifactTiming, InstallReport, ManifestInfo, MicroAppInfo,
+    PackageArtifact, PackageValidationReport,
     OntologyConfigItem, AgentConfigItem, ReleaseConfigItem
 )
+from src.domains.install_job import InstallStage, InstallTimingStage
+from src.domains.install_journal import JournalStep, JournalStepKind
+from src.application.install_saga import InstallSaga
 from src.ports.application_port import ApplicationPort
+from src.ports.artifact_index_port import ArtifactIndexPort
+from src.ports.install_journal_port import InstallJournalPort
 from src.ports.external_service_port import (
+    ChartInfo,
+    ChartUploadResult,
     DeployInstallerPort,
     OntologyManagerPort,
     AgentFactoryPort,
+    UploadProgressCallback,
 )
 from src.infrastructure.config.settings import Settings
+from src.infrastructure.executor import BlockingExecutor
+from src.infrastructure.metrics import InstallMetrics, StageTimer
+from src.infrastructure.upload import DirectoryPackageArchive, PackageArchive, ZipPackageArchive
 
 logger = logging.getLogger(__name__)
 
+# 计算镜像/Chart 内容摘要时每次读取的字节数
+DIGEST_CHUNK_SIZE = 1024 * 1024
+
+# 安装包各目录下识别的文件扩展名
+IMAGE_EXTENSIONS = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tar.xz')
+CHART_EXTENSIONS = ('.tgz', '.tar.gz')
+ICON_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico')
+DEFINITION_EXTENSIONS = ('.json', '.yaml', '.yml')
+
+# Kubernetes 命名空间格式（RFC 1123 DNS label）
+_NAMESPACE_PATTERN = re.compile(r"^[a-z0-9]([-a-z0-9]{0,61}[a-z0-9])?$")
+
 
 class ApplicationService:
     """
@@ -47,6 +79,10 @@ class ApplicationService:
         ontology_manager_port: Optional[OntologyManagerPort] = None,
         agent_factory_port: Optional[AgentFactoryPort] = None,
         settings: Optional[Settings] = None,
+        blocking_executor: Optional[BlockingExecutor] = None,
+        artifact_index_port: Optional[ArtifactIndexPort] = None,
+        install_metrics: Optional[InstallMetrics] = None,
+        install_journal_port: Optional[InstallJournalPort] = None,
     ):
         """
         初始化应用服务。
@@ -57,24 +93,76 @@ class ApplicationService:
             ontology_manager_port: Ontology Manager 端口（可选）
             agent_factory_port: Agent Factory 端口（可选）
             settings: 应用配置（可选）
+            blocking_executor: 阻塞任务执行器（可选，未提供时按 blocking_io_workers 创建）
+            artifact_index_port: 已上传制品索引端口（可选，未提供时不跳过已上传的镜像/Chart）
+            install_metrics: 安装指标（可选，未提供时只在内存中累计）
+            install_journal_port: 安装日志端口（可选，未提供时安装失败仍回滚，但重试不复用已完成的步骤）
         """
         self._application_port = application_port
         self._deploy_installer_port = deploy_installer_port
         self._ontology_manager_port = ontology_manager_port
         self._agent_factory_port = agent_factory_port
         self._settings = settings
+        self._blocking_executor = blocking_executor or BlockingExecutor(
+            settings.blocking_io_workers if settings else 4
+        )
+        self._artifact_index_port = artifact_index_port
+        self._install_metrics = install_metrics or InstallMetrics()
+        self._install_journal_port = install_journal_port
 
-    async def get_all_applications(self, pinned: Optional[bool] = None) -> List[Application]:
+    async def _run_blocking(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        在阻塞任务执行器中执行 ZIP 读取、文件操作、YAML 解析等阻塞操作，避免阻塞事件循环。
+
+        参数:
+            func: 阻塞函数
+            args: 位置参数
+
+        返回:
+            Any: 函数返回值
+        """
+        return await self._blocking_executor.run(func, *args)
+
+    async def get_all_applications(
+        self,
+        pinned: Optional[bool] = None,
+        include_icon: bool = True,
+    ) -> List[Application]:
         """
         获取所有已安装的应用列表，可按被钉状态过滤。
 
         参数:
             pinned: 可选，按被钉状态过滤（True=仅被钉，False=仅未被钉，None=不过滤）
+            include_icon: 是否加载图标内容；为 False 时仅返回 icon_hash
 
         返回:
             List[Application]: 应用列表
         """
-        return await self._application_port.get_all_applications(pinned=pinned)
+        return await self._application_port.get_all_applications(pinned=pinned, include_icon=include_icon)
+
+    async def list_applications(self, query: ApplicationListQuery) -> ApplicationPage:
+        """
+        按条件分页查询应用列表。
+
+        参数:
+            query: 查询条件（过滤、分页游标、每页数量等）
+
+        返回:
+            ApplicationPage: 分页结果
+        """
+        return await self._application_port.list_applications(query)
+
+    async def get_application_icon(self, app_id: int) -> Optional[ApplicationIcon]:
+        """
+        获取应用图标的原始内容。
+
+        参数:
+            app_id: 应用主键 ID
+
+        返回:
+            Optional[ApplicationIcon]: 应用图标，应用不存在或没有图标时返回 None
+        """
+        return await self._application_port.get_application_icon(app_id)
 
     async def get_application_by_key(self, key: str) -> Application:
         """
@@ -119,7 +207,8 @@ class ApplicationService:
         异常:
             ValueError: 当应用不存在时抛出
         """
-        return await self._application_port.get_application_by_id(app_id)
+        # 基础信息不包含 Release、业务知识网络和智能体配置
+        return await self._application_port.get_application_by_id(app_id, include_config=False)
 
     async def set_application_pinned(self, app_id: int, pinned: bool) -> Application:
         """
@@ -147,7 +236,7 @@ class ApplicationService:
 
         流程：
         1. 通过 id 获取应用的业务知识网络配置项（ontology_config）
-        2. 遍历配置项，通过 id 调用外部接口查询业务知识网络详情
+        2. 并发通过 id 调用外部接口查询业务知识网络详情（受并发数和整体截止时间限制）
         3. 返回业务知识网络详情列表（原始数据）
 
         参数:
@@ -160,30 +249,22 @@ class ApplicationService:
         异常:
             ValueError: 当应用不存在时抛出
         """
-        # 1. 通过 id 获取应用
-        application = await self._application_port.get_application_by_id(app_id)
-        
-        # 2. 遍历配置项，通过 id 调用外部接口查询详情
-        ontologies = []
-        for config_item in application.ontology_config:
-            try:
-                if self._ontology_manager_port:
-                    # 调用外部接口查询业务知识网络详情（返回原始数据）
-                    kn_data = await self._ontology_manager_port.get_knowledge_network(
-                        config_item.id,
-                        auth_token=auth_token,
-                        business_domain=application.business_domain,
-                    )
-                    ontologies.append(kn_data)
-                else:
-                    # 如果没有外部服务端口，返回基本信息
-                    ontologies.append({"id": config_item.id})
-            except Exception as e:
-                logger.warning(f"获取业务知识网络详情失败 (ID: {config_item.id}): {e}")
-                # 即使查询失败，也返回基本信息
-                ontologies.append({"id": config_item.id})
+        # 1. 通过 id 获取应用（不需要图标）
+        application = await self._application_port.get_application_by_id(app_id, include_icon=False)
         
-        return ontologies
+        # 2. 并发通过 id 调用外部接口查询详情（原始数据），查询失败的项只返回基本信息
+        ontology_ids = [config_item.id for config_item in application.ontology_config]
+        if not self._ontology_manager_port:
+            return [{"id": item_id} for item_id in ontology_ids]
+
+        async def fetch(item_id: Any) -> dict:
+            return await self._ontology_manager_port.get_knowledge_network(
+                item_id,
+                auth_token=auth_token,
+                business_domain=application.business_domain,
+            )
+
+        return await self._fetch_details_concurrently(ontology_ids, fetch, "业务知识网络")
 
     async def get_application_agents_by_id(
         self,
@@ -195,7 +276,7 @@ class ApplicationService:
 
         流程：
         1. 通过 id 获取应用的智能体配置项（agent_config）
-        2. 遍历配置项，通过 id 调用外部接口查询智能体详情
+        2. 并发通过 id 调用外部接口查询智能体详情（受并发数和整体截止时间限制）
         3. 返回智能体详情列表（原始数据）
 
         参数:
@@ -208,30 +289,77 @@ class ApplicationService:
         异常:
             ValueError: 当应用不存在时抛出
         """
-        # 1. 通过 id 获取应用
-        application = await self._application_port.get_application_by_id(app_id)
+        # 1. 通过 id 获取应用（不需要图标）
+        application = await self._application_port.get_application_by_id(app_id, include_icon=False)
         
-        # 2. 遍历配置项，通过 id 调用外部接口查询详情
-        agents = []
-        for config_item in application.agent_config:
-            try:
-                if self._agent_factory_port:
-                    # 调用外部接口查询智能体详情（返回原始数据）
-                    agent_data = await self._agent_factory_port.get_agent(
-                        config_item.id,
-                        auth_token=auth_token,
-                        business_domain=application.business_domain,
-                    )
-                    agents.append(agent_data)
-                else:
-                    # 如果没有外部服务端口，返回基本信息
-                    agents.append({"id": config_item.id})
-            except Exception as e:
-                logger.warning(f"获取智能体详情失败 (ID: {config_item.id}): {e}")
+        # 2. 并发通过 id 调用外部接口查询详情（原始数据），查询失败的项只返回基本信息
+        agent_ids = [config_item.id for config_item in application.agent_config]
+        if not self._agent_factory_port:
+            return [{"id": item_id} for item_id in agent_ids]
+
+        async def fetch(item_id: Any) -> dict:
+            return await self._agent_factory_port.get_agent(
+                item_id,
+                auth_token=auth_token,
+                business_domain=application.business_domain,
+            )
+
+        return await self._fetch_details_concurrently(agent_ids, fetch, "智能体")
+
+    async def _fetch_details_concurrently(
+        self,
+        item_ids: List[Any],
+        fetch: Callable[[Any], Awaitable[dict]],
+        label: str,
+    ) -> List[dict]:
+        """
+        并发查询一组详情，结果顺序与 item_ids 一致。
+
+        并发数受 detail_fetch_concurrency 限制；整体超过 detail_fetch_deadline 仍未返回的
+        查询会被取消。查询失败或超时的项返回 {"id": item_id}。
+
+        参数:
+            item_ids: 待查询的 ID 列表
+            fetch: 查询单个 ID 详情的协程函数
+            label: 日志中的资源名称
+
+        返回:
+            List[dict]: 详情列表
+        """
+        if not item_ids:
+            return []
+
+        concurrency = self._settings.detail_fetch_concurrency if self._settings else 8
+        deadline = self._settings.detail_fetch_deadline if self._settings else 10.0
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def fetch_one(item_id: Any) -> dict:
+            async with semaphore:
+                return await fetch(item_id)
+
+        tasks = [asyncio.ensure_future(fetch_one(item_id)) for item_id in item_ids]
+        try:
+            _, pending = await asyncio.wait(tasks, timeout=deadline if deadline > 0 else None)
+        finally:
+            # 超时或调用方被取消时，取消尚未完成的查询
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            logger.warning(f"获取{label}详情超时 ({deadline}s)，{len(pending)}/{len(tasks)} 项只返回基本信息")
+
+        results = []
+        for item_id, task in zip(item_ids, tasks):
+            if task.cancelled():
+                results.append({"id": item_id})
+            elif task.exception() is not None:
+                logger.warning(f"获取{label}详情失败 (ID: {item_id}): {task.exception()}")
                 # 即使查询失败，也返回基本信息
-                agents.append({"id": config_item.id})
-        
-        return agents
+                results.append({"id": item_id})
+            else:
+                results.append(task.result())
+        return results
 
     async def configure_application(
         self,
@@ -256,8 +384,8 @@ class ApplicationService:
         异常:
             ValueError: 当应用不存在时抛出
         """
-        # 获取现有应用
-        application = await self._application_port.get_application_by_id(app_id)
+        # 获取现有应用（不需要图标）
+        application = await self._application_port.get_application_by_id(app_id, include_icon=False)
 
         # 基于现有配置，将 is_config 统一置为 True
         new_ontology_config = [
@@ -270,37 +398,46 @@ class ApplicationService:
         ]
 
         # 更新配置
-        return await self._application_port.update_application_config(
+        result = await self._application_port.update_application_config(
             key=application.key,
             ontology_config=new_ontology_config,
             agent_config=new_agent_config,
             updated_by=updated_by,
             updated_by_id=updated_by_id,
         )
+        await self._invalidate_detail_cache(application)
+        return result
 
     async def install_application(
         self,
-        zip_data: BinaryIO,
+        package_path: str,
         updated_by: str = "",
         updated_by_id: str = "",
         auth_token: Optional[str] = None,
+        progress: Optional[Callable[[str], Awaitable[None]]] = None,
+        timer: Optional[StageTimer] = None,
     ) -> Application:
         """
         安装应用。
 
         流程：
-        1. 将 zip 数据写入临时文件
-        2. 解压并校验安装包结构和 manifest.yaml
+        1. 打开已落盘的 zip 安装包（默认按 ZIP 索引读取，不解压）
+        2. 校验安装包结构和 manifest.yaml
         3. 解析 application.key，校验 version
         4. 如果应用已存在，版本号必须大于已上传版本
         5. 解压安装包，上传镜像和 Chart
         6. 导入业务知识网络和 DataAgent 智能体
         7. 更新应用信息
 
+        已完成的上传、Release 安装和创建记录在安装日志中：安装失败时并发回滚新安装的 Release、
+        已创建的业务知识网络和智能体；重试安装同一版本时复用已上传的镜像和 Chart。
+
         参数:
-            zip_data: ZIP 格式应用安装包数据
+            package_path: ZIP 格式应用安装包的本地文件路径（由调用方负责清理）
             updated_by: 更新者用户显示名称
             updated_by_id: 更新者用户ID
+            progress: 阶段进度回调（可选），进入每个安装阶段（InstallStage）时以阶段名调用
+            timer: 阶段计时器（可选），调用方已记录接收安装包等阶段时传入，安装结束后包含各阶段耗时
 
         返回:
             Application: 安装后的应用
@@ -309,66 +446,59 @@ class ApplicationService:
             ValueError: 当安装包格式错误或版本冲突时抛出
         """
         logger.info(f"[install_application] 开始安装应用，updated_by: {updated_by}")
+        timer = timer or StageTimer()
         temp_dir = None
+        archive: Optional[PackageArchive] = None
+        manifest: Optional[ManifestInfo] = None
+        install_report: Optional[InstallReport] = None
+        saga: Optional[InstallSaga] = None
+        succeeded = False
         try:
-            # 创建临时目录
-            temp_base = self._settings.temp_dir if self._settings else "/tmp/dip-hub"
-            os.makedirs(temp_base, exist_ok=True)
-            temp_dir = tempfile.mkdtemp(dir=temp_base)
-            logger.info(f"[install_application] 创建临时目录: {temp_dir}")
-            
-            # 保存 zip 文件
-            zip_path = os.path.join(temp_dir, "package.zip")
-            with open(zip_path, "wb") as f:
-                shutil.copyfileobj(zip_data, f)
-            zip_size = os.path.getsize(zip_path)
-            logger.info(f"[install_application] ZIP 文件已保存: {zip_path}, 大小: {zip_size} bytes")
+            # 直接使用调用方落盘的 zip 文件，不再复制
+            zip_path = package_path
+            zip_size = await self._run_blocking(os.path.getsize, zip_path)
+            logger.info(f"[install_application] ZIP 文件: {zip_path}, 大小: {zip_size} bytes")
             
-            # 解压 zip 文件
-            extract_dir = os.path.join(temp_dir, "extracted")
-            logger.info(f"[install_application] 开始解压 ZIP 文件到: {extract_dir}")
-            try:
-                with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                    file_list = zip_ref.namelist()
-                    logger.info(f"[install_application] ZIP 文件包含 {len(file_list)} 个文件/目录")
-                    logger.debug(f"[install_application] ZIP 文件列表: {file_list[:10]}..." if len(file_list) > 10 else f"[install_application] ZIP 文件列表: {file_list}")
-                    zip_ref.extractall(extract_dir)
-                logger.info(f"[install_application] ZIP 文件解压完成")
-            except zipfile.BadZipFile as e:
-                logger.error(f"[install_application] ZIP 文件格式错误: {e}", exc_info=True)
-                raise ValueError(f"无效的 ZIP 文件格式: {str(e)}")
-            except Exception as e:
-                logger.error(f"[install_application] 解压 ZIP 文件失败: {e}", exc_info=True)
-                raise ValueError(f"解压 ZIP 文件失败: {str(e)}")
+            await self._report_stage(progress, InstallStage.EXTRACT, timer)
+            if self._settings is None or self._settings.install_zip_index_enabled:
+                # 只读取 ZIP 中央目录，小文件按需读取，镜像和 Chart 上传时从 ZIP 中流式读取
+                archive = await self._run_blocking(ZipPackageArchive, zip_path)
+                logger.info(f"[install_application] ZIP 文件包含 {len(archive)} 个文件，按 ZIP 索引读取，不解压")
+            else:
+                temp_dir = await self._run_blocking(self._create_temp_dir, self._settings.temp_dir)
+                archive = await self._run_blocking(
+                    self._extract_package, zip_path, os.path.join(temp_dir, "extracted")
+                )
             
-            # 查找 manifest.yaml（从解压目录逐层查找）
+            # 查找 manifest.yaml（从安装包根目录逐层查找）
             # 应用包结构：manifest.yaml 同层有 application.key、packages/、ontologies/、agents/
+            await self._report_stage(progress, InstallStage.VALIDATE, timer)
             logger.info(f"[install_application] 开始逐层查找 manifest.yaml 文件")
-            manifest_path = self._find_file_bfs(extract_dir, ["manifest.yaml", "manifest.yml"])
+            manifest_path = await self._run_blocking(archive.find_file, ["manifest.yaml", "manifest.yml"])
             
             if not manifest_path:
-                logger.error(f"[install_application] 未找到 manifest.yaml 文件，解压目录内容: {os.listdir(extract_dir) if os.path.exists(extract_dir) else '目录不存在'}")
+                root_files = await self._run_blocking(archive.list_files, "")
+                logger.error(f"[install_application] 未找到 manifest.yaml 文件，安装包根目录内容: {root_files}")
                 raise ValueError("安装包缺少 manifest.yaml 文件")
             
             logger.info(f"[install_application] 找到 manifest.yaml: {manifest_path}")
             
             # manifest.yaml 所在目录即为应用包根目录，同层包含 application.key、packages/、ontologies/、agents/
-            manifest_dir = os.path.dirname(manifest_path)
-            logger.info(f"[install_application] 应用包根目录: {manifest_dir}")
+            manifest_dir = posixpath.dirname(manifest_path)
+            logger.info(f"[install_application] 应用包根目录: {manifest_dir or '/'}")
             
             # application.key 与 manifest.yaml 同层
-            app_key_path = os.path.join(manifest_dir, "application.key")
-            if not os.path.exists(app_key_path):
-                logger.error(f"[install_application] 未找到 application.key 文件，应在 manifest.yaml 同层目录: {manifest_dir}")
+            app_key_path = posixpath.join(manifest_dir, "application.key")
+            if not await self._run_blocking(archive.is_file, app_key_path):
+                logger.error(f"[install_application] 未找到 application.key 文件，应在 manifest.yaml 同层目录: {manifest_dir or '/'}")
                 raise ValueError("安装包缺少 application.key 文件（应与 manifest.yaml 同层）")
             
             logger.info(f"[install_application] 找到 application.key: {app_key_path}")
             try:
-                with open(app_key_path, "r", encoding="utf-8") as f:
-                    app_key = f.read().strip()
-                    if not app_key:
-                        raise ValueError("application.key 文件为空")
-                    logger.info(f"[install_application] 读取 application.key 成功: {app_key}")
+                app_key = (await self._run_blocking(archive.read_bytes, app_key_path)).decode("utf-8").strip()
+                if not app_key:
+                    raise ValueError("application.key 文件为空")
+                logger.info(f"[install_application] 读取 application.key 成功: {app_key}")
             except Exception as e:
                 logger.error(f"[install_application] 读取 application.key 失败: {e}", exc_info=True)
                 raise ValueError(f"读取 application.key 失败: {str(e)}")
@@ -376,12 +506,11 @@ class ApplicationService:
             # 读取并解析 manifest.yaml
             logger.info(f"[install_application] 开始读取 manifest.yaml")
             try:
-                with open(manifest_path, "r", encoding="utf-8") as f:
-                    manifest_content = f.read()
-                    logger.debug(f"[install_application] manifest.yaml 内容:\n{manifest_content}")
-                    manifest_data = yaml.safe_load(manifest_content)
-                    if not manifest_data:
-                        raise ValueError("manifest.yaml 文件为空或格式错误")
+                manifest_content = (await self._run_blocking(archive.read_bytes, manifest_path)).decode("utf-8")
+                logger.debug(f"[install_application] manifest.yaml 内容:\n{manifest_content}")
+                manifest_data = await self._run_blocking(yaml.safe_load, manifest_content)
+                if not manifest_data:
+                    raise ValueError("manifest.yaml 文件为空或格式错误")
             except yaml.YAMLError as e:
                 logger.error(f"[install_application] manifest.yaml 解析失败: {e}", exc_info=True)
                 raise ValueError(f"manifest.yaml 解析失败: {str(e)}")
@@ -399,15 +528,13 @@ class ApplicationService:
             
             # 校验版本
             logger.info(f"[install_application] 开始校验版本，key: {manifest.key}, version: {manifest.version}")
-            existing_app = await self._application_port.get_application_by_key_optional(manifest.key)
+            existing_app = await self._application_port.get_application_by_key_optional(
+                manifest.key, include_icon=False
+            )
             if existing_app:
                 logger.info(f"[install_application] 应用已存在: key={manifest.key}, 当前版本={existing_app.version}, 新版本={manifest.version}")
-                if manifest.version == existing_app.version:
-                    error_msg = f"版本号冲突: 新版本 {manifest.version} 与已安装版本相同。请更新版本号或先卸载现有应用 (key: {manifest.key})"
-                    logger.error(f"[install_application] {error_msg}")
-                    raise ValueError(error_msg)
-                if not self._is_version_greater(manifest.version, existing_app.version):
-                    error_msg = f"版本号冲突: 新版本 {manifest.version} 必须大于已安装版本 {existing_app.version}。当前已安装版本: {existing_app.version} (key: {manifest.key})"
+                error_msg = self._check_version(manifest.key, manifest.version, existing_app)
+                if error_msg:
                     logger.error(f"[install_application] {error_msg}")
                     raise ValueError(error_msg)
                 logger.info(
@@ -415,6 +542,11 @@ class ApplicationService:
                 )
             else:
                 logger.info(f"[install_application] 应用不存在，将创建新应用: key={manifest.key}")
+
+            # 校验通过后开始记录安装日志，此后的失败都需要回滚
+            saga = await InstallSaga.begin(
+                self._install_journal_port, manifest.key, manifest.version, existing_app
+            )
             
             # 读取图标（从 assets/icons/ 目录自动发现）
             logger.info(f"[install_application] 开始读取图标")
@@ -422,219 +554,55 @@ class ApplicationService:
             icon_path = None
             
             # 查找 assets/icons/ 目录下的图标文件
-            icons_dir = os.path.join(manifest_dir, "assets", "icons")
-            if os.path.exists(icons_dir) and os.path.isdir(icons_dir):
-                icon_files = [f for f in os.listdir(icons_dir) 
-                             if f.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico'))]
-                if icon_files:
-                    # 使用第一个找到的图标文件
-                    icon_path = os.path.join("assets", "icons", icon_files[0])
-                    logger.info(f"[install_application] 自动找到图标: {icon_path}")
+            icons_dir = posixpath.join(manifest_dir, "assets", "icons")
+            icon_files = [f for f in await self._run_blocking(archive.list_files, icons_dir)
+                          if f.lower().endswith(ICON_EXTENSIONS)]
+            if icon_files:
+                # 使用第一个找到的图标文件
+                icon_path = posixpath.join("assets", "icons", icon_files[0])
+                logger.info(f"[install_application] 自动找到图标: {icon_path}")
             
             if icon_path:
-                icon_full_path = os.path.join(manifest_dir, icon_path)
+                icon_full_path = posixpath.join(manifest_dir, icon_path)
                 logger.info(f"[install_application] 图标路径: {icon_path}")
                 logger.debug(f"[install_application] 图标完整路径: {icon_full_path}")
-                if os.path.exists(icon_full_path):
-                    try:
-                        with open(icon_full_path, "rb") as f:
-                            icon_data = f.read()
-                            icon_base64 = base64.b64encode(icon_data).decode("utf-8")
-                            logger.info(f"[install_application] 图标读取成功，大小: {len(icon_data)} bytes")
-                    except Exception as e:
-                        logger.warning(f"[install_application] 读取图标失败: {e}", exc_info=True)
-                else:
-                    logger.warning(f"[install_application] 图标文件不存在: {icon_full_path}")
+                try:
+                    icon_data = await self._run_blocking(archive.read_bytes, icon_full_path)
+                    icon_base64 = base64.b64encode(icon_data).decode("utf-8")
+                    logger.info(f"[install_application] 图标读取成功，大小: {len(icon_data)} bytes")
+                except Exception as e:
+                    logger.warning(f"[install_application] 读取图标失败: {e}", exc_info=True)
             else:
                 logger.info(f"[install_application] 未找到图标文件，跳过图标读取")
             
-            # 上传镜像（从 packages/images/ 目录自动发现）
+            # 上传镜像和 Chart 并安装 Release（从 packages/images/、packages/charts/ 目录自动发现）
             release_configs = []
             if self._deploy_installer_port:
-                # 自动查找 packages/images/ 目录下的镜像文件
-                image_paths = []
-                images_dir = os.path.join(manifest_dir, "packages", "images")
-                if os.path.exists(images_dir) and os.path.isdir(images_dir):
-                    image_files = [f for f in os.listdir(images_dir) 
-                                  if f.lower().endswith(('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tar.xz'))]
-                    # 构建相对路径
-                    image_paths = [os.path.join("packages", "images", f) for f in image_files]
-                    logger.info(f"[install_application] 自动找到 {len(image_paths)} 个镜像文件: {image_paths}")
-                
-                logger.info(f"[install_application] 开始处理镜像，镜像数量: {len(image_paths)}")
-                for idx, image_path in enumerate(image_paths, 1):
-                    image_full_path = os.path.join(manifest_dir, image_path)
-                    logger.info(f"[install_application] 处理镜像 [{idx}/{len(image_paths)}]: {image_path}")
-                    logger.debug(f"[install_application] 镜像完整路径: {image_full_path}")
-                    if os.path.exists(image_full_path):
-                        try:
-                            file_size = os.path.getsize(image_full_path)
-                            logger.info(f"[install_application] 开始上传镜像: {image_path}, 大小: {file_size} bytes")
-                            with open(image_full_path, "rb") as f:
-                                await self._deploy_installer_port.upload_image(f, auth_token=auth_token)
-                            logger.info(f"[install_application] 镜像上传成功: {image_path}")
-                        except Exception as e:
-                            logger.error(f"[install_application] 镜像上传失败 ({image_path}): {e}", exc_info=True)
-                            raise ValueError(f"镜像上传失败 ({image_path}): {str(e)}")
-                    else:
-                        logger.error(f"[install_application] 镜像文件不存在: {image_full_path}")
-                        raise ValueError(f"镜像文件不存在: {image_path}")
-                
-                # 上传 Chart 并安装（从 packages/charts/ 目录自动发现）
-                # 自动查找 packages/charts/ 目录下的 Chart 文件
-                chart_configs = []
-                charts_dir = os.path.join(manifest_dir, "packages", "charts")
-                if os.path.exists(charts_dir) and os.path.isdir(charts_dir):
-                    chart_files = [f for f in os.listdir(charts_dir) 
-                                  if f.lower().endswith(('.tgz', '.tar.gz'))]
-                    # 为每个 Chart 创建配置对象
-                    chart_configs = [{"path": os.path.join("packages", "charts", f)} for f in chart_files]
-                    logger.info(f"[install_application] 自动找到 {len(chart_configs)} 个 Chart 文件: {[c['path'] for c in chart_configs]}")
-                
-                logger.info(f"[install_application] 开始处理 Chart，Chart 数量: {len(chart_configs)}")
-                for idx, chart_config in enumerate(chart_configs, 1):
-                    chart_path = chart_config.get("path", "")
-                    if not chart_path:
-                        logger.warning(f"[install_application] Chart 配置缺少 path 字段，跳过: {chart_config}")
-                        continue
-                    
-                    logger.info(f"[install_application] 处理 Chart [{idx}/{len(chart_configs)}]: {chart_path}")
-                    chart_full_path = os.path.join(manifest_dir, chart_path)
-                    logger.debug(f"[install_application] Chart 完整路径: {chart_full_path}")
-                    if os.path.exists(chart_full_path):
-                        try:
-                            file_size = os.path.getsize(chart_full_path)
-                            logger.info(f"[install_application] 开始上传 Chart: {chart_path}, 大小: {file_size} bytes")
-                            with open(chart_full_path, "rb") as f:
-                                chart_result = await self._deploy_installer_port.upload_chart(f, auth_token=auth_token)
-                            logger.info(f"[install_application] Chart 上传成功: {chart_result.chart.name} v{chart_result.chart.version}")
-                            
-                            # 安装 release
-                            release_name = chart_config.get("release_name", chart_result.chart.name)
-                            # namespace 优先级：chart 配置 > manifest.release-config.namespace > 默认值
-                            namespace = chart_config.get("namespace") or manifest.release_config.get("namespace")
-                            values = chart_result.values
-                            values["namespace"] = namespace
-                            logger.info(f"[install_application] 开始安装 Release: name={release_name}, namespace={namespace}, chart={chart_result.chart.name} v{chart_result.chart.version}")
-                            
-                            await self._deploy_installer_port.install_release(
-                                release_name=release_name,
-                                namespace=namespace,
-                                chart_name=chart_result.chart.name,
-                                chart_version=chart_result.chart.version,
-                                values=values,
-                                auth_token=auth_token,
-                            )
-                            release_configs.append(ReleaseConfigItem(name=release_name, namespace=namespace))
-                            logger.info(f"[install_application] Release 安装成功: {release_name}, namespace: {namespace}")
-                        except Exception as e:
-                            logger.error(f"[install_application] Chart 处理失败 ({chart_path}): {e}", exc_info=True)
-                            raise ValueError(f"Chart 处理失败 ({chart_path}): {str(e)}")
-                    else:
-                        logger.error(f"[install_application] Chart 文件不存在: {chart_full_path}")
-                        raise ValueError(f"Chart 文件不存在: {chart_path}")
+                await self._report_stage(progress, InstallStage.DEPLOY, timer)
+                release_configs, install_report = await self._deploy_packages(
+                    manifest, archive, manifest_dir, auth_token=auth_token, saga=saga
+                )
+                self._record_deploy_spans(timer, install_report)
             else:
                 logger.warning(f"[install_application] Deploy Installer 端口未配置，跳过镜像和 Chart 上传")
             
-            # 导入业务知识网络（从 ontologies 目录读取 JSON 文件）
-            logger.info(f"[install_application] 开始导入业务知识网络，business_domain: {manifest.business_domain}")
-            ontology_config = []
-            if self._ontology_manager_port:
-                ontologies_dir = os.path.join(manifest_dir, "ontologies")
-                logger.debug(f"[install_application] 业务知识网络目录: {ontologies_dir}")
-                if os.path.exists(ontologies_dir) and os.path.isdir(ontologies_dir):
-                    files = os.listdir(ontologies_dir)
-                    logger.info(f"[install_application] ontologies 目录包含 {len(files)} 个文件: {files}")
-                    for filename in files:
-                        if filename.endswith(('.json', '.yaml', '.yml')):
-                            ontology_file_path = os.path.join(ontologies_dir, filename)
-                            logger.info(f"[install_application] 处理业务知识网络文件: {filename}")
-                            try:
-                                with open(ontology_file_path, "r", encoding="utf-8") as f:
-                                    if filename.endswith('.json'):
-                                        onto_config = json.load(f)
-                                    else:
-                                        onto_config = yaml.safe_load(f)
-                                
-                                logger.debug(f"[install_application] 业务知识网络配置内容: {onto_config}")
-                                logger.info(f"[install_application] 开始创建业务知识网络: {filename}")
-                                onto_id = await self._ontology_manager_port.create_knowledge_network(
-                                    onto_config,
-                                    auth_token=auth_token,
-                                    business_domain=manifest.business_domain,
-                                )
-                                if onto_id:
-                                    ontology_config.append(OntologyConfigItem(
-                                        id=str(onto_id),
-                                        is_config=False,  # 安装时默认为未配置
-                                    ))
-                                    logger.info(f"[install_application] 成功导入业务知识网络: {filename} -> ID: {onto_id}")
-                                else:
-                                    logger.warning(f"[install_application] 业务知识网络创建返回空 ID: {filename}")
-                            except json.JSONDecodeError as e:
-                                logger.error(f"[install_application] 业务知识网络 JSON 解析失败 ({filename}): {e}", exc_info=True)
-                                raise ValueError(f"业务知识网络配置文件格式错误 ({filename}): {str(e)}")
-                            except yaml.YAMLError as e:
-                                logger.error(f"[install_application] 业务知识网络 YAML 解析失败 ({filename}): {e}", exc_info=True)
-                                raise ValueError(f"业务知识网络配置文件格式错误 ({filename}): {str(e)}")
-                            except Exception as e:
-                                logger.error(f"[install_application] 导入业务知识网络失败 ({filename}): {e}", exc_info=True)
-                                raise ValueError(f"导入业务知识网络失败 ({filename}): {str(e)}")
-                else:
-                    logger.info(f"[install_application] ontologies 目录不存在或不是目录，跳过业务知识网络导入")
-            else:
-                logger.warning(f"[install_application] Ontology Manager 端口未配置，跳过业务知识网络导入")
-            
-            # 导入智能体（从 agents 目录读取 JSON 文件）
-            logger.info(f"[install_application] 开始导入智能体，business_domain: {manifest.business_domain}")
-            agent_config = []
-            if self._agent_factory_port:
-                agents_dir = os.path.join(manifest_dir, "agents")
-                logger.debug(f"[install_application] 智能体目录: {agents_dir}")
-                if os.path.exists(agents_dir) and os.path.isdir(agents_dir):
-                    files = os.listdir(agents_dir)
-                    logger.info(f"[install_application] agents 目录包含 {len(files)} 个文件: {files}")
-                    for filename in files:
-                        if filename.endswith(('.json', '.yaml', '.yml')):
-                            agent_file_path = os.path.join(agents_dir, filename)
-                            logger.info(f"[install_application] 处理智能体文件: {filename}")
-                            try:
-                                with open(agent_file_path, "r", encoding="utf-8") as f:
-                                    if filename.endswith('.json'):
-                                        agent_config_data = json.load(f)
-                                    else:
-                                        agent_config_data = yaml.safe_load(f)
-                                
-                                logger.debug(f"[install_application] 智能体配置内容: {agent_config_data}")
-                                logger.info(f"[install_application] 开始创建智能体: {filename}")
-                                agent_result = await self._agent_factory_port.create_agent(
-                                    agent_config_data,
-                                    auth_token=auth_token,
-                                    business_domain=manifest.business_domain,
-                                )
-                                if agent_result.id:
-                                    agent_config.append(AgentConfigItem(
-                                        id=str(agent_result.id),
-                                        is_config=False,  # 安装时默认为未配置
-                                    ))
-                                    logger.info(f"[install_application] 成功导入智能体: {filename} -> ID: {agent_result.id}, version: {agent_result.version}")
-                                else:
-                                    logger.warning(f"[install_application] 智能体创建返回空 ID: {filename}")
-                            except json.JSONDecodeError as e:
-                                logger.error(f"[install_application] 智能体 JSON 解析失败 ({filename}): {e}", exc_info=True)
-                                raise ValueError(f"智能体配置文件格式错误 ({filename}): {str(e)}")
-                            except yaml.YAMLError as e:
-                                logger.error(f"[install_application] 智能体 YAML 解析失败 ({filename}): {e}", exc_info=True)
-                                raise ValueError(f"智能体配置文件格式错误 ({filename}): {str(e)}")
-                            except Exception as e:
-                                logger.error(f"[install_application] 导入智能体失败 ({filename}): {e}", exc_info=True)
-                                raise ValueError(f"导入智能体失败 ({filename}): {str(e)}")
-                else:
-                    logger.info(f"[install_application] agents 目录不存在或不是目录，跳过智能体导入")
-            else:
-                logger.warning(f"[install_application] Agent Factory 端口未配置，跳过智能体导入")
+            # 导入业务知识网络和智能体（分别从 ontologies/、agents/ 目录读取配置文件），两者相互独立，同时导入
+            await self._report_stage(progress, InstallStage.IMPORT, timer)
+            logger.info(f"[install_application] 开始导入业务知识网络和智能体，business_domain: {manifest.business_domain}")
+            ontology_ids, agent_ids = await self._gather_or_cancel([
+                self._timed(timer, InstallTimingStage.ONTOLOGY_IMPORT, self._import_ontologies(
+                    archive, manifest_dir, manifest.business_domain, auth_token=auth_token, saga=saga
+                )),
+                self._timed(timer, InstallTimingStage.AGENT_IMPORT, self._import_agents(
+                    archive, manifest_dir, manifest.business_domain, auth_token=auth_token, saga=saga
+                )),
+            ])
+            # 安装时默认为未配置
+            ontology_config = [OntologyConfigItem(id=item_id, is_config=False) for item_id in ontology_ids]
+            agent_config = [AgentConfigItem(id=item_id, is_config=False) for item_id in agent_ids]
             
             # 创建或更新应用
+            await self._report_stage(progress, InstallStage.SAVE, timer)
             logger.info(f"[install_application] 开始创建/更新应用记录")
             logger.info(f"[install_application] 应用信息: key={manifest.key}, name={manifest.name}, version={manifest.version}")
             logger.info(f"[install_application] 配置统计: releases={len(release_configs)}, ontologies={len(ontology_config)}, agents={len(agent_config)}")
@@ -660,41 +628,939 @@ class ApplicationService:
             )
             
             try:
-                if existing_app:
-                    # 更新现有应用
-                    logger.info(f"[install_application] 更新现有应用: key={manifest.key}")
-                    result = await self._application_port.update_application(application)
-                    logger.info(f"[install_application] 应用更新成功: id={result.id}, key={result.key}")
-                else:
-                    # 创建新应用
-                    logger.info(f"[install_application] 创建新应用: key={manifest.key}")
-                    result = await self._application_port.create_application(application)
-                    logger.info(f"[install_application] 应用创建成功: id={result.id}, key={result.key}")
+                # 单条语句创建或更新应用：已安装版本与校验时读到的版本不一致（并发安装）时失败
+                expected_version = existing_app.version if existing_app else None
+                logger.info(
+                    f"[install_application] {'更新现有应用' if existing_app else '创建新应用'}: "
+                    f"key={manifest.key}, 预期已安装版本={expected_version}"
+                )
+                result = await self._application_port.upsert_application(application, expected_version=expected_version)
+                logger.info(f"[install_application] 应用保存成功: id={result.id}, key={result.key}")
                 
                 logger.info(f"[install_application] 应用安装完成: key={manifest.key}, name={manifest.name}")
-                return result
             except Exception as e:
                 logger.error(f"[install_application] 保存应用记录失败: {e}", exc_info=True)
                 raise ValueError(f"保存应用记录失败: {str(e)}")
+
+            await saga.complete()
+            # 重新安装时旧版本和新版本的业务知识网络/智能体详情都可能已变化
+            await self._invalidate_detail_cache(application, existing_app)
+            timer.stop()
+            install_report = install_report or InstallReport()
+            install_report.stages = timer.durations
+            install_report.total_duration = timer.elapsed
+            result.install_report = install_report
+            succeeded = True
+            return result
         
         except ValueError as e:
             # ValueError 是预期的业务异常，记录错误但不记录堆栈
             logger.error(f"[install_application] 应用安装失败 (业务错误): {str(e)}")
+            await self._rollback_install(saga, timer)
             raise
         except Exception as e:
             # 其他未预期的异常，记录详细堆栈
             logger.error(f"[install_application] 应用安装失败 (未预期错误): {e}", exc_info=True)
+            await self._rollback_install(saga, timer)
             raise ValueError(f"应用安装失败: {str(e)}")
         finally:
-            # 清理临时目录
+            self._finish_timing(timer, manifest, install_report, succeeded)
+            if archive is not None:
+                archive.close()
+            # 清理临时目录（仅解压模式）
             if temp_dir and os.path.exists(temp_dir):
                 logger.debug(f"[install_application] 清理临时目录: {temp_dir}")
                 try:
-                    shutil.rmtree(temp_dir, ignore_errors=True)
+                    await self._run_blocking(functools.partial(shutil.rmtree, temp_dir, ignore_errors=True))
                     logger.debug(f"[install_application] 临时目录清理完成")
                 except Exception as e:
                     logger.warning(f"[install_application] 清理临时目录失败: {e}")
 
+    async def validate_package(
+        self,
+        package_path: str,
+        received_ranges: Optional[List[Tuple[int, int]]] = None,
+    ) -> PackageValidationReport:
+        """
+        预检安装包（不安装）。
+
+        只读取 ZIP 中央目录和 manifest.yaml、application.key、业务知识网络/智能体配置等小文件，
+        不解压镜像和 Chart；返回发现的全部问题（而不是第一个）和制品清单。
+        检查项与安装一致：安装包结构、manifest 字段、配置文件格式、版本号必须大于已安装版本。
+
+        参数:
+            package_path: ZIP 格式应用安装包的本地文件路径（由调用方负责清理）
+            received_ranges: 已收到的字节区间（分块上传未完成时传入），None 表示安装包完整
+
+        返回:
+            PackageValidationReport: 预检结果
+
+        异常:
+            IncompletePackageError: 当 ZIP 中央目录或元数据文件所在的字节区间尚未收到时抛出
+        """
+        started = time.perf_counter()
+        report = await self._run_blocking(self._inspect_package, package_path, received_ranges)
+        # manifest 存在其他问题时同样校验版本号，一次返回全部问题
+        if report.key and report.version:
+            try:
+                # 预检只校验版本号
+                existing_app = await self._application_port.get_application_by_key_optional(
+                    report.key, include_icon=False, include_config=False
+                )
+            except Exception as e:
+                logger.warning(f"[validate_package] 查询已安装应用失败: {e}")
+                report.problems.append(f"查询已安装应用失败，无法校验版本: {str(e)}")
+            else:
+                if existing_app is not None:
+                    report.installed_version = existing_app.version
+                    version_problem = self._check_version(report.key, report.version, existing_app)
+                    if version_problem:
+                        report.problems.append(version_problem)
+        logger.info(
+            f"[validate_package] 预检完成: 问题 {len(report.problems)} 个，制品 {len(report.artifacts)} 个，"
+            f"耗时: {(time.perf_counter() - started) * 1000:.1f}ms"
+        )
+        return report
+
+    def _inspect_package(
+        self,
+        zip_path: str,
+        received_ranges: Optional[List[Tuple[int, int]]] = None,
+    ) -> PackageValidationReport:
+        """
+        读取 ZIP 索引和元数据文件，检查安装包结构（在阻塞任务执行器中执行）。
+
+        参数:
+            zip_path: ZIP 文件路径
+            received_ranges: 已收到的字节区间，None 表示文件完整
+
+        返回:
+            PackageValidationReport: 预检结果（不含版本校验，但读取应用标识和版本号供版本校验使用）
+
+        异常:
+            IncompletePackageError: 当需要读取的字节区间尚未收到时抛出
+        """
+        report = PackageValidationReport()
+        try:
+            archive = ZipPackageArchive(zip_path, received_ranges)
+        except ValueError as e:
+            report.problems.append(str(e))
+            return report
+
+        with archive:
+            manifest_path = archive.find_file(["manifest.yaml", "manifest.yml"])
+            if not manifest_path:
+                report.problems.append("安装包缺少 manifest.yaml 文件")
+                return report
+            manifest_dir = posixpath.dirname(manifest_path)
+
+            app_key = ""
+            app_key_path = posixpath.join(manifest_dir, "application.key")
+            if not archive.is_file(app_key_path):
+                report.problems.append("安装包缺少 application.key 文件（应与 manifest.yaml 同层）")
+            else:
+                try:
+                    app_key = archive.read_bytes(app_key_path).decode("utf-8").strip()
+                    if not app_key:
+                        report.problems.append("application.key 文件为空")
+                    report.key = app_key or None
+                except Exception as e:
+                    report.problems.append(f"读取 application.key 失败: {str(e)}")
+
+            manifest_data = None
+            try:
+                manifest_data = yaml.safe_load(archive.read_bytes(manifest_path).decode("utf-8"))
+                if not manifest_data:
+                    report.problems.append("manifest.yaml 文件为空或格式错误")
+            except yaml.YAMLError as e:
+                report.problems.append(f"manifest.yaml 解析失败: {str(e)}")
+            except Exception as e:
+                report.problems.append(f"读取 manifest.yaml 失败: {str(e)}")
+
+            if manifest_data:
+                if isinstance(manifest_data, dict) and manifest_data.get("version"):
+                    report.version = str(manifest_data["version"])
+                manifest_problems = self._check_manifest(manifest_data)
+                report.problems.extend(manifest_problems)
+                if app_key and not manifest_problems:
+                    report.manifest = self._parse_manifest(manifest_data, app_key)
+
+            # 与安装时的文件筛选规则一致：镜像/Chart/图标不区分扩展名大小写，配置文件区分
+            def add_artifacts(kind: str, directory: str, matches: Callable[[str], bool]) -> List[str]:
+                full_dir = posixpath.join(manifest_dir, directory)
+                names = [f for f in archive.list_files(full_dir) if matches(f)]
+                for name in names:
+                    path = posixpath.join(directory, name)
+                    report.artifacts.append(PackageArtifact(kind, path, archive.file_size(posixpath.join(manifest_dir, path))))
+                return names
+
+            add_artifacts("image", "packages/images", lambda f: f.lower().endswith(IMAGE_EXTENSIONS))
+            add_artifacts("chart", "packages/charts", lambda f: f.lower().endswith(CHART_EXTENSIONS))
+            add_artifacts("icon", "assets/icons", lambda f: f.lower().endswith(ICON_EXTENSIONS))
+            for kind, directory, label in (("ontology", "ontologies", "业务知识网络"), ("agent", "agents", "智能体")):
+                for name in add_artifacts(kind, directory, lambda f: f.endswith(DEFINITION_EXTENSIONS)):
+                    try:
+                        self._load_definition_file(archive, posixpath.join(manifest_dir, directory, name))
+                    except Exception as e:
+                        report.problems.append(f"{label}配置文件格式错误 ({name}): {str(e)}")
+            # 读取失败的原因是字节区间尚未收到时，以上问题不可信，交由调用方补齐分块后重新预检
+            archive.check_complete()
+        return report
+
+    @staticmethod
+    def _create_temp_dir(temp_base: str) -> str:
+        """
+        在临时文件目录下创建本次安装的临时目录。
+
+        参数:
+            temp_base: 临时文件目录
+
+        返回:
+            str: 新建的临时目录路径
+        """
+        os.makedirs(temp_base, exist_ok=True)
+        return tempfile.mkdtemp(dir=temp_base)
+
+    @staticmethod
+    def _extract_package(zip_path: str, extract_dir: str) -> PackageArchive:
+        """
+        将 ZIP 安装包完整解压到目录（install_zip_index_enabled 关闭时使用）。
+
+        参数:
+            zip_path: ZIP 文件路径
+            extract_dir: 解压目录
+
+        返回:
+            PackageArchive: 解压目录对应的安装包
+
+        异常:
+            ValueError: 当 ZIP 文件格式错误或解压失败时抛出
+        """
+        logger.info(f"[install_application] 开始解压 ZIP 文件到: {extract_dir}")
+        try:
+            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+                file_list = zip_ref.namelist()
+                logger.info(f"[install_application] ZIP 文件包含 {len(file_list)} 个文件/目录")
+                logger.debug(f"[install_application] ZIP 文件列表: {file_list[:10]}..." if len(file_list) > 10 else f"[install_application] ZIP 文件列表: {file_list}")
+                zip_ref.extractall(extract_dir)
+            logger.info(f"[install_application] ZIP 文件解压完成")
+        except zipfile.BadZipFile as e:
+            logger.error(f"[install_application] ZIP 文件格式错误: {e}", exc_info=True)
+            raise ValueError(f"无效的 ZIP 文件格式: {str(e)}")
+        except Exception as e:
+            logger.error(f"[install_application] 解压 ZIP 文件失败: {e}", exc_info=True)
+            raise ValueError(f"解压 ZIP 文件失败: {str(e)}")
+        return DirectoryPackageArchive(extract_dir)
+
+    @staticmethod
+    async def _report_stage(
+        progress: Optional[Callable[[str], Awaitable[None]]], stage: str, timer: Optional[StageTimer] = None
+    ) -> None:
+        """
+        通知进入新的安装阶段。进度回调失败只记录日志，不影响安装。
+
+        参数:
+            progress: 阶段进度回调，为 None 时不通知
+            stage: 安装阶段（InstallStage）
+            timer: 阶段计时器（可选），结束上一阶段的计时并开始本阶段
+        """
+        if timer is not None:
+            timer.begin(stage)
+        if progress is None:
+            return
+        try:
+            await progress(stage)
+        except Exception as e:
+            logger.warning(f"[install_application] 记录安装阶段失败: {stage}, {e}")
+
+    @staticmethod
+    async def _rollback_install(saga: Optional[InstallSaga], timer: StageTimer) -> None:
+        """
+        安装失败后回滚已完成的步骤（校验阶段失败时没有需要回滚的步骤）。
+
+        参数:
+            saga: 安装事务，校验通过前为 None
+            timer: 阶段计时器
+        """
+        if saga is None:
+            return
+        with timer.stage(InstallTimingStage.COMPENSATE):
+            failures = await saga.compensate()
+        if failures:
+            logger.error(
+                f"[install_application] 回滚失败 {len(failures)} 个步骤，已保留在安装日志中，重试时复用: {failures}"
+            )
+
+    @staticmethod
+    async def _timed(timer: StageTimer, stage: str, awaitable: Awaitable[Any]) -> Any:
+        """
+        等待并计时（用于并发执行的子阶段）。
+
+        参数:
+            timer: 阶段计时器
+            stage: 阶段名（InstallTimingStage）
+            awaitable: 子阶段协程
+
+        返回:
+            Any: 协程返回值
+        """
+        with timer.stage(stage):
+            return await awaitable
+
+    @staticmethod
+    def _record_deploy_spans(timer: StageTimer, report: InstallReport) -> None:
+        """
+        按各制品耗时记录镜像上传、Chart 上传和 Release 安装子阶段的跨度（从第一个开始到最后一个结束）。
+
+        参数:
+            timer: 阶段计时器
+            report: 部署阶段的安装报告
+        """
+        stages = {
+            "image": InstallTimingStage.IMAGE_UPLOAD,
+            "chart": InstallTimingStage.CHART_UPLOAD,
+            "release": InstallTimingStage.RELEASE_INSTALL,
+        }
+        for kind, stage in stages.items():
+            timings = [t for t in report.artifacts if t.kind == kind]
+            if timings:
+                start = min(t.started_at for t in timings)
+                end = max(t.started_at + t.duration for t in timings)
+                timer.record(stage, end - start)
+
+    def _finish_timing(
+        self,
+        timer: StageTimer,
+        manifest: Optional[ManifestInfo],
+        install_report: Optional[InstallReport],
+        succeeded: bool,
+    ) -> None:
+        """
+        安装结束（无论成功与否）后记录阶段耗时指标，并输出一行结构化的耗时统计日志。
+
+        参数:
+            timer: 阶段计时器
+            manifest: 已解析的 manifest，校验前失败时为 None
+            install_report: 部署阶段的安装报告，部署前失败时为 None
+            succeeded: 是否安装成功
+        """
+        timer.stop()
+        total = timer.elapsed
+        durations = timer.durations
+        for stage, seconds in durations.items():
+            self._install_metrics.observe_stage(stage, seconds)
+        self._install_metrics.observe_install(succeeded, total)
+
+        uploaded_bytes = {"image": 0, "chart": 0}
+        skipped_bytes = {"image": 0, "chart": 0}
+        for timing in install_report.artifacts if install_report else []:
+            if timing.kind in uploaded_bytes and timing.size:
+                (skipped_bytes if timing.skipped else uploaded_bytes)[timing.kind] += timing.size
+                self._install_metrics.add_artifact_bytes(timing.kind, timing.size, skipped=timing.skipped)
+
+        summary = {
+            "key": manifest.key if manifest else None,
+            "version": manifest.version if manifest else None,
+            "result": "success" if succeeded else "failure",
+            "total": round(total, 3),
+            "stages": {stage: round(seconds, 3) for stage, seconds in durations.items()},
+            "uploaded_bytes": uploaded_bytes,
+            "skipped_bytes": skipped_bytes,
+        }
+        logger.info(f"[install_application] 安装耗时统计: {json.dumps(summary, ensure_ascii=False)}")
+
+    async def _deploy_packages(
+        self,
+        manifest: ManifestInfo,
+        archive: PackageArchive,
+        manifest_dir: str = "",
+        auth_token: Optional[str] = None,
+        saga: Optional[InstallSaga] = None,
+    ) -> Tuple[List[ReleaseConfigItem], InstallReport]:
+        """
+        上传镜像和 Chart 并安装 Release。
+
+        流水线：
+        - 镜像和 Chart 共用 install_upload_concurrency 个上传并发；
+        - Chart 上传不依赖镜像，与镜像同时开始；安装包中没有镜像与 Chart 的对应关系，
+          因此每个 Release 在 Chart 上传完成且全部镜像上传完成后开始安装；
+        - 各 Release 相互独立，最多 install_release_concurrency 个同时安装。
+        镜像和 Chart 直接从安装包中流式读取上传。
+        配置了制品索引时先计算内容摘要，已上传过的镜像/Chart 跳过上传（Chart 使用记录的上传结果安装 Release）。
+        上次安装同一版本已完成的上传和 Release 安装（记录在安装日志中）同样跳过。
+        任一步骤失败时取消其余步骤并抛出 ValueError。
+
+        参数:
+            manifest: 应用清单
+            archive: 安装包
+            manifest_dir: 应用包根目录（manifest.yaml 所在目录，安装包内路径）
+            auth_token: 认证 Token
+            saga: 安装事务（可选），记录已完成的步骤并登记 Release 的回滚操作
+
+        返回:
+            Tuple[List[ReleaseConfigItem], InstallReport]: 已安装的 Release（按 Chart 顺序）和安装报告
+
+        异常:
+            ValueError: 当文件不存在、上传或安装失败时抛出
+        """
+        # 自动查找 packages/images/ 目录下的镜像文件
+        image_paths = []
+        images_dir = posixpath.join(manifest_dir, "packages", "images")
+        if await self._run_blocking(archive.is_dir, images_dir):
+            image_files = [f for f in await self._run_blocking(archive.list_files, images_dir)
+                          if f.lower().endswith(IMAGE_EXTENSIONS)]
+            # 构建相对路径
+            image_paths = [posixpath.join("packages", "images", f) for f in image_files]
+            logger.info(f"[install_application] 自动找到 {len(image_paths)} 个镜像文件: {image_paths}")
+
+        # 自动查找 packages/charts/ 目录下的 Chart 文件
+        chart_paths = []
+        charts_dir = posixpath.join(manifest_dir, "packages", "charts")
+        if await self._run_blocking(archive.is_dir, charts_dir):
+            chart_files = [f for f in await self._run_blocking(archive.list_files, charts_dir)
+                          if f.lower().endswith(CHART_EXTENSIONS)]
+            chart_paths = [posixpath.join("packages", "charts", f) for f in chart_files]
+            logger.info(f"[install_application] 自动找到 {len(chart_paths)} 个 Chart 文件: {chart_paths}")
+
+        upload_concurrency = self._settings.install_upload_concurrency if self._settings else 4
+        release_concurrency = self._settings.install_release_concurrency if self._settings else 4
+        upload_semaphore = asyncio.Semaphore(max(1, upload_concurrency))
+        release_semaphore = asyncio.Semaphore(max(1, release_concurrency))
+        logger.info(
+            f"[install_application] 开始处理镜像和 Chart，镜像数量: {len(image_paths)}，Chart 数量: {len(chart_paths)}，"
+            f"上传并发: {upload_concurrency}，安装并发: {release_concurrency}"
+        )
+
+        stage_start = time.perf_counter()
+        image_timings: List[Optional[ArtifactTiming]] = [None] * len(image_paths)
+        chart_timings: List[Optional[ArtifactTiming]] = [None] * len(chart_paths)
+        release_timings: List[Optional[ArtifactTiming]] = [None] * len(chart_paths)
+
+        async def upload_image(idx: int, image_path: str) -> None:
+            image_full_path = posixpath.join(manifest_dir, image_path)
+            if not await self._run_blocking(archive.is_file, image_full_path):
+                logger.error(f"[install_application] 镜像文件不存在: {image_full_path}")
+                raise ValueError(f"镜像文件不存在: {image_path}")
+            started = time.perf_counter()
+            file_size = await self._run_blocking(archive.file_size, image_full_path)
+            digest, record = await self._find_uploaded_artifact(archive, "image", image_full_path, image_path, saga)
+            if record is not None:
+                duration = time.perf_counter() - started
+                image_timings[idx] = ArtifactTiming(
+                    "image", image_path, file_size, started - stage_start, duration, digest, skipped=True
+                )
+                logger.info(f"[install_application] 镜像内容已上传过，跳过上传: {image_path}, sha256: {digest}")
+                return
+            async with upload_semaphore:
+                started = time.perf_counter()
+                try:
+                    logger.info(f"[install_application] 开始上传镜像 [{idx + 1}/{len(image_paths)}]: {image_path}, 大小: {file_size} bytes")
+                    with await self._run_blocking(archive.open, image_full_path) as f:
+                        image_results = await self._deploy_installer_port.upload_image(
+                            f,
+                            auth_token=auth_token,
+                            size=file_size,
+                            progress_callback=self._make_upload_progress_logger(image_path),
+                        )
+                except Exception as e:
+                    logger.error(f"[install_application] 镜像上传失败 ({image_path}): {e}", exc_info=True)
+                    raise ValueError(f"镜像上传失败 ({image_path}): {str(e)}")
+                duration = time.perf_counter() - started
+            image_timings[idx] = ArtifactTiming("image", image_path, file_size, started - stage_start, duration, digest)
+            logger.info(f"[install_application] 镜像上传成功: {image_path}, 耗时: {duration:.2f}s")
+            if digest:
+                images = [asdict(r) for r in image_results or [] if is_dataclass(r)]
+                await self._save_uploaded_artifact(
+                    ArtifactRecord("image", digest, file_size, image_path, {"images": images}), saga
+                )
+
+        images_task = asyncio.ensure_future(
+            self._gather_or_cancel([upload_image(idx, path) for idx, path in enumerate(image_paths)])
+        )
+
+        async def deploy_chart(idx: int, chart_path: str) -> ReleaseConfigItem:
+            chart_full_path = posixpath.join(manifest_dir, chart_path)
+            if not await self._run_blocking(archive.is_file, chart_full_path):
+                logger.error(f"[install_application] Chart 文件不存在: {chart_full_path}")
+                raise ValueError(f"Chart 文件不存在: {chart_path}")
+            started = time.perf_counter()
+            file_size = await self._run_blocking(archive.file_size, chart_full_path)
+            digest, record = await self._find_uploaded_artifact(archive, "chart", chart_full_path, chart_path, saga)
+            chart_result = self._chart_result_from_record(record) if record is not None else None
+            if chart_result is not None:
+                duration = time.perf_counter() - started
+                chart_timings[idx] = ArtifactTiming(
+                    "chart", chart_path, file_size, started - stage_start, duration, digest, skipped=True
+                )
+                logger.info(
+                    f"[install_application] Chart 内容已上传过，跳过上传: {chart_path} "
+                    f"({chart_result.chart.name} v{chart_result.chart.version}), sha256: {digest}"
+                )
+            else:
+                async with upload_semaphore:
+                    started = time.perf_counter()
+                    try:
+                        logger.info(f"[install_application] 开始上传 Chart [{idx + 1}/{len(chart_paths)}]: {chart_path}, 大小: {file_size} bytes")
+                        with await self._run_blocking(archive.open, chart_full_path) as f:
+                            chart_result = await self._deploy_installer_port.upload_chart(
+                                f,
+                                auth_token=auth_token,
+                                size=file_size,
+                                progress_callback=self._make_upload_progress_logger(chart_path),
+                            )
+                    except Exception as e:
+                        logger.error(f"[install_application] Chart 处理失败 ({chart_path}): {e}", exc_info=True)
+                        raise ValueError(f"Chart 处理失败 ({chart_path}): {str(e)}")
+                    duration = time.perf_counter() - started
+                chart_timings[idx] = ArtifactTiming("chart", chart_path, file_size, started - stage_start, duration, digest)
+                logger.info(f"[install_application] Chart 上传成功: {chart_result.chart.name} v{chart_result.chart.version}, 耗时: {duration:.2f}s")
+                if digest:
+                    await self._save_uploaded_artifact(
+                        ArtifactRecord("chart", digest, file_size, chart_path, asdict(chart_result)), saga
+                    )
+
+            # Release 运行依赖镜像，等待全部镜像上传完成（shield：本 Chart 被取消时不取消镜像上传）
+            await asyncio.shield(images_task)
+
+            release_name = chart_result.chart.name
+            # namespace 来自 manifest.release-config.namespace
+            namespace = manifest.release_config.get("namespace")
+            values = copy.deepcopy(chart_result.values)
+            values["namespace"] = namespace
+            release_step = JournalStep(
+                JournalStepKind.RELEASE,
+                release_name,
+                result={
+                    "namespace": namespace,
+                    "chart_name": chart_result.chart.name,
+                    "chart_version": chart_result.chart.version,
+                },
+            )
+
+            async def delete_release() -> None:
+                await self._deploy_installer_port.delete_release(
+                    release_name=release_name, namespace=namespace, auth_token=auth_token
+                )
+
+            previous = saga.find(JournalStepKind.RELEASE, release_name) if saga is not None else None
+            if previous is not None and previous.result == release_step.result:
+                # 上次安装同一版本时已安装相同 Chart 版本的 Release
+                saga.adopt(previous, delete_release)
+                release_timings[idx] = ArtifactTiming(
+                    "release", release_name, None, time.perf_counter() - stage_start, 0.0, skipped=True
+                )
+                logger.info(f"[install_application] Release 已在上次安装中完成，跳过: {release_name}, namespace: {namespace}")
+                return ReleaseConfigItem(name=release_name, namespace=namespace)
+            async with release_semaphore:
+                started = time.perf_counter()
+                logger.info(f"[install_application] 开始安装 Release: name={release_name}, namespace={namespace}, chart={chart_result.chart.name} v{chart_result.chart.version}")
+                try:
+                    await self._deploy_installer_port.install_release(
+                        release_name=release_name,
+                        namespace=namespace,
+                        chart_name=chart_result.chart.name,
+                        chart_version=chart_result.chart.version,
+                        values=values,
+                        auth_token=auth_token,
+                    )
+                except Exception as e:
+                    logger.error(f"[install_application] Chart 处理失败 ({chart_path}): {e}", exc_info=True)
+                    # 部署服务中的 Chart 或镜像仓库中的镜像可能已被清理（如镜像拉取失败），
+                    # 删除本次跳过上传的 Chart 和全部镜像的索引和安装日志记录，下次安装时重新上传
+                    skipped = [t for t in image_timings if t is not None and t.skipped]
+                    if chart_timings[idx].skipped:
+                        skipped.append(chart_timings[idx])
+                    await self._forget_skipped_artifacts(skipped, saga)
+                    raise ValueError(f"Chart 处理失败 ({chart_path}): {str(e)}")
+                duration = time.perf_counter() - started
+            if saga is not None:
+                await saga.record(release_step, delete_release)
+            release_timings[idx] = ArtifactTiming("release", release_name, None, started - stage_start, duration)
+            logger.info(f"[install_application] Release 安装成功: {release_name}, namespace: {namespace}, 耗时: {duration:.2f}s")
+            return ReleaseConfigItem(name=release_name, namespace=namespace)
+
+        results = await self._gather_or_cancel(
+            [images_task] + [deploy_chart(idx, path) for idx, path in enumerate(chart_paths)]
+        )
+        release_configs = results[1:]
+
+        skipped = [t for t in image_timings + chart_timings if t is not None and t.skipped]
+        report = InstallReport(
+            artifacts=[t for t in image_timings + chart_timings + release_timings if t is not None],
+            duration=time.perf_counter() - stage_start,
+            skipped_count=len(skipped),
+            bytes_saved=sum(t.size or 0 for t in skipped),
+        )
+        logger.info(
+            f"[install_application] 镜像和 Chart 处理完成，耗时: {report.duration:.2f}s，"
+            f"跳过已上传制品: {report.skipped_count} 个，节省上传: {report.bytes_saved} bytes"
+        )
+        return release_configs, report
+
+    @property
+    def _artifact_dedup_enabled(self) -> bool:
+        """是否按制品索引跳过已上传的镜像/Chart。"""
+        return self._artifact_index_port is not None and (
+            self._settings is None or self._settings.artifact_dedup_enabled
+        )
+
+    async def _find_uploaded_artifact(
+        self,
+        archive: PackageArchive,
+        kind: str,
+        path: str,
+        name: str = "",
+        saga: Optional[InstallSaga] = None,
+    ) -> Tuple[Optional[str], Optional[ArtifactRecord]]:
+        """
+        计算镜像/Chart 的内容摘要并查询是否已上传过（先查安装日志，再查制品索引）。
+
+        未启用制品索引且安装日志不持久化时不计算摘要。
+        查询索引失败时只记录日志，按未上传处理。
+
+        参数:
+            archive: 安装包
+            kind: 制品类型（image/chart）
+            path: 文件路径（安装包内路径）
+            name: 相对应用包根目录的路径（安装日志中的步骤对象）
+            saga: 安装事务（可选）
+
+        返回:
+            Tuple[Optional[str], Optional[ArtifactRecord]]: (内容摘要, 已上传的制品记录)
+        """
+        resumable = saga is not None and saga.resumable
+        if not self._artifact_dedup_enabled and not resumable:
+            return None, None
+        digest = await self._run_blocking(self._compute_digest, archive, path)
+        step = saga.find(kind, name, digest) if resumable else None
+        if step is not None:
+            logger.info(f"[install_application] 上次安装同一版本时已上传: {name}")
+            return digest, ArtifactRecord(kind, digest, 0, name, copy.deepcopy(step.result))
+        if not self._artifact_dedup_enabled:
+            return digest, None
+        try:
+            return digest, await self._artifact_index_port.get_artifact(kind, digest)
+        except Exception as e:
+            logger.warning(f"[install_application] 查询制品索引失败，按未上传处理: {path}, {e}")
+            return digest, None
+
+    async def _save_uploaded_artifact(self, record: ArtifactRecord, saga: Optional[InstallSaga] = None) -> None:
+        """
+        将已上传的制品记录到制品索引和安装日志。写入失败只记录日志，不影响安装。
+
+        参数:
+            record: 制品记录
+            saga: 安装事务（可选）
+        """
+        if saga is not None:
+            await saga.record(JournalStep(record.kind, record.name, record.digest, result=record.result))
+        if not self._artifact_dedup_enabled:
+            return
+        try:
+            await self._artifact_index_port.save_artifact(record)
+        except Exception as e:
+            logger.warning(f"[install_application] 写入制品索引失败: {record.name}, {e}")
+
+    async def _forget_uploaded_artifact(self, kind: str, digest: Optional[str]) -> None:
+        """
+        删除失效的制品记录。删除失败只记录日志。
+
+        参数:
+            kind: 制品类型（image/chart）
+            digest: 内容摘要，为 None 时不处理
+        """
+        if not digest or self._artifact_index_port is None:
+            return
+        try:
+            await self._artifact_index_port.delete_artifact(kind, digest)
+            logger.info(f"[install_application] 已删除失效的制品索引: {kind}:{digest}")
+        except Exception as e:
+            logger.warning(f"[install_application] 删除制品索引失败: {kind}:{digest}, {e}")
+
+    async def _forget_skipped_artifacts(
+        self,
+        timings: List[ArtifactTiming],
+        saga: Optional[InstallSaga] = None,
+    ) -> None:
+        """
+        删除跳过上传的镜像/Chart 的制品索引和安装日志记录，下次安装时重新上传。
+
+        参数:
+            timings: 跳过上传的制品计时（kind 为 image/chart）
+            saga: 安装事务（可选）
+        """
+        for timing in timings:
+            await self._forget_uploaded_artifact(timing.kind, timing.digest)
+            if saga is not None:
+                await saga.forget(timing.kind, timing.name)
+
+    @staticmethod
+    def _compute_digest(archive: PackageArchive, path: str) -> str:
+        """
+        流式计算文件内容的 SHA-256 摘要（在阻塞任务执行器中执行）。
+
+        参数:
+            archive: 安装包
+            path: 文件路径（安装包内路径）
+
+        返回:
+            str: 十六进制摘要
+        """
+        digest = hashlib.sha256()
+        with archive.open(path) as f:
+            for chunk in iter(lambda: f.read(DIGEST_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _chart_result_from_record(record: ArtifactRecord) -> Optional[ChartUploadResult]:
+        """
+        从制品记录还原 Chart 上传结果。
+
+        参数:
+            record: 制品记录
+
+        返回:
+            Optional[ChartUploadResult]: Chart 上传结果，记录不完整时返回 None（重新上传）
+        """
+        chart = record.result.get("chart") or {}
+        if not chart.get("name") or not chart.get("version"):
+            return None
+        return ChartUploadResult(
+            chart=ChartInfo(name=chart["name"], version=chart["version"]),
+            values=copy.deepcopy(record.result.get("values") or {}),
+        )
+
+    async def _import_ontologies(
+        self,
+        archive: PackageArchive,
+        manifest_dir: str,
+        business_domain: str,
+        auth_token: Optional[str] = None,
+        saga: Optional[InstallSaga] = None,
+    ) -> List[str]:
+        """
+        从 ontologies/ 目录导入业务知识网络。
+
+        参数:
+            archive: 安装包
+            manifest_dir: 应用包根目录（安装包内路径）
+            business_domain: 业务域
+            auth_token: 认证 Token
+            saga: 安装事务（可选），安装失败时删除已创建的业务知识网络
+
+        返回:
+            List[str]: 创建的业务知识网络 ID（按文件名排序）
+        """
+        if not self._ontology_manager_port:
+            logger.warning(f"[install_application] Ontology Manager 端口未配置，跳过业务知识网络导入")
+            return []
+
+        async def create(data: Any) -> Optional[str]:
+            return await self._ontology_manager_port.create_knowledge_network(
+                data,
+                auth_token=auth_token,
+                business_domain=business_domain,
+            )
+
+        async def delete(kn_id: str) -> None:
+            await self._ontology_manager_port.delete_knowledge_network(
+                kn_id,
+                auth_token=auth_token,
+                business_domain=business_domain,
+            )
+
+        return await self._import_definitions(
+            archive, manifest_dir, "ontologies", "业务知识网络", create,
+            saga=saga, kind=JournalStepKind.ONTOLOGY, delete=delete,
+        )
+
+    async def _import_agents(
+        self,
+        archive: PackageArchive,
+        manifest_dir: str,
+        business_domain: str,
+        auth_token: Optional[str] = None,
+        saga: Optional[InstallSaga] = None,
+    ) -> List[str]:
+        """
+        从 agents/ 目录导入智能体。
+
+        参数:
+            archive: 安装包
+            manifest_dir: 应用包根目录（安装包内路径）
+            business_domain: 业务域
+            auth_token: 认证 Token
+            saga: 安装事务（可选），安装失败时删除已创建的智能体
+
+        返回:
+            List[str]: 创建的智能体 ID（按文件名排序）
+        """
+        if not self._agent_factory_port:
+            logger.warning(f"[install_application] Agent Factory 端口未配置，跳过智能体导入")
+            return []
+
+        async def create(data: Any) -> Optional[str]:
+            agent_result = await self._agent_factory_port.create_agent(
+                data,
+                auth_token=auth_token,
+                business_domain=business_domain,
+            )
+            logger.debug(f"[install_application] 智能体创建结果: ID: {agent_result.id}, version: {agent_result.version}")
+            return agent_result.id
+
+        async def delete(agent_id: str) -> None:
+            await self._agent_factory_port.delete_agent(
+                agent_id,
+                auth_token=auth_token,
+                business_domain=business_domain,
+            )
+
+        return await self._import_definitions(
+            archive, manifest_dir, "agents", "智能体", create,
+            saga=saga, kind=JournalStepKind.AGENT, delete=delete,
+        )
+
+    async def _import_definitions(
+        self,
+        archive: PackageArchive,
+        manifest_dir: str,
+        dir_name: str,
+        label: str,
+        create: Callable[[Any], Awaitable[Optional[str]]],
+        saga: Optional[InstallSaga] = None,
+        kind: Optional[str] = None,
+        delete: Optional[Callable[[str], Awaitable[None]]] = None,
+    ) -> List[str]:
+        """
+        导入目录下的 JSON/YAML 配置文件。
+
+        文件在阻塞任务执行器中读取和解析，不阻塞事件循环；创建请求最多 install_import_concurrency 个并发。
+        任一文件解析或创建失败时取消其余导入并抛出 ValueError。
+        提供安装事务时记录创建的资源并登记删除操作；上次安装同一版本时已由内容相同的文件创建的资源直接复用。
+
+        参数:
+            archive: 安装包
+            manifest_dir: 应用包根目录（安装包内路径）
+            dir_name: 配置文件目录名（相对应用包根目录）
+            label: 日志和错误信息中的资源名称
+            create: 根据配置内容创建资源的协程函数，返回资源 ID
+            saga: 安装事务（可选）
+            kind: 安装日志步骤类型（JournalStepKind）
+            delete: 根据资源 ID 删除资源的协程函数（回滚时调用）
+
+        返回:
+            List[str]: 创建的资源 ID，按文件名排序，创建返回空 ID 的文件不计入
+
+        异常:
+            ValueError: 当配置文件格式错误或创建失败时抛出
+        """
+        directory = posixpath.join(manifest_dir, dir_name)
+        if not await self._run_blocking(archive.is_dir, directory):
+            logger.info(f"[install_application] {dir_name} 目录不存在或不是目录，跳过{label}导入")
+            return []
+
+        filenames = [f for f in await self._run_blocking(archive.list_files, directory) if f.endswith(DEFINITION_EXTENSIONS)]
+        logger.info(f"[install_application] {dir_name} 目录包含 {len(filenames)} 个配置文件: {filenames}")
+        concurrency = self._settings.install_import_concurrency if self._settings else 8
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def import_one(filename: str) -> Optional[str]:
+            try:
+                data = await self._run_blocking(
+                    self._load_definition_file, archive, posixpath.join(directory, filename)
+                )
+            except (json.JSONDecodeError, yaml.YAMLError) as e:
+                logger.error(f"[install_application] {label}配置文件解析失败 ({filename}): {e}", exc_info=True)
+                raise ValueError(f"{label}配置文件格式错误 ({filename}): {str(e)}")
+            except Exception as e:
+                logger.error(f"[install_application] 读取{label}配置文件失败 ({filename}): {e}", exc_info=True)
+                raise ValueError(f"导入{label}失败 ({filename}): {str(e)}")
+
+            name = posixpath.join(dir_name, filename)
+            digest = None
+            if saga is not None:
+                digest = hashlib.sha256(
+                    json.dumps(data, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+                ).hexdigest()
+                previous = saga.find(kind, name, digest)
+                if previous is not None and previous.resource_id:
+                    saga.adopt(previous, self._bind_delete(delete, previous.resource_id))
+                    logger.info(f"[install_application] {label}已在上次安装中创建，复用: {filename} -> ID: {previous.resource_id}")
+                    return previous.resource_id
+
+            async with semaphore:
+                logger.info(f"[install_application] 开始创建{label}: {filename}")
+                try:
+                    item_id = await create(data)
+                except Exception as e:
+                    logger.error(f"[install_application] 导入{label}失败 ({filename}): {e}", exc_info=True)
+                    raise ValueError(f"导入{label}失败 ({filename}): {str(e)}")
+
+            if not item_id:
+                logger.warning(f"[install_application] {label}创建返回空 ID: {filename}")
+                return None
+            logger.info(f"[install_application] 成功导入{label}: {filename} -> ID: {item_id}")
+            if saga is not None:
+                await saga.record(
+                    JournalStep(kind, name, digest, resource_id=str(item_id)),
+                    self._bind_delete(delete, str(item_id)),
+                )
+            return str(item_id)
+
+        item_ids = await self._gather_or_cancel([import_one(filename) for filename in filenames])
+        return [item_id for item_id in item_ids if item_id]
+
+    @staticmethod
+    def _bind_delete(
+        delete: Optional[Callable[[str], Awaitable[None]]], resource_id: str
+    ) -> Optional[Callable[[], Awaitable[None]]]:
+        """将删除函数绑定到资源 ID，作为安装事务的补偿操作。"""
+        if delete is None:
+            return None
+
+        async def compensate() -> None:
+            await delete(resource_id)
+
+        return compensate
+
+    @staticmethod
+    def _load_definition_file(archive: PackageArchive, path: str) -> Any:
+        """
+        读取并解析 JSON/YAML 配置文件（在阻塞任务执行器中执行）。
+
+        参数:
+            archive: 安装包
+            path: 文件路径（安装包内路径）
+
+        返回:
+            Any: 解析后的配置内容
+        """
+        content = archive.read_bytes(path).decode("utf-8")
+        if path.endswith('.json'):
+            return json.loads(content)
+        return yaml.safe_load(content)
+
+    @staticmethod
+    async def _gather_or_cancel(aws: List[Awaitable[Any]]) -> List[Any]:
+        """
+        并发等待一组协程/任务，任一失败时取消其余任务，等待其结束后再抛出异常。
+
+        参数:
+            aws: 协程或任务列表
+
+        返回:
+            List[Any]: 结果列表，顺序与 aws 一致
+        """
+        tasks = [asyncio.ensure_future(aw) for aw in aws]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
     async def uninstall_application(
         self,
         app_id: int,
@@ -717,8 +1583,8 @@ class ApplicationService:
         异常:
             ValueError: 当应用不存在时抛出
         """
-        # 获取应用信息
-        application = await self._application_port.get_application_by_id(app_id)
+        # 获取应用信息（不需要图标）
+        application = await self._application_port.get_application_by_id(app_id, include_icon=False)
         
         # 删除 Release
         if self._deploy_installer_port and application.release_config:
@@ -735,7 +1601,32 @@ class ApplicationService:
                     logger.warning(f"[uninstall_application] 删除 Release 失败 ({release_item.name}): {e}")
         
         # 删除数据库记录
-        return await self._application_port.delete_application_by_id(app_id)
+        deleted = await self._application_port.delete_application_by_id(app_id)
+        await self._invalidate_detail_cache(application)
+        return deleted
+
+    async def _invalidate_detail_cache(self, *applications: Optional[Application]) -> None:
+        """
+        清除应用关联的业务知识网络和智能体详情缓存。
+
+        缓存清除失败只记录日志，不影响主流程。
+
+        参数:
+            applications: 应用实体（为 None 的项忽略）
+        """
+        ontology_ids = list(dict.fromkeys(
+            item.id for app in applications if app is not None for item in app.ontology_config or []
+        ))
+        agent_ids = list(dict.fromkeys(
+            item.id for app in applications if app is not None for item in app.agent_config or []
+        ))
+        try:
+            if self._ontology_manager_port and ontology_ids:
+                await self._ontology_manager_port.invalidate(ontology_ids)
+            if self._agent_factory_port and agent_ids:
+                await self._agent_factory_port.invalidate(agent_ids)
+        except Exception as e:
+            logger.warning(f"清除业务知识网络/智能体详情缓存失败: {e}")
 
     async def create_application(self, application: Application) -> Application:
         """
@@ -782,61 +1673,27 @@ class ApplicationService:
         """
         return await self._application_port.delete_application(key)
 
-    def _find_file_bfs(self, root_dir: str, filenames: list) -> Optional[str]:
+    def _make_upload_progress_logger(self, name: str) -> UploadProgressCallback:
         """
-        从指定目录逐层（广度优先）查找文件。
+        创建上传进度回调，每完成 10% 记录一次日志。
 
         参数:
-            root_dir: 搜索起始目录
-            filenames: 要查找的文件名列表（按优先级排序）
+            name: 上传文件名称（用于日志）
 
         返回:
-            Optional[str]: 找到的文件完整路径，未找到返回 None
+            UploadProgressCallback: 进度回调
         """
-        from collections import deque
-        
-        logger.info(f"[_find_file_bfs] 开始查找文件: {filenames}, 起始目录: {root_dir}")
-        
-        if not os.path.exists(root_dir):
-            logger.error(f"[_find_file_bfs] 起始目录不存在: {root_dir}")
-            return None
-        
-        if not os.path.isdir(root_dir):
-            logger.error(f"[_find_file_bfs] 起始路径不是目录: {root_dir}")
-            return None
-        
-        queue = deque([root_dir])
-        searched_dirs = []
-        
-        while queue:
-            current_dir = queue.popleft()
-            searched_dirs.append(current_dir)
-            
-            try:
-                entries = os.listdir(current_dir)
-                logger.debug(f"[_find_file_bfs] 搜索目录: {current_dir}, 内容: {entries}")
-            except (PermissionError, OSError) as e:
-                logger.warning(f"[_find_file_bfs] 无法读取目录 {current_dir}: {e}")
-                continue
-            
-            # 在当前目录查找目标文件
-            for filename in filenames:
-                if filename in entries:
-                    file_path = os.path.join(current_dir, filename)
-                    if os.path.isfile(file_path):
-                        logger.info(f"[_find_file_bfs] 找到文件: {file_path}")
-                        return file_path
-                    else:
-                        logger.debug(f"[_find_file_bfs] {filename} 存在但不是文件: {file_path}")
-            
-            # 将子目录加入队列（排序以保证一致性）
-            subdirs = sorted([e for e in entries if os.path.isdir(os.path.join(current_dir, e))])
-            for entry in subdirs:
-                entry_path = os.path.join(current_dir, entry)
-                queue.append(entry_path)
-        
-        logger.warning(f"[_find_file_bfs] 未找到文件 {filenames}，已搜索 {len(searched_dirs)} 个目录")
-        return None
+        last_step = [0]
+
+        def _on_progress(sent: int, total: Optional[int]) -> None:
+            if not total:
+                return
+            step = sent * 10 // total
+            if step > last_step[0]:
+                last_step[0] = step
+                logger.info(f"[install_application] 上传进度 {name}: {sent}/{total} bytes ({step * 10}%)")
+
+        return _on_progress
 
     def _parse_manifest(self, data: dict, app_key: str) -> ManifestInfo:
         """
@@ -854,49 +1711,95 @@ class ApplicationService:
         """
         if not app_key:
             raise ValueError("application.key 不能为空")
-        
-        name = data.get("name")
-        version = data.get("version")
-        manifest_version = data.get("manifest_version", 1)
-        
-        if not name:
-            raise ValueError("manifest.yaml 缺少 name 字段")
-        if not version:
-            raise ValueError("manifest.yaml 缺少 version 字段")
-        
+        problems = self._check_manifest(data)
+        if problems:
+            raise ValueError(problems[0])
+
         # 解析 micro-app 配置
         micro_app = None
         micro_app_data = data.get("micro-app")
         if micro_app_data:
-            micro_app_name = micro_app_data.get("name")
-            micro_app_entry = micro_app_data.get("entry")
-            if not micro_app_name:
-                raise ValueError("manifest.yaml 中 micro-app.name 字段缺失")
-            if not micro_app_entry:
-                raise ValueError("manifest.yaml 中 micro-app.entry 字段缺失")
             micro_app = MicroAppInfo(
-                name=micro_app_name,
-                entry=micro_app_entry,
+                name=micro_app_data.get("name"),
+                entry=micro_app_data.get("entry"),
                 headless=micro_app_data.get("headless", False),
             )
         
-        # 解析 release-config 配置（namespace 为必填字段）
-        release_config = data.get("release-config") or {}
-        if not release_config.get("namespace"):
-            raise ValueError("manifest.yaml 缺少 release-config.namespace 字段")
-        
         return ManifestInfo(
             key=app_key,  # 使用从 application.key 文件读取的值
-            name=name,
-            version=version,
-            manifest_version=manifest_version,
+            name=data.get("name"),
+            version=data.get("version"),
+            manifest_version=data.get("manifest_version", 1),
             description=data.get("description"),
             category=data.get("category"),
             business_domain=data.get("business-domain", "db_public"),
             micro_app=micro_app,
-            release_config=release_config,
+            release_config=data.get("release-config") or {},
         )
 
+    @staticmethod
+    def _check_manifest(data: Any) -> List[str]:
+        """
+        检查 manifest 数据，返回发现的全部问题（安装和预检共用）。
+
+        参数:
+            data: manifest 数据
+
+        返回:
+            List[str]: 问题列表，为空表示通过
+        """
+        problems = []
+        if not isinstance(data, dict):
+            problems.append("manifest.yaml 格式错误: 顶层应为键值对象")
+            return problems
+
+        if not data.get("name"):
+            problems.append("manifest.yaml 缺少 name 字段")
+        if not data.get("version"):
+            problems.append("manifest.yaml 缺少 version 字段")
+
+        micro_app_data = data.get("micro-app")
+        if micro_app_data:
+            if not isinstance(micro_app_data, dict):
+                problems.append("manifest.yaml 中 micro-app 格式错误: 应为键值对象")
+            else:
+                if not micro_app_data.get("name"):
+                    problems.append("manifest.yaml 中 micro-app.name 字段缺失")
+                if not micro_app_data.get("entry"):
+                    problems.append("manifest.yaml 中 micro-app.entry 字段缺失")
+
+        # release-config.namespace 为必填字段，且必须是合法的 Kubernetes 命名空间
+        release_config = data.get("release-config") or {}
+        namespace = release_config.get("namespace") if isinstance(release_config, dict) else None
+        if not namespace:
+            problems.append("manifest.yaml 缺少 release-config.namespace 字段")
+        elif not isinstance(namespace, str) or not _NAMESPACE_PATTERN.match(namespace):
+            problems.append(
+                f"manifest.yaml 中 release-config.namespace 无效: {namespace}"
+                f"（只能包含小写字母、数字和 '-'，以字母或数字开头和结尾，不超过 63 个字符）"
+            )
+        return problems
+
+    def _check_version(self, key: str, version: str, existing_app: Optional[Application]) -> Optional[str]:
+        """
+        检查安装包版本是否可以覆盖已安装版本（安装和预检共用）。
+
+        参数:
+            key: 应用包唯一标识
+            version: 安装包版本号
+            existing_app: 已安装的应用，未安装时为 None
+
+        返回:
+            Optional[str]: 版本冲突描述，可以安装时返回 None
+        """
+        if existing_app is None:
+            return None
+        if version == existing_app.version:
+            return f"版本号冲突: 新版本 {version} 与已安装版本相同。请更新版本号或先卸载现有应用 (key: {key})"
+        if not self._is_version_greater(version, existing_app.version):
+            return f"版本号冲突: 新版本 {version} 必须大于已安装版本 {existing_app.version}。当前已安装版本: {existing_app.version} (key: {key})"
+        return None
+
     def _is_version_greater(self, new_version: str, old_version: Optional[str]) -> bool:
         """
         检查新版本是否大于旧版本。
@@ -0,0 +1,307 @@
+"""
+安装任务服务
+
+实现异步安装：接收已落盘的安装包后立即返回任务，由后台 worker 从有界队列中取出并执行安装，
+任务状态和阶段事件通过 InstallJobPort 记录，供任一副本查询。
+"""
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+from src.application.application_service import ApplicationService
+from src.domains.install_job import InstallJob, InstallJobEvent, InstallJobStatus, InstallTimingStage
+from src.ports.install_job_port import InstallJobPort
+from src.ports.user_management_port import UserInfo
+from src.infrastructure.config.settings import Settings
+from src.infrastructure.context.token_context import TokenContext, UserContext
+from src.infrastructure.exceptions import ServiceUnavailableError
+from src.infrastructure.metrics import StageTimer
+from src.infrastructure.upload import remove_file_quietly
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _QueuedInstall:
+    """
+    排队中的安装请求（仅保存在本进程内存中）。
+
+    Token 和用户信息只在内存中传给 worker，不写入任务存储。
+    """
+    job: InstallJob
+    package_path: str
+    auth_token: Optional[str]
+    user_info: Optional[UserInfo]
+    timer: StageTimer
+
+
+class InstallJobService:
+    """
+    安装任务服务。
+
+    每个副本启动 install_job_workers 个 worker，等待队列长度上限为 install_job_queue_size，
+    队列已满时拒绝提交。安装包只保存在接收请求的副本本地，因此任务由该副本执行。
+    """
+
+    def __init__(
+        self,
+        application_service: ApplicationService,
+        install_job_port: InstallJobPort,
+        settings: Settings,
+    ):
+        """
+        初始化安装任务服务。
+
+        参数:
+            application_service: 应用服务，实际执行安装
+            install_job_port: 安装任务端口
+            settings: 应用配置
+        """
+        self._application_service = application_service
+        self._install_job_port = install_job_port
+        self._worker_count = max(1, settings.install_job_workers)
+        self._queue_size = max(1, settings.install_job_queue_size)
+        # 队列和 worker 在 start() 中创建，绑定到运行中的事件循环
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """启动 worker（重复调用无副作用）。"""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self._queue_size)
+        self._workers = [
+            asyncio.ensure_future(self._worker(index)) for index in range(self._worker_count)
+        ]
+        logger.info(f"[InstallJobService] 已启动 {self._worker_count} 个安装 worker，队列长度 {self._queue_size}")
+
+    async def stop(self) -> None:
+        """
+        停止 worker。
+
+        正在执行和排队中的任务标记为失败，并删除其安装包。
+        """
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+        queue, self._queue = self._queue, None
+        while queue is not None and not queue.empty():
+            item = queue.get_nowait()
+            await self._finish(item.job, InstallJobStatus.FAILED, "SERVICE_UNAVAILABLE", "服务关闭，安装任务未执行")
+            remove_file_quietly(item.package_path)
+
+    async def submit_install(
+        self,
+        package_path: str,
+        updated_by: str = "",
+        updated_by_id: str = "",
+        timer: Optional[StageTimer] = None,
+    ) -> InstallJob:
+        """
+        提交异步安装任务。
+
+        提交成功后安装包由本服务负责删除；提交失败时仍由调用方负责删除。
+        当前请求的 Token 和用户信息会传给执行任务的 worker，提交者记录为任务的创建者。
+
+        参数:
+            package_path: ZIP 格式应用安装包的本地文件路径
+            updated_by: 更新者用户显示名称
+            updated_by_id: 更新者用户ID
+            timer: 阶段计时器（可选），调用方已记录接收安装包阶段时传入
+
+        返回:
+            InstallJob: 已排队的安装任务
+
+        异常:
+            ServiceUnavailableError: 当安装队列已满时抛出
+        """
+        await self.start()
+        if self._queue.full():
+            logger.warning(f"[submit_install] 安装队列已满: {self._queue_size}")
+            raise self._queue_full_error()
+
+        now = datetime.now()
+        job = InstallJob(
+            id=uuid.uuid4().hex,
+            status=InstallJobStatus.PENDING,
+            updated_by=updated_by,
+            updated_by_id=updated_by_id,
+            created_by_id=updated_by_id,
+            created_at=now,
+            updated_at=now,
+        )
+        await self._install_job_port.append_event(
+            job.id, InstallJobEvent(stage=None, status=job.status, message="安装任务已排队", timestamp=now)
+        )
+        await self._install_job_port.save_job(job)
+
+        item = _QueuedInstall(
+            job=job,
+            package_path=package_path,
+            auth_token=TokenContext.get_token(),
+            user_info=UserContext.get_user_info(),
+            timer=timer or StageTimer(),
+        )
+        item.timer.begin(InstallTimingStage.QUEUE)
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            # 保存任务期间其他请求占满了队列
+            await self._finish(job, InstallJobStatus.FAILED, "SERVICE_UNAVAILABLE", "安装队列已满")
+            raise self._queue_full_error()
+
+        logger.info(f"[submit_install] 安装任务已排队: job_id={job.id}, 排队数={self._queue.qsize()}")
+        return job
+
+    async def get_job(self, job_id: str) -> Optional[InstallJob]:
+        """
+        获取安装任务。
+
+        参数:
+            job_id: 任务 ID
+
+        返回:
+            Optional[InstallJob]: 安装任务，不存在或已过期时返回 None
+        """
+        return await self._install_job_port.get_job(job_id)
+
+    async def get_events(self, job_id: str, start: int = 0) -> List[InstallJobEvent]:
+        """
+        获取安装任务事件。
+
+        参数:
+            job_id: 任务 ID
+            start: 起始序号（从 0 开始）
+
+        返回:
+            List[InstallJobEvent]: 序号不小于 start 的事件
+        """
+        return await self._install_job_port.get_events(job_id, start)
+
+    def _queue_full_error(self) -> ServiceUnavailableError:
+        """创建安装队列已满的异常。"""
+        return ServiceUnavailableError(
+            code="INSTALL_QUEUE_FULL",
+            description=f"安装任务队列已满（{self._queue_size}）",
+            solution="请等待正在执行的安装任务完成后重试",
+        )
+
+    async def _worker(self, index: int) -> None:
+        """
+        从队列中依次取出并执行安装任务。
+
+        参数:
+            index: worker 序号（用于日志）
+        """
+        while True:
+            item = await self._queue.get()
+            try:
+                await self._run(item)
+            except asyncio.CancelledError:
+                await asyncio.shield(self._finish(
+                    item.job, InstallJobStatus.FAILED, "SERVICE_UNAVAILABLE", "服务关闭，安装任务已中断"
+                ))
+                raise
+            except Exception as e:
+                logger.error(f"[InstallJobService] worker {index} 执行安装任务异常: {e}", exc_info=True)
+            finally:
+                remove_file_quietly(item.package_path)
+                self._queue.task_done()
+
+    async def _run(self, item: _QueuedInstall) -> None:
+        """
+        执行一个安装任务，并记录阶段和结果。
+
+        参数:
+            item: 排队中的安装请求
+        """
+        job = item.job
+        logger.info(f"[InstallJobService] 开始执行安装任务: job_id={job.id}")
+
+        async def on_stage(stage: str) -> None:
+            job.status = InstallJobStatus.RUNNING
+            job.stage = stage
+            await self._record(job, InstallJobEvent(stage=stage, status=job.status, message=f"开始阶段: {stage}"))
+
+        TokenContext.set_token(item.auth_token)
+        UserContext.set_user_info(item.user_info)
+        try:
+            application = await self._application_service.install_application(
+                package_path=item.package_path,
+                updated_by=job.updated_by,
+                updated_by_id=job.updated_by_id,
+                progress=on_stage,
+                timer=item.timer,
+            )
+        except ValueError as e:
+            error_msg = str(e)
+            error_code = "VERSION_CONFLICT" if "版本" in error_msg else "INVALID_PACKAGE"
+            await self._finish(job, InstallJobStatus.FAILED, error_code, error_msg, timer=item.timer)
+            return
+        except Exception as e:
+            logger.error(f"[InstallJobService] 安装任务失败 (未预期错误): job_id={job.id}, {e}", exc_info=True)
+            await self._finish(
+                job, InstallJobStatus.FAILED, "INTERNAL_ERROR", f"应用安装失败: {str(e)}", timer=item.timer
+            )
+            return
+        finally:
+            TokenContext.clear_token()
+            UserContext.clear_user_info()
+
+        job.application_id = application.id
+        job.application_key = application.key
+        await self._finish(
+            job, InstallJobStatus.SUCCEEDED, message=f"应用安装成功: key={application.key}", timer=item.timer
+        )
+
+    async def _finish(
+        self,
+        job: InstallJob,
+        status: str,
+        error_code: Optional[str] = None,
+        message: str = "",
+        timer: Optional[StageTimer] = None,
+    ) -> None:
+        """
+        记录任务结束。
+
+        参数:
+            job: 安装任务
+            status: 结束状态（succeeded/failed）
+            error_code: 失败时的错误码
+            message: 结果描述，失败时同时作为错误描述
+            timer: 阶段计时器（可选），传入时记录各阶段耗时和总耗时
+        """
+        job.status = status
+        if timer is not None:
+            job.stage_durations = timer.durations
+            job.duration = timer.elapsed
+        if status == InstallJobStatus.FAILED:
+            job.error_code = error_code
+            job.error = message
+        logger.info(f"[InstallJobService] 安装任务结束: job_id={job.id}, status={status}, {message}")
+        await self._record(job, InstallJobEvent(stage=job.stage, status=status, message=message))
+
+    async def _record(self, job: InstallJob, event: InstallJobEvent) -> None:
+        """
+        追加任务事件并保存任务状态。存储失败只记录日志，不影响安装。
+
+        先追加事件再保存状态：读到已结束状态的客户端随后一定能读到结束事件。
+
+        参数:
+            job: 安装任务
+            event: 任务事件
+        """
+        now = datetime.now()
+        event.timestamp = now
+        job.updated_at = now
+        try:
+            await self._install_job_port.append_event(job.id, event)
+            await self._install_job_port.save_job(job)
+        except Exception as e:
+            logger.warning(f"[InstallJobService] 保存安装任务状态失败: job_id={job.id}, {e}")
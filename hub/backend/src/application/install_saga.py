@@ -0,0 +1,224 @@
+"""
+安装事务（Saga）
+
+在一次应用安装中记录已完成的外部副作用，并为可回滚的步骤登记补偿操作：
+- 安装失败时并发执行补偿（删除新安装的 Release、已创建的业务知识网络和智能体）；
+- 镜像和 Chart 上传无法撤销也无需撤销，保留在安装日志中，重试安装同一版本时直接复用；
+- 补偿失败的步骤同样保留在日志中，重试时复用已创建的资源，不再重复创建。
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
+
+from src.domains.application import Application
+from src.domains.install_journal import InstallJournal, JournalStep, JournalStepKind
+from src.ports.install_journal_port import InstallJournalPort
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Compensation:
+    """已登记的补偿操作。"""
+    step: JournalStep
+    action: Callable[[], Awaitable[None]]
+
+
+class InstallSaga:
+    """
+    单次安装的事务记录。
+
+    升级已安装应用时，旧版本已有的 Release、业务知识网络和智能体不登记补偿，
+    避免安装失败时删除正在使用的资源。
+    """
+
+    def __init__(
+        self,
+        journal: InstallJournal,
+        journal_port: Optional[InstallJournalPort] = None,
+        existing_app: Optional[Application] = None,
+    ):
+        """
+        初始化安装事务。
+
+        参数:
+            journal: 安装日志（新建或上次失败时留下的）
+            journal_port: 安装日志端口（可选，未提供时只在内存中记录，不支持重试续装）
+            existing_app: 已安装的旧版本应用（升级时提供）
+        """
+        self._journal = journal
+        self._journal_port = journal_port
+        self._compensations: List[_Compensation] = []
+        self._lock = asyncio.Lock()
+        self._protected: Set[Tuple[str, str]] = set()
+        if existing_app is not None:
+            self._protected.update((JournalStepKind.RELEASE, r.name) for r in existing_app.release_config)
+            self._protected.update((JournalStepKind.ONTOLOGY, str(o.id)) for o in existing_app.ontology_config)
+            self._protected.update((JournalStepKind.AGENT, str(a.id)) for a in existing_app.agent_config)
+
+    @classmethod
+    async def begin(
+        cls,
+        journal_port: Optional[InstallJournalPort],
+        app_key: str,
+        version: str,
+        existing_app: Optional[Application] = None,
+    ) -> "InstallSaga":
+        """
+        开始一次安装：读取同一版本上次失败留下的日志（如有），并记录本次尝试。
+
+        读取或写入日志失败只记录日志，按全新安装处理。
+
+        参数:
+            journal_port: 安装日志端口（可选）
+            app_key: 应用包唯一标识
+            version: 安装的版本号
+            existing_app: 已安装的旧版本应用（升级时提供）
+
+        返回:
+            InstallSaga: 安装事务
+        """
+        journal = None
+        if journal_port is not None:
+            try:
+                journal = await journal_port.get_journal(app_key, version)
+            except Exception as e:
+                logger.warning(f"[InstallSaga] 读取安装日志失败，按全新安装处理: {app_key}:{version}, {e}")
+        if journal is not None and journal.steps:
+            logger.info(
+                f"[InstallSaga] 继续上次未完成的安装: {app_key}:{version}，第 {journal.attempts + 1} 次尝试，"
+                f"已完成 {len(journal.steps)} 个步骤"
+            )
+        if journal is None:
+            journal = InstallJournal(app_key=app_key, version=version, created_at=datetime.now())
+        journal.attempts += 1
+        saga = cls(journal, journal_port, existing_app)
+        await saga._save()
+        return saga
+
+    @property
+    def journal(self) -> InstallJournal:
+        """安装日志。"""
+        return self._journal
+
+    @property
+    def resumable(self) -> bool:
+        """安装日志是否持久化（可供重试时复用）。"""
+        return self._journal_port is not None
+
+    def find(self, kind: str, name: str, digest: Optional[str] = None) -> Optional[JournalStep]:
+        """
+        查找之前完成的步骤（内容摘要不一致的步骤不复用）。
+
+        参数:
+            kind: 步骤类型（JournalStepKind）
+            name: 步骤对象
+            digest: 内容摘要，为 None 时只能匹配没有摘要的步骤（Release）
+
+        返回:
+            Optional[JournalStep]: 已完成的步骤，不存在时返回 None
+        """
+        step = self._journal.find(kind, name)
+        if step is None or step.digest != digest:
+            return None
+        return step
+
+    async def record(
+        self,
+        step: JournalStep,
+        compensate: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> None:
+        """
+        记录已完成的步骤，并登记补偿操作（可选）。
+
+        参数:
+            step: 已完成的步骤
+            compensate: 补偿操作；资源属于已安装的旧版本时不登记
+        """
+        self._journal.add(step)
+        if compensate is not None and not self._is_protected(step):
+            self._compensations.append(_Compensation(step, compensate))
+        await self._save()
+
+    async def forget(self, kind: str, name: str) -> None:
+        """
+        删除已失效的步骤记录（如复用的 Chart 在部署服务中已不存在），重试时重新执行。
+
+        参数:
+            kind: 步骤类型
+            name: 步骤对象
+        """
+        self._journal.remove(kind, name)
+        await self._save()
+
+    def adopt(self, step: JournalStep, compensate: Optional[Callable[[], Awaitable[None]]] = None) -> None:
+        """
+        复用之前完成的步骤，并登记补偿操作（可选），本次安装再次失败时一并回滚。
+
+        参数:
+            step: 之前完成的步骤
+            compensate: 补偿操作
+        """
+        if compensate is not None and not self._is_protected(step):
+            self._compensations.append(_Compensation(step, compensate))
+
+    async def compensate(self) -> List[str]:
+        """
+        安装失败时并发执行全部补偿操作。
+
+        补偿成功的步骤从日志中删除；补偿失败的步骤保留，重试时复用已创建的资源。
+
+        返回:
+            List[str]: 补偿失败的步骤描述
+        """
+        compensations, self._compensations = self._compensations, []
+        if not compensations:
+            await self._save()
+            return []
+        logger.info(f"[InstallSaga] 安装失败，开始回滚 {len(compensations)} 个步骤")
+        results = await asyncio.gather(
+            *(c.action() for c in compensations), return_exceptions=True
+        )
+        failures = []
+        for compensation, result in zip(compensations, results):
+            step = compensation.step
+            label = f"{step.kind}:{step.resource_id or step.name}"
+            if isinstance(result, BaseException):
+                logger.warning(f"[InstallSaga] 回滚失败，保留在安装日志中: {label}, {result}")
+                failures.append(label)
+            else:
+                logger.info(f"[InstallSaga] 已回滚: {label}")
+                self._journal.remove(step.kind, step.name)
+        await self._save()
+        return failures
+
+    async def complete(self) -> None:
+        """安装成功：删除安装日志。删除失败只记录日志（日志会按 TTL 过期）。"""
+        self._compensations = []
+        if self._journal_port is None:
+            return
+        try:
+            await self._journal_port.delete_journal(self._journal.app_key, self._journal.version)
+        except Exception as e:
+            logger.warning(f"[InstallSaga] 删除安装日志失败: {self._journal.app_key}:{self._journal.version}, {e}")
+
+    def _is_protected(self, step: JournalStep) -> bool:
+        """步骤对应的资源是否属于已安装的旧版本。"""
+        key = step.resource_id if step.resource_id is not None else step.name
+        return (step.kind, str(key)) in self._protected
+
+    async def _save(self) -> None:
+        """保存安装日志。写入失败只记录日志，不影响安装。"""
+        if self._journal_port is None:
+            return
+        async with self._lock:
+            self._journal.updated_at = datetime.now()
+            try:
+                await self._journal_port.save_journal(self._journal)
+            except Exception as e:
+                logger.warning(
+                    f"[InstallSaga] 保存安装日志失败: {self._journal.app_key}:{self._journal.version}, {e}"
+                )
+
@@ -10,6 +10,7 @@ from src.domains.session import SessionInfo
 from src.ports.session_port import SessionPort
 from src.ports.oauth2_port import OAuth2Port
 from src.ports.deploy_manager_port import DeployManagerPort
+from src.ports.hydra_port import HydraPort
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +30,7 @@ class LogoutService:
         session_port: SessionPort,
         oauth2_port: OAuth2Port,
         deploy_manager_port: DeployManagerPort,
+        hydra_port: Optional[HydraPort] = None,
     ):
         """
         初始化登出服务。
@@ -37,10 +39,12 @@ class LogoutService:
             session_port: Session 端口
             oauth2_port: OAuth2 端口
             deploy_manager_port: 部署管理端口
+            hydra_port: Hydra 端口（可选），用于登出时清除 Token 内省缓存
         """
         self._session_port = session_port
         self._oauth2_port = oauth2_port
         self._deploy_manager_port = deploy_manager_port
+        self._hydra_port = hydra_port
 
     async def get_session(self, session_id: str) -> Optional[SessionInfo]:
         """
@@ -71,6 +75,13 @@ class LogoutService:
         except Exception as e:
             logger.warning(f"撤销 Token 失败: {e}")
 
+        # 清除 Access Token 的内省缓存，避免登出后缓存仍判定 Token 有效
+        if self._hydra_port is not None and session_info.token:
+            try:
+                await self._hydra_port.invalidate(session_info.token)
+            except Exception as e:
+                logger.warning(f"清除 Token 内省缓存失败: {e}")
+
         # 删除 Session
         try:
             await self._session_port.delete_session(session_id)
@@ -3,12 +3,16 @@
 
 定义应用相关的领域模型和实体。
 """
+import base64
+import binascii
+import hashlib
+import json
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, List
+from typing import Dict, Optional, List
 
 
-@dataclass
+@dataclass(slots=True)
 class MicroAppInfo:
     """
     微应用信息。
@@ -23,7 +27,7 @@ class MicroAppInfo:
     headless: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class OntologyConfigItem:
     """
     业务知识网络配置项。
@@ -36,7 +40,7 @@ class OntologyConfigItem:
     is_config: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentConfigItem:
     """
     智能体配置项。
@@ -49,7 +53,7 @@ class AgentConfigItem:
     is_config: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class ReleaseConfigItem:
     """
     Release 配置项。
@@ -63,6 +67,71 @@ class ReleaseConfigItem:
 
 
 @dataclass
+class ArtifactTiming:
+    """
+    安装过程中单个制品的处理耗时。
+
+    属性:
+        kind: 制品类型（image=镜像上传，chart=Chart 上传，release=Release 安装）
+        name: 制品名称（镜像/Chart 为安装包内相对路径，Release 为 Release 名称）
+        size: 文件大小（字节），Release 为 None
+        started_at: 相对安装阶段开始的启动时间（秒）
+        duration: 耗时（秒）
+        digest: 镜像/Chart 内容的 SHA-256 摘要，未计算时为 None
+        skipped: 是否因内容已上传过而跳过上传
+    """
+    kind: str
+    name: str
+    size: Optional[int] = None
+    started_at: float = 0.0
+    duration: float = 0.0
+    digest: Optional[str] = None
+    skipped: bool = False
+
+
+@dataclass
+class InstallReport:
+    """
+    应用安装报告（仅安装接口返回）。
+
+    属性:
+        artifacts: 各制品的处理耗时，按镜像、Chart、Release 顺序排列
+        duration: 镜像上传、Chart 上传和 Release 安装阶段的总耗时（秒）
+        skipped_count: 因内容已上传过而跳过上传的镜像/Chart 数量
+        bytes_saved: 跳过上传的镜像/Chart 总大小（字节）
+        stages: 各安装阶段耗时（秒），阶段名见 InstallStage 和 InstallTimingStage
+        total_duration: 安装总耗时（秒，含接收安装包）
+    """
+    artifacts: List[ArtifactTiming] = field(default_factory=list)
+    duration: float = 0.0
+    skipped_count: int = 0
+    bytes_saved: int = 0
+    stages: Dict[str, float] = field(default_factory=dict)
+    total_duration: float = 0.0
+
+
+@dataclass
+class ArtifactRecord:
+    """
+    已上传制品的索引记录（按内容摘要去重）。
+
+    属性:
+        kind: 制品类型（image=镜像，chart=Chart）
+        digest: 制品内容的 SHA-256 摘要（十六进制）
+        size: 文件大小（字节）
+        name: 首次上传时的安装包内相对路径
+        result: 上传结果（镜像为 ImageUploadResult、Chart 为 ChartUploadResult 的字典形式）
+        created_at: 首次上传时间
+    """
+    kind: str
+    digest: str
+    size: int
+    name: str = ""
+    result: dict = field(default_factory=dict)
+    created_at: Optional[datetime] = None
+
+
+@dataclass(slots=True)
 class Application:
     """
     应用领域模型。
@@ -85,6 +154,8 @@ class Application:
         updated_by: 更新者用户显示名称
         updated_by_id: 更新者用户ID
         updated_at: 更新时间
+        icon_hash: 图标内容的 SHA-1 摘要（十六进制），无图标时为 None
+        install_report: 安装报告，仅安装接口返回时填充，不持久化
     """
     id: int
     key: str
@@ -103,15 +174,19 @@ class Application:
     updated_by: str = ""
     updated_by_id: str = ""
     updated_at: Optional[datetime] = None
+    icon_hash: Optional[str] = None
+    install_report: Optional[InstallReport] = None
 
     def has_icon(self) -> bool:
         """
         检查应用是否有图标。
 
+        列表查询不加载图标内容时，通过 icon_hash 判断。
+
         返回:
             bool: 是否有图标
         """
-        return self.icon is not None and len(self.icon) > 0
+        return (self.icon is not None and len(self.icon) > 0) or bool(self.icon_hash)
 
     def is_configured(self) -> bool:
         """
@@ -141,6 +216,173 @@ class Application:
         return len(self.agent_config) > 0
 
 
+# 图标文件头与 Content-Type 的对应关系
+_ICON_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"\x00\x00\x01\x00", "image/x-icon"),
+    (b"BM", "image/bmp"),
+)
+
+
+def compute_icon_hash(data: bytes) -> str:
+    """
+    计算图标内容摘要，用作图标的版本标识和 ETag。
+
+    参数:
+        data: 图标二进制内容
+
+    返回:
+        str: SHA-1 摘要（十六进制），与 MySQL 的 SHA1() 结果一致
+    """
+    return hashlib.sha1(data).hexdigest()
+
+
+@dataclass
+class ApplicationIcon:
+    """
+    应用图标（原始二进制内容）。
+
+    属性:
+        data: 图标二进制内容
+        icon_hash: 图标内容的 SHA-1 摘要（十六进制）
+    """
+    data: bytes
+    icon_hash: str
+
+    @property
+    def content_type(self) -> str:
+        """
+        根据文件头识别图标的 Content-Type。
+
+        返回:
+            str: MIME 类型，无法识别时为 application/octet-stream
+        """
+        head = self.data[:512]
+        for signature, content_type in _ICON_SIGNATURES:
+            if head.startswith(signature):
+                return content_type
+        if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+            return "image/webp"
+        text = head.lstrip().lower()
+        if text.startswith(b"<svg") or (text.startswith(b"<?xml") and b"<svg" in text):
+            return "image/svg+xml"
+        return "application/octet-stream"
+
+
+@dataclass
+class ApplicationCursor:
+    """
+    应用列表的分页游标（keyset），指向上一页最后一个应用。
+
+    列表按 (updated_at, id) 倒序排列，下一页从严格小于该位置的应用开始。
+
+    属性:
+        updated_at: 上一页最后一个应用的更新时间
+        id: 上一页最后一个应用的主键 ID
+    """
+    updated_at: datetime
+    id: int
+
+    def encode(self) -> str:
+        """
+        编码为不透明的游标字符串（URL 安全的 Base64）。
+
+        返回:
+            str: 游标字符串
+        """
+        payload = json.dumps({"u": self.updated_at.isoformat(), "i": self.id}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "ApplicationCursor":
+        """
+        从游标字符串解析。
+
+        参数:
+            token: encode() 生成的游标字符串
+
+        返回:
+            ApplicationCursor: 游标
+
+        异常:
+            ValueError: 游标格式无效时抛出
+        """
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            return cls(updated_at=datetime.fromisoformat(payload["u"]), id=int(payload["i"]))
+        except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"无效的分页游标: {token}") from e
+
+    @classmethod
+    def after(cls, application: "Application") -> "ApplicationCursor":
+        """
+        生成指向指定应用之后的游标。
+
+        参数:
+            application: 当前页最后一个应用
+
+        返回:
+            ApplicationCursor: 游标
+        """
+        return cls(updated_at=application.updated_at or datetime.min, id=application.id)
+
+
+class ApplicationRefKind:
+    """应用引用的外部资源类型（t_application_ref.kind）。"""
+    ONTOLOGY = "ontology"  # 业务知识网络
+    AGENT = "agent"  # 智能体
+
+
+@dataclass
+class ApplicationListQuery:
+    """
+    应用列表查询条件。
+
+    属性:
+        pinned: 按被钉状态过滤，None 表示不过滤
+        category: 按应用分组过滤
+        business_domain: 按业务域过滤
+        is_config: 按是否完成配置过滤
+        name_prefix: 按应用名称前缀过滤
+        ontology_id: 只返回使用指定业务知识网络的应用
+        agent_id: 只返回使用指定智能体的应用
+        limit: 每页数量，None 表示不分页（返回全部）
+        cursor: 分页游标，None 表示第一页
+        include_total: 是否统计满足过滤条件的总数
+        include_icon: 是否加载图标内容
+    """
+    pinned: Optional[bool] = None
+    category: Optional[str] = None
+    business_domain: Optional[str] = None
+    is_config: Optional[bool] = None
+    name_prefix: Optional[str] = None
+    ontology_id: Optional[str] = None
+    agent_id: Optional[str] = None
+    limit: Optional[int] = None
+    cursor: Optional[ApplicationCursor] = None
+    include_total: bool = False
+    include_icon: bool = True
+
+
+@dataclass
+class ApplicationPage:
+    """
+    应用列表分页结果。
+
+    属性:
+        items: 当前页的应用列表
+        next_cursor: 下一页游标，没有下一页时为 None
+        total: 满足过滤条件的总数，未要求统计时为 None
+    """
+    items: List[Application] = field(default_factory=list)
+    next_cursor: Optional[ApplicationCursor] = None
+    total: Optional[int] = None
+
+
 @dataclass
 class OntologyInfo:
     """
@@ -206,3 +448,49 @@ class ManifestInfo:
     business_domain: str = "db_public"
     micro_app: Optional[MicroAppInfo] = None
     release_config: dict = field(default_factory=dict)
+
+
+@dataclass
+class PackageArtifact:
+    """
+    安装包中的制品。
+
+    属性:
+        kind: 制品类型（image=镜像，chart=Chart，ontology=业务知识网络，agent=智能体，icon=图标）
+        path: 相对应用包根目录的路径
+        size: 文件大小（字节，解压后）
+    """
+    kind: str
+    path: str
+    size: int = 0
+
+
+@dataclass
+class PackageValidationReport:
+    """
+    安装包预检结果（只读取 ZIP 中央目录和元数据文件，不解压镜像和 Chart）。
+
+    属性:
+        problems: 发现的全部问题，为空表示可以安装
+        manifest: 解析出的 manifest 信息，manifest 存在问题时为 None
+        key: application.key 中的应用标识（manifest 存在其他问题时同样读取），无法读取时为 None
+        version: manifest.yaml 中的版本号（manifest 存在其他问题时同样读取），无法读取时为 None
+        installed_version: 已安装的版本号，应用未安装时为 None
+        artifacts: 安装包中的制品清单
+    """
+    problems: List[str] = field(default_factory=list)
+    manifest: Optional[ManifestInfo] = None
+    key: Optional[str] = None
+    version: Optional[str] = None
+    installed_version: Optional[str] = None
+    artifacts: List[PackageArtifact] = field(default_factory=list)
+
+    @property
+    def valid(self) -> bool:
+        """是否可以安装。"""
+        return not self.problems
+
+    @property
+    def total_size(self) -> int:
+        """制品总大小（字节）。"""
+        return sum(artifact.size for artifact in self.artifacts)
@@ -0,0 +1,108 @@
+"""
+安装任务领域模型
+
+定义异步安装任务及其阶段事件的领域模型。
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Optional
+
+
+class InstallJobStatus:
+    """安装任务状态。"""
+    PENDING = "pending"  # 已排队，等待执行
+    RUNNING = "running"  # 执行中
+    SUCCEEDED = "succeeded"  # 安装成功
+    FAILED = "failed"  # 安装失败
+
+    FINISHED = (SUCCEEDED, FAILED)
+
+
+class InstallStage:
+    """安装阶段，按执行顺序排列。"""
+    EXTRACT = "extract"  # 解压安装包
+    VALIDATE = "validate"  # 校验 manifest.yaml、application.key 和版本
+    DEPLOY = "deploy"  # 上传镜像和 Chart，安装 Release
+    IMPORT = "import"  # 导入业务知识网络和智能体
+    SAVE = "save"  # 保存应用记录
+
+
+class InstallTimingStage:
+    """
+    安装耗时统计的阶段。
+
+    RECEIVE、QUEUE（仅异步安装）与 InstallStage 的各阶段依次执行；其余为部署和导入阶段内并发执行的子阶段，
+    镜像/Chart/Release 子阶段的耗时为从第一个开始到最后一个结束的跨度。
+    """
+    RECEIVE = "receive"  # 接收安装包并写入临时文件
+    QUEUE = "queue"  # 异步安装任务排队等待
+    IMAGE_UPLOAD = "image_upload"  # 上传镜像
+    CHART_UPLOAD = "chart_upload"  # 上传 Chart
+    RELEASE_INSTALL = "release_install"  # 安装 Release
+    ONTOLOGY_IMPORT = "ontology_import"  # 导入业务知识网络
+    AGENT_IMPORT = "agent_import"  # 导入智能体
+    COMPENSATE = "compensate"  # 安装失败后回滚已完成的步骤
+
+
+@dataclass
+class InstallJobEvent:
+    """
+    安装任务事件。
+
+    属性:
+        stage: 安装阶段（InstallStage），任务结束事件为最后执行的阶段
+        status: 事件对应的任务状态（InstallJobStatus）
+        message: 事件描述
+        timestamp: 事件时间
+    """
+    stage: Optional[str]
+    status: str
+    message: str = ""
+    timestamp: Optional[datetime] = None
+
+
+@dataclass
+class InstallJob:
+    """
+    异步安装任务。
+
+    属性:
+        id: 任务 ID
+        status: 任务状态（InstallJobStatus）
+        stage: 当前（或失败时所在的）安装阶段，排队中为 None
+        application_id: 安装成功后的应用主键 ID
+        application_key: 安装成功后的应用唯一标识
+        error_code: 安装失败时的错误码
+        error: 安装失败时的错误描述
+        updated_by: 提交者用户显示名称
+        updated_by_id: 提交者用户ID
+        created_by_id: 创建者用户ID，只有创建者可以查询任务和订阅事件
+        stage_durations: 各阶段耗时（秒），任务结束后填充
+        duration: 安装总耗时（秒），任务结束后填充
+        created_at: 提交时间
+        updated_at: 最后更新时间
+    """
+    id: str
+    status: str = InstallJobStatus.PENDING
+    stage: Optional[str] = None
+    application_id: Optional[int] = None
+    application_key: Optional[str] = None
+    error_code: Optional[str] = None
+    error: Optional[str] = None
+    updated_by: str = ""
+    updated_by_id: str = ""
+    created_by_id: str = ""
+    stage_durations: Dict[str, float] = field(default_factory=dict)
+    duration: Optional[float] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    @property
+    def is_finished(self) -> bool:
+        """
+        任务是否已结束（成功或失败）。
+
+        返回:
+            bool: 已结束返回 True
+        """
+        return self.status in InstallJobStatus.FINISHED
@@ -0,0 +1,95 @@
+"""
+安装日志领域模型
+
+记录一次应用安装中已完成的外部副作用（镜像/Chart 上传、Release 安装、业务知识网络/智能体创建），
+用于安装失败时回滚，以及重试同一版本时跳过已完成的步骤。
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+
+class JournalStepKind:
+    """安装日志步骤类型。"""
+    IMAGE = "image"  # 镜像已上传，result 为 {"images": [...]}
+    CHART = "chart"  # Chart 已上传，result 为 ChartUploadResult 的字典形式
+    RELEASE = "release"  # Release 已安装，result 为 {"namespace", "chart_name", "chart_version"}
+    ONTOLOGY = "ontology"  # 业务知识网络已创建，resource_id 为业务知识网络 ID
+    AGENT = "agent"  # 智能体已创建，resource_id 为智能体 ID
+
+
+@dataclass
+class JournalStep:
+    """
+    安装日志中的一个已完成步骤。
+
+    属性:
+        kind: 步骤类型（JournalStepKind）
+        name: 步骤对象（镜像/Chart/配置文件为相对应用包根目录的路径，Release 为 Release 名称）
+        digest: 对应文件内容的 SHA-256 摘要，重试时只复用内容一致的步骤
+        resource_id: 创建的资源 ID（业务知识网络/智能体）
+        result: 步骤结果
+    """
+    kind: str
+    name: str
+    digest: Optional[str] = None
+    resource_id: Optional[str] = None
+    result: dict = field(default_factory=dict)
+
+
+@dataclass
+class InstallJournal:
+    """
+    应用安装日志，按 (应用唯一标识, 版本号) 区分；安装成功后删除。
+
+    属性:
+        app_key: 应用包唯一标识
+        version: 安装的版本号
+        steps: 已完成的步骤
+        attempts: 已尝试安装的次数（含本次）
+        created_at: 首次安装尝试时间
+        updated_at: 最后更新时间
+    """
+    app_key: str
+    version: str
+    steps: List[JournalStep] = field(default_factory=list)
+    attempts: int = 0
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    def find(self, kind: str, name: str, digest: Optional[str] = None) -> Optional[JournalStep]:
+        """
+        查找已完成的步骤。
+
+        参数:
+            kind: 步骤类型
+            name: 步骤对象
+            digest: 内容摘要，传入时只返回摘要一致的步骤
+
+        返回:
+            Optional[JournalStep]: 已完成的步骤，不存在时返回 None
+        """
+        for step in self.steps:
+            if step.kind == kind and step.name == name and (digest is None or step.digest == digest):
+                return step
+        return None
+
+    def add(self, step: JournalStep) -> None:
+        """
+        记录已完成的步骤，替换同类型同对象的旧记录。
+
+        参数:
+            step: 已完成的步骤
+        """
+        self.remove(step.kind, step.name)
+        self.steps.append(step)
+
+    def remove(self, kind: str, name: str) -> None:
+        """
+        删除步骤记录（步骤已回滚时调用）。
+
+        参数:
+            kind: 步骤类型
+            name: 步骤对象
+        """
+        self.steps = [s for s in self.steps if not (s.kind == kind and s.name == name)]
@@ -0,0 +1,9 @@
+"""
+缓存模块
+
+提供进程内的有界 TTL 缓存、stale-while-revalidate 读穿缓存等缓存相关的基础设施功能。
+"""
+from src.infrastructure.cache.ttl_cache import TTLCache
+from src.infrastructure.cache.swr_cache import StaleWhileRevalidateCache
+
+__all__ = ["TTLCache", "StaleWhileRevalidateCache"]
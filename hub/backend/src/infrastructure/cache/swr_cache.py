@@ -0,0 +1,149 @@
+"""
+Stale-while-revalidate 读穿缓存
+
+在 TTLCache 之上实现读穿（read-through）缓存：
+- 新鲜期内直接返回缓存值；
+- 过期但仍在陈旧期内时立即返回旧值，同时在后台刷新；
+- 未命中时调用加载函数，同一个键的并发加载只执行一次。
+仅在单个事件循环内使用，不做线程同步。
+"""
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Set, Tuple, TypeVar
+
+from src.infrastructure.cache.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class StaleWhileRevalidateCache(Generic[K, V]):
+    """
+    带后台刷新的有界读穿缓存。
+
+    条目写入后 ttl 秒内为新鲜状态，之后 stale_ttl 秒内为陈旧状态（仍可返回并触发刷新），
+    超过 ttl + stale_ttl 后删除。加载失败不缓存；后台刷新失败时保留旧值。
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        stale_ttl: float = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        初始化缓存。
+
+        参数:
+            max_size: 最大条目数，超过时按 LRU 淘汰
+            ttl: 新鲜期（秒）
+            stale_ttl: 新鲜期之后允许返回旧值的时长（秒）
+            clock: 时钟函数（秒），便于测试时替换
+        """
+        self._ttl = ttl
+        self._stale_ttl = max(0.0, stale_ttl)
+        self._clock = clock
+        # 值为 (新鲜期截止时间, 缓存值)
+        self._entries: TTLCache[K, Tuple[float, V]] = TTLCache(max_size, clock)
+        self._inflight: Dict[K, asyncio.Task] = {}
+        # 失效计数，用于丢弃失效前发起、失效后才返回的加载结果
+        self._generation = 0
+        # 持有后台刷新任务的引用，避免任务在完成前被回收
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def get_or_load(self, key: K, loader: Callable[[], Awaitable[V]]) -> V:
+        """
+        读取缓存，未命中时加载。
+
+        参数:
+            key: 缓存键
+            loader: 加载函数，返回要缓存的值
+
+        返回:
+            V: 缓存值或新加载的值
+
+        异常:
+            Exception: 未命中且加载失败时抛出加载函数的异常
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            fresh_until, value = entry
+            if fresh_until <= self._clock() and key not in self._inflight:
+                task = self._start_load(key, loader)
+                self._tasks.add(task)
+                task.add_done_callback(self._on_background_done)
+            return value
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._start_load(key, loader)
+        # shield：单个调用方被取消时不影响等待同一个键的其他调用方
+        return await asyncio.shield(task)
+
+    def invalidate_where(self, predicate: Callable[[K], bool]) -> int:
+        """
+        使满足条件的缓存条目失效，进行中的加载结果也不再写入缓存。
+
+        参数:
+            predicate: 键的判断函数
+
+        返回:
+            int: 删除的条目数
+        """
+        self._generation += 1
+        for key in [key for key in self._inflight if predicate(key)]:
+            del self._inflight[key]
+        return self._entries.delete_where(predicate)
+
+    def clear(self) -> None:
+        """清空缓存。"""
+        self.invalidate_where(lambda key: True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _start_load(self, key: K, loader: Callable[[], Awaitable[V]]) -> asyncio.Task:
+        """
+        启动一次加载并登记为进行中。
+
+        参数:
+            key: 缓存键
+            loader: 加载函数
+
+        返回:
+            asyncio.Task: 加载任务
+        """
+        task = asyncio.ensure_future(self._load(key, loader, self._generation))
+        self._inflight[key] = task
+        return task
+
+    async def _load(self, key: K, loader: Callable[[], Awaitable[V]], generation: int) -> V:
+        """
+        调用加载函数，成功后写入缓存。
+
+        参数:
+            key: 缓存键
+            loader: 加载函数
+            generation: 发起加载时的失效计数
+
+        返回:
+            V: 加载的值
+        """
+        try:
+            value = await loader()
+            if generation == self._generation:
+                self._entries.set(key, (self._clock() + self._ttl, value), self._ttl + self._stale_ttl)
+            return value
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+
+    def _on_background_done(self, task: asyncio.Task) -> None:
+        """后台刷新结束回调：释放任务引用，记录刷新失败。"""
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"[StaleWhileRevalidateCache] 后台刷新失败，继续使用旧值: {task.exception()}")
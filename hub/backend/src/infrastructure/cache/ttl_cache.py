@@ -0,0 +1,100 @@
+"""
+有界 TTL 缓存
+
+进程内的键值缓存，每个条目有独立的过期时间，超过容量时按 LRU 淘汰。
+仅在单个事件循环内使用，不做线程同步。
+"""
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    带过期时间和 LRU 淘汰的有界缓存。
+
+    读取命中时条目移动到队尾；写入新条目导致超出容量时淘汰队首（最久未使用）条目。
+    过期条目在读取时惰性删除。
+    """
+
+    def __init__(self, max_size: int, clock: Callable[[], float] = time.monotonic):
+        """
+        初始化缓存。
+
+        参数:
+            max_size: 最大条目数，小于等于 0 时不缓存任何内容
+            clock: 时钟函数（秒），便于测试时替换
+        """
+        self._max_size = max_size
+        self._clock = clock
+        self._entries: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+
+    def get(self, key: K) -> Optional[V]:
+        """
+        读取缓存。
+
+        参数:
+            key: 缓存键
+
+        返回:
+            Optional[V]: 缓存值，不存在或已过期时返回 None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V, ttl: float) -> None:
+        """
+        写入缓存。
+
+        参数:
+            key: 缓存键
+            value: 缓存值
+            ttl: 存活时间（秒），小于等于 0 时不写入
+        """
+        if ttl <= 0 or self._max_size <= 0:
+            return
+        self._entries[key] = (self._clock() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: K) -> None:
+        """
+        删除缓存条目。
+
+        参数:
+            key: 缓存键
+        """
+        self._entries.pop(key, None)
+
+    def delete_where(self, predicate: Callable[[K], bool]) -> int:
+        """
+        删除所有键满足条件的缓存条目。
+
+        参数:
+            predicate: 键的判断函数
+
+        返回:
+            int: 删除的条目数
+        """
+        keys = [key for key in self._entries if predicate(key)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        """清空缓存。"""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
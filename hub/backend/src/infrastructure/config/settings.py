@@ -86,10 +86,80 @@ class Settings(BaseSettings):
     db_name: str = Field(default="dip", description="数据库名称")
     db_user: str = Field(default="root", description="数据库用户名")
     db_password: str = Field(default="", description="数据库密码")
+    db_pool_minsize: int = Field(default=2, description="数据库连接池最小连接数，服务启动时预热")
+    db_pool_maxsize: int = Field(default=10, description="数据库连接池最大连接数")
+    db_pool_recycle: int = Field(
+        default=3600,
+        description="数据库连接的最长使用时间（秒），超过后重建连接，应小于数据库的 wait_timeout；-1 表示不回收"
+    )
+    db_connect_timeout: int = Field(default=10, description="建立数据库连接的超时时间（秒）")
+    db_pool_acquire_timeout: float = Field(
+        default=10.0,
+        description="从连接池获取连接的超时时间（秒），连接全部占用时最多等待该时间，<=0 表示不限"
+    )
+    db_pool_warmup_enabled: bool = Field(default=True, description="是否在服务启动时预热数据库连接池")
 
     # Proton 部署服务配置
     proton_url: str = Field(default="http://localhost", description="Proton 服务地址")
     proton_timeout: int = Field(default=300, description="Proton 请求超时时间（秒）")
+    deploy_upload_chunk_size: int = Field(
+        default=1024 * 1024,
+        description="镜像/Chart 流式上传的分块大小（字节）"
+    )
+    install_upload_concurrency: int = Field(default=4, description="安装应用时镜像/Chart 的最大并发上传数")
+    install_release_concurrency: int = Field(default=4, description="安装应用时 Release 的最大并发安装数")
+    install_import_concurrency: int = Field(default=8, description="安装应用时业务知识网络/智能体的最大并发创建数")
+    artifact_dedup_enabled: bool = Field(
+        default=True,
+        description="安装应用时是否按内容摘要跳过已上传过的镜像和 Chart（记录在 t_artifact_upload 表）"
+    )
+    install_zip_index_enabled: bool = Field(
+        default=True,
+        description="安装应用时是否直接按 ZIP 索引读取安装包（镜像和 Chart 从 ZIP 流式上传），关闭时先完整解压到临时目录"
+    )
+
+    # 分块上传配置
+    upload_chunk_size: int = Field(default=8 * 1024 * 1024, description="分块上传的默认分块大小（字节）")
+    upload_max_chunk_size: int = Field(default=64 * 1024 * 1024, description="分块上传允许的最大分块大小（字节）")
+    upload_max_package_size: int = Field(
+        default=20 * 1024 * 1024 * 1024,
+        description="分块上传允许的最大安装包大小（字节），创建会话时按该大小预分配文件"
+    )
+    upload_max_sessions_per_user: int = Field(default=5, description="每个用户同时存在的未完成分块上传会话数上限")
+    upload_session_ttl: int = Field(
+        default=86400,
+        description="分块上传会话在最后一次收到分块后的保留时间（秒），过期后删除已上传的分块"
+    )
+
+    # 阻塞任务执行器配置
+    blocking_io_workers: int = Field(
+        default=4,
+        description="执行 ZIP 读取、文件写入、YAML 解析等阻塞操作的专用线程数"
+    )
+
+    # 事件循环延迟监控配置
+    loop_lag_monitor_enabled: bool = Field(default=True, description="是否启用事件循环延迟监控")
+    loop_lag_monitor_interval: float = Field(default=0.5, description="事件循环延迟采样间隔（秒）")
+    loop_lag_warn_threshold: float = Field(
+        default=0.2,
+        description="事件循环延迟超过该值（秒）时记录告警日志，<=0 表示不告警"
+    )
+
+    # 异步安装任务配置
+    install_job_workers: int = Field(default=2, description="每个副本执行异步安装任务的 worker 数")
+    install_job_queue_size: int = Field(default=16, description="每个副本等待执行的异步安装任务队列长度")
+    install_job_ttl: int = Field(default=86400, description="异步安装任务状态在 Redis 中的保留时间（秒）")
+    install_job_poll_interval: float = Field(
+        default=1.0,
+        description="安装任务事件流（SSE）轮询任务状态的间隔（秒）"
+    )
+
+    # 安装日志配置（失败回滚与重试续装）
+    install_journal_enabled: bool = Field(
+        default=True,
+        description="是否在 Redis 中记录安装日志，重试安装同一版本时跳过已完成的上传和创建"
+    )
+    install_journal_ttl: int = Field(default=7 * 86400, description="安装日志的保留时间（秒），每次写入时续期")
 
     # Ontology Manager 服务配置
     ontology_manager_url: str = Field(
@@ -111,6 +181,28 @@ class Settings(BaseSettings):
         description="Agent Factory 请求超时时间（秒）"
     )
 
+    # 业务知识网络/智能体详情并发查询配置
+    detail_fetch_concurrency: int = Field(default=8, description="查询应用关联详情时的最大并发请求数")
+    detail_fetch_deadline: float = Field(
+        default=10.0,
+        description="查询应用关联详情的整体截止时间（秒），超时未返回的项只返回 ID，<=0 表示不限制"
+    )
+
+    # 业务知识网络/智能体详情缓存配置
+    detail_cache_enabled: bool = Field(default=True, description="是否缓存业务知识网络和智能体详情")
+    detail_cache_ttl: int = Field(default=300, description="详情缓存新鲜期（秒）")
+    detail_cache_stale_ttl: int = Field(
+        default=3600,
+        description="详情缓存过期后仍可返回旧值并在后台刷新的时长（秒）"
+    )
+    detail_cache_max_size: int = Field(default=2000, description="详情缓存最大条目数（每个上游服务）")
+
+    # HTTP 客户端连接池配置（每个上游服务一个连接池）
+    http_pool_limit: int = Field(default=100, description="单个连接池的最大连接数")
+    http_pool_limit_per_host: int = Field(default=20, description="单个连接池对同一主机的最大连接数")
+    http_pool_keepalive_timeout: float = Field(default=30.0, description="空闲连接保持时间（秒）")
+    http2_enabled: bool = Field(default=True, description="是否为 httpx 客户端启用 HTTP/2（需安装 h2）")
+
     # Mock 模式配置
     use_mock_services: bool = Field(
         default=False, 
@@ -123,6 +215,26 @@ class Settings(BaseSettings):
     redis_db: int = Field(default=1, description="Redis 数据库编号")
     redis_min_idle_conns: int = Field(default=8, description="Redis 最小空闲连接数")
 
+    # Token 内省缓存配置
+    introspect_cache_enabled: bool = Field(default=True, description="是否启用 Token 内省缓存")
+    introspect_cache_ttl: int = Field(default=60, description="内省结果缓存时间（秒），不超过 Token 剩余有效期")
+    introspect_cache_max_size: int = Field(default=10000, description="进程内内省缓存最大条目数")
+    introspect_cache_redis_enabled: bool = Field(
+        default=False,
+        description="是否启用 Redis 二级内省缓存（多个 worker 共享）"
+    )
+    introspect_cache_local_ttl: int = Field(
+        default=5,
+        description="启用 Redis 二级缓存时，进程内缓存的最长时间（秒）"
+    )
+
+    # 用户信息缓存配置
+    user_info_cache_enabled: bool = Field(default=True, description="是否启用用户信息缓存")
+    user_info_cache_ttl: int = Field(default=300, description="用户信息缓存时间（秒）")
+    user_info_cache_max_size: int = Field(default=10000, description="用户信息缓存最大条目数")
+    user_info_batch_window_ms: int = Field(default=5, description="未命中用户合并批量查询的等待窗口（毫秒）")
+    user_info_batch_max_size: int = Field(default=50, description="单次批量查询的最大用户数")
+
     # OAuth2 配置
     oauth_client_id: str = Field(default="", description="OAuth2 客户端 ID")
     oauth_client_secret: str = Field(default="", description="OAuth2 客户端 Secret")
@@ -8,29 +8,44 @@ import logging
 
 from src.application.health_service import HealthService
 from src.application.application_service import ApplicationService
+from src.application.install_job_service import InstallJobService
 from src.application.login_service import LoginService
 from src.application.logout_service import LogoutService
 from src.application.refresh_token_service import RefreshTokenService
 from src.application.user_info_service import UserInfoService
 from src.adapters.health_adapter import HealthAdapter
 from src.adapters.application_adapter import ApplicationAdapter
+from src.adapters.artifact_index_adapter import ArtifactIndexAdapter
 from src.adapters.session_adapter import SessionAdapter
+from src.adapters.install_job_adapter import RedisInstallJobAdapter
+from src.adapters.install_journal_adapter import RedisInstallJournalAdapter
 from src.adapters.oauth2_adapter import OAuth2Adapter
 from src.adapters.hydra_adapter import HydraAdapter
+from src.adapters.cached_hydra_adapter import CachedHydraAdapter
 from src.adapters.user_management_adapter import UserManagementAdapter
+from src.adapters.cached_user_management_adapter import CachedUserManagementAdapter
 from src.adapters.deploy_manager_adapter import DeployManagerAdapter
 from src.adapters.external_service_adapter import (
     DeployInstallerAdapter,
     OntologyManagerAdapter,
     AgentFactoryAdapter,
 )
+from src.adapters.cached_external_service_adapter import (
+    CachedOntologyManagerAdapter,
+    CachedAgentFactoryAdapter,
+)
 from src.adapters.mock_external_service_adapter import (
     MockDeployInstallerAdapter,
     MockOntologyManagerAdapter,
     MockAgentFactoryAdapter,
 )
-from src.adapters.mock_application_adapter import MockApplicationAdapter
+from src.adapters.mock_application_adapter import MockApplicationAdapter, MockArtifactIndexAdapter
 from src.infrastructure.config.settings import Settings, get_settings
+from src.infrastructure.executor import BlockingExecutor
+from src.infrastructure.http_client import HttpClientPool
+from src.infrastructure.database.pool import ACQUIRE_WAIT_BUCKETS
+from src.infrastructure.metrics import Histogram, InstallMetrics, LoopLagMonitor, MetricsRegistry
+from src.infrastructure.upload import ResumableUploadStore
 
 logger = logging.getLogger(__name__)
 
@@ -50,14 +65,24 @@ class Container:
             settings: 应用配置。如果为 None，则使用默认配置。
         """
         self._settings = settings or get_settings()
+        self._http_client_pool = None
+        self._blocking_executor = None
+        self._upload_store = None
+        self._loop_lag_monitor = None
+        self._metrics_registry = None
+        self._install_metrics = None
         self._health_adapter = None
         self._health_service = None
         self._application_adapter = None
         self._application_service = None
+        self._artifact_index_adapter = None
         self._deploy_installer_adapter = None
         self._ontology_manager_adapter = None
         self._agent_factory_adapter = None
         self._session_adapter = None
+        self._install_job_adapter = None
+        self._install_journal_adapter = None
+        self._install_job_service = None
         self._oauth2_adapter = None
         self._hydra_adapter = None
         self._user_management_adapter = None
@@ -72,6 +97,78 @@ class Container:
         """获取应用配置。"""
         return self._settings
     
+    @property
+    def http_client_pool(self) -> HttpClientPool:
+        """获取共享 HTTP 连接池实例（单例）。"""
+        if self._http_client_pool is None:
+            self._http_client_pool = HttpClientPool(self._settings)
+        return self._http_client_pool
+
+    @property
+    def blocking_executor(self) -> BlockingExecutor:
+        """获取阻塞任务执行器实例（单例）。"""
+        if self._blocking_executor is None:
+            self._blocking_executor = BlockingExecutor(self._settings.blocking_io_workers)
+        return self._blocking_executor
+
+    @property
+    def upload_store(self) -> ResumableUploadStore:
+        """获取分块上传会话存储实例（单例，同一会话的锁在进程内共享）。"""
+        if self._upload_store is None:
+            self._upload_store = ResumableUploadStore(
+                self._settings.temp_dir, self._settings.upload_session_ttl, self.blocking_executor
+            )
+        return self._upload_store
+
+    @property
+    def loop_lag_monitor(self) -> LoopLagMonitor:
+        """获取事件循环延迟监控器实例（单例）。"""
+        if self._loop_lag_monitor is None:
+            self._loop_lag_monitor = LoopLagMonitor(
+                interval=self._settings.loop_lag_monitor_interval,
+                warn_threshold=self._settings.loop_lag_warn_threshold,
+            )
+        return self._loop_lag_monitor
+
+    @property
+    def metrics_registry(self) -> MetricsRegistry:
+        """获取指标注册表实例（单例），登记事件循环延迟和阻塞任务执行器指标。"""
+        if self._metrics_registry is None:
+            registry = MetricsRegistry()
+            monitor = self.loop_lag_monitor
+            executor = self.blocking_executor
+            registry.register_gauge(
+                "event_loop_lag_seconds", "最近一次采样的事件循环延迟（秒）", lambda: monitor.last_lag
+            )
+            registry.register_gauge(
+                "event_loop_lag_recent_max_seconds", "最近采样窗口内的最大事件循环延迟（秒）",
+                lambda: monitor.recent_max_lag,
+            )
+            registry.register_gauge(
+                "event_loop_lag_max_seconds", "进程启动以来的最大事件循环延迟（秒）", lambda: monitor.max_lag
+            )
+            registry.register_counter(
+                "event_loop_lag_seconds_sum", "事件循环延迟累计值（秒）", lambda: monitor.lag_sum
+            )
+            registry.register_counter(
+                "event_loop_lag_samples_total", "事件循环延迟采样次数", lambda: monitor.samples
+            )
+            registry.register_gauge(
+                "blocking_executor_pending", "阻塞任务执行器中执行和排队的任务数", lambda: executor.pending
+            )
+            registry.register_gauge(
+                "blocking_executor_max_workers", "阻塞任务执行器的最大线程数", lambda: executor.max_workers
+            )
+            self._metrics_registry = registry
+        return self._metrics_registry
+
+    @property
+    def install_metrics(self) -> InstallMetrics:
+        """获取安装指标实例（单例），登记到指标注册表。"""
+        if self._install_metrics is None:
+            self._install_metrics = InstallMetrics(self.metrics_registry)
+        return self._install_metrics
+
     @property
     def health_adapter(self) -> HealthAdapter:
         """获取健康适配器实例（单例）。"""
@@ -94,9 +191,51 @@ class Container:
                 logger.info("使用 Mock 应用适配器（内存存储）")
                 self._application_adapter = MockApplicationAdapter()
             else:
-                self._application_adapter = ApplicationAdapter(self._settings)
+                acquire_wait = Histogram(buckets=ACQUIRE_WAIT_BUCKETS)
+                adapter = ApplicationAdapter(self._settings, acquire_wait)
+                self._register_database_pool_metrics(adapter, acquire_wait)
+                self._application_adapter = adapter
         return self._application_adapter
 
+    def _register_database_pool_metrics(self, adapter: ApplicationAdapter, acquire_wait: Histogram) -> None:
+        """登记数据库连接池指标（连接池创建前各项为 0）。"""
+        registry = self.metrics_registry
+
+        def connections():
+            pool = adapter.pool
+            if pool is None:
+                return [({"state": "in_use"}, 0), ({"state": "free"}, 0)]
+            return [({"state": "in_use"}, pool.in_use), ({"state": "free"}, pool.free)]
+
+        registry.register_gauge(
+            "db_pool_connections", "数据库连接池的连接数，按状态（in_use=使用中，free=空闲）区分", connections
+        )
+        registry.register_gauge(
+            "db_pool_max_connections", "数据库连接池的最大连接数",
+            lambda: adapter.pool.maxsize if adapter.pool is not None else 0,
+        )
+        registry.register_gauge(
+            "db_pool_waiting", "正在等待获取数据库连接的请求数",
+            lambda: adapter.pool.waiting if adapter.pool is not None else 0,
+        )
+        registry.register_counter(
+            "db_pool_acquire_timeouts_total", "获取数据库连接超时的次数",
+            lambda: adapter.pool.acquire_timeouts if adapter.pool is not None else 0,
+        )
+        registry.register_histogram(
+            "db_pool_acquire_wait_seconds", "获取数据库连接的等待时间（秒）", acquire_wait
+        )
+
+    @property
+    def artifact_index_adapter(self):
+        """获取制品索引适配器实例（单例），与应用适配器共享数据库连接池。"""
+        if self._artifact_index_adapter is None:
+            if self._settings.use_mock_services:
+                self._artifact_index_adapter = MockArtifactIndexAdapter()
+            else:
+                self._artifact_index_adapter = ArtifactIndexAdapter(self.application_adapter.get_pool)
+        return self._artifact_index_adapter
+
     @property
     def deploy_installer_adapter(self):
         """获取 Deploy Installer 适配器实例（单例）。"""
@@ -105,7 +244,9 @@ class Container:
                 logger.info("使用 Mock Deploy Installer 适配器")
                 self._deploy_installer_adapter = MockDeployInstallerAdapter()
             else:
-                self._deploy_installer_adapter = DeployInstallerAdapter(self._settings)
+                self._deploy_installer_adapter = DeployInstallerAdapter(
+                    self._settings, self.http_client_pool, self.blocking_executor
+                )
         return self._deploy_installer_adapter
 
     @property
@@ -116,7 +257,10 @@ class Container:
                 logger.info("使用 Mock Ontology Manager 适配器")
                 self._ontology_manager_adapter = MockOntologyManagerAdapter()
             else:
-                self._ontology_manager_adapter = OntologyManagerAdapter(self._settings)
+                ontology_manager_adapter = OntologyManagerAdapter(self._settings, self.http_client_pool)
+                if self._settings.detail_cache_enabled:
+                    ontology_manager_adapter = CachedOntologyManagerAdapter(ontology_manager_adapter, self._settings)
+                self._ontology_manager_adapter = ontology_manager_adapter
         return self._ontology_manager_adapter
 
     @property
@@ -127,7 +271,10 @@ class Container:
                 logger.info("使用 Mock Agent Factory 适配器")
                 self._agent_factory_adapter = MockAgentFactoryAdapter()
             else:
-                self._agent_factory_adapter = AgentFactoryAdapter(self._settings)
+                agent_factory_adapter = AgentFactoryAdapter(self._settings, self.http_client_pool)
+                if self._settings.detail_cache_enabled:
+                    agent_factory_adapter = CachedAgentFactoryAdapter(agent_factory_adapter, self._settings)
+                self._agent_factory_adapter = agent_factory_adapter
         return self._agent_factory_adapter
 
     @property
@@ -137,32 +284,59 @@ class Container:
             self._session_adapter = SessionAdapter(self._settings)
         return self._session_adapter
 
+    @property
+    def install_job_adapter(self):
+        """获取安装任务适配器实例（单例），复用 Session 适配器的 Redis 连接。"""
+        if self._install_job_adapter is None:
+            self._install_job_adapter = RedisInstallJobAdapter(
+                self._settings, self.session_adapter.get_client
+            )
+        return self._install_job_adapter
+
+    @property
+    def install_journal_adapter(self):
+        """获取安装日志适配器实例（单例），未启用安装日志时返回 None。"""
+        if self._install_journal_adapter is None and self._settings.install_journal_enabled:
+            self._install_journal_adapter = RedisInstallJournalAdapter(
+                self._settings, self.session_adapter.get_client
+            )
+        return self._install_journal_adapter
+
     @property
     def oauth2_adapter(self):
         """获取 OAuth2 适配器实例（单例）。"""
         if self._oauth2_adapter is None:
-            self._oauth2_adapter = OAuth2Adapter(self._settings)
+            self._oauth2_adapter = OAuth2Adapter(self._settings, self.http_client_pool)
         return self._oauth2_adapter
 
     @property
     def hydra_adapter(self):
         """获取 Hydra 适配器实例（单例）。"""
         if self._hydra_adapter is None:
-            self._hydra_adapter = HydraAdapter(self._settings)
+            hydra_adapter = HydraAdapter(self._settings, self.http_client_pool)
+            if self._settings.introspect_cache_enabled:
+                redis_client_factory = None
+                if self._settings.introspect_cache_redis_enabled:
+                    redis_client_factory = self.session_adapter.get_client
+                hydra_adapter = CachedHydraAdapter(hydra_adapter, self._settings, redis_client_factory)
+            self._hydra_adapter = hydra_adapter
         return self._hydra_adapter
 
     @property
     def user_management_adapter(self):
         """获取 User Management 适配器实例（单例）。"""
         if self._user_management_adapter is None:
-            self._user_management_adapter = UserManagementAdapter(self._settings)
+            user_management_adapter = UserManagementAdapter(self._settings, self.http_client_pool)
+            if self._settings.user_info_cache_enabled:
+                user_management_adapter = CachedUserManagementAdapter(user_management_adapter, self._settings)
+            self._user_management_adapter = user_management_adapter
         return self._user_management_adapter
 
     @property
     def deploy_manager_adapter(self):
         """获取 Deploy Manager 适配器实例（单例）。"""
         if self._deploy_manager_adapter is None:
-            self._deploy_manager_adapter = DeployManagerAdapter(self._settings)
+            self._deploy_manager_adapter = DeployManagerAdapter(self._settings, self.http_client_pool)
         return self._deploy_manager_adapter
 
     @property
@@ -186,6 +360,7 @@ class Container:
                 session_port=self.session_adapter,
                 oauth2_port=self.oauth2_adapter,
                 deploy_manager_port=self.deploy_manager_adapter,
+                hydra_port=self.hydra_adapter,
             )
         return self._logout_service
 
@@ -219,9 +394,34 @@ class Container:
                 ontology_manager_port=self.ontology_manager_adapter,
                 agent_factory_port=self.agent_factory_adapter,
                 settings=self._settings,
+                blocking_executor=self.blocking_executor,
+                artifact_index_port=self.artifact_index_adapter,
+                install_metrics=self.install_metrics,
+                install_journal_port=self.install_journal_adapter,
             )
         return self._application_service
 
+    @property
+    def install_job_service(self) -> InstallJobService:
+        """获取安装任务服务实例（单例）。"""
+        if self._install_job_service is None:
+            self._install_job_service = InstallJobService(
+                application_service=self.application_service,
+                install_job_port=self.install_job_adapter,
+                settings=self._settings,
+            )
+        return self._install_job_service
+
+    async def warm_up(self) -> None:
+        """
+        预热数据库连接池（Mock 模式或未启用预热时跳过）。
+
+        服务启动时在标记就绪前调用，使首个请求不需要建立数据库连接。
+        """
+        if self._settings.use_mock_services or not self._settings.db_pool_warmup_enabled:
+            return
+        await self.application_adapter.warm_up()
+
     def set_ready(self, ready: bool = True) -> None:
         """
         设置服务就绪状态。
@@ -235,12 +435,20 @@ class Container:
         """
         关闭容器，释放资源。
 
-        关闭数据库连接池等资源。
+        关闭数据库连接池、HTTP 连接池、阻塞任务执行器等资源。
         """
+        if self._install_job_service is not None:
+            await self._install_job_service.stop()
+        if self._loop_lag_monitor is not None:
+            await self._loop_lag_monitor.stop()
         if self._application_adapter is not None:
             await self._application_adapter.close()
         if self._session_adapter is not None:
             await self._session_adapter.close()
+        if self._http_client_pool is not None:
+            await self._http_client_pool.close()
+        if self._blocking_executor is not None:
+            self._blocking_executor.shutdown(wait=False)
 
 
 # 全局容器实例
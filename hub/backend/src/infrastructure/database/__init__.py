@@ -1,4 +1,4 @@
 """
-数据库初始化模块
+数据库初始化与连接池模块
 """
 
@@ -3,8 +3,9 @@
 
 在服务启动时自动检测并创建所需的数据库表。
 """
+import json
 import logging
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 import aiomysql
 
@@ -91,13 +92,14 @@ async def ensure_tables_exist(settings: Settings) -> None:
                     `name` VARCHAR(128) NOT NULL COMMENT '应用名称',
                     `description` VARCHAR(800) NULL COMMENT '应用描述',
                     `icon` BLOB NULL COMMENT '应用图标（二进制数据）',
+                    `icon_hash` CHAR(40) NULL COMMENT '应用图标 SHA-1 摘要',
                     `version` VARCHAR(128) NULL COMMENT '当前上传的版本号',
                     `category` VARCHAR(128) NULL COMMENT '应用所属分组',
                     `business_domain` VARCHAR(128) NULL DEFAULT 'db_public' COMMENT '业务域',
-                    `micro_app` TEXT NULL COMMENT '微应用配置（JSON对象）',
-                    `release_config` TEXT NULL COMMENT '应用安装配置（JSON数组，helm release名称列表）',
-                    `ontology_ids` TEXT NULL COMMENT '业务知识网络配置（JSON数组，每个元素包含id和is_config字段）',
-                    `agent_ids` TEXT NULL COMMENT '智能体配置（JSON数组，每个元素包含id和is_config字段）',
+                    `micro_app` JSON NULL COMMENT '微应用配置（JSON对象）',
+                    `release_config` JSON NULL COMMENT '应用安装配置（JSON数组，helm release名称列表）',
+                    `ontology_ids` JSON NULL COMMENT '业务知识网络配置（JSON数组，每个元素包含id和is_config字段）',
+                    `agent_ids` JSON NULL COMMENT '智能体配置（JSON数组，每个元素包含id和is_config字段）',
                     `is_config` BOOLEAN NOT NULL DEFAULT FALSE COMMENT '是否完成配置',
                     `pinned` BOOLEAN NOT NULL DEFAULT FALSE COMMENT '是否被钉（置顶）',
                     `updated_by` VARCHAR(128) NOT NULL COMMENT '更新者用户显示名称',
@@ -107,11 +109,53 @@ async def ensure_tables_exist(settings: Settings) -> None:
                     UNIQUE INDEX `idx_key` (`key`),
                     INDEX `idx_updated_by` (`updated_by`),
                     INDEX `idx_updated_at` (`updated_at`),
-                    INDEX `idx_category` (`category`)
+                    INDEX `idx_category` (`category`),
+                    INDEX `idx_category_updated_at` (`category`, `updated_at`),
+                    INDEX `idx_business_domain_updated_at` (`business_domain`, `updated_at`),
+                    INDEX `idx_pinned_updated_at` (`pinned`, `updated_at`),
+                    INDEX `idx_name` (`name`)
                 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='应用表'
                 """
             )
             
+            # 检查并创建应用引用表（应用 → 业务知识网络/智能体，由 ApplicationAdapter 与 t_application 同步写入，
+            # 按业务知识网络/智能体 ID 反查应用时走 idx_kind_ref_id 索引）
+            await _ensure_table_exists(
+                cursor,
+                settings.db_name,
+                "t_application_ref",
+                """
+                CREATE TABLE IF NOT EXISTS `t_application_ref` (
+                    `application_id` BIGINT NOT NULL COMMENT '应用主键ID（t_application.id）',
+                    `kind` VARCHAR(16) NOT NULL COMMENT '引用类型（ontology=业务知识网络，agent=智能体）',
+                    `ref_id` VARCHAR(128) NOT NULL COMMENT '业务知识网络ID或智能体ID',
+                    `is_config` BOOLEAN NOT NULL DEFAULT FALSE COMMENT '是否已配置',
+                    PRIMARY KEY (`application_id`, `kind`, `ref_id`),
+                    INDEX `idx_kind_ref_id` (`kind`, `ref_id`)
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='应用引用的业务知识网络和智能体'
+                """
+            )
+
+            # 检查并创建制品索引表（镜像/Chart 内容摘要 → 上传结果，安装/升级时跳过已上传的制品）
+            await _ensure_table_exists(
+                cursor,
+                settings.db_name,
+                "t_artifact_upload",
+                """
+                CREATE TABLE IF NOT EXISTS `t_artifact_upload` (
+                    `id` BIGINT NOT NULL AUTO_INCREMENT COMMENT '主键ID',
+                    `kind` VARCHAR(16) NOT NULL COMMENT '制品类型（image=镜像，chart=Chart）',
+                    `digest` CHAR(64) NOT NULL COMMENT '制品内容 SHA-256 摘要',
+                    `size` BIGINT NOT NULL COMMENT '文件大小（字节）',
+                    `name` VARCHAR(512) NULL COMMENT '首次上传时的安装包内路径',
+                    `result` TEXT NOT NULL COMMENT '上传结果（JSON对象）',
+                    `created_at` TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '首次上传时间',
+                    PRIMARY KEY (`id`),
+                    UNIQUE INDEX `idx_kind_digest` (`kind`, `digest`)
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='已上传制品索引表'
+                """
+            )
+            
             # 检查并添加 business_domain 字段（如果表已存在但字段不存在）
             await _ensure_column_exists(
                 cursor,
@@ -147,6 +191,46 @@ async def ensure_tables_exist(settings: Settings) -> None:
                 "pinned",
                 "ALTER TABLE `t_application` ADD COLUMN `pinned` BOOLEAN NOT NULL DEFAULT FALSE COMMENT '是否被钉（置顶）' AFTER `is_config`"
             )
+
+            # 升级脚本：检查并添加 icon_hash 字段（图标摘要），列表查询只读取摘要而不读取图标内容
+            await _ensure_column_exists(
+                cursor,
+                settings.db_name,
+                "t_application",
+                "icon_hash",
+                "ALTER TABLE `t_application` ADD COLUMN `icon_hash` CHAR(40) NULL COMMENT '应用图标 SHA-1 摘要' AFTER `icon`"
+            )
+            await _backfill_icon_hash(cursor)
+
+            # 升级脚本：应用列表分页/过滤使用的组合索引（InnoDB 二级索引隐含主键 id，
+            # 因此 (过滤列, updated_at) 即可覆盖 ORDER BY updated_at DESC, id DESC 的 keyset 分页）
+            for index_name, columns in (
+                ("idx_category_updated_at", "`category`, `updated_at`"),
+                ("idx_business_domain_updated_at", "`business_domain`, `updated_at`"),
+                ("idx_pinned_updated_at", "`pinned`, `updated_at`"),
+                ("idx_name", "`name`"),
+            ):
+                await _ensure_index_exists(
+                    cursor,
+                    settings.db_name,
+                    "t_application",
+                    index_name,
+                    f"ALTER TABLE `t_application` ADD INDEX `{index_name}` ({columns})"
+                )
+
+            # 升级脚本：JSON 字段由 TEXT 改为 JSON 类型（写入时由数据库校验格式）
+            await _ensure_json_columns(
+                cursor,
+                settings.db_name,
+                "t_application",
+                {
+                    "micro_app": "微应用配置（JSON对象）",
+                    "release_config": "应用安装配置（JSON数组，helm release名称列表）",
+                    "ontology_ids": "业务知识网络配置（JSON数组，每个元素包含id和is_config字段）",
+                    "agent_ids": "智能体配置（JSON数组，每个元素包含id和is_config字段）",
+                },
+            )
+            await _backfill_application_refs(cursor)
         
         await connection.commit()
         logger.info("数据库表检查完成")
@@ -293,3 +377,171 @@ async def _ensure_column_type_updated(
         logger.warning(f"检查/更新列类型 '{table_name}.{column_name}' 失败: {e}")
         # 不抛出异常，因为列可能已经存在或表结构不同
 
+
+async def _ensure_index_exists(
+    cursor: aiomysql.Cursor,
+    db_name: str,
+    table_name: str,
+    index_name: str,
+    alter_sql: str,
+) -> None:
+    """
+    确保索引存在，如果不存在则添加。
+
+    参数:
+        cursor: 数据库游标
+        db_name: 数据库名称
+        table_name: 表名
+        index_name: 索引名
+        alter_sql: 添加索引的 SQL 语句
+    """
+    try:
+        await cursor.execute(
+            """
+            SELECT COUNT(*) as cnt
+            FROM INFORMATION_SCHEMA.STATISTICS
+            WHERE TABLE_SCHEMA = %s
+            AND TABLE_NAME = %s
+            AND INDEX_NAME = %s
+            """,
+            (db_name, table_name, index_name)
+        )
+        result = await cursor.fetchone()
+        count = result[0] if result else 0
+
+        if count == 0:
+            await cursor.execute(alter_sql)
+            logger.info(f"✓ 表 '{table_name}' 的索引 '{index_name}' 已添加")
+        else:
+            logger.debug(f"○ 表 '{table_name}' 的索引 '{index_name}' 已存在")
+    except Exception as e:
+        logger.warning(f"检查/添加索引 '{table_name}.{index_name}' 失败: {e}")
+        # 不抛出异常，索引缺失只影响查询性能
+
+
+async def _backfill_icon_hash(cursor: aiomysql.Cursor) -> None:
+    """
+    为已有图标但尚未计算摘要的应用回填 icon_hash。
+
+    参数:
+        cursor: 数据库游标
+    """
+    try:
+        await cursor.execute(
+            "UPDATE `t_application` SET `icon_hash` = SHA1(`icon`) "
+            "WHERE `icon` IS NOT NULL AND `icon_hash` IS NULL"
+        )
+        if cursor.rowcount:
+            logger.info(f"✓ 已回填 {cursor.rowcount} 个应用的图标摘要")
+    except Exception as e:
+        logger.warning(f"回填图标摘要失败: {e}")
+
+
+async def _ensure_json_columns(
+    cursor: aiomysql.Cursor,
+    db_name: str,
+    table_name: str,
+    columns: Dict[str, str],
+) -> None:
+    """
+    将 TEXT 类型的列改为 JSON 类型（多列在同一条 ALTER 语句中修改，只重建一次表）。
+
+    修改前将不是合法 JSON 的值置为 NULL（读取时按空配置处理），否则类型转换会失败。
+    MariaDB 的 JSON 类型是带 JSON_VALID 校验的 LONGTEXT，已转换的列不再是 TEXT，不会重复修改。
+
+    参数:
+        cursor: 数据库游标
+        db_name: 数据库名称
+        table_name: 表名
+        columns: 列名 → 列注释
+    """
+    try:
+        await cursor.execute(
+            """
+            SELECT COLUMN_NAME, DATA_TYPE
+            FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_SCHEMA = %s
+            AND TABLE_NAME = %s
+            """,
+            (db_name, table_name)
+        )
+        data_types = {row[0]: str(row[1]).lower() for row in await cursor.fetchall()}
+        pending = [name for name in columns if data_types.get(name) == "text"]
+        if not pending:
+            logger.debug(f"○ 表 '{table_name}' 的 JSON 列已是 JSON 类型")
+            return
+
+        for name in pending:
+            await cursor.execute(
+                f"UPDATE `{table_name}` SET `{name}` = NULL WHERE `{name}` IS NOT NULL AND JSON_VALID(`{name}`) = 0"
+            )
+            if cursor.rowcount:
+                logger.warning(f"表 '{table_name}' 的列 '{name}' 有 {cursor.rowcount} 行不是合法 JSON，已置为 NULL")
+        modify = ", ".join(
+            f"MODIFY COLUMN `{name}` JSON NULL COMMENT '{columns[name]}'" for name in pending
+        )
+        await cursor.execute(f"ALTER TABLE `{table_name}` {modify}")
+        logger.info(f"✓ 表 '{table_name}' 的列 {pending} 已改为 JSON 类型")
+    except Exception as e:
+        logger.warning(f"修改 JSON 列类型 '{table_name}' 失败: {e}")
+        # 不抛出异常，TEXT 类型的列仍可正常读写
+
+
+def _parse_ref_ids(value: Optional[str]) -> List[Tuple[str, bool]]:
+    """
+    解析 ontology_ids/agent_ids 字段中的 (ID, 是否已配置) 列表，兼容仅包含 ID 的旧格式。
+
+    参数:
+        value: JSON 数组字符串
+
+    返回:
+        List[Tuple[str, bool]]: (ID, 是否已配置) 列表，无法解析时返回空列表
+    """
+    if not value:
+        return []
+    try:
+        data = json.loads(value)
+    except (TypeError, ValueError):
+        return []
+    refs = []
+    for item in data if isinstance(data, list) else []:
+        if isinstance(item, dict) and item.get("id") not in (None, ""):
+            refs.append((str(item["id"]), bool(item.get("is_config", False))))
+        elif isinstance(item, (int, str)) and item != "":
+            refs.append((str(item), False))
+    return refs
+
+
+async def _backfill_application_refs(cursor: aiomysql.Cursor) -> None:
+    """
+    为 t_application_ref 中还没有引用记录的应用回填引用（引用表新建后首次启动时回填全部应用）。
+
+    参数:
+        cursor: 数据库游标
+    """
+    try:
+        await cursor.execute(
+            """
+            SELECT a.id, a.ontology_ids, a.agent_ids
+            FROM t_application a
+            WHERE NOT EXISTS (SELECT 1 FROM t_application_ref r WHERE r.application_id = a.id)
+            """
+        )
+        rows = await cursor.fetchall()
+        values = []
+        for app_id, ontology_ids, agent_ids in rows:
+            seen = set()
+            for kind, refs in (("ontology", _parse_ref_ids(ontology_ids)), ("agent", _parse_ref_ids(agent_ids))):
+                for ref_id, is_config in refs:
+                    if (kind, ref_id) not in seen:
+                        seen.add((kind, ref_id))
+                        values.append((app_id, kind, ref_id, is_config))
+        if values:
+            await cursor.executemany(
+                "INSERT IGNORE INTO t_application_ref (application_id, kind, ref_id, is_config) "
+                "VALUES (%s, %s, %s, %s)",
+                values,
+            )
+            logger.info(f"✓ 已回填 {len(values)} 条应用引用记录")
+    except Exception as e:
+        logger.warning(f"回填应用引用记录失败: {e}")
@@ -0,0 +1,144 @@
+"""
+数据库连接池
+
+封装 aiomysql 连接池：连接池大小、连接回收时间、连接超时和获取连接超时均由配置指定，
+并统计获取连接的等待时间和正在等待的请求数，供指标接口输出。
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import aiomysql
+
+from src.infrastructure.config.settings import Settings
+from src.infrastructure.metrics.histogram import Histogram
+
+logger = logging.getLogger(__name__)
+
+# 获取连接等待时间的分桶上界（秒），连接池空闲时为亚毫秒级
+ACQUIRE_WAIT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class DatabasePool:
+    """
+    数据库连接池。
+
+    acquire 的用法与 aiomysql.Pool.acquire 一致（async with pool.acquire() as conn），
+    超过 db_pool_acquire_timeout 仍未获取到连接时抛出 TimeoutError，而不是无限排队。
+    """
+
+    def __init__(self, settings: Settings, acquire_wait: Optional[Histogram] = None):
+        """
+        初始化连接池（不建立连接，调用 open 后可用）。
+
+        参数:
+            settings: 应用配置
+            acquire_wait: 获取连接等待时间直方图（可选）
+        """
+        self._settings = settings
+        self._acquire_timeout = settings.db_pool_acquire_timeout
+        self._acquire_wait = acquire_wait or Histogram(buckets=ACQUIRE_WAIT_BUCKETS)
+        self._pool: Optional[aiomysql.Pool] = None
+        self.waiting = 0
+        self.acquire_timeouts = 0
+
+    async def open(self) -> None:
+        """创建 aiomysql 连接池，并建立 db_pool_minsize 个连接。"""
+        settings = self._settings
+        self._pool = await aiomysql.create_pool(
+            host=settings.db_host,
+            port=settings.db_port,
+            user=settings.db_user,
+            password=settings.db_password,
+            db=settings.db_name,
+            autocommit=True,
+            minsize=settings.db_pool_minsize,
+            maxsize=max(settings.db_pool_minsize, settings.db_pool_maxsize),
+            pool_recycle=settings.db_pool_recycle,
+            connect_timeout=settings.db_connect_timeout,
+        )
+        logger.info(
+            f"数据库连接池已创建: {settings.db_host}:{settings.db_port}/{settings.db_name}, "
+            f"minsize={self._pool.minsize}, maxsize={self._pool.maxsize}"
+        )
+
+    async def warm_up(self) -> int:
+        """
+        预热连接池：同时获取 minsize 个连接并逐个 ping，确保首个请求不需要建立连接。
+
+        返回:
+            int: 预热的连接数
+        """
+        count = self._pool.minsize
+
+        async def ping() -> None:
+            async with self.acquire() as conn:
+                await conn.ping(reconnect=True)
+
+        await asyncio.gather(*(ping() for _ in range(count)))
+        return count
+
+    @property
+    def maxsize(self) -> int:
+        """最大连接数。"""
+        return self._pool.maxsize if self._pool is not None else 0
+
+    @property
+    def free(self) -> int:
+        """空闲连接数。"""
+        return self._pool.freesize if self._pool is not None else 0
+
+    @property
+    def in_use(self) -> int:
+        """正在使用（含正在建立）的连接数。"""
+        return self._pool.size - self._pool.freesize if self._pool is not None else 0
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[aiomysql.Connection]:
+        """
+        获取连接，退出上下文时归还。
+
+        异常:
+            TimeoutError: 超过 db_pool_acquire_timeout 仍未获取到连接时抛出
+        """
+        started = time.perf_counter()
+        self.waiting += 1
+        task = asyncio.ensure_future(self._pool.acquire())
+        try:
+            timeout = self._acquire_timeout if self._acquire_timeout > 0 else None
+            conn = await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            self.acquire_timeouts += 1
+            # 超时与获取成功同时发生时归还连接，避免泄漏
+            task.add_done_callback(self._release_abandoned)
+            task.cancel()
+            logger.warning(
+                f"[DatabasePool] 获取数据库连接超时（{self._acquire_timeout}s），"
+                f"使用中 {self.in_use}/{self.maxsize}，等待 {self.waiting - 1}"
+            )
+            raise TimeoutError(f"获取数据库连接超时（{self._acquire_timeout}s）")
+        except BaseException:
+            task.add_done_callback(self._release_abandoned)
+            task.cancel()
+            raise
+        finally:
+            self.waiting -= 1
+            self._acquire_wait.observe(time.perf_counter() - started)
+        try:
+            yield conn
+        finally:
+            await self._pool.release(conn)
+
+    def _release_abandoned(self, task: asyncio.Future) -> None:
+        """归还已放弃等待但最终获取成功的连接。"""
+        if task.cancelled() or task.exception() is not None:
+            return
+        asyncio.ensure_future(self._pool.release(task.result()))
+
+    async def close(self) -> None:
+        """关闭连接池。"""
+        if self._pool is not None:
+            self._pool.close()
+            await self._pool.wait_closed()
@@ -192,6 +192,24 @@ class ExternalServiceError(BusinessException):
         )
 
 
+class ServiceUnavailableError(BusinessException):
+    """服务暂时不可用异常（如任务队列已满）。"""
+    def __init__(
+        self,
+        description: str = "服务暂时不可用",
+        code: str = "SERVICE_UNAVAILABLE",
+        solution: Optional[str] = "请稍后重试",
+        detail: Optional[dict] = None,
+    ):
+        super().__init__(
+            code=code,
+            description=description,
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            solution=solution,
+            detail=detail,
+        )
+
+
 def create_error_response(
     status_code: int,
     code: str,
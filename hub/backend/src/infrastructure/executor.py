@@ -0,0 +1,79 @@
+"""
+阻塞任务执行器
+
+为 ZIP 读取、文件操作、YAML 解析等阻塞 I/O 和 CPU 任务提供专用的有界线程池，
+避免这些任务阻塞事件循环，也避免占满 asyncio 默认线程池。
+"""
+import asyncio
+import contextvars
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class BlockingExecutor:
+    """
+    有界阻塞任务执行器。
+
+    最多 max_workers 个任务同时执行，其余任务排队等待。
+    任务在调用方的上下文副本中执行（与 asyncio.to_thread 一致），可读取 TokenContext 等上下文变量。
+    """
+
+    def __init__(self, max_workers: int, thread_name_prefix: str = "dip-hub-blocking"):
+        """
+        初始化执行器（线程按需创建）。
+
+        参数:
+            max_workers: 最大线程数
+            thread_name_prefix: 线程名前缀
+        """
+        self._max_workers = max(1, max_workers)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._max_workers, thread_name_prefix=thread_name_prefix
+        )
+        # 已提交但尚未完成的任务数（含排队中的任务）
+        self._pending = 0
+
+    @property
+    def max_workers(self) -> int:
+        """最大线程数。"""
+        return self._max_workers
+
+    @property
+    def pending(self) -> int:
+        """已提交但尚未完成的任务数（含排队中的任务）。"""
+        return self._pending
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        在线程池中执行阻塞函数并等待结果。
+
+        参数:
+            func: 阻塞函数
+            args: 位置参数
+            kwargs: 关键字参数
+
+        返回:
+            T: 函数返回值
+        """
+        loop = asyncio.get_running_loop()
+        call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+        self._pending += 1
+        try:
+            return await loop.run_in_executor(self._executor, call)
+        finally:
+            self._pending -= 1
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        关闭线程池，取消排队中的任务。
+
+        参数:
+            wait: 是否等待执行中的任务完成
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,128 @@
+"""
+HTTP 客户端连接池
+
+为每个上游服务维护一个长期存活的 HTTP 客户端（aiohttp.ClientSession 或
+httpx.AsyncClient），复用 TCP/TLS 连接，避免每次请求都重新握手。
+客户端在首次使用时创建，由容器在应用关闭时统一释放。
+"""
+import importlib.util
+import logging
+from typing import Dict
+
+import aiohttp
+import httpx
+
+from src.infrastructure.config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+
+def _http2_available() -> bool:
+    """
+    检查 httpx 的 HTTP/2 依赖（h2）是否已安装。
+
+    返回:
+        bool: 是否可以启用 HTTP/2
+    """
+    return importlib.util.find_spec("h2") is not None
+
+
+class HttpClientPool:
+    """
+    HTTP 客户端连接池。
+
+    按上游服务名称缓存客户端实例，同一上游的所有请求共享连接池。
+    aiohttp 不支持 HTTP/2，HTTP/2 仅对 httpx 客户端生效。
+    """
+
+    def __init__(self, settings: Settings):
+        """
+        初始化连接池。
+
+        参数:
+            settings: 应用配置
+        """
+        self._limit = settings.http_pool_limit
+        self._limit_per_host = settings.http_pool_limit_per_host
+        self._keepalive_timeout = settings.http_pool_keepalive_timeout
+        self._http2 = settings.http2_enabled and _http2_available()
+        if settings.http2_enabled and not self._http2:
+            logger.info("未安装 h2，httpx 客户端使用 HTTP/1.1")
+        self._aiohttp_sessions: Dict[str, aiohttp.ClientSession] = {}
+        self._httpx_clients: Dict[str, httpx.AsyncClient] = {}
+
+    def get_aiohttp_session(self, name: str, verify_ssl: bool = True) -> aiohttp.ClientSession:
+        """
+        获取指定上游服务的 aiohttp 会话（单例）。
+
+        会话不设置默认超时，调用方应在每次请求时传入 timeout。
+
+        参数:
+            name: 上游服务名称
+            verify_ssl: 是否校验 SSL 证书
+
+        返回:
+            aiohttp.ClientSession: 共享会话
+        """
+        session = self._aiohttp_sessions.get(name)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self._limit,
+                limit_per_host=self._limit_per_host,
+                keepalive_timeout=self._keepalive_timeout,
+                ssl=None if verify_ssl else False,
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=None),
+            )
+            self._aiohttp_sessions[name] = session
+            logger.info(
+                f"[HttpClientPool] 创建 aiohttp 连接池: {name}, "
+                f"limit={self._limit}, limit_per_host={self._limit_per_host}"
+            )
+        return session
+
+    def get_httpx_client(self, name: str, verify: bool = True) -> httpx.AsyncClient:
+        """
+        获取指定上游服务的 httpx 客户端（单例）。
+
+        客户端不设置默认超时，调用方应在每次请求时传入 timeout。
+
+        参数:
+            name: 上游服务名称
+            verify: 是否校验 SSL 证书
+
+        返回:
+            httpx.AsyncClient: 共享客户端
+        """
+        client = self._httpx_clients.get(name)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self._limit_per_host,
+                    max_keepalive_connections=self._limit_per_host,
+                    keepalive_expiry=self._keepalive_timeout,
+                ),
+                http2=self._http2,
+                verify=verify,
+                timeout=None,
+            )
+            self._httpx_clients[name] = client
+            logger.info(
+                f"[HttpClientPool] 创建 httpx 连接池: {name}, "
+                f"max_connections={self._limit_per_host}, http2={self._http2}"
+            )
+        return client
+
+    async def close(self) -> None:
+        """关闭所有客户端，释放连接。"""
+        for session in self._aiohttp_sessions.values():
+            if not session.closed:
+                await session.close()
+        for client in self._httpx_clients.values():
+            if not client.is_closed:
+                await client.aclose()
+        self._aiohttp_sessions.clear()
+        self._httpx_clients.clear()
+
@@ -0,0 +1,12 @@
+"""
+指标模块
+
+提供 Prometheus 文本格式的指标注册表、直方图、阶段计时器、事件循环延迟监控等运行时指标相关的基础设施功能。
+"""
+from src.infrastructure.metrics.registry import MetricsRegistry
+from src.infrastructure.metrics.histogram import Histogram
+from src.infrastructure.metrics.stage_timer import StageTimer
+from src.infrastructure.metrics.install_metrics import InstallMetrics
+from src.infrastructure.metrics.loop_lag import LoopLagMonitor
+
+__all__ = ["MetricsRegistry", "Histogram", "StageTimer", "InstallMetrics", "LoopLagMonitor"]
@@ -0,0 +1,94 @@
+"""
+直方图指标
+
+按标签分组累计观测值的分布，抓取时输出 Prometheus 直方图格式（_bucket/_sum/_count）。
+"""
+import math
+import threading
+from typing import Dict, List, Sequence, Tuple
+
+# 默认分桶上界（秒），覆盖从毫秒级的元数据读取到十分钟级的镜像上传
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0,
+)
+
+
+class _Series:
+    """单组标签的累计值。"""
+
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, bucket_count: int):
+        self.counts = [0] * bucket_count
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram:
+    """
+    直方图。
+
+    observe 可在任意线程调用；分桶上界自动追加 +Inf。
+    """
+
+    def __init__(self, label_names: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        初始化直方图。
+
+        参数:
+            label_names: 标签名
+            buckets: 分桶上界（升序）
+        """
+        bounds = sorted(float(b) for b in buckets)
+        if not bounds or not math.isinf(bounds[-1]):
+            bounds.append(math.inf)
+        self._label_names = tuple(label_names)
+        self._bounds = tuple(bounds)
+        self._series: Dict[Tuple[str, ...], _Series] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        """
+        记录一次观测值。
+
+        参数:
+            value: 观测值
+            labels: 标签值，必须与 label_names 一致
+
+        异常:
+            ValueError: 当标签与 label_names 不一致时抛出
+        """
+        if set(labels) != set(self._label_names):
+            raise ValueError(f"标签应为 {self._label_names}，实际为 {tuple(labels)}")
+        key = tuple(str(labels[name]) for name in self._label_names)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(len(self._bounds))
+            for i, bound in enumerate(self._bounds):
+                if value <= bound:
+                    series.counts[i] += 1
+                    break
+            series.sum += value
+            series.count += 1
+
+    def collect(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """
+        读取全部样本。
+
+        返回:
+            List[Tuple[str, Dict[str, str], float]]: (指标名后缀, 标签, 值) 列表，桶计数为累计值
+        """
+        with self._lock:
+            snapshot = [(key, list(s.counts), s.sum, s.count) for key, s in self._series.items()]
+        samples: List[Tuple[str, Dict[str, str], float]] = []
+        for key, counts, total, count in snapshot:
+            labels = dict(zip(self._label_names, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self._bounds, counts):
+                cumulative += bucket_count
+                le = "+Inf" if math.isinf(bound) else repr(bound)
+                samples.append(("_bucket", {**labels, "le": le}, cumulative))
+            samples.append(("_sum", labels, total))
+            samples.append(("_count", labels, count))
+        return samples
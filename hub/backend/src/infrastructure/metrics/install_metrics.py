@@ -0,0 +1,81 @@
+"""
+安装指标
+
+登记安装应用的阶段耗时直方图、总耗时直方图和制品字节数计数器。
+"""
+import threading
+from typing import Dict, Optional, Tuple
+
+from src.infrastructure.metrics.histogram import Histogram
+from src.infrastructure.metrics.registry import MetricsRegistry
+
+
+class InstallMetrics:
+    """
+    安装指标。
+
+    未提供注册表时只在内存中累计（不输出），便于在不暴露指标的场景中复用同一调用方式。
+    """
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        """
+        初始化并向注册表登记安装指标。
+
+        参数:
+            registry: 指标注册表（可选）
+        """
+        self._stage_seconds = Histogram(label_names=("stage",))
+        self._install_seconds = Histogram(label_names=("result",))
+        self._artifact_bytes: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.register_histogram(
+                "install_stage_duration_seconds", "安装应用各阶段耗时（秒）", self._stage_seconds
+            )
+            registry.register_histogram(
+                "install_duration_seconds", "安装应用总耗时（秒），按结果（success/failure）区分", self._install_seconds
+            )
+            registry.register_counter(
+                "install_artifact_bytes_total",
+                "安装应用时处理的镜像/Chart 字节数，按类型和结果（uploaded=已上传，skipped=内容已上传过而跳过）区分",
+                self._artifact_byte_samples,
+            )
+
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        """
+        记录一个阶段的耗时。
+
+        参数:
+            stage: 阶段名
+            seconds: 耗时（秒）
+        """
+        self._stage_seconds.observe(seconds, stage=stage)
+
+    def observe_install(self, succeeded: bool, seconds: float) -> None:
+        """
+        记录一次安装的总耗时。
+
+        参数:
+            succeeded: 是否安装成功
+            seconds: 耗时（秒）
+        """
+        self._install_seconds.observe(seconds, result="success" if succeeded else "failure")
+
+    def add_artifact_bytes(self, kind: str, size: int, skipped: bool = False) -> None:
+        """
+        累计镜像/Chart 字节数。
+
+        参数:
+            kind: 制品类型（image/chart）
+            size: 字节数
+            skipped: 是否因内容已上传过而跳过上传
+        """
+        key = (kind, "skipped" if skipped else "uploaded")
+        with self._lock:
+            self._artifact_bytes[key] = self._artifact_bytes.get(key, 0) + size
+
+    def _artifact_byte_samples(self):
+        """读取制品字节数样本。"""
+        with self._lock:
+            items = list(self._artifact_bytes.items())
+        return [({"kind": kind, "result": result}, value) for (kind, result), value in items]
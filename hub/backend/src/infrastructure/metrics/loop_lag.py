@@ -0,0 +1,88 @@
+"""
+事件循环延迟监控
+
+后台任务按固定间隔休眠，以实际唤醒时间与预期唤醒时间之差作为事件循环延迟。
+事件循环被阻塞时，同一 worker 上的所有请求（健康检查、列表查询、认证等）都会被延迟相同的时间。
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Callable, Deque, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LoopLagMonitor:
+    """
+    事件循环延迟监控器。
+
+    记录最近一次延迟、最近 window 个采样的最大延迟，以及累计采样数和累计延迟；
+    延迟超过 warn_threshold 时记录告警日志。
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.5,
+        warn_threshold: float = 0.2,
+        window: int = 120,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        """
+        初始化监控器。
+
+        参数:
+            interval: 采样间隔（秒）
+            warn_threshold: 记录告警日志的延迟阈值（秒），<=0 表示不告警
+            window: 计算最近最大延迟的采样数
+            clock: 单调时钟（测试时可替换）
+        """
+        self._interval = interval
+        self._warn_threshold = warn_threshold
+        self._clock = clock
+        self._recent: Deque[float] = deque(maxlen=max(1, window))
+        self._task: Optional[asyncio.Task] = None
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.samples = 0
+        self.lag_sum = 0.0
+
+    @property
+    def recent_max_lag(self) -> float:
+        """最近 window 个采样中的最大延迟（秒）。"""
+        return max(self._recent, default=0.0)
+
+    def record(self, lag: float) -> None:
+        """
+        记录一次延迟采样。
+
+        参数:
+            lag: 延迟（秒），负数按 0 计
+        """
+        lag = max(0.0, lag)
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.samples += 1
+        self.lag_sum += lag
+        self._recent.append(lag)
+        if 0 < self._warn_threshold <= lag:
+            logger.warning(f"[LoopLagMonitor] 事件循环延迟 {lag * 1000:.0f} ms，可能有阻塞操作在事件循环中执行")
+
+    def start(self) -> None:
+        """启动后台采样任务（重复调用无副作用）。"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """停止后台采样任务。"""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _run(self) -> None:
+        """按间隔休眠并记录唤醒延迟。"""
+        while True:
+            expected = self._clock() + self._interval
+            await asyncio.sleep(self._interval)
+            self.record(self._clock() - expected)
@@ -0,0 +1,125 @@
+"""
+指标注册表
+
+以回调方式登记运行时指标，抓取时读取当前值并输出 Prometheus 文本格式，
+不引入额外依赖。
+"""
+import logging
+import math
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Tuple, Union
+
+from src.infrastructure.metrics.histogram import Histogram
+
+logger = logging.getLogger(__name__)
+
+# 指标回调返回单个值，或 (标签, 值) 列表
+MetricValue = Union[float, Iterable[Tuple[Dict[str, str], float]]]
+
+
+@dataclass
+class _Metric:
+    """已登记的指标。"""
+    name: str
+    help: str
+    type: str
+    callback: Callable[[], MetricValue]
+
+
+def _escape_label_value(value: str) -> str:
+    """转义标签值中的反斜杠、双引号和换行。"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    """格式化指标值。"""
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """
+    指标注册表。
+
+    同名指标重复登记时覆盖旧的回调。单个指标回调失败时跳过该指标，不影响其他指标。
+    """
+
+    def __init__(self, prefix: str = "dip_hub_"):
+        """
+        初始化注册表。
+
+        参数:
+            prefix: 指标名前缀
+        """
+        self._prefix = prefix
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register_gauge(self, name: str, help: str, callback: Callable[[], MetricValue]) -> None:
+        """
+        登记瞬时值指标。
+
+        参数:
+            name: 指标名（不含前缀）
+            help: 指标说明
+            callback: 返回当前值的函数
+        """
+        self._register(name, help, "gauge", callback)
+
+    def register_counter(self, name: str, help: str, callback: Callable[[], MetricValue]) -> None:
+        """
+        登记单调递增的计数指标。
+
+        参数:
+            name: 指标名（不含前缀，按惯例以 _total 结尾）
+            help: 指标说明
+            callback: 返回当前累计值的函数
+        """
+        self._register(name, help, "counter", callback)
+
+    def register_histogram(self, name: str, help: str, histogram: Histogram) -> None:
+        """
+        登记直方图指标。
+
+        参数:
+            name: 指标名（不含前缀，输出时追加 _bucket/_sum/_count）
+            help: 指标说明
+            histogram: 直方图
+        """
+        self._register(name, help, "histogram", histogram.collect)
+
+    def _register(self, name: str, help: str, metric_type: str, callback: Callable[[], MetricValue]) -> None:
+        full_name = self._prefix + name
+        self._metrics[full_name] = _Metric(full_name, help, metric_type, callback)
+
+    def render(self) -> str:
+        """
+        读取全部指标并输出 Prometheus 文本格式。
+
+        返回:
+            str: 文本格式的指标
+        """
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            try:
+                value = metric.callback()
+                if metric.type == "histogram":
+                    samples = [(metric.name + suffix, labels, sample) for suffix, labels, sample in value]
+                elif isinstance(value, (int, float)):
+                    samples = [(metric.name, {}, value)]
+                else:
+                    samples = [(metric.name, labels, sample) for labels, sample in value]
+            except Exception as e:
+                logger.warning(f"[MetricsRegistry] 读取指标失败: {metric.name}, {e}")
+                continue
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for sample_name, labels, sample in samples:
+                if labels:
+                    label_text = ",".join(f'{k}="{_escape_label_value(v)}"' for k, v in labels.items())
+                    lines.append(f"{sample_name}{{{label_text}}} {_format_value(sample)}")
+                else:
+                    lines.append(f"{sample_name} {_format_value(sample)}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,86 @@
+"""
+阶段计时器
+
+记录一次多阶段处理（如安装应用）中各阶段的耗时：
+顺序执行的阶段用 begin/stop 首尾相接地计时，并发执行的子阶段用 stage 上下文管理器单独计时。
+"""
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+
+class StageTimer:
+    """
+    阶段计时器（单次处理使用一个实例）。
+
+    同名阶段多次计时时耗时累加。并发子阶段的耗时与所在顺序阶段重叠，各阶段耗时之和可能大于总耗时。
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        """
+        初始化计时器，从创建时开始计算总耗时。
+
+        参数:
+            clock: 单调时钟（测试时可替换）
+        """
+        self._clock = clock
+        self._started = clock()
+        self._durations: Dict[str, float] = {}
+        self._current: Optional[str] = None
+        self._current_started = 0.0
+
+    def begin(self, name: str) -> None:
+        """
+        结束当前顺序阶段（如有）并开始新的顺序阶段。
+
+        参数:
+            name: 阶段名
+        """
+        self.stop()
+        self._current = name
+        self._current_started = self._clock()
+
+    def stop(self) -> None:
+        """结束当前顺序阶段（没有进行中的阶段时无操作）。"""
+        if self._current is not None:
+            self.record(self._current, self._clock() - self._current_started)
+            self._current = None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        对代码块计时（不影响当前顺序阶段），代码块抛出异常时也记录耗时。
+
+        参数:
+            name: 阶段名
+        """
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self.record(name, self._clock() - started)
+
+    def record(self, name: str, seconds: float) -> None:
+        """
+        直接记录阶段耗时（如由各制品耗时推算出的并发阶段跨度）。
+
+        参数:
+            name: 阶段名
+            seconds: 耗时（秒）
+        """
+        self._durations[name] = self._durations.get(name, 0.0) + max(0.0, seconds)
+
+    @property
+    def current(self) -> Optional[str]:
+        """进行中的顺序阶段，没有时为 None。"""
+        return self._current
+
+    @property
+    def durations(self) -> Dict[str, float]:
+        """已结束阶段的耗时（秒），按首次记录顺序排列。"""
+        return dict(self._durations)
+
+    @property
+    def elapsed(self) -> float:
+        """从创建计时器到现在的总耗时（秒）。"""
+        return self._clock() - self._started
@@ -0,0 +1,40 @@
+"""
+上传模块
+
+提供请求体流式落盘、可续传的分块上传、安装包读取等上传相关的基础设施功能。
+"""
+from src.infrastructure.upload.package_ingest import (
+    IngestedPackage,
+    ingest_stream_to_file,
+    remove_file_quietly,
+)
+from src.infrastructure.upload.package_archive import (
+    IncompletePackageError,
+    PackageArchive,
+    ZipPackageArchive,
+    DirectoryPackageArchive,
+)
+from src.infrastructure.upload.resumable_upload import (
+    ChunkChecksumError,
+    ChunkInProgressError,
+    ResumableUploadStore,
+    UploadCompletingError,
+    UploadIncompleteError,
+    UploadSession,
+)
+
+__all__ = [
+    "IngestedPackage",
+    "ingest_stream_to_file",
+    "remove_file_quietly",
+    "IncompletePackageError",
+    "PackageArchive",
+    "ZipPackageArchive",
+    "DirectoryPackageArchive",
+    "ChunkChecksumError",
+    "ChunkInProgressError",
+    "ResumableUploadStore",
+    "UploadCompletingError",
+    "UploadIncompleteError",
+    "UploadSession",
+]
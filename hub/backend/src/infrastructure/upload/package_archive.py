@@ -0,0 +1,414 @@
+"""
+安装包读取
+
+提供统一的安装包文件访问接口，路径均为安装包内以 "/" 分隔的相对路径：
+- ZipPackageArchive：基于 ZIP 中央目录定位文件，按需读取小文件，大文件（镜像、Chart）
+  通过 ZipFile.open 流式读取，不解压到磁盘；分块上传未完成时可限定只读取已收到的字节区间；
+- DirectoryPackageArchive：读取已解压到目录的安装包。
+"""
+import bisect
+import io
+import logging
+import os
+import posixpath
+import zipfile
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class IncompletePackageError(Exception):
+    """
+    读取安装包需要尚未收到的字节区间（分块上传未完成）。
+
+    属性:
+        ranges: 需要的字节区间 [起始偏移, 结束偏移) 列表
+    """
+
+    def __init__(self, ranges: List[Tuple[int, int]]):
+        self.ranges = sorted(set(ranges))
+        super().__init__(f"安装包还缺少 {len(self.ranges)} 个字节区间")
+
+
+class _RangeNotReceivedError(OSError):
+    """读取了尚未收到的字节区间。"""
+
+
+class _ReceivedRangesFile(io.RawIOBase):
+    """
+    只允许读取已收到字节区间的只读文件。
+
+    读取范围超出已收到的区间时记录该范围并抛出 OSError（ZipFile 会将其视为读取失败）。
+    """
+
+    def __init__(self, path: str, ranges: List[Tuple[int, int]]):
+        """
+        打开文件。
+
+        参数:
+            path: 文件路径
+            ranges: 已收到的字节区间 [起始偏移, 结束偏移) 列表，按偏移升序且互不相邻
+        """
+        super().__init__()
+        self._file = open(path, "rb")
+        self._starts = [start for start, _ in ranges]
+        self._ranges = ranges
+        self.missing_ranges: List[Tuple[int, int]] = []
+
+    def is_received(self, start: int, end: int) -> bool:
+        """判断 [start, end) 是否都已收到。"""
+        if start >= end:
+            return True
+        index = bisect.bisect_right(self._starts, start) - 1
+        return index >= 0 and self._ranges[index][1] >= end
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self._file.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def read(self, size: int = -1) -> bytes:
+        start = self._file.tell()
+        file_size = os.fstat(self._file.fileno()).st_size
+        end = file_size if size is None or size < 0 else min(start + size, file_size)
+        if not self.is_received(start, end):
+            self.missing_ranges.append((start, end))
+            raise _RangeNotReceivedError(f"字节区间 [{start}, {end}) 尚未上传")
+        return self._file.read(end - start)
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        self._file.close()
+        super().close()
+
+
+class PackageArchive(ABC):
+    """
+    安装包文件访问接口。
+
+    支持 with 语句，退出时关闭底层资源。
+    """
+
+    @abstractmethod
+    def find_file(self, filenames: List[str]) -> Optional[str]:
+        """
+        从安装包根目录逐层（广度优先，同层目录按名称排序）查找文件。
+
+        参数:
+            filenames: 要查找的文件名列表（按优先级排序）
+
+        返回:
+            Optional[str]: 找到的文件路径，未找到返回 None
+        """
+        pass
+
+    @abstractmethod
+    def is_dir(self, path: str) -> bool:
+        """
+        判断目录是否存在。
+
+        参数:
+            path: 目录路径，"" 表示安装包根目录
+
+        返回:
+            bool: 目录存在返回 True
+        """
+        pass
+
+    @abstractmethod
+    def is_file(self, path: str) -> bool:
+        """
+        判断文件是否存在。
+
+        参数:
+            path: 文件路径
+
+        返回:
+            bool: 文件存在返回 True
+        """
+        pass
+
+    @abstractmethod
+    def list_files(self, path: str) -> List[str]:
+        """
+        列出目录下（不含子目录）的文件名。
+
+        参数:
+            path: 目录路径，"" 表示安装包根目录
+
+        返回:
+            List[str]: 按名称排序的文件名，目录不存在时返回空列表
+        """
+        pass
+
+    @abstractmethod
+    def file_size(self, path: str) -> int:
+        """
+        获取文件（解压后）大小。
+
+        参数:
+            path: 文件路径
+
+        返回:
+            int: 文件大小（字节）
+        """
+        pass
+
+    @abstractmethod
+    def open(self, path: str) -> BinaryIO:
+        """
+        以二进制只读方式打开文件，用于流式读取。
+
+        参数:
+            path: 文件路径
+
+        返回:
+            BinaryIO: 文件对象，由调用方关闭
+        """
+        pass
+
+    def read_bytes(self, path: str) -> bytes:
+        """
+        读取文件全部内容，仅用于小文件（manifest、图标、配置文件等）。
+
+        参数:
+            path: 文件路径
+
+        返回:
+            bytes: 文件内容
+        """
+        with self.open(path) as f:
+            return f.read()
+
+    def close(self) -> None:
+        """关闭底层资源。"""
+
+    def __enter__(self) -> "PackageArchive":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class ZipPackageArchive(PackageArchive):
+    """
+    基于 ZIP 中央目录的安装包。
+
+    打开时只读取中央目录建立文件索引，不解压任何成员。
+    不同成员可在多个线程中同时读取（ZipFile 内部对共享文件句柄加锁）。
+
+    传入 received_ranges 时只读取这些字节区间：结尾记录和中央目录所在的区间缺失时构造失败，
+    成员所在的区间缺失时 open 失败，缺失的区间都记录在 missing_ranges 中。
+    """
+
+    def __init__(self, zip_path: str, received_ranges: Optional[List[Tuple[int, int]]] = None):
+        """
+        打开 ZIP 安装包并建立文件索引。
+
+        参数:
+            zip_path: ZIP 文件路径
+            received_ranges: 已收到的字节区间 [起始偏移, 结束偏移) 列表（按偏移升序），None 表示文件完整
+
+        异常:
+            ValueError: 当 ZIP 文件格式错误时抛出
+            IncompletePackageError: 当 ZIP 结尾记录或中央目录所在的字节区间尚未收到时抛出
+        """
+        self._file: Optional[_ReceivedRangesFile] = None
+        self.missing_ranges: List[Tuple[int, int]] = []
+        if received_ranges is not None:
+            self._file = _ReceivedRangesFile(zip_path, received_ranges)
+        try:
+            self._zip = zipfile.ZipFile(self._file or zip_path, "r")
+        except (zipfile.BadZipFile, OSError) as e:
+            if self._file is not None:
+                self._file.close()
+                if self._file.missing_ranges:
+                    raise IncompletePackageError(self._file.missing_ranges)
+            if isinstance(e, zipfile.BadZipFile):
+                raise ValueError(f"无效的 ZIP 文件格式: {str(e)}")
+            raise
+
+        self._files: Dict[str, zipfile.ZipInfo] = {}
+        self._dirs: Dict[str, List[str]] = {"": []}
+        for info in self._zip.infolist():
+            name = info.filename.strip("/")
+            if info.is_dir():
+                self._add_dir(name)
+                continue
+            directory, basename = posixpath.split(name)
+            self._files[name] = info
+            self._add_dir(directory)
+            self._dirs[directory].append(basename)
+        for names in self._dirs.values():
+            names.sort()
+        # 成员在 ZIP 文件中的区间：从本地文件头到下一个成员（或中央目录）之前
+        self._member_ends: Dict[str, int] = {}
+        if self._file is not None:
+            offsets = sorted({info.header_offset for info in self._files.values()} | {self._zip.start_dir})
+            for name, info in self._files.items():
+                self._member_ends[name] = offsets[bisect.bisect_right(offsets, info.header_offset)]
+
+    def _add_dir(self, path: str) -> None:
+        """登记目录及其所有上级目录（ZIP 中不一定有目录成员）。"""
+        while path and path not in self._dirs:
+            self._dirs[path] = []
+            path = posixpath.dirname(path)
+
+    def __len__(self) -> int:
+        """安装包中的文件数量（不含目录）。"""
+        return len(self._files)
+
+    def find_file(self, filenames: List[str]) -> Optional[str]:
+        """
+        从安装包根目录逐层查找文件，结果与在解压目录中广度优先查找一致。
+
+        参数:
+            filenames: 要查找的文件名列表（按优先级排序）
+
+        返回:
+            Optional[str]: 找到的文件路径，未找到返回 None
+        """
+        best_key = None
+        best_path = None
+        for directory, names in self._dirs.items():
+            for priority, filename in enumerate(filenames):
+                if filename not in names:
+                    continue
+                parts = tuple(directory.split("/")) if directory else ()
+                # 广度优先 + 同层按名称排序的访问顺序即 (深度, 路径各级名称) 的字典序
+                key = (len(parts), parts, priority)
+                if best_key is None or key < best_key:
+                    best_key = key
+                    best_path = posixpath.join(directory, filename)
+                break
+        if best_path is None:
+            logger.warning(f"[find_file] 未找到文件 {filenames}，已搜索 {len(self._dirs)} 个目录")
+        else:
+            logger.info(f"[find_file] 找到文件: {best_path}")
+        return best_path
+
+    def is_dir(self, path: str) -> bool:
+        return path.strip("/") in self._dirs
+
+    def is_file(self, path: str) -> bool:
+        return path in self._files
+
+    def list_files(self, path: str) -> List[str]:
+        return list(self._dirs.get(path.strip("/"), []))
+
+    def file_size(self, path: str) -> int:
+        return self._files[path].file_size
+
+    def open(self, path: str) -> BinaryIO:
+        info = self._files.get(path)
+        if info is None:
+            raise FileNotFoundError(path)
+        if self._file is not None:
+            member_range = (info.header_offset, self._member_ends[path])
+            if not self._file.is_received(*member_range):
+                self.missing_ranges.append(member_range)
+                raise IncompletePackageError([member_range])
+        return self._zip.open(info, "r")
+
+    def check_complete(self) -> None:
+        """
+        确认此前读取的成员都在已收到的字节区间内。
+
+        异常:
+            IncompletePackageError: 当有成员所在的字节区间尚未收到时抛出
+        """
+        if self.missing_ranges:
+            raise IncompletePackageError(self.missing_ranges)
+
+    def close(self) -> None:
+        self._zip.close()
+        if self._file is not None:
+            self._file.close()
+
+
+class DirectoryPackageArchive(PackageArchive):
+    """已解压到目录的安装包。"""
+
+    def __init__(self, root_dir: str):
+        """
+        初始化。
+
+        参数:
+            root_dir: 解压目录
+        """
+        self._root_dir = root_dir
+
+    def _full_path(self, path: str) -> str:
+        """将安装包内路径转换为本地文件路径。"""
+        parts = [part for part in path.split("/") if part]
+        return os.path.join(self._root_dir, *parts)
+
+    def find_file(self, filenames: List[str]) -> Optional[str]:
+        """
+        从解压目录逐层（广度优先）查找文件。
+
+        参数:
+            filenames: 要查找的文件名列表（按优先级排序）
+
+        返回:
+            Optional[str]: 找到的文件路径，未找到返回 None
+        """
+        if not os.path.isdir(self._root_dir):
+            logger.error(f"[find_file] 起始目录不存在或不是目录: {self._root_dir}")
+            return None
+
+        queue = deque([""])
+        searched = 0
+        while queue:
+            current = queue.popleft()
+            searched += 1
+            try:
+                entries = os.listdir(self._full_path(current))
+            except OSError as e:
+                logger.warning(f"[find_file] 无法读取目录 {current or '/'}: {e}")
+                continue
+
+            for filename in filenames:
+                if filename in entries and self.is_file(posixpath.join(current, filename)):
+                    path = posixpath.join(current, filename)
+                    logger.info(f"[find_file] 找到文件: {path}")
+                    return path
+
+            # 将子目录加入队列（排序以保证一致性）
+            for entry in sorted(entries):
+                if self.is_dir(posixpath.join(current, entry)):
+                    queue.append(posixpath.join(current, entry))
+
+        logger.warning(f"[find_file] 未找到文件 {filenames}，已搜索 {searched} 个目录")
+        return None
+
+    def is_dir(self, path: str) -> bool:
+        return os.path.isdir(self._full_path(path))
+
+    def is_file(self, path: str) -> bool:
+        return os.path.isfile(self._full_path(path))
+
+    def list_files(self, path: str) -> List[str]:
+        directory = self._full_path(path)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(f for f in os.listdir(directory) if os.path.isfile(os.path.join(directory, f)))
+
+    def file_size(self, path: str) -> int:
+        return os.path.getsize(self._full_path(path))
+
+    def open(self, path: str) -> BinaryIO:
+        return open(self._full_path(path), "rb")
@@ -0,0 +1,125 @@
+"""
+安装包流式接收
+
+将 HTTP 请求体按块写入临时目录下的文件，同时计算大小和 SHA-256 摘要，
+避免把整个安装包读入内存。
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Optional
+
+from src.infrastructure.executor import BlockingExecutor
+
+logger = logging.getLogger(__name__)
+
+# 内存中累积的待写入数据达到该大小后再落盘，减少小块写入的系统调用次数
+DEFAULT_WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+@dataclass
+class IngestedPackage:
+    """
+    已落盘的安装包。
+
+    属性:
+        path: 临时文件路径
+        size: 文件大小（字节）
+        sha256: 文件内容的 SHA-256 摘要（十六进制）
+    """
+    path: str
+    size: int
+    sha256: str
+
+
+async def ingest_stream_to_file(
+    stream: AsyncIterator[bytes],
+    temp_dir: str,
+    suffix: str = ".zip",
+    write_buffer_size: int = DEFAULT_WRITE_BUFFER_SIZE,
+    executor: Optional[BlockingExecutor] = None,
+) -> IngestedPackage:
+    """
+    将字节流写入临时文件，边写边计算大小和摘要。
+
+    内存中最多保留 write_buffer_size 字节的待写入数据，与安装包大小无关。
+    写入失败（如客户端断开）时删除已写入的部分文件。
+    文件创建和落盘在 executor 中执行，不阻塞事件循环；落盘期间继续接收下一批数据。
+
+    参数:
+        stream: 异步字节流（如 request.stream()）
+        temp_dir: 临时文件所在目录，不存在时自动创建
+        suffix: 临时文件后缀
+        write_buffer_size: 落盘前在内存中累积的最大字节数
+        executor: 执行文件操作的阻塞任务执行器（可选，未提供时使用 asyncio 默认线程池）
+
+    返回:
+        IngestedPackage: 落盘后的安装包信息
+    """
+    async def run_blocking(func: Callable[..., Any], *args: Any) -> Any:
+        if executor is not None:
+            return await executor.run(func, *args)
+        return await asyncio.to_thread(func, *args)
+
+    path = await run_blocking(_create_temp_file, temp_dir, suffix)
+    digest = hashlib.sha256()
+    size = 0
+    pending = bytearray()
+    try:
+        f = await run_blocking(open, path, "wb")
+        try:
+            async for chunk in stream:
+                if not chunk:
+                    continue
+                digest.update(chunk)
+                size += len(chunk)
+                pending += chunk
+                if len(pending) >= write_buffer_size:
+                    # 换出缓冲区后再落盘，写入期间不会修改正在写入的数据
+                    data, pending = pending, bytearray()
+                    await run_blocking(f.write, data)
+            if pending:
+                await run_blocking(f.write, pending)
+        finally:
+            await run_blocking(f.close)
+    except BaseException:
+        remove_file_quietly(path)
+        raise
+
+    logger.info(f"[ingest_stream_to_file] 安装包已落盘: {path}, 大小: {size} bytes, sha256: {digest.hexdigest()}")
+    return IngestedPackage(path=path, size=size, sha256=digest.hexdigest())
+
+
+def _create_temp_file(temp_dir: str, suffix: str) -> str:
+    """
+    在临时目录下创建空的上传文件。
+
+    参数:
+        temp_dir: 临时文件所在目录，不存在时自动创建
+        suffix: 临时文件后缀
+
+    返回:
+        str: 临时文件路径
+    """
+    os.makedirs(temp_dir, exist_ok=True)
+    fd, path = tempfile.mkstemp(suffix=suffix, prefix="upload-", dir=temp_dir)
+    os.close(fd)
+    return path
+
+
+def remove_file_quietly(path: str) -> None:
+    """
+    删除文件，忽略文件不存在等错误。
+
+    参数:
+        path: 文件路径
+    """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"删除临时文件失败 ({path}): {e}")
@@ -0,0 +1,542 @@
+"""
+可续传的分块上传
+
+安装包按固定大小分块上传，每块按偏移量直接写入临时目录下预分配的安装包文件，
+全部分块到齐后该文件即为完整安装包，无需再次合并复制。
+上传会话的元数据（已收到的分块）保存在同一目录的 meta.json 中，连接中断后可查询已收到的分块并续传。
+完成上传时会话标记为完成中，安装包移出会话目录交给安装使用，之后不再接收分块。
+"""
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
+
+from src.infrastructure.executor import BlockingExecutor
+
+logger = logging.getLogger(__name__)
+
+# 上传会话目录名（位于 temp_dir 下）
+UPLOADS_DIR_NAME = "uploads"
+# 会话目录中的元数据文件名和安装包文件名
+META_FILE_NAME = "meta.json"
+PACKAGE_FILE_NAME = "package.zip"
+# 分块落盘前在内存中累积的最大字节数
+CHUNK_WRITE_BUFFER_SIZE = 1024 * 1024
+# 上传会话 ID 格式（uuid4 十六进制），同时防止路径穿越
+_UPLOAD_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+class ChunkChecksumError(ValueError):
+    """分块内容与请求携带的 SHA-256 摘要不一致。"""
+
+
+class UploadIncompleteError(ValueError):
+    """上传会话还有未收到的分块。"""
+
+
+class UploadCompletingError(Exception):
+    """上传会话正在完成（或仍有分块在上传），不能再上传分块、预检或重复完成。"""
+
+
+class ChunkInProgressError(Exception):
+    """同一分块正在由另一个请求上传。"""
+
+
+@dataclass
+class UploadSession:
+    """
+    分块上传会话。
+
+    属性:
+        id: 会话 ID
+        size: 安装包总大小（字节）
+        chunk_size: 分块大小（字节），最后一块可以更小
+        sha256: 安装包整体的 SHA-256 摘要（可选），完成上传时校验
+        received: 已收到并校验通过的分块序号（升序）
+        completing: 是否已开始完成上传（安装包已移出会话目录）
+        created_by_id: 创建者用户 ID
+        created_at: 创建时间
+        updated_at: 最近一次收到分块的时间
+    """
+    id: str
+    size: int
+    chunk_size: int
+    sha256: Optional[str] = None
+    received: List[int] = field(default_factory=list)
+    completing: bool = False
+    created_by_id: str = ""
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    @property
+    def chunk_count(self) -> int:
+        """分块总数。"""
+        return (self.size + self.chunk_size - 1) // self.chunk_size
+
+    @property
+    def received_bytes(self) -> int:
+        """已收到的字节数。"""
+        return sum(self.chunk_range(index)[1] for index in self.received)
+
+    @property
+    def is_complete(self) -> bool:
+        """是否已收到全部分块。"""
+        return len(self.received) == self.chunk_count
+
+    def chunk_range(self, index: int) -> Tuple[int, int]:
+        """
+        计算分块在安装包中的位置。
+
+        参数:
+            index: 分块序号（从 0 开始）
+
+        返回:
+            Tuple[int, int]: (偏移量, 长度)
+        """
+        offset = index * self.chunk_size
+        return offset, min(self.chunk_size, self.size - offset)
+
+    def received_ranges(self) -> List[Tuple[int, int]]:
+        """
+        已收到的字节区间（合并相邻分块）。
+
+        返回:
+            List[Tuple[int, int]]: [起始偏移, 结束偏移) 区间列表，按偏移升序
+        """
+        ranges: List[Tuple[int, int]] = []
+        for index in self.received:
+            start, length = self.chunk_range(index)
+            if ranges and ranges[-1][1] == start:
+                ranges[-1] = (ranges[-1][0], start + length)
+            else:
+                ranges.append((start, start + length))
+        return ranges
+
+    def chunks_covering(self, ranges: List[Tuple[int, int]]) -> List[int]:
+        """
+        覆盖指定字节区间且尚未收到的分块序号。
+
+        参数:
+            ranges: 字节区间 [起始偏移, 结束偏移) 列表
+
+        返回:
+            List[int]: 升序的分块序号列表
+        """
+        received = set(self.received)
+        chunks = set()
+        for start, end in ranges:
+            first = max(start, 0) // self.chunk_size
+            last = (min(end, self.size) - 1) // self.chunk_size
+            chunks.update(index for index in range(first, last + 1) if index not in received)
+        return sorted(chunks)
+
+    def missing_chunks(self) -> List[int]:
+        """
+        未收到的分块序号。
+
+        返回:
+            List[int]: 升序的分块序号列表
+        """
+        received = set(self.received)
+        return [index for index in range(self.chunk_count) if index not in received]
+
+
+def _session_to_dict(session: UploadSession) -> Dict[str, Any]:
+    """将上传会话转换为可写入 meta.json 的字典。"""
+    data = asdict(session)
+    data["created_at"] = session.created_at.isoformat() if session.created_at else None
+    data["updated_at"] = session.updated_at.isoformat() if session.updated_at else None
+    return data
+
+
+def _session_from_dict(data: Dict[str, Any]) -> UploadSession:
+    """从 meta.json 的内容还原上传会话。"""
+    return UploadSession(
+        id=data["id"],
+        size=int(data["size"]),
+        chunk_size=int(data["chunk_size"]),
+        sha256=data.get("sha256"),
+        received=sorted(int(index) for index in data.get("received") or []),
+        completing=bool(data.get("completing")),
+        created_by_id=data.get("created_by_id") or "",
+        created_at=datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None,
+        updated_at=datetime.fromisoformat(data["updated_at"]) if data.get("updated_at") else None,
+    )
+
+
+def _pwrite_all(fd: int, data: bytes, offset: int) -> None:
+    """在指定偏移量写入全部数据（处理部分写入）。"""
+    view = memoryview(data)
+    while view:
+        count = os.pwrite(fd, view, offset)
+        view = view[count:]
+        offset += count
+
+
+class ResumableUploadStore:
+    """
+    分块上传会话存储。
+
+    会话保存在 temp_dir/uploads/<会话 ID>/ 目录下，同一会话的元数据更新和完成上传在进程内串行执行。
+    超过 ttl 未收到分块的会话在创建新会话时清理。
+    文件操作在 executor 中执行，不阻塞事件循环。
+    """
+
+    def __init__(self, temp_dir: str, ttl: int, executor: Optional[BlockingExecutor] = None):
+        """
+        初始化存储。
+
+        参数:
+            temp_dir: 临时文件目录
+            ttl: 会话在最后一次收到分块后的保留时间（秒）
+            executor: 执行文件操作的阻塞任务执行器（可选，未提供时使用 asyncio 默认线程池）
+        """
+        self._temp_dir = temp_dir
+        self._root = os.path.join(temp_dir, UPLOADS_DIR_NAME)
+        self._ttl = ttl
+        self._executor = executor
+        self._locks: Dict[str, asyncio.Lock] = {}
+        # 各会话正在写入的分块序号：同一分块同时只允许一个写入者，有分块在写入时不能完成上传
+        self._writing: Dict[str, Set[int]] = {}
+
+    async def _run_blocking(self, func: Callable[..., Any], *args: Any) -> Any:
+        """在阻塞任务执行器中执行文件操作。"""
+        if self._executor is not None:
+            return await self._executor.run(func, *args)
+        return await asyncio.to_thread(func, *args)
+
+    def _session_dir(self, upload_id: str) -> str:
+        """会话目录路径。"""
+        return os.path.join(self._root, upload_id)
+
+    def package_path(self, upload_id: str) -> str:
+        """
+        会话对应的安装包文件路径。
+
+        参数:
+            upload_id: 会话 ID
+
+        返回:
+            str: 安装包文件路径
+        """
+        return os.path.join(self._session_dir(upload_id), PACKAGE_FILE_NAME)
+
+    def _lock(self, upload_id: str) -> asyncio.Lock:
+        """获取会话的元数据更新锁。"""
+        lock = self._locks.get(upload_id)
+        if lock is None:
+            lock = self._locks[upload_id] = asyncio.Lock()
+        return lock
+
+    async def create(
+        self,
+        size: int,
+        chunk_size: int,
+        sha256: Optional[str] = None,
+        created_by_id: str = "",
+    ) -> UploadSession:
+        """
+        创建上传会话并预分配安装包文件。
+
+        参数:
+            size: 安装包总大小（字节），必须大于 0
+            chunk_size: 分块大小（字节），必须大于 0
+            sha256: 安装包整体的 SHA-256 摘要（可选）
+            created_by_id: 创建者用户 ID
+
+        返回:
+            UploadSession: 新建的上传会话
+
+        异常:
+            ValueError: 当大小或分块大小无效时抛出
+        """
+        if size <= 0 or chunk_size <= 0:
+            raise ValueError("安装包大小和分块大小必须大于 0")
+        await self._run_blocking(self._remove_expired_sessions)
+        now = datetime.now()
+        session = UploadSession(
+            id=uuid.uuid4().hex,
+            size=size,
+            chunk_size=chunk_size,
+            sha256=sha256.lower() if sha256 else None,
+            created_by_id=created_by_id,
+            created_at=now,
+            updated_at=now,
+        )
+        await self._run_blocking(self._create_session_files, session)
+        logger.info(
+            f"[ResumableUploadStore] 创建上传会话: {session.id}, 大小: {size} bytes, "
+            f"分块大小: {chunk_size} bytes, 分块数: {session.chunk_count}"
+        )
+        return session
+
+    async def count_sessions(self, created_by_id: str) -> int:
+        """
+        统计用户未开始完成的上传会话数（先清理过期会话）。
+
+        参数:
+            created_by_id: 创建者用户 ID
+
+        返回:
+            int: 会话数
+        """
+        await self._run_blocking(self._remove_expired_sessions)
+        return await self._run_blocking(self._count_sessions, created_by_id)
+
+    async def get(self, upload_id: str) -> Optional[UploadSession]:
+        """
+        获取上传会话。
+
+        参数:
+            upload_id: 会话 ID
+
+        返回:
+            Optional[UploadSession]: 上传会话，不存在或 ID 格式无效时返回 None
+        """
+        if not _UPLOAD_ID_PATTERN.match(upload_id or ""):
+            return None
+        return await self._run_blocking(self._read_meta, upload_id)
+
+    async def write_chunk(
+        self,
+        upload_id: str,
+        index: int,
+        stream: AsyncIterator[bytes],
+        sha256: str,
+    ) -> UploadSession:
+        """
+        接收一个分块：按偏移量写入安装包文件，校验长度和摘要后记录为已收到。
+
+        同一分块可重复上传（覆盖写入）：写入前先将该分块从已收到中移除并保存元数据，
+        因此校验失败或上传中断时该分块不计为已收到，需要重新上传；同一分块同时只允许一个请求上传。
+
+        参数:
+            upload_id: 会话 ID
+            index: 分块序号（从 0 开始）
+            stream: 分块内容的异步字节流
+            sha256: 分块内容的 SHA-256 摘要（十六进制）
+
+        返回:
+            UploadSession: 更新后的上传会话
+
+        异常:
+            LookupError: 当会话不存在时抛出
+            UploadCompletingError: 当会话已开始完成上传时抛出
+            ChunkInProgressError: 当同一分块正在由另一个请求上传时抛出
+            ValueError: 当分块序号或长度无效时抛出
+            ChunkChecksumError: 当分块摘要不一致时抛出
+        """
+        async with self._lock(upload_id):
+            session = await self.get(upload_id)
+            if session is None:
+                raise LookupError(f"上传会话不存在: {upload_id}")
+            if session.completing:
+                raise UploadCompletingError(f"上传会话正在完成，不能再上传分块: {upload_id}")
+            if index < 0 or index >= session.chunk_count:
+                raise ValueError(f"分块序号超出范围: {index}，有效范围 0-{session.chunk_count - 1}")
+            writing = self._writing.setdefault(upload_id, set())
+            if index in writing:
+                raise ChunkInProgressError(f"分块 {index} 正在上传，请等待当前上传结束")
+            if index in session.received:
+                # 覆盖写入会破坏已校验的内容，校验通过前不再计为已收到
+                session.received = [i for i in session.received if i != index]
+                await self._run_blocking(self._write_meta, session)
+            writing.add(index)
+        try:
+            return await self._write_chunk(session, index, stream, sha256)
+        finally:
+            writing = self._writing.get(upload_id)
+            if writing is not None:
+                writing.discard(index)
+                if not writing:
+                    self._writing.pop(upload_id, None)
+
+    async def _write_chunk(
+        self,
+        session: UploadSession,
+        index: int,
+        stream: AsyncIterator[bytes],
+        sha256: str,
+    ) -> UploadSession:
+        """写入并校验分块（调用方已登记为正在写入），通过后记录为已收到。"""
+        upload_id = session.id
+        offset, length = session.chunk_range(index)
+        digest = hashlib.sha256()
+        written = 0
+        pending = bytearray()
+        fd = await self._run_blocking(os.open, self.package_path(upload_id), os.O_WRONLY)
+        try:
+            async for data in stream:
+                if not data:
+                    continue
+                if written + len(pending) + len(data) > length:
+                    raise ValueError(f"分块 {index} 的长度超过 {length} bytes")
+                digest.update(data)
+                pending += data
+                if len(pending) >= CHUNK_WRITE_BUFFER_SIZE:
+                    buffer, pending = pending, bytearray()
+                    await self._run_blocking(_pwrite_all, fd, buffer, offset + written)
+                    written += len(buffer)
+            if pending:
+                await self._run_blocking(_pwrite_all, fd, pending, offset + written)
+                written += len(pending)
+        finally:
+            await self._run_blocking(os.close, fd)
+
+        if written != length:
+            raise ValueError(f"分块 {index} 的长度应为 {length} bytes，实际收到 {written} bytes")
+        if digest.hexdigest() != sha256.lower():
+            raise ChunkChecksumError(f"分块 {index} 的 SHA-256 摘要不一致，请重新上传该分块")
+
+        async with self._lock(upload_id):
+            session = await self.get(upload_id)
+            if session is None:
+                raise LookupError(f"上传会话不存在: {upload_id}")
+            if index not in session.received:
+                session.received = sorted(session.received + [index])
+            session.updated_at = datetime.now()
+            await self._run_blocking(self._write_meta, session)
+        logger.debug(f"[ResumableUploadStore] 收到分块: {upload_id}#{index}, {length} bytes")
+        return session
+
+    async def complete(self, upload_id: str) -> str:
+        """
+        完成上传：确认全部分块已收到，并在会话携带整体摘要时校验安装包。
+
+        校验通过后会话标记为完成中，安装包移到会话目录之外，之后的分块上传、预检和完成请求都会被拒绝。
+
+        参数:
+            upload_id: 会话 ID
+
+        返回:
+            str: 完整安装包的文件路径（位于会话目录之外，由调用方在使用后删除，并调用 delete 清理会话）
+
+        异常:
+            LookupError: 当会话不存在时抛出
+            UploadCompletingError: 当会话已开始完成上传或仍有分块在上传时抛出
+            UploadIncompleteError: 当还有分块未收到时抛出
+            ChunkChecksumError: 当安装包整体摘要不一致时抛出
+        """
+        async with self._lock(upload_id):
+            session = await self.get(upload_id)
+            if session is None:
+                raise LookupError(f"上传会话不存在: {upload_id}")
+            if session.completing:
+                raise UploadCompletingError(f"上传会话已在完成中: {upload_id}")
+            if self._writing.get(upload_id):
+                raise UploadCompletingError(f"上传会话还有分块正在上传: {upload_id}")
+            missing = session.missing_chunks()
+            if missing:
+                preview = ", ".join(str(index) for index in missing[:10])
+                raise UploadIncompleteError(
+                    f"还有 {len(missing)} 个分块未上传: {preview}{' ...' if len(missing) > 10 else ''}"
+                )
+            if session.sha256:
+                actual = await self._run_blocking(self._file_sha256, self.package_path(upload_id))
+                if actual != session.sha256:
+                    raise ChunkChecksumError(f"安装包 SHA-256 摘要不一致: 期望 {session.sha256}，实际 {actual}")
+            session.completing = True
+            session.updated_at = datetime.now()
+            await self._run_blocking(self._write_meta, session)
+            path = os.path.join(self._temp_dir, f"upload-{upload_id}.zip")
+            await self._run_blocking(os.replace, self.package_path(upload_id), path)
+        logger.info(f"[ResumableUploadStore] 上传会话开始完成: {upload_id}, 安装包: {path}")
+        return path
+
+    async def delete(self, upload_id: str) -> bool:
+        """
+        删除上传会话及其文件。
+
+        参数:
+            upload_id: 会话 ID
+
+        返回:
+            bool: 会话是否存在
+        """
+        if not _UPLOAD_ID_PATTERN.match(upload_id or ""):
+            return False
+        self._locks.pop(upload_id, None)
+        self._writing.pop(upload_id, None)
+        session_dir = self._session_dir(upload_id)
+        existed = await self._run_blocking(os.path.isdir, session_dir)
+        if existed:
+            await self._run_blocking(functools.partial(shutil.rmtree, session_dir, ignore_errors=True))
+            logger.info(f"[ResumableUploadStore] 已删除上传会话: {upload_id}")
+        return existed
+
+    def _create_session_files(self, session: UploadSession) -> None:
+        """创建会话目录、预分配安装包文件（稀疏文件）并写入元数据，失败时删除会话目录。"""
+        session_dir = self._session_dir(session.id)
+        os.makedirs(session_dir)
+        try:
+            with open(self.package_path(session.id), "wb") as f:
+                f.truncate(session.size)
+            self._write_meta(session)
+        except OSError:
+            shutil.rmtree(session_dir, ignore_errors=True)
+            raise
+
+    def _count_sessions(self, created_by_id: str) -> int:
+        """统计用户未开始完成的会话数。"""
+        if not os.path.isdir(self._root):
+            return 0
+        count = 0
+        for upload_id in os.listdir(self._root):
+            session = self._read_meta(upload_id)
+            if session is not None and not session.completing and session.created_by_id == created_by_id:
+                count += 1
+        return count
+
+    def _read_meta(self, upload_id: str) -> Optional[UploadSession]:
+        """读取会话元数据，不存在或损坏时返回 None。"""
+        try:
+            with open(os.path.join(self._session_dir(upload_id), META_FILE_NAME), "r", encoding="utf-8") as f:
+                return _session_from_dict(json.load(f))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"[ResumableUploadStore] 读取上传会话失败: {upload_id}, {e}")
+            return None
+
+    def _write_meta(self, session: UploadSession) -> None:
+        """原子写入会话元数据（先写临时文件再替换）。"""
+        meta_path = os.path.join(self._session_dir(session.id), META_FILE_NAME)
+        tmp_path = meta_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(_session_to_dict(session), f)
+        os.replace(tmp_path, meta_path)
+
+    def _remove_expired_sessions(self) -> None:
+        """删除超过 ttl 未更新的会话目录。"""
+        if self._ttl <= 0 or not os.path.isdir(self._root):
+            return
+        deadline = time.time() - self._ttl
+        for upload_id in os.listdir(self._root):
+            session_dir = self._session_dir(upload_id)
+            try:
+                meta_path = os.path.join(session_dir, META_FILE_NAME)
+                mtime = os.path.getmtime(meta_path if os.path.exists(meta_path) else session_dir)
+            except OSError:
+                continue
+            if mtime < deadline:
+                shutil.rmtree(session_dir, ignore_errors=True)
+                self._locks.pop(upload_id, None)
+                logger.info(f"[ResumableUploadStore] 已清理过期的上传会话: {upload_id}")
+
+    @staticmethod
+    def _file_sha256(path: str) -> str:
+        """流式计算文件的 SHA-256 摘要。"""
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for data in iter(lambda: f.read(CHUNK_WRITE_BUFFER_SIZE), b""):
+                digest.update(data)
+        return digest.hexdigest()
@@ -27,6 +27,7 @@ from src.infrastructure.logging.logger import setup_logging
 from src.infrastructure.middleware.auth_middleware import AuthMiddleware
 from src.infrastructure.database.init import ensure_tables_exist
 from src.routers.health_router import create_health_router
+from src.routers.metrics_router import create_metrics_router
 from src.routers.application_router import create_application_router
 from src.routers.login_router import create_login_router
 from src.routers.logout_router import create_logout_router
@@ -69,6 +70,20 @@ def create_app(settings: Settings = None) -> FastAPI:
             # 这里选择继续启动，但记录错误
             logger.warning("服务将在数据库表可能不完整的情况下启动")
 
+        # 预热数据库连接池，避免首个请求承担建立连接的开销
+        try:
+            await container.warm_up()
+        except Exception as e:
+            logger.error(f"数据库连接池预热失败: {e}", exc_info=True)
+            logger.warning("服务将在数据库连接池未预热的情况下启动，首次访问数据库时再建立连接")
+
+        # 启动异步安装任务 worker
+        await container.install_job_service.start()
+
+        # 启动事件循环延迟监控
+        if settings.loop_lag_monitor_enabled:
+            container.loop_lag_monitor.start()
+
         # 初始化完成后标记服务为就绪状态
         container.set_ready(True)
         logger.info("服务已准备好接受请求")
@@ -79,7 +94,7 @@ def create_app(settings: Settings = None) -> FastAPI:
         logger.info("正在关闭服务")
         container.set_ready(False)
 
-        # 关闭数据库连接池
+        # 停止安装任务 worker，关闭数据库连接池
         await container.close()
         logger.info("资源已释放")
     
@@ -104,6 +119,7 @@ def create_app(settings: Settings = None) -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "X-Total-Count"],
     )
     
     # 注册全局异常处理器
@@ -140,7 +156,16 @@ def create_app(settings: Settings = None) -> FastAPI:
     health_router = create_health_router(container.health_service)
     app.include_router(health_router, prefix=settings.api_prefix)
 
-    application_router = create_application_router(container.application_service)
+    metrics_router = create_metrics_router(container.metrics_registry)
+    app.include_router(metrics_router, prefix=settings.api_prefix)
+
+    application_router = create_application_router(
+        container.application_service,
+        settings,
+        container.install_job_service,
+        container.blocking_executor,
+        container.upload_store,
+    )
     app.include_router(application_router, prefix=settings.api_prefix)
 
     login_router = create_login_router(container.login_service, settings)
@@ -7,7 +7,9 @@
 from abc import ABC, abstractmethod
 from typing import List, Optional
 
-from src.domains.application import Application, OntologyConfigItem, AgentConfigItem
+from src.domains.application import (
+    Application, ApplicationIcon, ApplicationListQuery, ApplicationPage, OntologyConfigItem, AgentConfigItem,
+)
 
 
 class ApplicationPort(ABC):
@@ -18,18 +20,49 @@ class ApplicationPort(ABC):
     """
 
     @abstractmethod
-    async def get_all_applications(self, pinned: Optional[bool] = None) -> List[Application]:
+    async def get_all_applications(
+        self,
+        pinned: Optional[bool] = None,
+        include_icon: bool = True,
+    ) -> List[Application]:
         """
         获取所有已安装的应用列表。
 
         参数:
             pinned: 可选，按被钉状态过滤（True=仅被钉，False=仅未被钉，None=不过滤）
+            include_icon: 是否加载图标内容；为 False 时 icon 为 None，仅返回 icon_hash
 
         返回:
             List[Application]: 应用列表
         """
         pass
 
+    @abstractmethod
+    async def list_applications(self, query: ApplicationListQuery) -> ApplicationPage:
+        """
+        按条件分页查询应用列表，按 (updated_at, id) 倒序排列。
+
+        参数:
+            query: 查询条件（过滤、分页游标、每页数量等）
+
+        返回:
+            ApplicationPage: 当前页应用、下一页游标以及（按需统计的）总数
+        """
+        pass
+
+    @abstractmethod
+    async def get_application_icon(self, app_id: int) -> Optional[ApplicationIcon]:
+        """
+        获取应用图标的原始内容。
+
+        参数:
+            app_id: 应用主键 ID
+
+        返回:
+            Optional[ApplicationIcon]: 应用图标，应用不存在或没有图标时返回 None
+        """
+        pass
+
     @abstractmethod
     async def set_application_pinned(self, app_id: int, pinned: bool) -> Application:
         """
@@ -48,12 +81,19 @@ class ApplicationPort(ABC):
         pass
 
     @abstractmethod
-    async def get_application_by_key(self, key: str) -> Application:
+    async def get_application_by_key(
+        self,
+        key: str,
+        include_icon: bool = True,
+        include_config: bool = True,
+    ) -> Application:
         """
         根据应用唯一标识获取应用信息。
 
         参数:
             key: 应用包唯一标识
+            include_icon: 是否加载图标内容；为 False 时 icon 为 None，仅返回 icon_hash
+            include_config: 是否加载 Release、业务知识网络和智能体配置；为 False 时均为空列表
 
         返回:
             Application: 应用实体
@@ -64,12 +104,19 @@ class ApplicationPort(ABC):
         pass
 
     @abstractmethod
-    async def get_application_by_key_optional(self, key: str) -> Optional[Application]:
+    async def get_application_by_key_optional(
+        self,
+        key: str,
+        include_icon: bool = True,
+        include_config: bool = True,
+    ) -> Optional[Application]:
         """
         根据应用唯一标识获取应用信息（可选）。
 
         参数:
             key: 应用包唯一标识
+            include_icon: 是否加载图标内容；为 False 时 icon 为 None，仅返回 icon_hash
+            include_config: 是否加载 Release、业务知识网络和智能体配置；为 False 时均为空列表
 
         返回:
             Optional[Application]: 应用实体，不存在时返回 None
@@ -77,12 +124,19 @@ class ApplicationPort(ABC):
         pass
 
     @abstractmethod
-    async def get_application_by_id(self, app_id: int) -> Application:
+    async def get_application_by_id(
+        self,
+        app_id: int,
+        include_icon: bool = True,
+        include_config: bool = True,
+    ) -> Application:
         """
         根据应用主键 ID 获取应用信息。
 
         参数:
             app_id: 应用主键 ID
+            include_icon: 是否加载图标内容；为 False 时 icon 为 None，仅返回 icon_hash
+            include_config: 是否加载 Release、业务知识网络和智能体配置；为 False 时均为空列表
 
         返回:
             Application: 应用实体
@@ -124,6 +178,30 @@ class ApplicationPort(ABC):
         """
         pass
 
+    @abstractmethod
+    async def upsert_application(
+        self,
+        application: Application,
+        expected_version: Optional[str] = None,
+    ) -> Application:
+        """
+        创建应用，或在已安装版本与预期一致时更新应用（安装时使用，单条语句完成）。
+
+        并发安装同一应用时，只有一个安装能按预期版本写入，其余安装失败，不会互相覆盖；
+        应用的被钉状态保留不变。
+
+        参数:
+            application: 应用实体
+            expected_version: 预期的已安装版本号，None 表示预期应用尚未安装
+
+        返回:
+            Application: 创建或更新后的应用实体（包含 ID）
+
+        异常:
+            ValueError: 已安装版本与预期不一致（应用已被其他安装修改）时抛出
+        """
+        pass
+
     @abstractmethod
     async def update_application_config(
         self,
@@ -0,0 +1,54 @@
+"""
+制品索引端口接口
+
+定义已上传镜像/Chart 索引（内容摘要 → 上传结果）的抽象接口（端口）。
+遵循六边形架构模式，这些端口定义了领域层与基础设施层之间的契约。
+"""
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from src.domains.application import ArtifactRecord
+
+
+class ArtifactIndexPort(ABC):
+    """
+    制品索引端口接口。
+
+    这是一个输出端口（被驱动端口），记录已上传到部署服务的镜像和 Chart，
+    安装/升级应用时内容相同的制品不再重复上传。
+    """
+
+    @abstractmethod
+    async def get_artifact(self, kind: str, digest: str) -> Optional[ArtifactRecord]:
+        """
+        按内容摘要查询已上传的制品。
+
+        参数:
+            kind: 制品类型（image/chart）
+            digest: 制品内容的 SHA-256 摘要
+
+        返回:
+            Optional[ArtifactRecord]: 制品记录，未上传过时返回 None
+        """
+        pass
+
+    @abstractmethod
+    async def save_artifact(self, record: ArtifactRecord) -> None:
+        """
+        保存（创建或覆盖）制品记录。
+
+        参数:
+            record: 制品记录
+        """
+        pass
+
+    @abstractmethod
+    async def delete_artifact(self, kind: str, digest: str) -> None:
+        """
+        删除制品记录（上传结果已失效时调用，下次安装重新上传）。
+
+        参数:
+            kind: 制品类型（image/chart）
+            digest: 制品内容的 SHA-256 摘要
+        """
+        pass
@@ -5,10 +5,14 @@
 遵循六边形架构模式，这些端口定义了应用层与外部服务之间的契约。
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional, BinaryIO
+from typing import Callable, List, Optional, BinaryIO
 from dataclasses import dataclass
 
 
+# 上传进度回调：参数为已发送字节数和总字节数（总大小未知时为 None）
+UploadProgressCallback = Callable[[int, Optional[int]], None]
+
+
 @dataclass
 class ImageUploadResult:
     """镜像上传结果。"""
@@ -71,12 +75,17 @@ class DeployInstallerPort(ABC):
         self,
         image_data: BinaryIO,
         auth_token: Optional[str] = None,
+        size: Optional[int] = None,
+        progress_callback: Optional[UploadProgressCallback] = None,
     ) -> List[ImageUploadResult]:
         """
         上传镜像。
 
         参数:
             image_data: 镜像数据（OCI archive 格式的 tar 文件）
+            auth_token: 认证令牌
+            size: 数据总大小（字节），为 None 时从文件对象推断
+            progress_callback: 上传进度回调，每发送一个分块调用一次
 
         返回:
             List[ImageUploadResult]: 上传的镜像列表
@@ -88,12 +97,17 @@ class DeployInstallerPort(ABC):
         self,
         chart_data: BinaryIO,
         auth_token: Optional[str] = None,
+        size: Optional[int] = None,
+        progress_callback: Optional[UploadProgressCallback] = None,
     ) -> ChartUploadResult:
         """
         上传 Chart。
 
         参数:
             chart_data: Chart 数据（标准 helm chart v2 文件）
+            auth_token: 认证令牌
+            size: 数据总大小（字节），为 None 时从文件对象推断
+            progress_callback: 上传进度回调，每发送一个分块调用一次
 
         返回:
             ChartUploadResult: Chart 上传结果
@@ -151,7 +165,7 @@ class OntologyManagerPort(ABC):
     """
     Ontology Manager 服务端口接口。
 
-    负责与 Ontology Manager 服务交互，处理业务知识网络的创建和查询。
+    负责与 Ontology Manager 服务交互，处理业务知识网络的创建、查询和删除。
     """
 
     @abstractmethod
@@ -197,12 +211,40 @@ class OntologyManagerPort(ABC):
         """
         pass
 
+    @abstractmethod
+    async def delete_knowledge_network(
+        self,
+        kn_id: str,
+        auth_token: Optional[str] = None,
+        business_domain: Optional[str] = None,
+    ) -> None:
+        """
+        删除业务知识网络（安装失败时回滚已创建的业务知识网络）。
+
+        参数:
+            kn_id: 业务知识网络 ID
+            auth_token: 认证令牌
+            business_domain: 业务域，默认为 None
+        """
+        pass
+
+    async def invalidate(self, kn_ids: List[str]) -> None:
+        """
+        使业务知识网络详情的缓存失效（安装、配置、卸载应用时调用）。
+
+        默认实现无缓存，不做任何操作。
+
+        参数:
+            kn_ids: 业务知识网络 ID 列表
+        """
+        return None
+
 
 class AgentFactoryPort(ABC):
     """
     Agent Factory 服务端口接口。
 
-    负责与 Agent Factory 服务交互，处理智能体的创建和查询。
+    负责与 Agent Factory 服务交互，处理智能体的创建、查询和删除。
     """
 
     @abstractmethod
@@ -248,3 +290,31 @@ class AgentFactoryPort(ABC):
         """
         pass
 
+    @abstractmethod
+    async def delete_agent(
+        self,
+        agent_id: str,
+        auth_token: Optional[str] = None,
+        business_domain: Optional[str] = None,
+    ) -> None:
+        """
+        删除智能体（安装失败时回滚已创建的智能体）。
+
+        参数:
+            agent_id: 智能体 ID
+            auth_token: 认证令牌
+            business_domain: 业务域，默认为 None
+        """
+        pass
+
+    async def invalidate(self, agent_ids: List[str]) -> None:
+        """
+        使智能体详情的缓存失效（安装、配置、卸载应用时调用）。
+
+        默认实现无缓存，不做任何操作。
+
+        参数:
+            agent_ids: 智能体 ID 列表
+        """
+        return None
+
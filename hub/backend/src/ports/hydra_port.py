@@ -14,6 +14,7 @@ class IntrospectResponse:
     active: bool
     visitor_id: Optional[str] = None
     visitor_typ: Optional[str] = None
+    exp: Optional[int] = None  # Token 过期时间（Unix 时间戳，秒）
 
 
 class HydraPort(ABC):
@@ -39,3 +40,13 @@ class HydraPort(ABC):
         """
         pass
 
+    async def invalidate(self, token: str) -> None:
+        """
+        使 Token 相关的缓存失效（登出、撤销 Token 时调用）。
+
+        默认实现无缓存，不做任何操作。
+
+        参数:
+            token: 访问令牌
+        """
+        return None
@@ -0,0 +1,67 @@
+"""
+安装任务端口接口
+
+定义异步安装任务状态存储的抽象接口（端口）。
+遵循六边形架构模式，这些端口定义了领域层与基础设施层之间的契约。
+"""
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from src.domains.install_job import InstallJob, InstallJobEvent
+
+
+class InstallJobPort(ABC):
+    """
+    安装任务端口接口。
+
+    这是一个输出端口（被驱动端口），定义了应用程序与安装任务状态存储的交互方式。
+    存储需要在多个副本之间共享，任一副本都能查询其他副本提交的任务。
+    """
+
+    @abstractmethod
+    async def save_job(self, job: InstallJob) -> None:
+        """
+        保存（创建或覆盖）安装任务。
+
+        参数:
+            job: 安装任务
+        """
+        pass
+
+    @abstractmethod
+    async def get_job(self, job_id: str) -> Optional[InstallJob]:
+        """
+        获取安装任务。
+
+        参数:
+            job_id: 任务 ID
+
+        返回:
+            Optional[InstallJob]: 安装任务，不存在或已过期时返回 None
+        """
+        pass
+
+    @abstractmethod
+    async def append_event(self, job_id: str, event: InstallJobEvent) -> None:
+        """
+        追加安装任务事件。
+
+        参数:
+            job_id: 任务 ID
+            event: 任务事件
+        """
+        pass
+
+    @abstractmethod
+    async def get_events(self, job_id: str, start: int = 0) -> List[InstallJobEvent]:
+        """
+        按追加顺序获取安装任务事件。
+
+        参数:
+            job_id: 任务 ID
+            start: 起始序号（从 0 开始），用于增量读取
+
+        返回:
+            List[InstallJobEvent]: 序号不小于 start 的事件
+        """
+        pass
@@ -0,0 +1,54 @@
+"""
+安装日志端口接口
+
+定义应用安装日志存储的抽象接口（端口）。
+遵循六边形架构模式，这些端口定义了领域层与基础设施层之间的契约。
+"""
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from src.domains.install_journal import InstallJournal
+
+
+class InstallJournalPort(ABC):
+    """
+    安装日志端口接口。
+
+    这是一个输出端口（被驱动端口），保存安装过程中已完成的步骤，
+    重试安装同一版本时（可能在其他副本上）据此跳过已完成的上传和创建。
+    """
+
+    @abstractmethod
+    async def get_journal(self, app_key: str, version: str) -> Optional[InstallJournal]:
+        """
+        获取安装日志。
+
+        参数:
+            app_key: 应用包唯一标识
+            version: 版本号
+
+        返回:
+            Optional[InstallJournal]: 安装日志，不存在或已过期时返回 None
+        """
+        pass
+
+    @abstractmethod
+    async def save_journal(self, journal: InstallJournal) -> None:
+        """
+        保存（创建或覆盖）安装日志。
+
+        参数:
+            journal: 安装日志
+        """
+        pass
+
+    @abstractmethod
+    async def delete_journal(self, app_key: str, version: str) -> None:
+        """
+        删除安装日志（安装成功后调用）。
+
+        参数:
+            app_key: 应用包唯一标识
+            version: 版本号
+        """
+        pass
@@ -4,19 +4,45 @@
 应用管理端点的 FastAPI 路由。
 这是处理 HTTP 请求并委托给应用层的接口适配器。
 """
-import io
+import asyncio
+import json
 import logging
-from fastapi import APIRouter, Query, Path, Request, status
-from fastapi.responses import Response
-from typing import List, Optional
+from fastapi import APIRouter, Header, Query, Path, Request, status
+from fastapi.responses import Response, StreamingResponse
+from typing import AsyncIterator, List, Optional
 
 from src.application.application_service import ApplicationService
+from src.application.install_job_service import InstallJobService
+from src.domains.application import ApplicationCursor, ApplicationListQuery
+from src.domains.install_job import InstallTimingStage
+from src.infrastructure.config.settings import Settings, get_settings
 from src.infrastructure.context.token_context import get_user_info
+from src.infrastructure.executor import BlockingExecutor
+from src.infrastructure.metrics import StageTimer
+from src.infrastructure.upload import (
+    ChunkChecksumError,
+    ChunkInProgressError,
+    IncompletePackageError,
+    ResumableUploadStore,
+    UploadCompletingError,
+    UploadIncompleteError,
+    UploadSession,
+    ingest_stream_to_file,
+    remove_file_quietly,
+)
 from src.infrastructure.exceptions import (
     ValidationError, NotFoundError, ConflictError, InternalError, UnauthorizedError
 )
 from src.routers.schemas.application import (
     ApplicationResponse,
+    ArtifactTimingResponse,
+    InstallReportResponse,
+    InstallJobResponse,
+    InstallJobEventResponse,
+    CreateUploadRequest,
+    UploadSessionResponse,
+    PackageArtifactResponse,
+    PackageValidationResponse,
     ApplicationBasicInfoResponse,
     MicroAppResponse,
     OntologyConfigItemResponse,
@@ -28,17 +54,84 @@ from src.routers.schemas.application import (
 
 logger = logging.getLogger(__name__)
 
+# 应用列表每页最大数量
+MAX_PAGE_SIZE = 500
+
+# 图标响应的安全响应头：图标接口无需认证，应用包中的 SVG 图标不能在接口源站执行脚本
+ICON_SECURITY_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "Content-Security-Policy": "default-src 'none'; style-src 'unsafe-inline'; sandbox",
+}
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    判断 If-None-Match 请求头是否命中 ETag（弱比较）。
+
+    参数:
+        if_none_match: If-None-Match 请求头的值
+        etag: 当前资源的 ETag（带引号）
+
+    返回:
+        bool: 命中返回 True
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
 
-def create_application_router(application_service: ApplicationService) -> APIRouter:
+def _format_sse(seq: int, event) -> str:
+    """
+    将安装任务事件格式化为 Server-Sent Events 消息。
+
+    参数:
+        seq: 事件序号（作为 SSE 的 id，供断线重连时通过 Last-Event-ID 续传）
+        event: 安装任务事件
+
+    返回:
+        str: SSE 消息文本
+    """
+    data = {
+        "seq": seq,
+        "stage": event.stage,
+        "status": event.status,
+        "message": event.message,
+        "timestamp": event.timestamp.isoformat() if event.timestamp else None,
+    }
+    return f"id: {seq}\nevent: {event.status}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def create_application_router(
+    application_service: ApplicationService,
+    settings: Settings = None,
+    install_job_service: Optional[InstallJobService] = None,
+    blocking_executor: Optional[BlockingExecutor] = None,
+    upload_store: Optional[ResumableUploadStore] = None,
+) -> APIRouter:
     """
     创建应用路由。
 
     参数:
         application_service: 应用服务实例
+        settings: 应用配置
+        install_job_service: 安装任务服务实例，为 None 时不注册异步安装接口
+        blocking_executor: 安装包落盘使用的阻塞任务执行器（可选）
+        upload_store: 分块上传会话存储，为 None 时不注册分块上传接口
 
     返回:
         APIRouter: 配置完成的路由
     """
+    if settings is None:
+        settings = get_settings()
+
     router = APIRouter(tags=["Application"])
 
     def _micro_app_to_response(micro_app) -> MicroAppResponse:
@@ -51,6 +144,36 @@ def create_application_router(application_service: ApplicationService) -> APIRou
             headless=micro_app.headless,
         )
 
+    def _icon_url(app) -> Optional[str]:
+        """生成带内容版本号的应用图标地址，无图标时返回 None。"""
+        if not app.icon_hash:
+            return None
+        return f"{settings.api_prefix}/applications/icon?id={app.id}&v={app.icon_hash[:12]}"
+
+    def _install_report_to_response(report) -> Optional[InstallReportResponse]:
+        """将安装报告转换为响应模型。"""
+        if report is None:
+            return None
+        return InstallReportResponse(
+            artifacts=[
+                ArtifactTimingResponse(
+                    kind=item.kind,
+                    name=item.name,
+                    size=item.size,
+                    started_at=round(item.started_at, 3),
+                    duration=round(item.duration, 3),
+                    digest=item.digest,
+                    skipped=item.skipped,
+                )
+                for item in report.artifacts
+            ],
+            duration=round(report.duration, 3),
+            skipped_count=report.skipped_count,
+            bytes_saved=report.bytes_saved,
+            stages={stage: round(seconds, 3) for stage, seconds in report.stages.items()},
+            total_duration=round(report.total_duration, 3),
+        )
+
     def _application_to_response(app) -> ApplicationResponse:
         """将应用领域模型转换为响应模型。"""
         return ApplicationResponse(
@@ -59,6 +182,8 @@ def create_application_router(application_service: ApplicationService) -> APIRou
             name=app.name,
             description=app.description,
             icon=app.icon,
+            icon_url=_icon_url(app),
+            icon_hash=app.icon_hash,
             category=app.category,
             version=app.version,
             micro_app=_micro_app_to_response(app.micro_app),
@@ -79,8 +204,19 @@ def create_application_router(application_service: ApplicationService) -> APIRou
             updated_by=app.updated_by,
             updated_by_id=app.updated_by_id,
             updated_at=app.updated_at,
+            install_report=_install_report_to_response(app.install_report),
         )
 
+    def _current_user_id() -> str:
+        """获取当前用户 ID，未认证时抛出 UnauthorizedError。"""
+        user_info = get_user_info()
+        if not user_info:
+            raise UnauthorizedError(
+                description="无法获取用户信息",
+                solution="请使用有效的token重新登录",
+            )
+        return user_info.id
+
     # ============ 1、安装应用 ============
     @router.post(
         "/applications",
@@ -112,20 +248,46 @@ def create_application_router(application_service: ApplicationService) -> APIRou
         返回:
             ApplicationResponse: 安装后的应用信息
         """
+        package = None
+        timer = StageTimer()
         try:
             logger.info("[install_application] 收到应用安装请求")
-            # 读取请求体（流式上传的 zip 数据）
-            body = await request.body()
-            logger.info(f"[install_application] 请求体大小: {len(body)} bytes")
+            # 流式接收请求体并写入临时文件，边写边计算大小和摘要，不在内存中保留完整安装包
+            with timer.stage(InstallTimingStage.RECEIVE):
+                package = await ingest_stream_to_file(
+                    request.stream(), settings.temp_dir, executor=blocking_executor
+                )
+            logger.info(f"[install_application] 请求体大小: {package.size} bytes, sha256: {package.sha256}")
             
-            if not body:
+            if package.size == 0:
                 logger.error("[install_application] 请求体为空")
                 raise ValidationError(
                     code="INVALID_REQUEST",
                     description="请求体不能为空",
                     solution="请上传有效的应用安装包（ZIP格式）",
                 )
-            
+
+            return await _install_package_file(request, package.path, timer)
+        finally:
+            # 安装完成（无论成功与否）后删除落盘的安装包
+            if package is not None:
+                remove_file_quietly(package.path)
+
+    async def _install_package_file(
+        request: Request, package_path: str, timer: Optional[StageTimer] = None
+    ) -> ApplicationResponse:
+        """
+        以当前用户身份安装已落盘的安装包，并将安装失败转换为业务异常。
+
+        参数:
+            request: 当前请求
+            package_path: 安装包文件路径（由调用方负责清理）
+            timer: 阶段计时器（可选），已记录接收安装包阶段时传入
+
+        返回:
+            ApplicationResponse: 安装后的应用信息
+        """
+        try:
             # 从上下文获取用户信息（由中间件通过token内省获取）
             user_info = get_user_info()
             if not user_info:
@@ -144,12 +306,12 @@ def create_application_router(application_service: ApplicationService) -> APIRou
             
             # 调用服务安装应用
             logger.info("[install_application] 开始调用应用服务安装应用")
-            zip_data = io.BytesIO(body)
             application = await application_service.install_application(
-                zip_data=zip_data,
+                package_path=package_path,
                 updated_by=updated_by,
                 updated_by_id=updated_by_id,
                 auth_token=auth_token,  # 保留参数以保持兼容性
+                timer=timer,
             )
             
             logger.info(f"[install_application] 应用安装成功: key={application.key}, id={application.id}")
@@ -179,37 +341,636 @@ def create_application_router(application_service: ApplicationService) -> APIRou
                 solution="请稍后重试或联系管理员",
             )
 
+    # ============ 1.5、安装包预检 ============
+    def _validation_report_to_response(report) -> PackageValidationResponse:
+        """将安装包预检结果转换为响应模型。"""
+        manifest = report.manifest
+        return PackageValidationResponse(
+            valid=report.valid,
+            problems=report.problems,
+            key=manifest.key if manifest else report.key,
+            name=manifest.name if manifest else None,
+            version=manifest.version if manifest else report.version,
+            installed_version=report.installed_version,
+            artifacts=[
+                PackageArtifactResponse(kind=a.kind, path=a.path, size=a.size)
+                for a in report.artifacts
+            ],
+            total_size=report.total_size,
+        )
+
+    @router.post(
+        "/applications/validate",
+        summary="预检安装包",
+        description="上传 zip 格式安装包（流式上传），只读取 ZIP 索引和元数据文件进行检查，不执行安装",
+        response_model=PackageValidationResponse,
+        responses={
+            200: {"description": "预检完成（是否可以安装见 valid 和 problems）"},
+            400: {"description": "请求参数错误", "model": ErrorResponse},
+            500: {"description": "服务器内部错误", "model": ErrorResponse},
+        }
+    )
+    async def validate_package(request: Request) -> PackageValidationResponse:
+        """
+        预检安装包。
+
+        检查安装包结构、manifest.yaml、application.key、配置文件格式以及与已安装版本的关系，
+        返回发现的全部问题和制品清单；不解压镜像和 Chart，也不调用部署服务。
+
+        返回:
+            PackageValidationResponse: 预检结果
+        """
+        _current_user_id()
+        package = None
+        try:
+            package = await ingest_stream_to_file(
+                request.stream(), settings.temp_dir, executor=blocking_executor
+            )
+            logger.info(f"[validate_package] 请求体大小: {package.size} bytes, sha256: {package.sha256}")
+            if package.size == 0:
+                raise ValidationError(
+                    code="INVALID_REQUEST",
+                    description="请求体不能为空",
+                    solution="请上传有效的应用安装包（ZIP格式）",
+                )
+            report = await application_service.validate_package(package.path)
+            return _validation_report_to_response(report)
+        finally:
+            if package is not None:
+                remove_file_quietly(package.path)
+
+    if upload_store is not None:
+        # ============ 1.4、分块上传安装包 ============
+        def _upload_session_to_response(session: UploadSession) -> UploadSessionResponse:
+            """将上传会话转换为响应模型。"""
+            return UploadSessionResponse(
+                id=session.id,
+                size=session.size,
+                chunk_size=session.chunk_size,
+                chunk_count=session.chunk_count,
+                received_bytes=session.received_bytes,
+                received_ranges=[[start, end] for start, end in session.received_ranges()],
+                missing_chunks=session.missing_chunks(),
+                complete=session.is_complete,
+                completing=session.completing,
+                created_at=session.created_at,
+                updated_at=session.updated_at,
+            )
+
+        async def _get_own_upload_session(upload_id: str) -> UploadSession:
+            """获取当前用户创建的上传会话，不存在或不属于当前用户时抛出 NotFoundError。"""
+            user_id = _current_user_id()
+            session = await upload_store.get(upload_id)
+            if session is None or (session.created_by_id and session.created_by_id != user_id):
+                raise NotFoundError(
+                    code="UPLOAD_NOT_FOUND",
+                    description=f"上传会话不存在: {upload_id}",
+                    solution="请重新创建上传会话",
+                )
+            return session
+
+        @router.post(
+            "/applications/uploads",
+            summary="创建分块上传会话",
+            description="创建可续传的安装包分块上传会话，返回分块大小和分块数",
+            response_model=UploadSessionResponse,
+            status_code=status.HTTP_201_CREATED,
+            responses={
+                201: {"description": "上传会话已创建"},
+                400: {"description": "请求参数错误", "model": ErrorResponse},
+            }
+        )
+        async def create_upload(body: CreateUploadRequest) -> UploadSessionResponse:
+            """
+            创建分块上传会话。
+
+            分块大小不传时使用 upload_chunk_size，且不能超过 upload_max_chunk_size；
+            安装包大小不能超过 upload_max_package_size，每个用户未完成的会话数不能超过 upload_max_sessions_per_user。
+
+            返回:
+                UploadSessionResponse: 新建的上传会话
+            """
+            user_id = _current_user_id()
+            chunk_size = body.chunk_size or settings.upload_chunk_size
+            if chunk_size > settings.upload_max_chunk_size:
+                raise ValidationError(
+                    code="INVALID_REQUEST",
+                    description=f"分块大小不能超过 {settings.upload_max_chunk_size} bytes",
+                    solution="请减小分块大小",
+                )
+            if body.size > settings.upload_max_package_size:
+                raise ValidationError(
+                    code="INVALID_REQUEST",
+                    description=f"安装包大小不能超过 {settings.upload_max_package_size} bytes",
+                    solution="请减小安装包大小或联系管理员调整上限",
+                )
+            if await upload_store.count_sessions(user_id) >= settings.upload_max_sessions_per_user:
+                raise ValidationError(
+                    code="TOO_MANY_UPLOADS",
+                    description=f"未完成的上传会话数已达上限 {settings.upload_max_sessions_per_user}",
+                    solution="请完成或取消已有的上传会话后重试",
+                )
+            session = await upload_store.create(body.size, chunk_size, sha256=body.sha256, created_by_id=user_id)
+            logger.info(f"[create_upload] 创建上传会话: {session.id}, 大小: {session.size} bytes, 分块数: {session.chunk_count}")
+            return _upload_session_to_response(session)
+
+        @router.get(
+            "/applications/uploads/{upload_id}",
+            summary="查询分块上传进度",
+            description="返回已收到的字节区间和尚未收到的分块，用于断点续传",
+            response_model=UploadSessionResponse,
+            responses={
+                200: {"description": "成功"},
+                404: {"description": "上传会话不存在", "model": ErrorResponse},
+            }
+        )
+        async def get_upload(upload_id: str = Path(..., description="上传会话 ID")) -> UploadSessionResponse:
+            """
+            查询分块上传进度。
+
+            返回:
+                UploadSessionResponse: 上传会话
+            """
+            return _upload_session_to_response(await _get_own_upload_session(upload_id))
+
+        @router.put(
+            "/applications/uploads/{upload_id}/chunks/{index}",
+            summary="上传分块",
+            description="上传一个分块（请求体为分块原始内容），分块按 SHA-256 摘要校验，同一分块可重复上传",
+            response_model=UploadSessionResponse,
+            responses={
+                200: {"description": "分块已接收"},
+                400: {"description": "分块序号、偏移量、长度或摘要错误", "model": ErrorResponse},
+                404: {"description": "上传会话不存在", "model": ErrorResponse},
+                409: {"description": "上传会话正在完成，或该分块正在由另一个请求上传", "model": ErrorResponse},
+            }
+        )
+        async def put_upload_chunk(
+            request: Request,
+            upload_id: str = Path(..., description="上传会话 ID"),
+            index: int = Path(..., ge=0, description="分块序号（从 0 开始）"),
+            chunk_sha256: str = Header(..., alias="X-Chunk-SHA256", description="分块内容的 SHA-256 摘要（十六进制）"),
+            chunk_offset: Optional[int] = Header(
+                None, alias="X-Chunk-Offset", description="分块在安装包中的偏移量（可选，传入时校验）"
+            ),
+        ) -> UploadSessionResponse:
+            """
+            上传分块。
+
+            分块内容按偏移量直接写入会话的安装包文件。
+
+            返回:
+                UploadSessionResponse: 更新后的上传会话
+            """
+            session = await _get_own_upload_session(upload_id)
+            if index < session.chunk_count and chunk_offset is not None and chunk_offset != session.chunk_range(index)[0]:
+                raise ValidationError(
+                    code="INVALID_CHUNK",
+                    description=f"分块 {index} 的偏移量应为 {session.chunk_range(index)[0]}，请求为 {chunk_offset}",
+                    solution="偏移量应为 分块序号 × chunk_size",
+                )
+            try:
+                session = await upload_store.write_chunk(upload_id, index, request.stream(), chunk_sha256)
+            except LookupError as e:
+                raise NotFoundError(code="UPLOAD_NOT_FOUND", description=str(e), solution="请重新创建上传会话")
+            except UploadCompletingError as e:
+                raise ConflictError(code="UPLOAD_COMPLETING", description=str(e), solution="上传会话已开始安装，请查看安装结果")
+            except ChunkInProgressError as e:
+                raise ConflictError(code="CHUNK_IN_PROGRESS", description=str(e), solution="请等待当前上传结束后再重试该分块")
+            except ChunkChecksumError as e:
+                logger.warning(f"[put_upload_chunk] {upload_id}: {e}")
+                raise ValidationError(code="CHUNK_CHECKSUM_MISMATCH", description=str(e), solution="请重新上传该分块")
+            except ValueError as e:
+                logger.warning(f"[put_upload_chunk] {upload_id}: {e}")
+                raise ValidationError(code="INVALID_CHUNK", description=str(e), solution="请按会话的分块大小切分安装包")
+            return _upload_session_to_response(session)
+
+        @router.post(
+            "/applications/uploads/{upload_id}/complete",
+            summary="完成分块上传并安装应用",
+            description="确认全部分块已收到（传入整体摘要时校验），然后直接使用已拼好的安装包文件安装应用",
+            response_model=ApplicationResponse,
+            responses={
+                200: {"description": "安装成功"},
+                400: {"description": "分块未上传完整、摘要不一致或安装包错误", "model": ErrorResponse},
+                404: {"description": "上传会话不存在", "model": ErrorResponse},
+                409: {"description": "版本冲突，或上传会话已在完成中、仍有分块在上传", "model": ErrorResponse},
+                500: {"description": "服务器内部错误", "model": ErrorResponse},
+            }
+        )
+        async def complete_upload(
+            request: Request,
+            upload_id: str = Path(..., description="上传会话 ID"),
+        ) -> ApplicationResponse:
+            """
+            完成分块上传并安装应用。
+
+            分块未上传完整时返回 400 且保留会话，可继续上传缺失的分块；
+            同一会话只能完成一次，开始安装后拒绝分块上传、预检和重复完成（409），安装结束后无论成功与否都删除会话。
+
+            返回:
+                ApplicationResponse: 安装后的应用信息
+            """
+            await _get_own_upload_session(upload_id)
+            try:
+                package_path = await upload_store.complete(upload_id)
+            except LookupError as e:
+                raise NotFoundError(code="UPLOAD_NOT_FOUND", description=str(e), solution="请重新创建上传会话")
+            except UploadCompletingError as e:
+                raise ConflictError(
+                    code="UPLOAD_COMPLETING", description=str(e), solution="请等待分块上传结束，或查看正在进行的安装结果"
+                )
+            except UploadIncompleteError as e:
+                raise ValidationError(code="UPLOAD_INCOMPLETE", description=str(e), solution="请上传缺失的分块后重试")
+            except ChunkChecksumError as e:
+                await upload_store.delete(upload_id)
+                raise ValidationError(code="CHECKSUM_MISMATCH", description=str(e), solution="请重新上传安装包")
+
+            logger.info(f"[complete_upload] 分块上传完成，开始安装: {upload_id}")
+            try:
+                return await _install_package_file(request, package_path)
+            finally:
+                remove_file_quietly(package_path)
+                await upload_store.delete(upload_id)
+
+        @router.post(
+            "/applications/uploads/{upload_id}/validate",
+            summary="预检分块上传的安装包",
+            description="只读取已收到的分块进行预检（ZIP 结尾记录、中央目录和元数据文件所在的分块到齐即可），不删除上传会话",
+            response_model=PackageValidationResponse,
+            responses={
+                200: {"description": "预检完成（是否可以安装见 valid 和 problems）"},
+                400: {"description": "预检需要的分块尚未上传（detail.needed_chunks 为需要上传的分块序号）", "model": ErrorResponse},
+                404: {"description": "上传会话不存在", "model": ErrorResponse},
+                409: {"description": "上传会话正在完成", "model": ErrorResponse},
+            }
+        )
+        async def validate_upload(upload_id: str = Path(..., description="上传会话 ID")) -> PackageValidationResponse:
+            """
+            预检分块上传的安装包。
+
+            不要求全部分块到齐，也不校验安装包整体摘要（complete 时校验）：
+            先上传最后的分块（ZIP 结尾记录和中央目录），预检只读取中央目录引用的元数据文件所在的分块；
+            需要的分块未到齐时返回 400，detail.needed_chunks 为需要上传的分块序号。
+
+            返回:
+                PackageValidationResponse: 预检结果
+            """
+            session = await _get_own_upload_session(upload_id)
+            if session.completing:
+                raise ConflictError(
+                    code="UPLOAD_COMPLETING",
+                    description=f"上传会话正在完成，不能再预检: {upload_id}",
+                    solution="上传会话已开始安装，请查看安装结果",
+                )
+            received_ranges = None if session.is_complete else session.received_ranges()
+            try:
+                report = await application_service.validate_package(
+                    upload_store.package_path(upload_id), received_ranges=received_ranges
+                )
+            except IncompletePackageError as e:
+                needed_chunks = session.chunks_covering(e.ranges)
+                preview = ", ".join(str(index) for index in needed_chunks[:10])
+                logger.info(f"[validate_upload] 预检需要的分块尚未上传: {upload_id}, 分块: {needed_chunks}")
+                raise ValidationError(
+                    code="UPLOAD_INCOMPLETE",
+                    description=f"预检还需要 {len(needed_chunks)} 个分块: {preview}{' ...' if len(needed_chunks) > 10 else ''}",
+                    solution="请上传这些分块后重新预检",
+                    detail={"needed_chunks": needed_chunks},
+                )
+            return _validation_report_to_response(report)
+
+        @router.delete(
+            "/applications/uploads/{upload_id}",
+            summary="取消分块上传",
+            description="删除上传会话及已上传的分块",
+            status_code=status.HTTP_204_NO_CONTENT,
+            response_class=Response,
+            responses={
+                204: {"description": "已删除"},
+                404: {"description": "上传会话不存在", "model": ErrorResponse},
+            }
+        )
+        async def delete_upload(upload_id: str = Path(..., description="上传会话 ID")) -> Response:
+            """
+            取消分块上传。
+
+            返回:
+                Response: 空响应
+            """
+            await _get_own_upload_session(upload_id)
+            await upload_store.delete(upload_id)
+            return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+    def _install_job_to_response(job, events=None) -> InstallJobResponse:
+        """将安装任务领域模型转换为响应模型。"""
+        return InstallJobResponse(
+            id=job.id,
+            status=job.status,
+            stage=job.stage,
+            application_id=job.application_id,
+            application_key=job.application_key,
+            error_code=job.error_code,
+            error=job.error,
+            updated_by=job.updated_by,
+            updated_by_id=job.updated_by_id,
+            stage_durations={stage: round(seconds, 3) for stage, seconds in job.stage_durations.items()},
+            duration=None if job.duration is None else round(job.duration, 3),
+            created_at=job.created_at,
+            updated_at=job.updated_at,
+            events=None if events is None else [
+                InstallJobEventResponse(
+                    seq=seq,
+                    stage=event.stage,
+                    status=event.status,
+                    message=event.message,
+                    timestamp=event.timestamp,
+                )
+                for seq, event in enumerate(events)
+            ],
+        )
+
+    if install_job_service is not None:
+        async def _get_own_install_job(job_id: str):
+            """获取当前用户提交的安装任务，不存在或不属于当前用户时抛出 NotFoundError。"""
+            user_id = _current_user_id()
+            job = await install_job_service.get_job(job_id)
+            if job is None or (job.created_by_id and job.created_by_id != user_id):
+                raise NotFoundError(description=f"安装任务不存在: {job_id}")
+            return job
+
+        # ============ 1.1、异步安装应用 ============
+        @router.post(
+            "/applications/jobs",
+            summary="异步安装应用",
+            description="上传 zip 格式安装包（流式上传），立即返回安装任务，由后台执行安装",
+            response_model=InstallJobResponse,
+            status_code=status.HTTP_202_ACCEPTED,
+            responses={
+                202: {"description": "安装任务已排队"},
+                400: {"description": "请求参数错误", "model": ErrorResponse},
+                503: {"description": "安装任务队列已满", "model": ErrorResponse},
+            }
+        )
+        async def submit_install_job(request: Request) -> InstallJobResponse:
+            """
+            异步安装应用。
+
+            安装包接收完成后立即返回任务 ID，解压、镜像和 Chart 上传、导入等步骤在后台执行，
+            通过 GET /applications/jobs/{job_id} 查询进度和结果。
+
+            返回:
+                InstallJobResponse: 已排队的安装任务
+            """
+            package = None
+            submitted = False
+            timer = StageTimer()
+            try:
+                logger.info("[submit_install_job] 收到异步安装请求")
+                with timer.stage(InstallTimingStage.RECEIVE):
+                    package = await ingest_stream_to_file(
+                        request.stream(), settings.temp_dir, executor=blocking_executor
+                    )
+                logger.info(f"[submit_install_job] 请求体大小: {package.size} bytes, sha256: {package.sha256}")
+
+                if package.size == 0:
+                    logger.error("[submit_install_job] 请求体为空")
+                    raise ValidationError(
+                        code="INVALID_REQUEST",
+                        description="请求体不能为空",
+                        solution="请上传有效的应用安装包（ZIP格式）",
+                    )
+
+                user_info = get_user_info()
+                if not user_info:
+                    logger.error("[submit_install_job] 无法获取用户信息")
+                    raise UnauthorizedError(
+                        description="无法获取用户信息",
+                        solution="请使用有效的token重新登录",
+                    )
+
+                job = await install_job_service.submit_install(
+                    package_path=package.path,
+                    updated_by=user_info.vision_name,
+                    updated_by_id=user_info.id,
+                    timer=timer,
+                )
+                submitted = True
+                return _install_job_to_response(job)
+            finally:
+                # 提交成功后安装包由安装任务负责删除
+                if package is not None and not submitted:
+                    remove_file_quietly(package.path)
+
+        # ============ 1.2、查询安装任务 ============
+        @router.get(
+            "/applications/jobs/{job_id}",
+            summary="查询安装任务",
+            description="查询当前用户提交的异步安装任务的状态、当前阶段和结果，任一副本均可查询",
+            response_model=InstallJobResponse,
+            responses={
+                200: {"description": "成功"},
+                404: {"description": "安装任务不存在、已过期或不属于当前用户", "model": ErrorResponse},
+            }
+        )
+        async def get_install_job(
+            job_id: str = Path(..., description="任务 ID"),
+            with_events: bool = Query(False, description="是否返回阶段事件列表"),
+        ) -> InstallJobResponse:
+            """
+            查询安装任务。
+
+            参数:
+                job_id: 任务 ID
+                with_events: 是否返回阶段事件列表
+
+            返回:
+                InstallJobResponse: 安装任务
+            """
+            job = await _get_own_install_job(job_id)
+            events = await install_job_service.get_events(job_id) if with_events else None
+            return _install_job_to_response(job, events)
+
+        # ============ 1.3、安装任务事件流 ============
+        @router.get(
+            "/applications/jobs/{job_id}/events",
+            summary="订阅安装任务事件",
+            description="以 Server-Sent Events 推送当前用户提交的安装任务的阶段事件，任务结束后关闭连接",
+            responses={
+                200: {"description": "事件流", "content": {"text/event-stream": {}}},
+                404: {"description": "安装任务不存在、已过期或不属于当前用户", "model": ErrorResponse},
+            }
+        )
+        async def stream_install_job_events(
+            job_id: str = Path(..., description="任务 ID"),
+            last_event_id: Optional[str] = Header(None, alias="Last-Event-ID", description="断线重连时最后收到的事件序号"),
+        ) -> StreamingResponse:
+            """
+            订阅安装任务事件。
+
+            按 install_job_poll_interval 轮询任务存储，推送新增事件；
+            任务结束且事件推送完毕后结束响应。
+
+            参数:
+                job_id: 任务 ID
+                last_event_id: 最后收到的事件序号，从其下一个事件开始推送
+
+            返回:
+                StreamingResponse: text/event-stream 事件流
+            """
+            await _get_own_install_job(job_id)
+            start = 0
+            if last_event_id is not None and last_event_id.strip().isdigit():
+                start = int(last_event_id) + 1
+
+            async def event_stream(seq: int) -> AsyncIterator[str]:
+                while True:
+                    # 先读任务状态再读事件：任务结束事件总是在结束状态之前写入
+                    job = await install_job_service.get_job(job_id)
+                    events = await install_job_service.get_events(job_id, seq)
+                    for event in events:
+                        yield _format_sse(seq, event)
+                        seq += 1
+                    if job is None or job.is_finished:
+                        return
+                    if not events:
+                        # 注释行作为心跳，避免代理因空闲断开连接
+                        yield ": keep-alive\n\n"
+                    await asyncio.sleep(settings.install_job_poll_interval)
+
+            return StreamingResponse(
+                event_stream(start),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
+
     # ============ 2、获取应用列表 ============
     @router.get(
         "/applications",
         summary="获取已安装应用列表",
         response_model=List[ApplicationResponse],
         responses={
-            200: {"description": "成功获取应用列表"},
+            200: {
+                "description": "成功获取应用列表",
+                "headers": {
+                    "X-Next-Cursor": {"description": "下一页游标，没有下一页时不返回"},
+                    "X-Total-Count": {"description": "满足过滤条件的总数，仅 with_total=true 时返回"},
+                },
+            },
+            400: {"description": "请求参数错误", "model": ErrorResponse},
             500: {"description": "服务器内部错误", "model": ErrorResponse},
         }
     )
     async def get_applications(
+        response: Response,
         pinned: Optional[bool] = Query(None, description="按被钉状态过滤：true=仅被钉，false=仅未被钉，不传=不过滤"),
+        category: Optional[str] = Query(None, description="按应用分组过滤"),
+        business_domain: Optional[str] = Query(None, description="按业务域过滤"),
+        is_config: Optional[bool] = Query(None, description="按是否完成配置过滤"),
+        name_prefix: Optional[str] = Query(None, description="按应用名称前缀过滤", max_length=128),
+        ontology_id: Optional[str] = Query(None, description="只返回使用指定业务知识网络的应用", max_length=128),
+        agent_id: Optional[str] = Query(None, description="只返回使用指定智能体的应用", max_length=128),
+        limit: Optional[int] = Query(None, description="每页数量，不传则返回全部", ge=1, le=MAX_PAGE_SIZE),
+        cursor: Optional[str] = Query(None, description="分页游标，取自上一页响应头 X-Next-Cursor"),
+        with_total: bool = Query(False, description="是否在响应头 X-Total-Count 中返回总数"),
+        include_icon: bool = Query(False, description="是否在列表中返回 Base64 图标；默认不返回，通过 icon_url 单独获取"),
     ) -> List[ApplicationResponse]:
         """
         获取已安装应用列表。
 
-        返回所有已安装的应用信息，按更新时间倒序排列。可通过 pinned 参数过滤被钉状态。
+        按更新时间倒序返回已安装的应用，可按被钉状态、分组、业务域、配置状态、名称前缀，
+        以及使用的业务知识网络/智能体过滤。
+        传入 limit 时按游标分页，下一页游标通过响应头 X-Next-Cursor 返回。
+        默认不返回图标内容，客户端通过 icon_url 单独加载（可被浏览器缓存）。
 
         返回:
             List[ApplicationResponse]: 应用列表
         """
         try:
-            applications = await application_service.get_all_applications(pinned=pinned)
-            return [_application_to_response(app) for app in applications]
+            page_cursor = ApplicationCursor.decode(cursor) if cursor else None
+        except ValueError as e:
+            raise ValidationError(description=str(e))
 
+        query = ApplicationListQuery(
+            pinned=pinned,
+            category=category,
+            business_domain=business_domain,
+            is_config=is_config,
+            name_prefix=name_prefix,
+            ontology_id=ontology_id,
+            agent_id=agent_id,
+            limit=limit,
+            cursor=page_cursor,
+            include_total=with_total,
+            include_icon=include_icon,
+        )
+        try:
+            page = await application_service.list_applications(query)
         except Exception as e:
             logger.exception(f"获取应用列表失败: {e}")
             raise InternalError(
                 description=f"获取应用列表失败: {str(e)}",
             )
 
+        if page.next_cursor is not None:
+            response.headers["X-Next-Cursor"] = page.next_cursor.encode()
+        if page.total is not None:
+            response.headers["X-Total-Count"] = str(page.total)
+        return [_application_to_response(app) for app in page.items]
+
+    # ============ 2.1、获取应用图标 ============
+    @router.get(
+        "/applications/icon",
+        summary="获取应用图标",
+        description="返回应用图标的原始内容，支持 ETag 条件请求；版本号 v 与当前图标一致时可被长期缓存。",
+        response_class=Response,
+        responses={
+            200: {"description": "图标内容"},
+            304: {"description": "图标未变化"},
+            404: {"description": "应用不存在或没有图标", "model": ErrorResponse},
+            500: {"description": "服务器内部错误", "model": ErrorResponse},
+        }
+    )
+    async def get_application_icon(
+        request: Request,
+        id: int = Query(..., description="应用主键 ID", ge=1),
+        v: Optional[str] = Query(None, description="图标版本号（icon_hash 前缀），仅用于区分缓存"),
+    ) -> Response:
+        """
+        获取应用图标。
+
+        参数:
+            id: 应用主键 ID
+            v: 图标版本号
+
+        返回:
+            Response: 图标内容，或 If-None-Match 命中时的 304 响应
+        """
+        try:
+            icon = await application_service.get_application_icon(id)
+        except Exception as e:
+            logger.exception(f"获取应用图标失败: {e}")
+            raise InternalError(description=f"获取应用图标失败: {str(e)}")
+
+        if icon is None:
+            raise NotFoundError(description=f"应用 {id} 不存在或没有图标")
+
+        etag = f'"{icon.icon_hash}"'
+        headers = {
+            "ETag": etag,
+            # 版本号与当前图标摘要一致时内容不会再变化，可长期缓存；
+            # 未带版本号或版本号已过期/无效时每次需要重新验证，避免把当前图标固定缓存一年
+            "Cache-Control": (
+                "public, max-age=31536000, immutable" if v and icon.icon_hash.startswith(v)
+                else "public, max-age=0, must-revalidate"
+            ),
+            **ICON_SECURITY_HEADERS,
+        }
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=icon.data, media_type=icon.content_type, headers=headers)
+
     # ============ 3、应用配置 ============
     @router.put(
         "/applications/config",
@@ -301,6 +1062,8 @@ def create_application_router(application_service: ApplicationService) -> APIRou
                 description=application.description,
                 version=application.version,
                 icon=application.icon,
+                icon_url=_icon_url(application),
+                icon_hash=application.icon_hash,
                 category=application.category,
                 micro_app=_micro_app_to_response(application.micro_app),
                 is_config=application.is_config,
@@ -0,0 +1,42 @@
+"""
+指标路由
+
+以 Prometheus 文本格式暴露运行时指标（事件循环延迟、阻塞任务执行器等）。
+"""
+from fastapi import APIRouter, Response
+
+from src.infrastructure.metrics import MetricsRegistry
+
+# Prometheus 文本格式的 Content-Type
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def create_metrics_router(metrics_registry: MetricsRegistry) -> APIRouter:
+    """
+    创建指标路由。
+
+    参数:
+        metrics_registry: 指标注册表实例。
+
+    返回:
+        APIRouter: 配置完成的路由。
+    """
+    router = APIRouter(tags=["Metrics"])
+
+    @router.get(
+        "/metrics",
+        summary="运行时指标",
+        response_class=Response,
+        responses={
+            200: {"description": "Prometheus 文本格式的指标", "content": {"text/plain": {}}},
+        }
+    )
+    async def get_metrics() -> Response:
+        """
+        运行时指标端点。
+
+        返回事件循环延迟、阻塞任务执行器排队数等指标，供 Prometheus 抓取。
+        """
+        return Response(content=metrics_registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+    return router
@@ -3,7 +3,7 @@
 
 定义应用相关的 API 请求和响应模型。
 """
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
 from pydantic import BaseModel, Field, ConfigDict
 
@@ -47,6 +47,113 @@ class ReleaseConfigItemResponse(BaseModel):
     namespace: str = Field(..., description="Release 所在命名空间")
 
 
+# ============ 安装报告响应 ============
+
+class ArtifactTimingResponse(BaseModel):
+    """安装制品耗时响应模型。"""
+    kind: str = Field(..., description="制品类型：image=镜像上传，chart=Chart 上传，release=Release 安装")
+    name: str = Field(..., description="制品名称（镜像/Chart 为安装包内路径，Release 为 Release 名称）")
+    size: Optional[int] = Field(None, description="文件大小（字节）")
+    started_at: float = Field(..., description="相对安装阶段开始的启动时间（秒）")
+    duration: float = Field(..., description="耗时（秒）")
+    digest: Optional[str] = Field(None, description="镜像/Chart 内容的 SHA-256 摘要")
+    skipped: bool = Field(False, description="是否因内容已上传过而跳过上传")
+
+
+class InstallReportResponse(BaseModel):
+    """安装报告响应模型。"""
+    artifacts: List[ArtifactTimingResponse] = Field(default_factory=list, description="各制品的处理耗时")
+    duration: float = Field(..., description="镜像上传、Chart 上传和 Release 安装阶段的总耗时（秒）")
+    skipped_count: int = Field(0, description="因内容已上传过而跳过上传的镜像/Chart 数量")
+    bytes_saved: int = Field(0, description="跳过上传的镜像/Chart 总大小（字节）")
+    stages: Dict[str, float] = Field(
+        default_factory=dict,
+        description="各安装阶段耗时（秒）：receive、extract、validate、deploy、import、save 依次执行，"
+                    "image_upload、chart_upload、release_install、ontology_import、agent_import 为并发子阶段",
+    )
+    total_duration: float = Field(0.0, description="安装总耗时（秒，含接收安装包）")
+
+
+# ============ 异步安装任务响应 ============
+
+class InstallJobEventResponse(BaseModel):
+    """安装任务事件响应模型。"""
+    seq: int = Field(..., description="事件序号（从 0 开始）")
+    stage: Optional[str] = Field(None, description="安装阶段：extract、validate、deploy、import、save，排队事件为空")
+    status: str = Field(..., description="任务状态：pending、running、succeeded、failed")
+    message: str = Field("", description="事件描述")
+    timestamp: Optional[datetime] = Field(None, description="事件时间")
+
+
+class InstallJobResponse(BaseModel):
+    """异步安装任务响应模型。"""
+    id: str = Field(..., description="任务 ID")
+    status: str = Field(..., description="任务状态：pending=排队中，running=执行中，succeeded=安装成功，failed=安装失败")
+    stage: Optional[str] = Field(None, description="当前（或失败时所在的）安装阶段，排队中为空")
+    application_id: Optional[int] = Field(None, description="安装成功后的应用主键 ID")
+    application_key: Optional[str] = Field(None, description="安装成功后的应用唯一标识")
+    error_code: Optional[str] = Field(None, description="安装失败时的错误码")
+    error: Optional[str] = Field(None, description="安装失败时的错误描述")
+    updated_by: str = Field("", description="提交者用户显示名称")
+    updated_by_id: str = Field("", description="提交者用户ID")
+    stage_durations: Dict[str, float] = Field(
+        default_factory=dict, description="各安装阶段耗时（秒，含 receive 和 queue 阶段，安装失败时另有 compensate 回滚阶段），任务结束后返回"
+    )
+    duration: Optional[float] = Field(None, description="安装总耗时（秒），任务结束后返回")
+    created_at: Optional[datetime] = Field(None, description="提交时间")
+    updated_at: Optional[datetime] = Field(None, description="最后更新时间")
+    events: Optional[List[InstallJobEventResponse]] = Field(None, description="阶段事件列表，仅在 with_events=true 时返回")
+
+
+# ============ 分块上传 ============
+
+class CreateUploadRequest(BaseModel):
+    """创建分块上传会话的请求体。"""
+    size: int = Field(..., gt=0, description="安装包总大小（字节）")
+    chunk_size: Optional[int] = Field(None, gt=0, description="分块大小（字节），不传时使用服务端默认值")
+    sha256: Optional[str] = Field(
+        None, pattern="^[0-9a-fA-F]{64}$", description="安装包整体的 SHA-256 摘要，传入时完成上传时校验"
+    )
+
+
+class UploadSessionResponse(BaseModel):
+    """分块上传会话响应模型。"""
+    id: str = Field(..., description="上传会话 ID")
+    size: int = Field(..., description="安装包总大小（字节）")
+    chunk_size: int = Field(..., description="分块大小（字节），最后一块可以更小")
+    chunk_count: int = Field(..., description="分块总数")
+    received_bytes: int = Field(..., description="已收到的字节数")
+    received_ranges: List[List[int]] = Field(
+        default_factory=list, description="已收到的字节区间，每项为 [起始偏移, 结束偏移)"
+    )
+    missing_chunks: List[int] = Field(default_factory=list, description="尚未收到的分块序号")
+    complete: bool = Field(..., description="是否已收到全部分块")
+    completing: bool = Field(False, description="是否已开始完成上传（开始安装后不再接收分块）")
+    created_at: Optional[datetime] = Field(None, description="创建时间")
+    updated_at: Optional[datetime] = Field(None, description="最近一次收到分块的时间")
+
+
+# ============ 安装包预检 ============
+
+class PackageArtifactResponse(BaseModel):
+    """安装包制品响应模型。"""
+    kind: str = Field(..., description="制品类型（image/chart/icon/ontology/agent）")
+    path: str = Field(..., description="相对应用包根目录的路径")
+    size: int = Field(..., description="文件大小（字节，解压后）")
+
+
+class PackageValidationResponse(BaseModel):
+    """安装包预检结果响应模型。"""
+    valid: bool = Field(..., description="是否可以安装")
+    problems: List[str] = Field(default_factory=list, description="发现的全部问题，为空表示可以安装")
+    key: Optional[str] = Field(None, description="应用包唯一标识，application.key 无法读取时为空")
+    name: Optional[str] = Field(None, description="应用名称")
+    version: Optional[str] = Field(None, description="安装包版本号，manifest 存在其他问题时同样返回并校验")
+    installed_version: Optional[str] = Field(None, description="已安装的版本号，应用未安装时为空")
+    artifacts: List[PackageArtifactResponse] = Field(default_factory=list, description="安装包中的制品清单")
+    total_size: int = Field(0, description="制品总大小（字节）")
+
+
 # ============ 应用信息响应 ============
 
 class ApplicationResponse(BaseModel):
@@ -59,7 +166,9 @@ class ApplicationResponse(BaseModel):
     key: str = Field(..., description="应用包唯一标识", max_length=32)
     name: str = Field(..., description="应用名称", max_length=128)
     description: Optional[str] = Field(None, description="应用描述", max_length=800)
-    icon: Optional[str] = Field(None, description="应用图标，Base64 编码")
+    icon: Optional[str] = Field(None, description="应用图标，Base64 编码（列表接口默认不返回，使用 icon_url 获取）")
+    icon_url: Optional[str] = Field(None, description="应用图标地址，无图标时为空")
+    icon_hash: Optional[str] = Field(None, description="应用图标内容摘要（SHA-1），图标变化时改变")
     category: Optional[str] = Field(None, description="应用所属分组", max_length=128)
     version: Optional[str] = Field(None, description="应用版本号", max_length=128)
     micro_app: Optional[MicroAppResponse] = Field(None, description="微应用配置")
@@ -71,6 +180,7 @@ class ApplicationResponse(BaseModel):
     updated_by: str = Field(..., description="更新者用户显示名称", max_length=128)
     updated_by_id: str = Field(..., description="更新者用户ID", max_length=36)
     updated_at: datetime = Field(..., description="更新时间")
+    install_report: Optional[InstallReportResponse] = Field(None, description="安装报告，仅安装接口返回")
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -89,6 +199,8 @@ class ApplicationBasicInfoResponse(BaseModel):
     description: Optional[str] = Field(None, description="应用描述")
     version: Optional[str] = Field(None, description="应用版本号")
     icon: Optional[str] = Field(None, description="应用图标")
+    icon_url: Optional[str] = Field(None, description="应用图标地址，无图标时为空")
+    icon_hash: Optional[str] = Field(None, description="应用图标内容摘要（SHA-1），图标变化时改变")
     category: Optional[str] = Field(None, description="应用所属分组")
     micro_app: Optional[MicroAppResponse] = Field(None, description="微应用配置")
     is_config: bool = Field(..., description="是否完成配置")
@@ -3,7 +3,9 @@ Application Tests
 
 Unit tests and integration tests for application management functionality.
 """
+import asyncio
 import io
+import os
 import pytest
 import zipfile
 from datetime import datetime
@@ -13,11 +15,13 @@ from fastapi.testclient import TestClient
 from src.main import create_app
 from src.infrastructure.config.settings import Settings
 from src.domains.application import (
-    Application, OntologyInfo, AgentInfo, ManifestInfo, MicroAppInfo,
-    OntologyConfigItem, AgentConfigItem
+    Application, ApplicationCursor, ApplicationIcon, ApplicationListQuery, ApplicationPage, OntologyInfo, AgentInfo, ManifestInfo, MicroAppInfo,
+    OntologyConfigItem, AgentConfigItem, compute_icon_hash
 )
 from src.application.application_service import ApplicationService
 from src.adapters.application_adapter import ApplicationAdapter
+from src.adapters.application_row_decoder import ApplicationRowDecoder
+from src.infrastructure.upload import DirectoryPackageArchive, ZipPackageArchive
 
 
 @pytest.fixture
@@ -124,6 +128,67 @@ category: 测试分类
     return buffer.getvalue()
 
 
+class FakeCursor:
+    """记录执行 SQL 的数据库游标。"""
+
+    def __init__(self, rows, count=0):
+        self.rows = rows
+        self.count = count
+        self.executed = []
+        self.rowcount = 1
+        self.lastrowid = 42
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, sql, params=()):
+        self.executed.append((" ".join(sql.split()), params))
+
+    async def executemany(self, sql, seq_of_params):
+        self.executed.append((" ".join(sql.split()), list(seq_of_params)))
+
+    async def fetchall(self):
+        return self.rows
+
+    async def fetchone(self):
+        return (self.count,)
+
+
+class FakePool:
+    """只提供一个游标的数据库连接池，记录事务操作。"""
+
+    def __init__(self, cursor: FakeCursor):
+        self._cursor = cursor
+        self.transactions = []
+
+    def acquire(self):
+        pool = self
+
+        class _Conn:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            def cursor(self):
+                return pool._cursor
+
+            async def begin(self):
+                pool.transactions.append("begin")
+
+            async def commit(self):
+                pool.transactions.append("commit")
+
+            async def rollback(self):
+                pool.transactions.append("rollback")
+
+        return _Conn()
+
+
 class TestApplicationDomain:
     """应用领域模型测试。"""
 
@@ -146,6 +211,26 @@ class TestApplicationDomain:
         )
         assert app.has_icon() is False
 
+    def test_application_cursor_round_trip(self):
+        """测试分页游标编码后可以还原，非法游标抛出 ValueError。"""
+        cursor = ApplicationCursor(updated_at=datetime(2024, 1, 1, 12, 0, 0), id=42)
+
+        assert ApplicationCursor.decode(cursor.encode()) == cursor
+        with pytest.raises(ValueError):
+            ApplicationCursor.decode("not-a-cursor")
+
+    def test_application_icon_detects_content_type(self):
+        """测试 ApplicationIcon 根据内容识别图片类型。"""
+        png = ApplicationIcon(data=b"\x89PNG\r\n\x1a\n....", icon_hash="x")
+        jpeg = ApplicationIcon(data=b"\xff\xd8\xff\xe0....", icon_hash="x")
+        svg = ApplicationIcon(data=b'<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg"/>', icon_hash="x")
+        unknown = ApplicationIcon(data=b"not an image", icon_hash="x")
+
+        assert png.content_type == "image/png"
+        assert jpeg.content_type == "image/jpeg"
+        assert svg.content_type == "image/svg+xml"
+        assert unknown.content_type == "application/octet-stream"
+
     def test_is_configured_returns_true_when_configured(self, sample_application: Application):
         """测试当已配置时 is_configured 返回 True。"""
         assert sample_application.is_configured() is True
@@ -248,6 +333,44 @@ class TestApplicationService:
         assert len(result) == 1
         assert result[0].id == 1
 
+    @pytest.mark.asyncio
+    async def test_get_application_agents_by_id_fetches_concurrently(self, test_settings: Settings):
+        """测试智能体详情并发查询：保持顺序、限制并发，失败和超时的项只返回 ID。"""
+        application = Application(
+            id=1, key="app", name="app", updated_by="u",
+            agent_config=[AgentConfigItem(id=str(i)) for i in range(6)],
+        )
+        port = AsyncMock()
+        port.get_application_by_id.return_value = application
+        running = 0
+        max_running = 0
+
+        async def get_agent(agent_id, auth_token=None, business_domain=None):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            try:
+                if agent_id == "3":
+                    raise RuntimeError("upstream error")
+                await asyncio.sleep(10 if agent_id == "5" else 0.01)
+                return {"id": agent_id, "name": f"agent-{agent_id}"}
+            finally:
+                running -= 1
+
+        agent_factory = AsyncMock()
+        agent_factory.get_agent.side_effect = get_agent
+        test_settings.detail_fetch_concurrency = 2
+        test_settings.detail_fetch_deadline = 0.5
+        service = ApplicationService(port, agent_factory_port=agent_factory, settings=test_settings)
+
+        result = await service.get_application_agents_by_id(1)
+
+        assert [item["id"] for item in result] == ["0", "1", "2", "3", "4", "5"]
+        assert result[0]["name"] == "agent-0"
+        assert result[3] == {"id": "3"}
+        assert result[5] == {"id": "5"}
+        assert max_running == 2
+
     @pytest.mark.asyncio
     async def test_configure_application_updates_config(self, sample_application: Application):
         """测试 configure_application 更新配置。"""
@@ -388,11 +511,8 @@ class TestApplicationService:
 class TestApplicationAdapter:
     """应用适配器测试。"""
 
-    @pytest.mark.asyncio
-    async def test_row_to_application_converts_correctly(self, test_settings: Settings):
+    def test_row_decoder_converts_correctly(self):
         """测试数据库行转换为应用模型。"""
-        adapter = ApplicationAdapter(test_settings)
-
         row = (
             1,                              # id
             "test-app-001",                 # key
@@ -406,11 +526,15 @@ class TestApplicationAdapter:
             '[{"id": 1, "is_config": true}, {"id": 2, "is_config": false}]',  # ontology_config (JSON)
             '[{"id": 1, "is_config": true}]',  # agent_config (JSON)
             True,                           # is_config
+            False,                          # pinned
             "user-001",                     # updated_by
+            None,                           # updated_by_id
             datetime(2024, 1, 1, 12, 0, 0), # updated_at
+            "db_public",                    # business_domain
+            None,                           # icon_hash
         )
 
-        app = adapter._row_to_application(row)
+        app = ApplicationRowDecoder().decode(row)
 
         assert app.id == 1
         assert app.key == "test-app-001"
@@ -436,10 +560,8 @@ class TestApplicationAdapter:
         assert app.updated_by == "user-001"
         assert app.updated_at == datetime(2024, 1, 1, 12, 0, 0)
 
-    @pytest.mark.asyncio
-    async def test_row_to_application_handles_null_values(self, test_settings: Settings):
+    def test_row_decoder_handles_null_values(self):
         """测试处理 NULL 值。"""
-        adapter = ApplicationAdapter(test_settings)
 
         row = (
             1,
@@ -454,11 +576,15 @@ class TestApplicationAdapter:
             None,  # ontology_ids
             None,  # agent_ids
             False, # is_config
+            None,  # pinned
             "user-001",
+            None,  # updated_by_id
             datetime(2024, 1, 1, 12, 0, 0),
+            None,  # business_domain
+            None,  # icon_hash
         )
 
-        app = adapter._row_to_application(row)
+        app = ApplicationRowDecoder().decode(row)
 
         assert app.description is None
         assert app.icon is None
@@ -468,11 +594,10 @@ class TestApplicationAdapter:
         assert app.ontology_config == []
         assert app.agent_config == []
         assert app.is_config is False
+        assert (app.pinned, app.updated_by_id, app.business_domain) == (False, "", "db_public")
 
-    @pytest.mark.asyncio
-    async def test_row_to_application_handles_invalid_json(self, test_settings: Settings):
+    def test_row_decoder_handles_invalid_json(self):
         """测试处理无效 JSON。"""
-        adapter = ApplicationAdapter(test_settings)
 
         row = (
             1,
@@ -487,30 +612,205 @@ class TestApplicationAdapter:
             "{invalid}",
             "{invalid}",
             False,
+            False,
             "user-001",
+            None,
             datetime(2024, 1, 1, 12, 0, 0),
+            "db_public",
+            None,
         )
 
-        with patch('src.adapters.application_adapter.logger') as mock_logger:
-            app = adapter._row_to_application(row)
+        with patch('src.adapters.application_row_decoder.logger') as mock_logger:
+            app = ApplicationRowDecoder().decode(row)
+            assert mock_logger.warning.call_count == 3
             assert app.release_config == []
             assert app.ontology_config == []
             assert app.agent_config == []
 
-    def test_parse_json_list_returns_list_for_valid_json(self, test_settings: Settings):
-        """测试 _parse_json_list 对有效 JSON 返回列表。"""
+    def test_row_decoder_reads_icon_hash(self):
+        """测试读取 icon_hash 列；列表查询不加载图标内容时仍返回摘要。"""
+        decoder = ApplicationRowDecoder()
+        row = (
+            1, "test-app-001", "测试应用", None, None, "1.0.0", None, None, None, None, None,
+            True, False, "user-001", "uid-001", datetime(2024, 1, 1), "db_public",
+            "a" * 40,                       # icon_hash
+        )
+
+        app = decoder.decode(row)
+
+        assert app.icon is None
+        assert app.icon_hash == "a" * 40
+        assert app.has_icon() is True
+
+        # 旧数据未回填摘要时根据图标内容计算
+        legacy = decoder.decode(row[:4] + (b"test-icon",) + row[5:17] + (None,))
+        assert legacy.icon_hash == compute_icon_hash(b"test-icon")
+
+    @pytest.mark.asyncio
+    async def test_list_applications_pushes_filters_and_keyset_into_sql(self, test_settings: Settings):
+        """测试过滤、keyset 分页和总数统计都在 SQL 中完成。"""
+        adapter = ApplicationAdapter(test_settings)
+        rows = [
+            (i, f"app-{i}", f"应用{i}", None, None, "1.0.0", "cat", None, None, None, None,
+             True, False, "user", "uid", datetime(2024, 1, 1), "db_public", None)
+            for i in (9, 8, 7)
+        ]
+        cursor = FakeCursor(rows, count=25)
+        adapter._pool = FakePool(cursor)
+        after = ApplicationCursor(updated_at=datetime(2024, 1, 2), id=10)
+
+        page = await adapter.list_applications(ApplicationListQuery(
+            category="cat", name_prefix="a_b%", limit=2, cursor=after, include_total=True, include_icon=False,
+        ))
+
+        assert [app.id for app in page.items] == [9, 8]
+        assert page.next_cursor == ApplicationCursor(updated_at=datetime(2024, 1, 1), id=8)
+        assert page.total == 25
+
+        (select_sql, select_params), (count_sql, count_params) = cursor.executed
+        assert "NULL AS icon" in select_sql
+        assert "WHERE category = %s AND name LIKE %s AND (updated_at < %s OR (updated_at = %s AND id < %s))" in select_sql
+        assert select_sql.endswith("ORDER BY updated_at DESC, id DESC LIMIT %s")
+        assert select_params == ("cat", "a\\_b\\%%", after.updated_at, after.updated_at, 10, 3)
+        assert count_sql == "SELECT COUNT(*) FROM t_application WHERE category = %s AND name LIKE %s"
+        assert count_params == ("cat", "a\\_b\\%%")
+
+    def test_row_decoder_fills_missing_columns_and_skips_icon(self):
+        """测试行解码器为旧表结构缺失的列生成常量表达式，不加载图标时不读取图标内容。"""
+        import json
+
+        legacy = ApplicationRowDecoder(
+            ["id", "key", "name", "description", "icon", "version", "category", "micro_app", "release_config",
+             "ontology_ids", "agent_ids", "is_config", "updated_by", "updated_at"],
+            json_loads=json.loads,
+        )
+        select_list = legacy.select_list(include_icon=False)
+        assert "NULL AS icon," in select_list
+        assert "0 AS pinned" in select_list
+        assert select_list.endswith("'db_public' AS business_domain, NULL AS icon_hash")
+
+        row = (
+            1, "app", "应用", None, b"test-icon", "1.0.0", None,
+            '{"name": "app", "entry": "/app"}', '["r1", {"name": "r2", "namespace": "ns"}]',
+            '[{"id": 1, "is_config": true}, 2]', "{invalid}",
+            1, 0, "user", None, datetime(2024, 1, 1), "db_public", None,
+        )
+        app = ApplicationRowDecoder().decode(row)
+
+        assert app.icon == "dGVzdC1pY29u"
+        assert app.icon_hash == compute_icon_hash(b"test-icon")
+        assert app.micro_app == MicroAppInfo(name="app", entry="/app", headless=False)
+        assert [(r.name, r.namespace) for r in app.release_config] == [("r1", "default"), ("r2", "ns")]
+        assert app.ontology_config == [OntologyConfigItem(id="1", is_config=True), OntologyConfigItem(id="2")]
+        assert app.agent_config == []
+        assert (app.is_config, app.pinned, app.updated_by_id) == (True, False, "")
+
+    @pytest.mark.asyncio
+    async def test_query_builder_writes_existing_columns_and_light_projection(self, test_settings: Settings):
+        """测试 SQL 构建器只写入旧表结构中存在的列，按 ID 查询可不加载图标和配置。"""
+        from src.adapters.application_query_builder import ApplicationQueryBuilder
+
+        legacy = ApplicationQueryBuilder(
+            ["id", "key", "name", "description", "icon", "version", "category", "micro_app", "release_config",
+             "ontology_ids", "agent_ids", "is_config", "updated_by", "updated_at"],
+        )
+        application = Application(id=None, key="app", name="应用", updated_by="user",
+                                  agent_config=[AgentConfigItem(id="agent-1", is_config=True)])
+        assert legacy.insert_sql.startswith("INSERT INTO t_application (`key`, name, description, icon, version,")
+        assert "pinned" not in legacy.insert_sql and "icon_hash" not in legacy.update_sql
+        params = legacy.update_params(application, None, datetime(2024, 1, 1))
+        assert params[-1] == "app" and len(params) == legacy.update_sql.count("%s")
+        assert legacy.update_config_sql == (
+            "UPDATE t_application SET ontology_ids = %s, agent_ids = %s, is_config = %s, updated_by = %s, "
+            "updated_at = %s WHERE `key` = %s"
+        )
+        assert legacy.select_icon_sql == "SELECT icon, NULL AS icon_hash FROM t_application WHERE id = %s"
+
         adapter = ApplicationAdapter(test_settings)
+        row = (1, "app", "应用", None, None, "1.0.0", None, None, None, None, None,
+               True, False, "user", "uid", datetime(2024, 1, 1), "db_public", "a" * 40)
+        cursor = FakeCursor([])
+        cursor.fetchone = AsyncMock(return_value=row)
+        adapter._pool = FakePool(cursor)
 
-        assert adapter._parse_json_list('[1, 2, 3]') == [1, 2, 3]
-        assert adapter._parse_json_list('["a", "b"]') == ["a", "b"]
+        app = await adapter.get_application_by_id(1, include_icon=False, include_config=False)
 
-    def test_parse_json_list_returns_default_for_invalid_json(self, test_settings: Settings):
-        """测试 _parse_json_list 对无效 JSON 返回默认值。"""
+        (sql, sql_params), = cursor.executed
+        assert "NULL AS icon," in sql and "NULL AS release_config, NULL AS ontology_ids, NULL AS agent_ids" in sql
+        assert sql.endswith("FROM t_application WHERE id = %s") and sql_params == (1,)
+        assert (app.id, app.icon_hash, app.agent_config) == (1, "a" * 40, [])
+
+    @pytest.mark.asyncio
+    async def test_upsert_application_guards_installed_version(self, test_settings: Settings):
+        """测试安装使用单条 upsert 语句按预期版本更新，ID 取自 LAST_INSERT_ID，版本不一致时失败、内容未变化时不算冲突。"""
+        adapter = ApplicationAdapter(test_settings)
+        cursor = FakeCursor([])
+        pool = FakePool(cursor)
+        adapter._pool = pool
+        application = Application(id=0, key="app", name="应用", version="2.0.0", updated_by="user")
+
+        result = await adapter.upsert_application(application, expected_version="1.0.0")
+
+        assert result.id == 42
+        (upsert_sql, upsert_params), (delete_sql, _) = cursor.executed
+        assert "ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id), name = IF(version <=> %s, VALUES(name), name)" in upsert_sql
+        assert upsert_sql.endswith("version = IF(version <=> %s, VALUES(version), version)")
+        assert "pinned = IF" not in upsert_sql
+        assert len(upsert_params) == upsert_sql.count("%s") and upsert_params[-1] == "1.0.0"
+        assert delete_sql == "DELETE FROM t_application_ref WHERE application_id = %s"
+
+        cursor.rowcount = 0
+        cursor.fetchone = AsyncMock(return_value=(7, "2.0.0"))
+        result = await adapter.upsert_application(application, expected_version="2.0.0")
+        assert result.id == 7
+        assert cursor.executed[-2] == ("SELECT id, version FROM t_application WHERE `key` = %s", ("app",))
+        assert pool.transactions[-1] == "commit"
+
+        for expected_version in ("1.0.0", None):
+            with pytest.raises(ValueError, match="应用已被其他安装修改"):
+                await adapter.upsert_application(application, expected_version=expected_version)
+            assert pool.transactions[-1] == "rollback"
+
+    @pytest.mark.asyncio
+    async def test_create_application_writes_refs_in_same_transaction(self, test_settings: Settings):
+        """测试创建应用时在同一事务中写入引用表（重复 ID 只写一次），并可按智能体 ID 走引用表反查。"""
         adapter = ApplicationAdapter(test_settings)
+        cursor = FakeCursor([], count=0)
+        pool = FakePool(cursor)
+        adapter._pool = pool
+        application = Application(
+            id=None, key="app", name="应用", updated_by="user",
+            ontology_config=[OntologyConfigItem(id="kn-1", is_config=True)],
+            agent_config=[AgentConfigItem(id="agent-1", is_config=False), AgentConfigItem(id="agent-1", is_config=True)],
+        )
+
+        await adapter.create_application(application)
+
+        assert pool.transactions == ["begin", "commit"]
+        (delete_sql, delete_params), (insert_sql, insert_params) = cursor.executed[-2:]
+        assert delete_sql == "DELETE FROM t_application_ref WHERE application_id = %s"
+        assert delete_params == (42,)
+        assert insert_sql.startswith("INSERT INTO t_application_ref")
+        assert insert_params == [(42, "ontology", "kn-1", True), (42, "agent", "agent-1", False)]
 
-        assert adapter._parse_json_list('{invalid}') == []
-        assert adapter._parse_json_list(None) == []
-        assert adapter._parse_json_list('') == []
+        where, params = adapter._build_list_filters(ApplicationListQuery(agent_id="agent-1"))
+        assert where == ["id IN (SELECT application_id FROM t_application_ref WHERE kind = %s AND ref_id = %s)"]
+        assert params == ["agent", "agent-1"]
+
+    def test_row_decoder_load_parses_valid_json(self):
+        """测试行解码器解析有效的 JSON 字段。"""
+        decoder = ApplicationRowDecoder()
+
+        assert decoder._load('[1, 2, 3]', "ontology_ids") == [1, 2, 3]
+        assert decoder._load('["a", "b"]', "agent_ids") == ["a", "b"]
+
+    def test_row_decoder_load_returns_none_for_invalid_json(self):
+        """测试行解码器对无效或空的 JSON 字段返回 None。"""
+        decoder = ApplicationRowDecoder()
+
+        assert decoder._load('{invalid}', "ontology_ids") is None
+        assert decoder._load(None, "ontology_ids") is None
+        assert decoder._load('', "ontology_ids") is None
 
 
 class TestApplicationRouter:
@@ -518,8 +818,8 @@ class TestApplicationRouter:
 
     def test_get_applications_endpoint_returns_200(self, test_settings: Settings):
         """测试获取应用列表接口返回 200 状态码。"""
-        with patch('src.adapters.application_adapter.ApplicationAdapter.get_all_applications') as mock_get_all:
-            mock_get_all.return_value = []
+        with patch('src.adapters.application_adapter.ApplicationAdapter.list_applications') as mock_list:
+            mock_list.return_value = ApplicationPage()
 
             app = create_app(test_settings)
             client = TestClient(app)
@@ -530,8 +830,8 @@ class TestApplicationRouter:
 
     def test_get_applications_endpoint_returns_array(self, test_settings: Settings):
         """测试获取应用列表接口返回数组格式。"""
-        with patch('src.adapters.application_adapter.ApplicationAdapter.get_all_applications') as mock_get_all:
-            mock_get_all.return_value = []
+        with patch('src.adapters.application_adapter.ApplicationAdapter.list_applications') as mock_list:
+            mock_list.return_value = ApplicationPage()
 
             app = create_app(test_settings)
             client = TestClient(app)
@@ -543,6 +843,36 @@ class TestApplicationRouter:
             assert isinstance(data, list)
             assert len(data) == 0
 
+    def test_get_application_icon_endpoint_supports_etag(self, test_settings: Settings):
+        """测试图标接口无需认证，返回 ETag 并在 If-None-Match 命中时返回 304。"""
+        data = b"\x89PNG\r\n\x1a\nicon"
+        icon = ApplicationIcon(data=data, icon_hash=compute_icon_hash(data))
+        with patch('src.adapters.application_adapter.ApplicationAdapter.get_application_icon') as mock_get_icon:
+            mock_get_icon.return_value = icon
+
+            client = TestClient(create_app(test_settings))
+            url = f"{test_settings.api_prefix}/applications/icon"
+
+            response = client.get(url, params={"id": 1, "v": icon.icon_hash[:12]})
+            assert response.status_code == 200
+            assert response.content == data
+            assert response.headers["content-type"] == "image/png"
+            assert response.headers["etag"] == f'"{icon.icon_hash}"'
+            assert "immutable" in response.headers["cache-control"]
+            assert response.headers["x-content-type-options"] == "nosniff"
+            assert response.headers["content-security-policy"].startswith("default-src 'none'")
+
+            # 版本号与当前图标不一致时不能长期缓存
+            response = client.get(url, params={"id": 1, "v": "stale"})
+            assert response.headers["cache-control"] == "public, max-age=0, must-revalidate"
+
+            response = client.get(url, params={"id": 1}, headers={"If-None-Match": f'W/"{icon.icon_hash}"'})
+            assert response.status_code == 304
+            assert response.content == b""
+
+            mock_get_icon.return_value = None
+            assert client.get(url, params={"id": 2}).status_code == 404
+
     def test_get_application_basic_info_endpoint_returns_404_when_not_found(self, test_settings: Settings):
         """测试当应用不存在时获取基础信息接口返回 404 状态码。"""
         with patch('src.adapters.application_adapter.ApplicationAdapter.get_application_by_key') as mock_get_by_key:
@@ -659,6 +989,1051 @@ class TestApplicationRouter:
             assert response.status_code == 404
 
 
+class TestPackageIngest:
+    """安装包流式接收测试。"""
+
+    @pytest.mark.asyncio
+    async def test_ingest_stream_to_file_writes_chunks_and_computes_digest(self, tmp_path):
+        """测试流式写入临时文件并计算大小和摘要。"""
+        import hashlib
+        from src.infrastructure.upload import ingest_stream_to_file
+
+        chunks = [b"PK\x03\x04", b"", b"x" * 4096, b"tail"]
+
+        async def stream():
+            for chunk in chunks:
+                yield chunk
+
+        package = await ingest_stream_to_file(stream(), str(tmp_path), write_buffer_size=1024)
+
+        expected = b"".join(chunks)
+        assert package.size == len(expected)
+        assert package.sha256 == hashlib.sha256(expected).hexdigest()
+        assert os.path.dirname(package.path) == str(tmp_path)
+        with open(package.path, "rb") as f:
+            assert f.read() == expected
+
+    @pytest.mark.asyncio
+    async def test_ingest_stream_to_file_removes_partial_file_on_error(self, tmp_path):
+        """测试流中断时删除已写入的部分文件。"""
+        from src.infrastructure.upload import ingest_stream_to_file
+
+        async def stream():
+            yield b"partial"
+            raise ConnectionError("client disconnected")
+
+        with pytest.raises(ConnectionError):
+            await ingest_stream_to_file(stream(), str(tmp_path))
+
+        assert os.listdir(tmp_path) == []
+
+
+class TestBlockingExecutor:
+    """阻塞任务执行器和事件循环延迟监控测试。"""
+
+    @staticmethod
+    async def _measure_lag(block) -> float:
+        """在执行 block 期间采样事件循环延迟，返回最大延迟。"""
+        from src.infrastructure.metrics import LoopLagMonitor
+
+        monitor = LoopLagMonitor(interval=0.01, warn_threshold=0)
+        monitor.start()
+        try:
+            await asyncio.sleep(0.05)
+            await block()
+            await asyncio.sleep(0.05)
+        finally:
+            await monitor.stop()
+        return monitor.max_lag
+
+    @pytest.mark.asyncio
+    async def test_blocking_work_in_executor_keeps_loop_responsive(self):
+        """测试阻塞操作在执行器中执行时事件循环延迟保持很低，在事件循环中执行时延迟明显。"""
+        import time
+        from src.infrastructure.executor import BlockingExecutor
+
+        executor = BlockingExecutor(2)
+        try:
+            async def offloaded():
+                await asyncio.gather(executor.run(time.sleep, 0.3), executor.run(time.sleep, 0.3))
+
+            async def inline():
+                time.sleep(0.3)
+
+            offloaded_lag = await self._measure_lag(offloaded)
+            inline_lag = await self._measure_lag(inline)
+        finally:
+            executor.shutdown()
+
+        assert offloaded_lag < 0.1
+        assert inline_lag >= 0.25
+        assert executor.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_executor_runs_in_caller_context(self):
+        """测试执行器中的任务可读取调用方的上下文变量。"""
+        import contextvars
+        from src.infrastructure.executor import BlockingExecutor
+
+        var = contextvars.ContextVar("var", default=None)
+        var.set("token")
+        executor = BlockingExecutor(1)
+        try:
+            assert await executor.run(var.get) == "token"
+        finally:
+            executor.shutdown()
+
+
+class TestResumableUpload:
+    """可续传分块上传测试。"""
+
+    @staticmethod
+    async def _stream(data: bytes, piece: int = 3):
+        for i in range(0, len(data), piece):
+            yield data[i:i + piece]
+
+    @pytest.mark.asyncio
+    async def test_chunks_written_out_of_order_assemble_in_place(self, tmp_path):
+        """测试分块乱序上传、摘要错误的分块不计入、全部到齐后会话文件即为完整安装包。"""
+        import hashlib
+        from src.infrastructure.upload import ChunkChecksumError, ResumableUploadStore, UploadIncompleteError
+
+        data = bytes(range(256)) * 4 + b"tail"
+        store = ResumableUploadStore(str(tmp_path), ttl=3600)
+        session = await store.create(len(data), 300, sha256=hashlib.sha256(data).hexdigest(), created_by_id="u1")
+        assert session.chunk_count == 4
+        chunks = [data[i:i + 300] for i in range(0, len(data), 300)]
+
+        def sha(chunk: bytes) -> str:
+            return hashlib.sha256(chunk).hexdigest()
+
+        await store.write_chunk(session.id, 2, self._stream(chunks[2]), sha(chunks[2]))
+        await store.write_chunk(session.id, 0, self._stream(chunks[0]), sha(chunks[0]))
+        with pytest.raises(ChunkChecksumError):
+            await store.write_chunk(session.id, 3, self._stream(chunks[3]), sha(b"other"))
+        with pytest.raises(ValueError, match="长度"):
+            await store.write_chunk(session.id, 3, self._stream(chunks[3] + b"x"), sha(chunks[3] + b"x"))
+
+        session = await store.get(session.id)
+        assert session.received == [0, 2]
+        assert session.received_ranges() == [(0, 300), (600, 900)]
+        assert session.missing_chunks() == [1, 3]
+        with pytest.raises(UploadIncompleteError):
+            await store.complete(session.id)
+
+        for index in (3, 1):
+            await store.write_chunk(session.id, index, self._stream(chunks[index]), sha(chunks[index]))
+        path = await store.complete(session.id)
+        with open(path, "rb") as f:
+            assert f.read() == data
+
+        assert await store.delete(session.id) is True
+        assert await store.get(session.id) is None
+        assert await store.get("../../etc") is None
+
+    @pytest.mark.asyncio
+    async def test_failed_reupload_of_received_chunk_is_no_longer_received(self, tmp_path):
+        """测试已收到的分块重新上传校验失败后计为未收到，完成上传被拒绝；同一分块不能同时上传。"""
+        import hashlib
+        from src.infrastructure.upload import (
+            ChunkChecksumError, ChunkInProgressError, ResumableUploadStore, UploadIncompleteError,
+        )
+
+        data = os.urandom(1000)
+        store = ResumableUploadStore(str(tmp_path), ttl=3600)
+        session = await store.create(len(data), 500)
+        chunks = [data[:500], data[500:]]
+
+        def sha(chunk: bytes) -> str:
+            return hashlib.sha256(chunk).hexdigest()
+
+        for index, chunk in enumerate(chunks):
+            await store.write_chunk(session.id, index, self._stream(chunk, 100), sha(chunk))
+        with pytest.raises(ChunkChecksumError):
+            await store.write_chunk(session.id, 1, self._stream(b"x" * 500, 100), sha(chunks[1]))
+        assert (await store.get(session.id)).received == [0]
+        with pytest.raises(UploadIncompleteError):
+            await store.complete(session.id)
+
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def slow_stream():
+            yield chunks[1][:100]
+            started.set()
+            await release.wait()
+            yield chunks[1][100:]
+
+        writing = asyncio.create_task(store.write_chunk(session.id, 1, slow_stream(), sha(chunks[1])))
+        await started.wait()
+        with pytest.raises(ChunkInProgressError):
+            await store.write_chunk(session.id, 1, self._stream(chunks[1]), sha(chunks[1]))
+        release.set()
+        await writing
+
+        with open(await store.complete(session.id), "rb") as f:
+            assert f.read() == data
+
+    def test_create_upload_limits_package_size_and_sessions_per_user(self, tmp_path, test_settings: Settings):
+        """测试安装包超过大小上限、用户会话数达到上限时创建会话返回 400，容器中的会话存储为单例。"""
+        from fastapi import FastAPI
+        from src.infrastructure.container import Container
+        from src.infrastructure.exceptions import BusinessException
+        from src.routers.application_router import create_application_router
+
+        test_settings.temp_dir = str(tmp_path)
+        test_settings.upload_max_package_size = 1024
+        test_settings.upload_max_sessions_per_user = 2
+        container = Container(test_settings)
+        assert container.upload_store is container.upload_store
+        app = FastAPI()
+        app.add_exception_handler(BusinessException, lambda request, exc: exc.to_response())
+        app.include_router(
+            create_application_router(AsyncMock(), test_settings, upload_store=container.upload_store),
+            prefix=test_settings.api_prefix,
+        )
+        client = TestClient(app)
+        url = f"{test_settings.api_prefix}/applications/uploads"
+
+        with patch("src.routers.application_router.get_user_info", return_value=MagicMock(id="u1")):
+            response = client.post(url, json={"size": 1 << 60})
+            assert response.status_code == 400 and response.json()["code"] == "INVALID_REQUEST"
+            assert [client.post(url, json={"size": 1024}).status_code for _ in range(2)] == [201, 201]
+            response = client.post(url, json={"size": 1024})
+            assert response.status_code == 400 and response.json()["code"] == "TOO_MANY_UPLOADS"
+        with patch("src.routers.application_router.get_user_info", return_value=MagicMock(id="u2")):
+            assert client.post(url, json={"size": 1024}).status_code == 201
+        assert len(os.listdir(tmp_path / "uploads")) == 3
+
+    @pytest.mark.asyncio
+    async def test_concurrent_completes_and_put_during_install_are_rejected(self, tmp_path):
+        """测试同一会话并发完成只有一个成功，安装期间上传分块和再次完成被拒绝，正在上传分块时不能完成。"""
+        import hashlib
+        from src.infrastructure.upload import ResumableUploadStore, UploadCompletingError
+
+        data = os.urandom(1000)
+        store = ResumableUploadStore(str(tmp_path), ttl=3600)
+        session = await store.create(len(data), 500, sha256=hashlib.sha256(data).hexdigest())
+        chunks = [data[:500], data[500:]]
+
+        def sha(chunk: bytes) -> str:
+            return hashlib.sha256(chunk).hexdigest()
+
+        await store.write_chunk(session.id, 0, self._stream(chunks[0], 100), sha(chunks[0]))
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def slow_stream():
+            yield chunks[1][:100]
+            started.set()
+            await release.wait()
+            yield chunks[1][100:]
+
+        writing = asyncio.create_task(store.write_chunk(session.id, 1, slow_stream(), sha(chunks[1])))
+        await started.wait()
+        with pytest.raises(UploadCompletingError, match="正在上传"):
+            await store.complete(session.id)
+        release.set()
+        await writing
+
+        results = await asyncio.gather(store.complete(session.id), store.complete(session.id), return_exceptions=True)
+        paths = [r for r in results if isinstance(r, str)]
+        assert len(paths) == 1
+        assert sum(isinstance(r, UploadCompletingError) for r in results) == 1
+        with open(paths[0], "rb") as f:
+            assert f.read() == data
+        assert not os.path.exists(store.package_path(session.id))
+        assert (await store.get(session.id)).completing
+
+        # 安装期间（安装包已移出会话目录）上传分块被拒绝，也不会写入正在安装的安装包
+        with pytest.raises(UploadCompletingError):
+            await store.write_chunk(session.id, 0, self._stream(b"x" * 500), sha(b"x" * 500))
+        with open(paths[0], "rb") as f:
+            assert f.read() == data
+        assert await store.delete(session.id) is True
+
+    @pytest.mark.asyncio
+    async def test_validate_reads_only_tail_and_metadata_chunks(self, tmp_path, test_settings: Settings):
+        """测试预检只需要中央目录和元数据文件所在的分块，镜像分块未上传时也能完成预检。"""
+        import hashlib
+        from src.infrastructure.upload import IncompletePackageError, ResumableUploadStore
+
+        zip_path = tmp_path / "package.zip"
+        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_STORED) as zf:
+            zf.writestr("packages/images/img.tar", os.urandom(8192))
+            zf.writestr("manifest.yaml", "name: App\nversion: 2.0.0\nrelease-config:\n  namespace: ns1\n")
+            zf.writestr("application.key", "app-key")
+        data = zip_path.read_bytes()
+        store = ResumableUploadStore(str(tmp_path / "tmp"), ttl=3600)
+        session = await store.create(len(data), 1024)
+        chunks = [data[i:i + 1024] for i in range(0, len(data), 1024)]
+        last = len(chunks) - 1
+        app_store = AsyncMock()
+        app_store.get_application_by_key_optional.return_value = None
+        service = ApplicationService(app_store, settings=test_settings)
+
+        async def validate():
+            current = await store.get(session.id)
+            return current, await service.validate_package(
+                store.package_path(session.id), received_ranges=current.received_ranges()
+            )
+
+        with pytest.raises(IncompletePackageError) as exc_info:
+            await validate()
+        assert session.chunks_covering(exc_info.value.ranges) == [last]
+
+        needed = [last]
+        while needed:
+            for index in needed:
+                await store.write_chunk(
+                    session.id, index, self._stream(chunks[index], 512), hashlib.sha256(chunks[index]).hexdigest()
+                )
+            try:
+                current, report = await validate()
+                needed = []
+            except IncompletePackageError as e:
+                needed = (await store.get(session.id)).chunks_covering(e.ranges)
+                assert needed
+
+        assert report.valid and report.manifest.key == "app-key"
+        assert [(a.path, a.size) for a in report.artifacts] == [("packages/images/img.tar", 8192)]
+        assert 0 in current.missing_chunks() and len(current.received) <= 3
+
+
+class TestInstallPipeline:
+    """安装流水线测试。"""
+
+    @pytest.mark.asyncio
+    async def test_deploy_packages_uploads_concurrently_and_records_timings(self, tmp_path, test_settings: Settings):
+        """测试镜像/Chart 并发上传受限，Release 在全部镜像上传后安装，耗时写入安装报告。"""
+        from src.ports.external_service_port import ChartInfo, ChartUploadResult
+
+        (tmp_path / "packages" / "images").mkdir(parents=True)
+        (tmp_path / "packages" / "charts").mkdir(parents=True)
+        for i in range(5):
+            (tmp_path / "packages" / "images" / f"img{i}.tar").write_bytes(b"i" * 10)
+        for i in range(2):
+            (tmp_path / "packages" / "charts" / f"chart{i}.tgz").write_bytes(b"c" * 5)
+
+        events = []
+        running = 0
+        max_running = 0
+
+        async def track(delay):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(delay)
+            running -= 1
+
+        async def upload_image(f, auth_token=None, size=None, progress_callback=None):
+            await track(0.02)
+            events.append("image")
+
+        async def upload_chart(f, auth_token=None, size=None, progress_callback=None):
+            await track(0.01)
+            events.append("chart")
+            name = os.path.basename(f.name).split(".")[0]
+            return ChartUploadResult(chart=ChartInfo(name=name, version="1.0.0"), values={})
+
+        async def install_release(release_name, **kwargs):
+            events.append("release")
+
+        deploy = AsyncMock()
+        deploy.upload_image.side_effect = upload_image
+        deploy.upload_chart.side_effect = upload_chart
+        deploy.install_release.side_effect = install_release
+        test_settings.install_upload_concurrency = 3
+        service = ApplicationService(AsyncMock(), deploy_installer_port=deploy, settings=test_settings)
+        manifest = ManifestInfo(key="app", name="app", version="1.0.0", release_config={"namespace": "ns1"})
+
+        releases, report = await service._deploy_packages(manifest, DirectoryPackageArchive(str(tmp_path)))
+
+        assert max_running == 3
+        assert sorted(r.name for r in releases) == ["chart0", "chart1"]
+        assert all(r.namespace == "ns1" for r in releases)
+        assert events.index("release") > max(i for i, e in enumerate(events) if e == "image")
+        assert [t.kind for t in report.artifacts] == ["image"] * 5 + ["chart"] * 2 + ["release"] * 2
+        assert report.artifacts[0].size == 10
+        assert report.duration > 0
+
+    @pytest.mark.asyncio
+    async def test_deploy_packages_cancels_remaining_work_on_failure(self, tmp_path, test_settings: Settings):
+        """测试任一镜像上传失败时取消其余上传且不安装 Release。"""
+        (tmp_path / "packages" / "images").mkdir(parents=True)
+        (tmp_path / "packages" / "charts").mkdir(parents=True)
+        (tmp_path / "packages" / "images" / "bad.tar").write_bytes(b"x")
+        (tmp_path / "packages" / "images" / "slow.tar").write_bytes(b"x")
+        (tmp_path / "packages" / "charts" / "chart.tgz").write_bytes(b"x")
+        cancelled = []
+        slow_started = asyncio.Event()
+
+        async def upload_image(f, **kwargs):
+            if f.name.endswith("bad.tar"):
+                await slow_started.wait()
+                raise RuntimeError("registry down")
+            try:
+                slow_started.set()
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(f.name)
+                raise
+
+        deploy = AsyncMock()
+        deploy.upload_image.side_effect = upload_image
+        service = ApplicationService(AsyncMock(), deploy_installer_port=deploy, settings=test_settings)
+        manifest = ManifestInfo(key="app", name="app", version="1.0.0", release_config={"namespace": "ns1"})
+
+        with pytest.raises(ValueError, match="镜像上传失败"):
+            await service._deploy_packages(manifest, DirectoryPackageArchive(str(tmp_path)))
+
+        assert len(cancelled) == 1
+        deploy.install_release.assert_not_called()
+
+
+    @pytest.mark.asyncio
+    async def test_deploy_packages_skips_artifacts_already_uploaded(self, tmp_path, test_settings: Settings):
+        """测试内容相同的镜像/Chart 在再次安装时跳过上传，Chart 使用记录的上传结果安装 Release。"""
+        from src.adapters.mock_application_adapter import MockArtifactIndexAdapter
+        from src.ports.external_service_port import ChartInfo, ChartUploadResult, ImageUploadResult
+
+        (tmp_path / "packages" / "images").mkdir(parents=True)
+        (tmp_path / "packages" / "charts").mkdir(parents=True)
+        (tmp_path / "packages" / "images" / "img.tar").write_bytes(b"i" * 100)
+        (tmp_path / "packages" / "charts" / "chart.tgz").write_bytes(b"c" * 10)
+
+        deploy = AsyncMock()
+        deploy.upload_image.return_value = [ImageUploadResult(from_name="a", to_name="b")]
+        deploy.upload_chart.return_value = ChartUploadResult(
+            chart=ChartInfo(name="chart", version="1.0.0"), values={"replicas": 1}
+        )
+        service = ApplicationService(
+            AsyncMock(), deploy_installer_port=deploy, settings=test_settings,
+            artifact_index_port=MockArtifactIndexAdapter(),
+        )
+        manifest = ManifestInfo(key="app", name="app", version="1.0.0", release_config={"namespace": "ns1"})
+
+        _, first = await service._deploy_packages(manifest, DirectoryPackageArchive(str(tmp_path)))
+        assert first.skipped_count == 0
+        assert deploy.upload_image.await_count == 1
+
+        (tmp_path / "packages" / "images" / "new.tar").write_bytes(b"n" * 7)
+        releases, second = await service._deploy_packages(manifest, DirectoryPackageArchive(str(tmp_path)))
+
+        assert deploy.upload_image.await_count == 2
+        assert deploy.upload_chart.await_count == 1
+        assert second.skipped_count == 2
+        assert second.bytes_saved == 110
+        assert [r.name for r in releases] == ["chart"]
+        assert deploy.install_release.await_args.kwargs["values"] == {"replicas": 1, "namespace": "ns1"}
+        assert {t.name: t.skipped for t in second.artifacts if t.kind != "release"} == {
+            "packages/images/img.tar": True, "packages/images/new.tar": False, "packages/charts/chart.tgz": True,
+        }
+
+    @pytest.mark.asyncio
+    async def test_release_failure_forgets_skipped_images_and_chart(self, tmp_path, test_settings: Settings):
+        """测试跳过上传后 Release 安装失败（如镜像已被仓库清理）时删除跳过的镜像和 Chart 索引，重试时重新上传。"""
+        from src.adapters.mock_application_adapter import MockArtifactIndexAdapter
+        from src.ports.external_service_port import ChartInfo, ChartUploadResult
+
+        (tmp_path / "packages" / "images").mkdir(parents=True)
+        (tmp_path / "packages" / "charts").mkdir(parents=True)
+        (tmp_path / "packages" / "images" / "img.tar").write_bytes(b"i" * 100)
+        (tmp_path / "packages" / "charts" / "chart.tgz").write_bytes(b"c" * 10)
+
+        deploy = AsyncMock()
+        deploy.upload_image.return_value = []
+        deploy.upload_chart.return_value = ChartUploadResult(chart=ChartInfo(name="chart", version="1.0.0"), values={})
+        service = ApplicationService(
+            AsyncMock(), deploy_installer_port=deploy, settings=test_settings,
+            artifact_index_port=MockArtifactIndexAdapter(),
+        )
+        manifest = ManifestInfo(key="app", name="app", version="1.0.0", release_config={"namespace": "ns1"})
+        archive = DirectoryPackageArchive(str(tmp_path))
+        await service._deploy_packages(manifest, archive)
+
+        deploy.install_release.side_effect = RuntimeError("ImagePullBackOff")
+        with pytest.raises(ValueError, match="ImagePullBackOff"):
+            await service._deploy_packages(manifest, archive)
+        assert (deploy.upload_image.await_count, deploy.upload_chart.await_count) == (1, 1)
+
+        deploy.install_release.side_effect = None
+        _, retry = await service._deploy_packages(manifest, archive)
+
+        assert retry.skipped_count == 0
+        assert (deploy.upload_image.await_count, deploy.upload_chart.await_count) == (2, 2)
+
+    @pytest.mark.asyncio
+    async def test_import_agents_keeps_file_name_order(self, tmp_path, test_settings: Settings):
+        """测试智能体并发创建受限，结果按文件名排序，格式错误的文件报错。"""
+        from src.ports.external_service_port import AgentFactoryResult
+
+        agents_dir = tmp_path / "agents"
+        agents_dir.mkdir()
+        for i in range(6):
+            (agents_dir / f"a{i}.yaml").write_text(f"name: a{i}\ndelay: {0.05 - i * 0.01}\n")
+        running = 0
+        max_running = 0
+
+        async def create_agent(data, auth_token=None, business_domain=None):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(data["delay"])
+            running -= 1
+            return AgentFactoryResult(id=f"id-{data['name']}", version="v1")
+
+        agent_factory = AsyncMock()
+        agent_factory.create_agent.side_effect = create_agent
+        test_settings.install_import_concurrency = 2
+        service = ApplicationService(AsyncMock(), agent_factory_port=agent_factory, settings=test_settings)
+
+        ids = await service._import_agents(DirectoryPackageArchive(str(tmp_path)), "", "db_public")
+
+        assert ids == [f"id-a{i}" for i in range(6)]
+        assert max_running == 2
+
+        (agents_dir / "b.json").write_text("{not json")
+        with pytest.raises(ValueError, match="智能体配置文件格式错误 \\(b.json\\)"):
+            await service._import_agents(DirectoryPackageArchive(str(tmp_path)), "", "db_public")
+
+
+class TestPackageArchive:
+    """安装包读取测试。"""
+
+    @staticmethod
+    def _write_package(root, zip_path):
+        """在目录中写入安装包文件，并打包为同样结构的 ZIP。"""
+        files = {
+            "z/manifest.yaml": b"name: z",
+            "a/b/manifest.yml": b"name: deep",
+            "b/manifest.yml": b"name: b",
+            "b/manifest.yaml": b"name: b-yaml",
+            "b/packages/images/img.tar": b"i" * 4096,
+            "b/packages/images/nested/skip.tar": b"x",
+        }
+        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name, data in files.items():
+                zf.writestr(name, data)
+                path = os.path.join(root, *name.split("/"))
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "wb") as f:
+                    f.write(data)
+
+    def test_zip_index_matches_extracted_directory(self, tmp_path):
+        """测试按 ZIP 索引查找和列出文件的结果与解压目录一致。"""
+        root = tmp_path / "extracted"
+        zip_path = tmp_path / "package.zip"
+        self._write_package(str(root), str(zip_path))
+
+        with ZipPackageArchive(str(zip_path)) as archive:
+            directory = DirectoryPackageArchive(str(root))
+            for candidate in (archive, directory):
+                assert candidate.find_file(["manifest.yaml", "manifest.yml"]) == "b/manifest.yaml"
+                assert candidate.find_file(["missing.yaml"]) is None
+                assert candidate.list_files("b/packages/images") == ["img.tar"]
+                assert candidate.is_dir("b/packages") and not candidate.is_dir("b/packages/charts")
+                assert candidate.file_size("b/packages/images/img.tar") == 4096
+                with candidate.open("b/packages/images/img.tar") as f:
+                    assert f.read(10) == b"i" * 10
+            assert len(archive) == 6
+
+    def test_invalid_zip_raises_value_error(self, tmp_path):
+        """测试非 ZIP 文件报错。"""
+        bad = tmp_path / "bad.zip"
+        bad.write_bytes(b"not a zip")
+
+        with pytest.raises(ValueError, match="无效的 ZIP 文件格式"):
+            ZipPackageArchive(str(bad))
+
+    @pytest.mark.asyncio
+    async def test_install_streams_members_without_extracting(self, tmp_path, test_settings: Settings):
+        """测试安装时镜像从 ZIP 成员流式上传，不在临时目录写入解压文件。"""
+        zip_path = tmp_path / "package.zip"
+        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("app/manifest.yaml", "name: App\nversion: 1.0.0\nrelease-config:\n  namespace: ns1\n")
+            zf.writestr("app/application.key", "app-key\n")
+            zf.writestr("app/packages/images/img.tar", b"image" * 1000)
+            zf.writestr("app/agents/a.json", '{"name": "a"}')
+        uploaded = []
+
+        async def upload_image(f, auth_token=None, size=None, progress_callback=None):
+            uploaded.append((f.name, size, f.read()))
+
+        deploy = AsyncMock()
+        deploy.upload_image.side_effect = upload_image
+        agent_factory = AsyncMock()
+        agent_factory.create_agent.return_value = MagicMock(id="agent-1", version="v0")
+        store = AsyncMock()
+        store.get_application_by_key_optional.return_value = None
+        store.upsert_application.side_effect = lambda app, **kwargs: app
+        test_settings.temp_dir = str(tmp_path / "tmp")
+        service = ApplicationService(
+            store, deploy_installer_port=deploy, agent_factory_port=agent_factory, settings=test_settings
+        )
+
+        result = await service.install_application(str(zip_path))
+
+        assert result.key == "app-key"
+        assert [item.id for item in result.agent_config] == ["agent-1"]
+        assert uploaded == [("app/packages/images/img.tar", 5000, b"image" * 1000)]
+        assert set(result.install_report.stages) == {
+            "extract", "validate", "deploy", "image_upload", "import", "ontology_import", "agent_import", "save"
+        }
+        assert result.install_report.total_duration >= sum(
+            result.install_report.stages[stage] for stage in ("extract", "validate", "deploy", "import", "save")
+        )
+        agent_factory.create_agent.assert_awaited_once()
+        assert agent_factory.create_agent.await_args.args[0] == {"name": "a"}
+        assert store.upsert_application.await_args.kwargs == {"expected_version": None}
+        assert not os.path.exists(test_settings.temp_dir) or os.listdir(test_settings.temp_dir) == []
+
+    @pytest.mark.asyncio
+    async def test_validate_package_reports_all_problems(self, tmp_path, test_settings: Settings, sample_application):
+        """测试预检一次返回全部问题和制品清单，且不调用部署服务。"""
+        zip_path = tmp_path / "package.zip"
+        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("app/manifest.yaml", "name: App\nversion: 1.0.0\nrelease-config:\n  namespace: Bad_NS\n")
+            zf.writestr("app/packages/images/img.TAR", b"i" * 300)
+            zf.writestr("app/packages/charts/c.tgz", b"c" * 200)
+            zf.writestr("app/agents/a.json", "{not json")
+        deploy = AsyncMock()
+        store = AsyncMock()
+        store.get_application_by_key_optional.return_value = sample_application
+        service = ApplicationService(store, deploy_installer_port=deploy, settings=test_settings)
+
+        report = await service.validate_package(str(zip_path))
+
+        assert not report.valid
+        assert len(report.problems) == 3
+        assert "application.key" in report.problems[0]
+        assert "Bad_NS" in report.problems[1]
+        assert "a.json" in report.problems[2]
+        assert report.manifest is None
+        assert [(a.kind, a.path, a.size) for a in report.artifacts] == [
+            ("image", "packages/images/img.TAR", 300),
+            ("chart", "packages/charts/c.tgz", 200),
+            ("agent", "agents/a.json", 9),
+        ]
+        assert report.total_size == 509
+        assert not deploy.method_calls
+
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            zf.writestr("manifest.yaml", "name: App\nversion: 1.0.0\nrelease-config:\n  namespace: ns1\n")
+            zf.writestr("application.key", "test-app-001")
+        report = await service.validate_package(str(zip_path))
+
+        assert report.manifest.key == "test-app-001"
+        assert report.installed_version == "1.0.0"
+        assert len(report.problems) == 1 and "版本" in report.problems[0]
+
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            zf.writestr("manifest.yaml", "name: App\nversion: 1.0.0\nrelease-config:\n  namespace: Bad_NS\n")
+            zf.writestr("application.key", "test-app-001")
+        report = await service.validate_package(str(zip_path))
+
+        assert report.manifest is None
+        assert (report.key, report.version, report.installed_version) == ("test-app-001", "1.0.0", "1.0.0")
+        assert len(report.problems) == 2
+        assert "Bad_NS" in report.problems[0] and "版本" in report.problems[1]
+
+
+class TestDeployInstallerStreamingUpload:
+    """Deploy Installer 流式上传测试。"""
+
+    @pytest.mark.asyncio
+    async def test_upload_image_streams_file_in_chunks(self, tmp_path):
+        """测试镜像按分块流式上传并回调进度，文件读取在注入的阻塞任务执行器中执行。"""
+        import threading
+        from aiohttp import web
+        from src.adapters.external_service_adapter import DeployInstallerAdapter
+        from src.infrastructure.executor import BlockingExecutor
+        from src.infrastructure.http_client import HttpClientPool
+
+        received = {}
+
+        async def handle_image(request: web.Request) -> web.Response:
+            received["content_length"] = request.headers.get("Content-Length")
+            received["body"] = await request.read()
+            return web.json_response({"images": [{"from": "a:1", "to": "registry/a:1"}]})
+
+        app = web.Application()
+        app.router.add_put("/internal/api/deploy-installer/v1/agents/image", handle_image)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        settings = Settings(proton_url=f"http://127.0.0.1:{port}", deploy_upload_chunk_size=1024)
+        http_pool = HttpClientPool(settings)
+        executor = BlockingExecutor(1, thread_name_prefix="test-deploy-read")
+        read_threads = set()
+        try:
+            adapter = DeployInstallerAdapter(settings, http_pool, executor)
+            payload = b"0123456789" * 500
+            image_file = tmp_path / "image.tar"
+            image_file.write_bytes(payload)
+
+            progress = []
+            with open(image_file, "rb") as f:
+                def read(size: int) -> bytes:
+                    read_threads.add(threading.current_thread().name)
+                    return f.read(size)
+
+                tracked = MagicMock(wraps=f)
+                tracked.read.side_effect = read
+                result = await adapter.upload_image(
+                    tracked, progress_callback=lambda sent, total: progress.append((sent, total))
+                )
+        finally:
+            await http_pool.close()
+            await runner.cleanup()
+            executor.shutdown()
+
+        assert result[0].to_name == "registry/a:1"
+        assert received["body"] == payload
+        assert received["content_length"] == str(len(payload))
+        assert [sent for sent, _ in progress] == [1024, 2048, 3072, 4096, 5000]
+        assert all(total == len(payload) for _, total in progress)
+        assert read_threads and all(name.startswith("test-deploy-read") for name in read_threads)
+
+
+class TestHttpClientPool:
+    """HTTP 连接池测试。"""
+
+    @pytest.mark.asyncio
+    async def test_pool_reuses_client_per_upstream_and_closes(self, test_settings: Settings):
+        """测试同一上游复用客户端，关闭后全部释放。"""
+        from src.infrastructure.http_client import HttpClientPool
+
+        pool = HttpClientPool(test_settings)
+        session = pool.get_aiohttp_session("ontology_manager")
+        client = pool.get_httpx_client("hydra")
+
+        assert pool.get_aiohttp_session("ontology_manager") is session
+        assert pool.get_aiohttp_session("agent_factory") is not session
+        assert pool.get_httpx_client("hydra") is client
+
+        await pool.close()
+
+        assert session.closed
+        assert client.is_closed
+
+
+class TestDetailCache:
+    """业务知识网络/智能体详情缓存测试。"""
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_served_while_refreshing(self):
+        """测试过期条目先返回旧值并在后台刷新，刷新后返回新值。"""
+        from src.infrastructure.cache import StaleWhileRevalidateCache
+
+        now = [0.0]
+        cache = StaleWhileRevalidateCache(10, ttl=10, stale_ttl=100, clock=lambda: now[0])
+        versions = iter(["v1", "v2"])
+        loader = AsyncMock(side_effect=lambda: next(versions))
+
+        assert await cache.get_or_load("k", loader) == "v1"
+        assert await cache.get_or_load("k", loader) == "v1"
+        assert loader.await_count == 1
+
+        now[0] = 20.0
+        assert await cache.get_or_load("k", loader) == "v1"
+        await asyncio.sleep(0)
+        assert loader.await_count == 2
+        assert await cache.get_or_load("k", loader) == "v2"
+
+        now[0] = 200.0
+        loader.side_effect = None
+        loader.return_value = "v3"
+        assert await cache.get_or_load("k", loader) == "v3"
+
+    @pytest.mark.asyncio
+    async def test_cached_agent_adapter_invalidates_all_business_domains(self, test_settings: Settings):
+        """测试智能体详情按 (ID, 业务域) 缓存，失效时清除所有业务域的条目。"""
+        from src.adapters.cached_external_service_adapter import CachedAgentFactoryAdapter
+        from src.ports.external_service_port import AgentFactoryPort
+
+        inner = AsyncMock(spec=AgentFactoryPort)
+        inner.get_agent.side_effect = lambda agent_id, auth_token=None, business_domain=None: {
+            "id": agent_id, "domain": business_domain,
+        }
+        adapter = CachedAgentFactoryAdapter(inner, test_settings)
+
+        for _ in range(2):
+            assert (await adapter.get_agent("a1", business_domain="d1"))["domain"] == "d1"
+            assert (await adapter.get_agent("a1", business_domain="d2"))["domain"] == "d2"
+            await adapter.get_agent("a2", business_domain="d1")
+        assert inner.get_agent.await_count == 3
+
+        await adapter.invalidate(["a1"])
+        await adapter.get_agent("a1", business_domain="d1")
+        await adapter.get_agent("a1", business_domain="d2")
+        await adapter.get_agent("a2", business_domain="d1")
+        assert inner.get_agent.await_count == 5
+        inner.invalidate.assert_awaited_once_with(["a1"])
+
+    @pytest.mark.asyncio
+    async def test_configure_and_uninstall_invalidate_details(self, sample_application: Application):
+        """测试配置和卸载应用时清除关联的详情缓存。"""
+        port = AsyncMock()
+        port.get_application_by_id.return_value = sample_application
+        ontology_manager = AsyncMock()
+        agent_factory = AsyncMock()
+        service = ApplicationService(
+            port, ontology_manager_port=ontology_manager, agent_factory_port=agent_factory,
+        )
+
+        await service.configure_application(1)
+        await service.uninstall_application(1)
+
+        ontology_ids = [item.id for item in sample_application.ontology_config]
+        agent_ids = [item.id for item in sample_application.agent_config]
+        assert ontology_manager.invalidate.await_args_list[-1].args == (ontology_ids,)
+        assert agent_factory.invalidate.await_args_list[-1].args == (agent_ids,)
+        assert ontology_manager.invalidate.await_count == 2
+
+
+class FakeRedisStore:
+    """内存实现的最小 Redis 客户端（字符串和列表），用于测试安装任务和安装日志存储。"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def rpush(self, key, value):
+        self.data.setdefault(key, []).append(value)
+
+    async def expire(self, key, seconds):
+        pass
+
+    async def lrange(self, key, start, end):
+        items = self.data.get(key, [])
+        return items[start:] if end == -1 else items[start:end + 1]
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+
+class TestInstallJobs:
+    """异步安装任务测试。"""
+
+    @staticmethod
+    def _make_service(test_settings: Settings, install):
+        """创建使用内存 Redis 和桩安装函数的安装任务服务。"""
+        from src.adapters.install_job_adapter import RedisInstallJobAdapter
+        from src.application.install_job_service import InstallJobService
+
+        redis_client = FakeRedisStore()
+
+        async def redis_client_factory():
+            return redis_client
+
+        application_service = MagicMock()
+        application_service.install_application = install
+        port = RedisInstallJobAdapter(test_settings, redis_client_factory)
+        return InstallJobService(application_service, port, test_settings)
+
+    @pytest.mark.asyncio
+    async def test_job_records_stages_and_result(self, test_settings: Settings, tmp_path):
+        """测试任务按阶段记录事件，成功后记录应用并删除安装包。"""
+        from src.domains.install_job import InstallStage
+        from src.infrastructure.context.token_context import TokenContext
+
+        seen_tokens = []
+
+        async def install(package_path, updated_by="", updated_by_id="", progress=None, timer=None):
+            seen_tokens.append(TokenContext.get_token())
+            for stage in (InstallStage.EXTRACT, InstallStage.VALIDATE, InstallStage.SAVE):
+                await progress(stage)
+            return Application(id=7, key="app-7", name="应用")
+
+        service = self._make_service(test_settings, install)
+        package_path = tmp_path / "package.zip"
+        package_path.write_bytes(b"PK")
+
+        TokenContext.set_token("token-1")
+        try:
+            job = await service.submit_install(str(package_path), updated_by="alice", updated_by_id="u1")
+        finally:
+            TokenContext.clear_token()
+        await asyncio.wait_for(service._queue.join(), 1)
+
+        stored = await service.get_job(job.id)
+        assert stored.status == "succeeded"
+        assert stored.stage == InstallStage.SAVE
+        assert (stored.application_id, stored.application_key) == (7, "app-7")
+        assert (stored.updated_by, stored.created_by_id) == ("alice", "u1")
+        events = await service.get_events(job.id)
+        assert [(e.stage, e.status) for e in events] == [
+            (None, "pending"), ("extract", "running"), ("validate", "running"),
+            ("save", "running"), ("save", "succeeded"),
+        ]
+        assert [e.stage for e in await service.get_events(job.id, 3)] == ["save", "save"]
+        assert seen_tokens == ["token-1"]
+        assert not package_path.exists()
+        await service.stop()
+
+    @pytest.mark.asyncio
+    async def test_failed_job_records_error_code(self, test_settings: Settings, tmp_path):
+        """测试版本冲突的任务记录为失败并保留失败阶段。"""
+        async def install(package_path, updated_by="", updated_by_id="", progress=None, timer=None):
+            await progress("validate")
+            raise ValueError("版本号冲突: 新版本 1.0.0 与已安装版本相同")
+
+        service = self._make_service(test_settings, install)
+        job = await service.submit_install(str(tmp_path / "missing.zip"))
+        await asyncio.wait_for(service._queue.join(), 1)
+
+        stored = await service.get_job(job.id)
+        assert (stored.status, stored.stage, stored.error_code) == ("failed", "validate", "VERSION_CONFLICT")
+        assert "版本号冲突" in stored.error
+        await service.stop()
+
+    @pytest.mark.asyncio
+    async def test_submit_rejects_when_queue_full(self, test_settings: Settings, tmp_path):
+        """测试队列已满时拒绝提交，服务停止时排队中的任务标记为失败。"""
+        from src.infrastructure.exceptions import ServiceUnavailableError
+
+        release = asyncio.Event()
+
+        async def install(package_path, updated_by="", updated_by_id="", progress=None, timer=None):
+            await release.wait()
+            return Application(id=1, key="app", name="应用")
+
+        test_settings.install_job_workers = 1
+        test_settings.install_job_queue_size = 1
+        service = self._make_service(test_settings, install)
+        running = await service.submit_install(str(tmp_path / "a.zip"))
+        await asyncio.sleep(0)
+        queued = await service.submit_install(str(tmp_path / "b.zip"))
+
+        with pytest.raises(ServiceUnavailableError) as exc_info:
+            await service.submit_install(str(tmp_path / "c.zip"))
+        assert exc_info.value.status_code == 503
+
+        await service.stop()
+        assert (await service.get_job(running.id)).status == "failed"
+        assert (await service.get_job(queued.id)).error_code == "SERVICE_UNAVAILABLE"
+
+    def test_job_endpoints_return_status_and_event_stream(self, test_settings: Settings):
+        """测试任务查询接口和 SSE 事件流，不存在或其他用户提交的任务返回 404。"""
+        from fastapi import FastAPI
+        from src.domains.install_job import InstallJob, InstallJobEvent
+        from src.infrastructure.exceptions import BusinessException
+        from src.routers.application_router import create_application_router
+
+        job_service = AsyncMock()
+        job_service.get_job.side_effect = lambda job_id: (
+            InstallJob(id="j1", status="succeeded", stage="save", application_id=3, created_by_id="u1")
+            if job_id == "j1" else None
+        )
+        job_service.get_events.side_effect = lambda job_id, start=0: [
+            InstallJobEvent(stage=None, status="pending", message="安装任务已排队"),
+            InstallJobEvent(stage="save", status="succeeded", message="应用安装成功"),
+        ][start:]
+
+        app = FastAPI()
+        app.add_exception_handler(BusinessException, lambda request, exc: exc.to_response())
+        app.include_router(
+            create_application_router(AsyncMock(), test_settings, job_service),
+            prefix=test_settings.api_prefix,
+        )
+        client = TestClient(app)
+        prefix = f"{test_settings.api_prefix}/applications/jobs"
+
+        def as_user(user_id: str):
+            return patch("src.routers.application_router.get_user_info", return_value=MagicMock(id=user_id))
+
+        with as_user("u2"):
+            assert client.get(f"{prefix}/j1").status_code == 404
+            assert client.get(f"{prefix}/j1/events").status_code == 404
+
+        with as_user("u1"):
+            response = client.get(f"{prefix}/j1", params={"with_events": True})
+            assert response.status_code == 200
+            assert response.json()["application_id"] == 3
+            assert [e["seq"] for e in response.json()["events"]] == [0, 1]
+            assert client.get(f"{prefix}/missing").status_code == 404
+
+            response = client.get(f"{prefix}/j1/events", headers={"Last-Event-ID": "0"})
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("text/event-stream")
+            assert response.text.startswith("id: 1\nevent: succeeded\ndata: ")
+            assert client.get(f"{prefix}/missing/events").status_code == 404
+
+
+class TestInstallJournal:
+    """安装失败回滚与重试续装测试。"""
+
+    @pytest.mark.asyncio
+    async def test_failed_install_is_rolled_back_and_retry_reuses_uploads(self, tmp_path, test_settings: Settings):
+        """测试安装失败时删除新建的 Release 和业务知识网络，重试时不再上传镜像和 Chart，成功后删除安装日志。"""
+        from src.adapters.install_journal_adapter import RedisInstallJournalAdapter
+        from src.ports.external_service_port import AgentFactoryResult, ChartInfo, ChartUploadResult
+
+        zip_path = tmp_path / "package.zip"
+        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("app/manifest.yaml", "name: App\nversion: 1.0.0\nrelease-config:\n  namespace: ns1\n")
+            zf.writestr("app/application.key", "app-key\n")
+            zf.writestr("app/packages/images/img.tar", b"image" * 100)
+            zf.writestr("app/packages/charts/chart.tgz", b"chart" * 10)
+            zf.writestr("app/ontologies/kn.json", '{"name": "kn"}')
+            zf.writestr("app/agents/a.json", '{"name": "a"}')
+        redis = FakeRedisStore()
+
+        async def get_client():
+            return redis
+
+        deploy = AsyncMock()
+        deploy.upload_chart.return_value = ChartUploadResult(chart=ChartInfo(name="chart", version="1.0.0"), values={})
+        ontology = AsyncMock()
+        ontology.create_knowledge_network.return_value = "kn-1"
+        agent_factory = AsyncMock()
+
+        async def failing_agent(data, **kwargs):
+            await asyncio.sleep(0.05)
+            raise RuntimeError("agent factory down")
+
+        agent_factory.create_agent.side_effect = failing_agent
+        store = AsyncMock()
+        store.get_application_by_key_optional.return_value = None
+        store.upsert_application.side_effect = lambda app, **kwargs: app
+        test_settings.temp_dir = str(tmp_path / "tmp")
+        service = ApplicationService(
+            store, deploy_installer_port=deploy, ontology_manager_port=ontology, agent_factory_port=agent_factory,
+            settings=test_settings, install_journal_port=RedisInstallJournalAdapter(test_settings, get_client),
+        )
+
+        with pytest.raises(ValueError, match="agent factory down"):
+            await service.install_application(str(zip_path))
+
+        deploy.delete_release.assert_awaited_once()
+        assert deploy.delete_release.await_args.kwargs["release_name"] == "chart"
+        ontology.delete_knowledge_network.assert_awaited_once()
+        assert ontology.delete_knowledge_network.await_args.args[0] == "kn-1"
+        journal = await RedisInstallJournalAdapter(test_settings, get_client).get_journal("app-key", "1.0.0")
+        assert journal.attempts == 1
+        assert sorted((s.kind, s.name) for s in journal.steps) == [
+            ("chart", "packages/charts/chart.tgz"), ("image", "packages/images/img.tar"),
+        ]
+
+        agent_factory.create_agent.side_effect = None
+        agent_factory.create_agent.return_value = AgentFactoryResult(id="agent-1", version="v0")
+        result = await service.install_application(str(zip_path))
+
+        assert deploy.upload_image.await_count == 1
+        assert deploy.upload_chart.await_count == 1
+        assert deploy.install_release.await_count == 2
+        assert [item.id for item in result.agent_config] == ["agent-1"]
+        assert result.install_report.skipped_count == 2
+        assert redis.data == {}
+
+
 class TestExternalServiceMocks:
     """外部服务 Mock 测试。"""
 
@@ -0,0 +1,300 @@
+"""
+Auth Tests
+
+Unit tests for token introspection caching and authentication helpers.
+"""
+import asyncio
+import time
+
+import pytest
+from unittest.mock import AsyncMock
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.adapters.cached_hydra_adapter import CachedHydraAdapter
+from src.adapters.cached_user_management_adapter import CachedUserManagementAdapter
+from src.application.logout_service import LogoutService
+from src.domains.session import SessionInfo
+from src.infrastructure.cache import TTLCache
+from src.infrastructure.config.settings import Settings
+from src.infrastructure.container import init_container
+from src.infrastructure.context.token_context import UserContext, get_auth_token
+from src.infrastructure.middleware.auth_middleware import AuthMiddleware, PUBLIC_PATHS, is_public_path
+from src.ports.hydra_port import HydraPort, IntrospectResponse
+from src.ports.user_management_port import UserManagementPort, UserInfo
+
+
+@pytest.fixture
+def test_settings() -> Settings:
+    """
+    创建测试配置。
+
+    返回:
+        Settings: 测试用的应用配置。
+    """
+    return Settings(
+        app_name="DIP Hub Test",
+        app_version="1.0.0-test",
+        debug=True,
+        introspect_cache_ttl=60,
+        introspect_cache_max_size=100,
+    )
+
+
+class FakeRedis:
+    """内存实现的最小 Redis 客户端，用于测试二级缓存。"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+
+class TestTTLCache:
+    """有界 TTL 缓存测试。"""
+
+    def test_get_returns_none_after_expiry(self):
+        """测试条目过期后读取返回 None。"""
+        now = [100.0]
+        cache = TTLCache(10, clock=lambda: now[0])
+        cache.set("a", 1, ttl=5)
+
+        assert cache.get("a") == 1
+        now[0] = 105.0
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used_when_full(self):
+        """测试超出容量时淘汰最久未使用的条目。"""
+        cache = TTLCache(2)
+        cache.set("a", 1, ttl=60)
+        cache.set("b", 2, ttl=60)
+        cache.get("a")
+        cache.set("c", 3, ttl=60)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+
+class TestCachedHydraAdapter:
+    """带缓存的 Hydra 适配器测试。"""
+
+    @pytest.mark.asyncio
+    async def test_introspect_caches_active_token(self, test_settings: Settings):
+        """测试有效 Token 的内省结果被缓存。"""
+        inner = AsyncMock(spec=HydraPort)
+        inner.introspect.return_value = IntrospectResponse(
+            active=True, visitor_id="u1", exp=int(time.time()) + 3600
+        )
+        adapter = CachedHydraAdapter(inner, test_settings)
+
+        first = await adapter.introspect("token-1")
+        second = await adapter.introspect("token-1")
+
+        assert first.visitor_id == "u1"
+        assert second is first
+        inner.introspect.assert_called_once_with("token-1")
+
+    @pytest.mark.asyncio
+    async def test_introspect_does_not_cache_inactive_or_expired_token(self, test_settings: Settings):
+        """测试无效 Token 和已过期 Token 不缓存。"""
+        inner = AsyncMock(spec=HydraPort)
+        inner.introspect.side_effect = [
+            IntrospectResponse(active=False),
+            IntrospectResponse(active=False),
+            IntrospectResponse(active=True, visitor_id="u1", exp=int(time.time()) - 1),
+            IntrospectResponse(active=True, visitor_id="u1", exp=int(time.time()) - 1),
+        ]
+        adapter = CachedHydraAdapter(inner, test_settings)
+
+        await adapter.introspect("bad")
+        await adapter.introspect("bad")
+        await adapter.introspect("expired")
+        await adapter.introspect("expired")
+
+        assert inner.introspect.call_count == 4
+
+    @pytest.mark.asyncio
+    async def test_invalidate_clears_local_and_redis_entries(self, test_settings: Settings):
+        """测试失效操作同时清除进程内缓存和 Redis 缓存。"""
+        inner = AsyncMock(spec=HydraPort)
+        inner.introspect.return_value = IntrospectResponse(
+            active=True, visitor_id="u1", exp=int(time.time()) + 3600
+        )
+        redis_client = FakeRedis()
+
+        async def redis_client_factory():
+            return redis_client
+
+        adapter = CachedHydraAdapter(inner, test_settings, redis_client_factory)
+        await adapter.introspect("token-1")
+        assert len(redis_client.data) == 1
+        assert "token-1" not in next(iter(redis_client.data))
+
+        # 另一个 worker 通过 Redis 命中缓存
+        other = CachedHydraAdapter(inner, test_settings, redis_client_factory)
+        assert (await other.introspect("token-1")).visitor_id == "u1"
+        assert inner.introspect.call_count == 1
+
+        await adapter.invalidate("token-1")
+        assert redis_client.data == {}
+        await adapter.introspect("token-1")
+        assert inner.introspect.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_logout_invalidates_access_token_cache(self):
+        """测试登出时清除 Access Token 的内省缓存。"""
+        hydra_port = AsyncMock(spec=HydraPort)
+        service = LogoutService(
+            session_port=AsyncMock(),
+            oauth2_port=AsyncMock(),
+            deploy_manager_port=AsyncMock(),
+            hydra_port=hydra_port,
+        )
+        session_info = SessionInfo(state="s", token="access-1", refresh_token="refresh-1")
+
+        await service.revoke_and_delete_session(session_info, "session-1")
+
+        hydra_port.invalidate.assert_awaited_once_with("access-1")
+
+
+class TestCachedUserManagementAdapter:
+    """带缓存的 User Management 适配器测试。"""
+
+    @staticmethod
+    def _make_inner():
+        """创建记录调用批次的内层端口。"""
+        calls = []
+
+        class FakeUserManagement(UserManagementPort):
+            async def batch_get_user_info_by_id(self, user_ids):
+                calls.append(list(user_ids))
+                await asyncio.sleep(0.01)
+                return {
+                    uid: UserInfo(id=uid, account=uid, vision_name=uid)
+                    for uid in user_ids
+                    if not uid.startswith("missing")
+                }
+
+        return FakeUserManagement(), calls
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_are_batched_and_deduplicated(self, test_settings: Settings):
+        """测试并发未命中合并为少量批量查询，同一用户只查询一次。"""
+        inner, calls = self._make_inner()
+        test_settings.user_info_batch_max_size = 50
+        adapter = CachedUserManagementAdapter(inner, test_settings)
+
+        user_ids = [f"u{i}" for i in range(500)] + ["u1", "u2"]
+        results = await asyncio.gather(
+            *(adapter.batch_get_user_info_by_id([uid]) for uid in user_ids)
+        )
+
+        assert all(uid in result for uid, result in zip(user_ids, results))
+        assert len(calls) == 10
+        assert sorted(uid for batch in calls for uid in batch) == sorted(set(user_ids))
+
+        # 之后的请求命中缓存
+        await adapter.batch_get_user_info_by_id(["u1", "u499"])
+        assert len(calls) == 10
+
+    @pytest.mark.asyncio
+    async def test_missing_user_is_omitted_and_not_cached(self, test_settings: Settings):
+        """测试不存在的用户不返回也不缓存。"""
+        inner, calls = self._make_inner()
+        adapter = CachedUserManagementAdapter(inner, test_settings)
+
+        assert await adapter.batch_get_user_info_by_id(["missing-1"]) == {}
+        assert await adapter.batch_get_user_info_by_id(["missing-1"]) == {}
+        assert len(calls) == 2
+
+
+class TestAuthMiddleware:
+    """认证中间件测试。"""
+
+    @staticmethod
+    def _legacy_is_public_path(path: str) -> bool:
+        """重构前的逐项匹配实现，用于对照。"""
+        for public_path in PUBLIC_PATHS:
+            if path == public_path:
+                return True
+            if path.endswith(public_path) or path.endswith(public_path + "/"):
+                return True
+            if path.startswith(public_path + "/") or path.startswith(public_path + "?"):
+                return True
+        return False
+
+    def test_is_public_path_matches_legacy_behaviour(self):
+        """测试预编译的公开路径匹配与原实现一致。"""
+        paths = [
+            "/healthz", "/api/dip-hub/v1/healthz", "/api/dip-hub/v1/readyz/",
+            "/docs", "/docs/oauth2-redirect", "/api/dip-hub/v1/openapi.json",
+            "/api/dip-hub/v1/login/callback", "/api/dip-hub/v1/logout",
+            "/api/dip-hub/v1/applications", "/api/dip-hub/v1/applications/login-app",
+            "/api/dip-hub/v1/userinfo", "/", "",
+        ]
+        for path in paths:
+            assert is_public_path(path) == self._legacy_is_public_path(path), path
+
+    @staticmethod
+    def _make_client(test_settings: Settings, active: bool = True) -> TestClient:
+        """创建挂载认证中间件的测试应用，容器中的 Hydra/User Management 替换为桩。"""
+        container = init_container(test_settings)
+        hydra = AsyncMock(spec=HydraPort)
+        hydra.introspect.return_value = IntrospectResponse(active=active, visitor_id="u1")
+        user_management = AsyncMock(spec=UserManagementPort)
+        user_management.batch_get_user_info_by_id.return_value = {
+            "u1": UserInfo(id="u1", account="alice", vision_name="Alice")
+        }
+        container._hydra_adapter = hydra
+        container._user_management_adapter = user_management
+
+        app = FastAPI()
+        app.add_middleware(AuthMiddleware)
+
+        @app.get("/api/dip-hub/v1/applications")
+        async def applications(request: Request):
+            return {
+                "state_token": request.state.auth_token,
+                "context_token": get_auth_token(),
+                "user": UserContext.get_user_info().account,
+            }
+
+        @app.get("/api/dip-hub/v1/healthz")
+        async def healthz():
+            return StreamingResponse(iter([b"o", b"k"]))
+
+        return TestClient(app)
+
+    def test_authenticated_request_sets_state_and_contexts(self, test_settings: Settings):
+        """测试认证通过后 request.state、TokenContext 和 UserContext 均已设置。"""
+        client = self._make_client(test_settings)
+
+        response = client.get("/api/dip-hub/v1/applications", headers={"Authorization": "Bearer abc"})
+
+        assert response.status_code == 200
+        assert response.json() == {"state_token": "Bearer abc", "context_token": "abc", "user": "alice"}
+
+    def test_rejects_missing_or_inactive_token(self, test_settings: Settings):
+        """测试缺少 token 或 token 无效时返回 401。"""
+        assert self._make_client(test_settings).get("/api/dip-hub/v1/applications").status_code == 401
+
+        client = self._make_client(test_settings, active=False)
+        response = client.get("/api/dip-hub/v1/applications", headers={"Authorization": "Bearer abc"})
+        assert response.status_code == 401
+
+    def test_public_path_streams_without_token(self, test_settings: Settings):
+        """测试公开路径无需 token，流式响应正常透传。"""
+        response = self._make_client(test_settings).get("/api/dip-hub/v1/healthz")
+
+        assert response.status_code == 200
+        assert response.content == b"ok"
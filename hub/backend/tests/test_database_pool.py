@@ -0,0 +1,59 @@
+"""
+Database Pool Tests
+
+Unit tests for the database connection pool wrapper.
+"""
+import asyncio
+
+import pytest
+
+from src.infrastructure.config.settings import Settings
+from src.infrastructure.database.pool import DatabasePool
+from src.infrastructure.metrics import Histogram
+
+
+class TestDatabasePool:
+    """数据库连接池测试。"""
+
+    @pytest.mark.asyncio
+    async def test_acquire_times_out_and_counts_waiters(self):
+        """测试连接全部占用时获取连接超时，等待数和等待时间计入指标，超时后连接不泄漏。"""
+
+        class FakeAioPool:
+            """只有一个连接的 aiomysql 连接池。"""
+
+            minsize = maxsize = size = 1
+
+            def __init__(self):
+                self.freesize = 1
+                self._cond = asyncio.Condition()
+
+            async def acquire(self):
+                async with self._cond:
+                    await self._cond.wait_for(lambda: self.freesize > 0)
+                    self.freesize -= 1
+                    return object()
+
+            async def release(self, conn):
+                async with self._cond:
+                    self.freesize += 1
+                    self._cond.notify()
+
+        acquire_wait = Histogram()
+        pool = DatabasePool(Settings(db_pool_acquire_timeout=0.05), acquire_wait)
+        pool._pool = FakeAioPool()
+        async with pool.acquire():
+            assert (pool.in_use, pool.free) == (1, 0)
+            blocked = asyncio.ensure_future(pool.acquire().__aenter__())
+            await asyncio.sleep(0.01)
+            assert pool.waiting == 1
+            with pytest.raises(TimeoutError, match="获取数据库连接超时"):
+                await blocked
+            assert pool.waiting == 0
+
+        await asyncio.sleep(0)
+        assert pool.acquire_timeouts == 1
+        assert (pool.in_use, pool.free) == (0, 1)
+        async with pool.acquire():
+            pass
+        assert ("_count", {}, 3) in acquire_wait.collect()
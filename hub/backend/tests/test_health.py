@@ -77,3 +77,18 @@ class TestReadyEndpoint:
         # 响应体应该为空
         assert response.text == ""
 
+
+class TestMetricsEndpoint:
+    """运行时指标接口测试。"""
+
+    def test_metrics_returns_prometheus_text_without_auth(self, test_client: TestClient, test_settings: Settings):
+        """测试指标接口无需认证，返回事件循环延迟、阻塞任务执行器和数据库连接池指标。"""
+        response = test_client.get(f"{test_settings.api_prefix}/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE dip_hub_event_loop_lag_seconds gauge" in response.text
+        assert "dip_hub_blocking_executor_max_workers 4.0" in response.text
+        assert "# TYPE dip_hub_install_stage_duration_seconds histogram" in response.text
+        assert 'dip_hub_db_pool_connections{state="in_use"} 0.0' in response.text
+        assert "# TYPE dip_hub_db_pool_acquire_wait_seconds histogram" in response.text
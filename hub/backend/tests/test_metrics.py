@@ -0,0 +1,39 @@
+"""
+Metrics Tests
+
+Unit tests for install stage timing and metrics histograms.
+"""
+from src.infrastructure.metrics import InstallMetrics, MetricsRegistry, StageTimer
+
+
+class TestInstallMetrics:
+    """安装阶段计时与指标测试。"""
+
+    def test_stage_timer_feeds_install_histograms(self):
+        """测试阶段计时器的顺序阶段和并发子阶段计时，以及安装直方图的文本输出。"""
+        now = [0.0]
+        timer = StageTimer(clock=lambda: now[0])
+        timer.begin("extract")
+        now[0] = 0.5
+        timer.begin("validate")
+        with timer.stage("agent_import"):
+            now[0] = 2.0
+        timer.stop()
+        timer.stop()
+
+        assert timer.durations == {"extract": 0.5, "agent_import": 1.5, "validate": 1.5}
+        assert timer.elapsed == 2.0
+
+        registry = MetricsRegistry()
+        metrics = InstallMetrics(registry)
+        for stage, seconds in timer.durations.items():
+            metrics.observe_stage(stage, seconds)
+        metrics.add_artifact_bytes("image", 100)
+        metrics.add_artifact_bytes("image", 50, skipped=True)
+        text = registry.render()
+
+        assert 'dip_hub_install_stage_duration_seconds_bucket{stage="extract",le="0.5"} 1.0' in text
+        assert 'dip_hub_install_stage_duration_seconds_bucket{stage="validate",le="1.0"} 0.0' in text
+        assert 'dip_hub_install_stage_duration_seconds_bucket{stage="validate",le="+Inf"} 1.0' in text
+        assert 'dip_hub_install_stage_duration_seconds_sum{stage="validate"} 1.5' in text
+        assert 'dip_hub_install_artifact_bytes_total{kind="image",result="skipped"} 50.0' in text